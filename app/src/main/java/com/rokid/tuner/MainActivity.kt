@@ -15,7 +15,6 @@ import androidx.lifecycle.Lifecycle
 import androidx.lifecycle.lifecycleScope
 import androidx.lifecycle.repeatOnLifecycle
 import com.rokid.tuner.constants.UiConstants
-import com.rokid.tuner.pitch.PitchDetector
 import kotlinx.coroutines.launch
 
 class MainActivity : AppCompatActivity() {
@@ -30,6 +29,9 @@ class MainActivity : AppCompatActivity() {
     
     private var activityStartTime: Long = UiConstants.INITIAL_TIME
 
+    private val presenter by lazy { TunerPresenter(viewModel::getTuningStatus, displayFrameIntervalMs()) }
+    private var renderedState: TunerPresenter.DisplayState? = null
+
     private companion object {
         private const val TAG = "MainActivity"
         private const val AUDIO_PERMISSION_REQUEST_CODE = UiConstants.AUDIO_PERMISSION_REQUEST_CODE
@@ -60,55 +62,42 @@ class MainActivity : AppCompatActivity() {
     private fun observeViewModel() {
         lifecycleScope.launch {
             repeatOnLifecycle(Lifecycle.State.STARTED) {
-                viewModel.tuningState.collect { state ->
-                    updateUI(state)
+                presenter.displayStates(viewModel.tuningState).collect { display ->
+                    render(display)
                 }
             }
         }
     }
 
-    private fun updateUI(state: TunerViewModel.TuningState) {
-        when (state) {
-            is TunerViewModel.TuningState.Idle -> {
-                noteTextView.text = getString(R.string.note_placeholder)
-                frequencyTextView.text = ""
-                centsTextView.text = ""
-                statusTextView.text = ""
-            }
-            is TunerViewModel.TuningState.Listening -> {
-                noteTextView.text = getString(R.string.note_placeholder)
-                frequencyTextView.text = ""
-                centsTextView.text = ""
-                statusTextView.text = getString(R.string.listening)
-            }
-            is TunerViewModel.TuningState.Detected -> {
-                updateTunerDisplay(state.result)
-            }
-            is TunerViewModel.TuningState.Error -> {
-                noteTextView.text = getString(R.string.note_placeholder)
-                frequencyTextView.text = ""
-                centsTextView.text = ""
-                statusTextView.text = getString(R.string.error_format, state.message)
+    /** Touches only the views whose text changed since the last render. */
+    private fun render(display: TunerPresenter.DisplayState) {
+        val previous = renderedState
+        if (previous == null || display.noteName != previous.noteName) {
+            noteTextView.text = display.noteName ?: getString(R.string.note_placeholder)
+        }
+        if (previous == null || display.frequencyText != previous.frequencyText) {
+            frequencyTextView.text = display.frequencyText
+        }
+        if (previous == null || display.centsText != previous.centsText) {
+            centsTextView.text = display.centsText
+        }
+        if (previous == null || display.status != previous.status || display.errorMessage != previous.errorMessage) {
+            statusTextView.text = when (display.status) {
+                TunerPresenter.Status.NONE -> ""
+                TunerPresenter.Status.LISTENING -> getString(R.string.listening)
+                TunerPresenter.Status.IN_TUNE -> getString(R.string.in_tune)
+                TunerPresenter.Status.SHARP -> getString(R.string.sharp_indicator)
+                TunerPresenter.Status.FLAT -> getString(R.string.flat_indicator)
+                TunerPresenter.Status.ERROR -> getString(R.string.error_format, display.errorMessage)
             }
         }
+        renderedState = display
     }
 
-    private fun updateTunerDisplay(result: PitchDetector.PitchResult) {
-        noteTextView.text = result.noteName
-        frequencyTextView.text = String.format("%.1f Hz", result.frequency)
-        centsTextView.text = if (result.cents > 0) {
-            String.format("+%.1f", result.cents)
-        } else {
-            String.format("%.1f", result.cents)
-        }
-        
-        val status = viewModel.getTuningStatus(result)
-        statusTextView.text = when (status) {
-            TunerViewModel.TuningStatus.IN_TUNE -> getString(R.string.in_tune)
-            TunerViewModel.TuningStatus.SHARP -> getString(R.string.sharp_indicator)
-            TunerViewModel.TuningStatus.FLAT -> getString(R.string.flat_indicator)
-            TunerViewModel.TuningStatus.LISTENING -> getString(R.string.listening)
-        }
+    private fun displayFrameIntervalMs(): Long {
+        @Suppress("DEPRECATION")
+        val refreshRate = windowManager.defaultDisplay.refreshRate
+        return if (refreshRate > 0f) (1000f / refreshRate).toLong() else UiConstants.DISPLAY_FRAME_INTERVAL_MS
     }
 
     private fun hasAudioPermission(): Boolean {
@@ -173,8 +162,10 @@ class MainActivity : AppCompatActivity() {
             return
         }
         if (viewModel.isRunning.value) {
-            Log.d(TAG, "Stopping tuning from onStop")
-            viewModel.stopTuning()
+            // Keep the audio session and detector so onResume restarts warm; the
+            // ViewModel releases them if the activity does not come back soon
+            Log.d(TAG, "Pausing tuning from onStop")
+            viewModel.pauseTuning()
         }
     }
 
@@ -0,0 +1,141 @@
+package com.rokid.tuner
+
+import com.rokid.tuner.audio.AudioConfig
+import com.rokid.tuner.constants.UiConstants
+import com.rokid.tuner.pitch.PitchDetector
+import kotlinx.coroutines.delay
+import kotlinx.coroutines.flow.Flow
+import kotlinx.coroutines.flow.conflate
+import kotlinx.coroutines.flow.distinctUntilChanged
+import kotlinx.coroutines.flow.flow
+import kotlinx.coroutines.flow.map
+
+/**
+ * Sits between [TunerViewModel.tuningState] and the views.
+ *
+ * Results are quantised to display resolution (0.1 Hz and 0.1 cent). While the note,
+ * status and rounded values stay the same, [present] returns the previous [DisplayState]
+ * instance, so [displayStates] only emits when something visible changes. Formatted
+ * strings come from caches: cents within the +/-50 cent display range are formatted once
+ * per value, and frequencies through a small direct-mapped cache. No String.format runs
+ * on the hot path.
+ *
+ * [displayStates] also caps emissions to one per frameIntervalMs, keeping only the
+ * newest state, so the views never update faster than the display refreshes.
+ *
+ * Not thread-safe; collect from a single coroutine (normally the main thread).
+ */
+class TunerPresenter(
+    private val statusOf: (PitchDetector.PitchResult) -> TunerViewModel.TuningStatus,
+    private val frameIntervalMs: Long = UiConstants.DISPLAY_FRAME_INTERVAL_MS
+) {
+
+    enum class Status { NONE, LISTENING, IN_TUNE, SHARP, FLAT, ERROR }
+
+    /** What the views show; noteName null means the placeholder. */
+    data class DisplayState(
+        val noteName: String?,
+        val frequencyText: String,
+        val centsText: String,
+        val status: Status,
+        val errorMessage: String? = null
+    )
+
+    companion object {
+        val IDLE = DisplayState(null, "", "", Status.NONE)
+        val LISTENING = DisplayState(null, "", "", Status.LISTENING)
+
+        private const val TENTHS = 10.0
+        private const val FREQUENCY_CACHE_SIZE = 256  // power of two
+        private val CENTS_CACHE_RANGE = (AudioConfig.MAX_CENTS_DEVIATION * TENTHS).toInt()
+
+        /** Formats a value given in tenths as "[-]units.tenths" without String.format. */
+        internal fun formatTenths(tenths: Int): String {
+            val magnitude = Math.abs(tenths)
+            val builder = StringBuilder(8)
+            if (tenths < 0) builder.append('-')
+            return builder.append(magnitude / 10).append('.').append(magnitude % 10).toString()
+        }
+    }
+
+    private var last = IDLE
+    private var lastFrequencyTenths = Int.MIN_VALUE
+    private var lastCentsTenths = Int.MIN_VALUE
+
+    private val centsCache = arrayOfNulls<String>(2 * CENTS_CACHE_RANGE + 1)
+    private val frequencyKeys = IntArray(FREQUENCY_CACHE_SIZE) { Int.MIN_VALUE }
+    private val frequencyValues = arrayOfNulls<String>(FREQUENCY_CACHE_SIZE)
+
+    /**
+     * Display state for a tuning state; the same instance as last time when nothing
+     * visible has changed.
+     */
+    fun present(state: TunerViewModel.TuningState): DisplayState {
+        val next = when (state) {
+            is TunerViewModel.TuningState.Idle -> IDLE
+            is TunerViewModel.TuningState.Listening -> LISTENING
+            is TunerViewModel.TuningState.Error ->
+                if (last.status == Status.ERROR && last.errorMessage == state.message) last
+                else DisplayState(null, "", "", Status.ERROR, state.message)
+            is TunerViewModel.TuningState.Detected -> presentResult(state.result)
+        }
+        if (next.status != Status.IN_TUNE && next.status != Status.SHARP && next.status != Status.FLAT) {
+            lastFrequencyTenths = Int.MIN_VALUE
+            lastCentsTenths = Int.MIN_VALUE
+        }
+        last = next
+        return next
+    }
+
+    /**
+     * Display states for states, emitted only on visible changes and at most once per
+     * frame interval (the newest state wins).
+     */
+    fun displayStates(states: Flow<TunerViewModel.TuningState>): Flow<DisplayState> = flow {
+        states.map { present(it) }
+            .distinctUntilChanged()
+            .conflate()
+            .collect { display ->
+                emit(display)
+                delay(frameIntervalMs)
+            }
+    }.distinctUntilChanged()
+
+    private fun presentResult(result: PitchDetector.PitchResult): DisplayState {
+        val frequencyTenths = Math.round(result.frequency * TENTHS).toInt()
+        val centsTenths = Math.round(result.cents * TENTHS.toFloat())
+        val status = when (statusOf(result)) {
+            TunerViewModel.TuningStatus.IN_TUNE -> Status.IN_TUNE
+            TunerViewModel.TuningStatus.SHARP -> Status.SHARP
+            TunerViewModel.TuningStatus.FLAT -> Status.FLAT
+            TunerViewModel.TuningStatus.LISTENING -> Status.LISTENING
+        }
+
+        val previous = last
+        if (status == previous.status && result.noteName == previous.noteName &&
+            frequencyTenths == lastFrequencyTenths && centsTenths == lastCentsTenths) {
+            return previous
+        }
+        lastFrequencyTenths = frequencyTenths
+        lastCentsTenths = centsTenths
+        return DisplayState(result.noteName, frequencyText(frequencyTenths), centsText(centsTenths), status)
+    }
+
+    private fun centsText(tenths: Int): String {
+        val index = tenths + CENTS_CACHE_RANGE
+        if (index < 0 || index >= centsCache.size) return formatCents(tenths)
+        return centsCache[index] ?: formatCents(tenths).also { centsCache[index] = it }
+    }
+
+    private fun formatCents(tenths: Int): String =
+        if (tenths > 0) "+" + formatTenths(tenths) else formatTenths(tenths)
+
+    private fun frequencyText(tenths: Int): String {
+        val slot = tenths and (FREQUENCY_CACHE_SIZE - 1)
+        if (frequencyKeys[slot] == tenths) return frequencyValues[slot]!!
+        val text = formatTenths(tenths) + " Hz"
+        frequencyKeys[slot] = tenths
+        frequencyValues[slot] = text
+        return text
+    }
+}
@@ -3,17 +3,31 @@ package com.rokid.tuner
 import android.util.Log
 import androidx.lifecycle.ViewModel
 import androidx.lifecycle.viewModelScope
+import com.rokid.tuner.audio.AudioConfig
+import com.rokid.tuner.audio.AudioFrame
 import com.rokid.tuner.audio.AudioRecorder
+import com.rokid.tuner.audio.AudioSource
+import com.rokid.tuner.audio.DutyCycleScheduler
+import com.rokid.tuner.audio.FrameQueue
+import com.rokid.tuner.audio.SlidingWindowBuffer
 import com.rokid.tuner.constants.UiConstants
+import com.rokid.tuner.pitch.FrequencyRange
+import com.rokid.tuner.pitch.NoteFinder
+import com.rokid.tuner.pitch.PhaseTracker
 import com.rokid.tuner.pitch.PitchDetector
+import com.rokid.tuner.pitch.PitchEstimator
+import com.rokid.tuner.profiling.StageProfiler
+import kotlinx.coroutines.CoroutineDispatcher
 import kotlinx.coroutines.Dispatchers
 import kotlinx.coroutines.Job
+import kotlinx.coroutines.coroutineScope
 import kotlinx.coroutines.delay
 import kotlinx.coroutines.currentCoroutineContext
 import kotlinx.coroutines.ensureActive
 import kotlinx.coroutines.flow.MutableStateFlow
 import kotlinx.coroutines.flow.StateFlow
 import kotlinx.coroutines.flow.asStateFlow
+import kotlinx.coroutines.flow.collectLatest
 import kotlinx.coroutines.isActive
 import kotlinx.coroutines.launch
 import java.util.concurrent.atomic.AtomicBoolean
@@ -21,12 +35,30 @@ import java.util.concurrent.atomic.AtomicBoolean
 /**
  * ViewModel for managing tuner state and business logic.
  * Separates UI concerns from audio processing and pitch detection.
+ *
+ * Audio comes from audioSourceFactory, called each time capture starts cold; it defaults
+ * to the microphone and can be a [com.rokid.tuner.audio.ReplayAudioSource] in tests.
+ * [pauseTuning] keeps the audio session and detector for warmRestartTimeoutMs so that
+ * [startTuning] can resume without rebuilding them.
+ *
+ * Capture runs on ioDispatcher; analysis, the strobe ticker and the warm-restart timeout
+ * run on defaultDispatcher. Tests pass a test dispatcher for both to run in virtual time.
+ *
+ * In strobe mode (see [setStrobeEnabled]) the capture side also follows the phase of the
+ * note the detector has locked with a [PhaseTracker], and [strobeState] is updated at
+ * display rate from the newest phase reading, without a pitch estimate per update.
  */
-class TunerViewModel : ViewModel() {
+class TunerViewModel(
+    private val audioSourceFactory: () -> AudioSource = { AudioRecorder() },
+    private val warmRestartTimeoutMs: Long = UiConstants.WARM_RESTART_TIMEOUT_MS,
+    private val ioDispatcher: CoroutineDispatcher = Dispatchers.IO,
+    private val defaultDispatcher: CoroutineDispatcher = Dispatchers.Default
+) : ViewModel() {
 
     companion object {
         private const val TAG = "TunerViewModel"
-        private val DEBUG = UiConstants.DEBUG
+        private const val DEBUG = UiConstants.DEBUG
+        private const val NANOS_PER_MILLI = 1_000_000L
     }
 
     // Tuning state
@@ -42,6 +74,13 @@ class TunerViewModel : ViewModel() {
         IN_TUNE, SHARP, FLAT, LISTENING
     }
 
+    // Strobe readout for the locked note
+    data class StrobeState(
+        val noteName: String,
+        val phase: Double,  // radians, 0..2*pi; turns forward while sharp, backward while flat
+        val cents: Float
+    )
+
     // State flows for UI observation
     private val _tuningState = MutableStateFlow<TuningState>(TuningState.Idle)
     val tuningState: StateFlow<TuningState> = _tuningState.asStateFlow()
@@ -52,15 +91,30 @@ class TunerViewModel : ViewModel() {
     private val _currentRms = MutableStateFlow(0.0)
     val currentRms: StateFlow<Double> = _currentRms.asStateFlow()
 
+    // Null while strobe mode is off or no note is locked
+    private val _strobeState = MutableStateFlow<StrobeState?>(null)
+    val strobeState: StateFlow<StrobeState?> = _strobeState.asStateFlow()
+
     // Internal state
-    private var audioRecorder: AudioRecorder? = null
+    private var audioSource: AudioSource? = null
     private var pitchDetector: PitchDetector? = null
     private var tuningJob: Job? = null
+    private var releaseJob: Job? = null
+    @Volatile private var frameQueue: FrameQueue? = null
+    private val profiler = StageProfiler()
+    private val dutyCycle = DutyCycleScheduler(PitchDetector.rmsThresholdFromSensitivity(UiConstants.DEFAULT_SENSITIVITY))
+    // Owned by the capture side, which rebuilds it when the frequency range changes
+    @Volatile private var analysisWindow = windowFor(FrequencyRange.GUITAR)
     private val isTuning = AtomicBoolean(false)
+    private val isPaused = AtomicBoolean(false)
     private val tuningLock = Any()
 
     // Configuration
     private var sensitivity = UiConstants.DEFAULT_SENSITIVITY
+    private var tuningTargets: List<Int>? = null
+    private var estimatorEngine = PitchEstimator.Engine.YIN
+    @Volatile private var frequencyRange = FrequencyRange.GUITAR
+    private val strobeEnabled = MutableStateFlow(false)
     private val inTuneThresholdCents = UiConstants.DEFAULT_IN_TUNE_THRESHOLD_CENTS
     private val displayDelayMs = UiConstants.DEFAULT_DISPLAY_DELAY_MS
     private val pitchUpdateDelayMs = UiConstants.DEFAULT_PITCH_UPDATE_DELAY_MS
@@ -70,10 +124,21 @@ class TunerViewModel : ViewModel() {
     private var lastValidPitchTime: Long = UiConstants.INITIAL_TIME
     private var lastPitchUpdateTime: Long = UiConstants.INITIAL_TIME
     private var consecutiveNullReads = UiConstants.INITIAL_NULL_READS
+    private var sessionRestartTried = false
+
+    // Strobe mode: analysis posts the locked note, capture tracks its phase and the
+    // ticker publishes the newest reading
+    private class StrobeTarget(val noteName: String, val frequency: Double)
+    @Volatile private var strobeTarget: StrobeTarget? = null
+    @Volatile private var strobeReading: PhaseTracker.Reading? = null
+    private val phaseTracker = PhaseTracker()  // capture side only
+    private var trackedTarget: StrobeTarget? = null  // capture side only
 
     /**
      * Starts the tuning process.
      * Call this when the user grants audio permission and the activity is ready.
+     * After [pauseTuning], resumes with the kept audio session and detector; otherwise
+     * builds both and warms the detector up while the first window is captured.
      */
     fun startTuning() {
         synchronized(tuningLock) {
@@ -82,22 +147,47 @@ class TunerViewModel : ViewModel() {
                 return
             }
 
-            try {
-                Log.d(TAG, "Starting tuning with sensitivity: $sensitivity")
+            val warm = isPaused.get()
+            releaseJob?.cancel()
+            releaseJob = null
+            val previousJob = tuningJob
+            tuningJob = null
 
-                audioRecorder = AudioRecorder()
-                pitchDetector = PitchDetector().apply {
-                    setSensitivity(sensitivity)
+            try {
+                if (warm) {
+                    Log.d(TAG, "Resuming tuning with sensitivity: $sensitivity")
+                } else {
+                    Log.d(TAG, "Starting tuning with sensitivity: $sensitivity")
+
+                    audioSource = audioSourceFactory()
+                    pitchDetector = PitchDetector(profiler).apply {
+                        setSensitivity(sensitivity)
+                        setTrackingEnabled(true)
+                        setTuningTargets(tuningTargets)
+                        setEstimator(estimatorEngine)
+                        setFrequencyRange(frequencyRange)
+                    }
                 }
 
-                audioRecorder?.start()
+                audioSource?.start()
+                isPaused.set(false)
                 isTuning.set(true)
                 _isRunning.value = true
                 
-                resetTimingState()
+                if (!warm) {
+                    dutyCycle.reset()
+                    resetTimingState()
+                }
 
-                tuningJob = viewModelScope.launch(Dispatchers.IO) {
-                    runTuningLoop()
+                tuningJob = viewModelScope.launch(ioDispatcher) {
+                    // A paused or stopped loop may still be finishing its last frame
+                    previousJob?.join()
+                    if (warm) {
+                        dutyCycle.reset()
+                        resetTimingState()
+                        pitchDetector?.reset()
+                    }
+                    runTuningLoop(warmUp = !warm)
                 }
             } catch (e: Exception) {
                 Log.e(TAG, "Error starting tuning", e)
@@ -108,21 +198,60 @@ class TunerViewModel : ViewModel() {
     }
 
     /**
-     * Stops the tuning process and releases resources.
+     * Pauses tuning for a brief interruption: capture and analysis stop, but the audio
+     * session and the detector's preallocated state are kept so the next [startTuning]
+     * resumes warm and reports a note from its first analysis window. Released as by
+     * [stopTuning] if tuning is not resumed within warmRestartTimeoutMs.
+     */
+    fun pauseTuning() {
+        Log.d(TAG, "Pausing tuning...")
+        synchronized(tuningLock) {
+            if (!isTuning.get()) return
+
+            isTuning.set(false)
+            _isRunning.value = false
+
+            // Kept so the resumed loop can wait for this one to finish
+            tuningJob?.cancel()
+            frameQueue = null
+
+            audioSource?.pause()
+            isPaused.set(true)
+            strobeTarget = null
+
+            releaseJob = viewModelScope.launch(defaultDispatcher) {
+                delay(warmRestartTimeoutMs)
+                Log.d(TAG, "Not resumed within $warmRestartTimeoutMs ms, releasing")
+                stopTuning()
+            }
+        }
+
+        _tuningState.value = TuningState.Idle
+        _currentRms.value = 0.0
+        _strobeState.value = null
+        Log.d(TAG, "Tuning paused")
+    }
+
+    /**
+     * Stops the tuning process and releases resources, including any kept by [pauseTuning].
      */
     fun stopTuning() {
         Log.d(TAG, "Stopping tuning...")
         synchronized(tuningLock) {
-            if (!isTuning.get()) return
+            val paused = isPaused.getAndSet(false)
+            if (!isTuning.get() && !paused) return
 
             isTuning.set(false)
             _isRunning.value = false
-            
+
+            releaseJob?.cancel()
+            releaseJob = null
+            // Kept so a restart can wait for this loop to finish
             tuningJob?.cancel()
-            tuningJob = null
+            frameQueue = null
 
-            audioRecorder?.stop()
-            audioRecorder = null
+            audioSource?.stop()
+            audioSource = null
 
             pitchDetector?.reset()
             pitchDetector = null
@@ -132,6 +261,7 @@ class TunerViewModel : ViewModel() {
         
         _tuningState.value = TuningState.Idle
         _currentRms.value = 0.0
+        _strobeState.value = null
         Log.d(TAG, "Tuning stopped")
     }
 
@@ -142,8 +272,72 @@ class TunerViewModel : ViewModel() {
     fun setSensitivity(value: Int) {
         sensitivity = value.coerceIn(UiConstants.MIN_SENSITIVITY, UiConstants.MAX_SENSITIVITY)
         pitchDetector?.setSensitivity(sensitivity)
+        dutyCycle.rmsThreshold = PitchDetector.rmsThresholdFromSensitivity(sensitivity)
+    }
+
+    /**
+     * Tunes to fixed strings (semitones from A4, e.g. MusicalConstants.STANDARD_TUNING_SEMITONES)
+     * instead of detecting any chromatic note; null restores chromatic mode.
+     */
+    fun setTuningTargets(semitonesFromA4: List<Int>?) {
+        tuningTargets = semitonesFromA4?.toList()
+        pitchDetector?.setTuningTargets(tuningTargets)
+    }
+
+    /**
+     * Selects the pitch estimation engine; applies immediately while tuning.
+     */
+    fun setEstimator(engine: PitchEstimator.Engine) {
+        estimatorEngine = engine
+        pitchDetector?.setEstimator(engine)
+    }
+
+    /**
+     * Selects the pitch range (see [FrequencyRange]); applies immediately while tuning,
+     * with the analysis window resized from the next captured block.
+     */
+    fun setFrequencyRange(range: FrequencyRange) {
+        frequencyRange = range
+        pitchDetector?.setFrequencyRange(range)
+    }
+
+    /**
+     * Enables strobe mode: once a note is detected, [strobeState] follows the signal's
+     * phase against that note at display rate with sub-cent resolution, much faster than
+     * [tuningState], which is limited by the pitch update delay. Off by default.
+     */
+    fun setStrobeEnabled(enabled: Boolean) {
+        strobeEnabled.value = enabled
+        if (!enabled) strobeTarget = null
+    }
+
+    /**
+     * Returns capture/analysis queue counters (frames published, analysed and dropped,
+     * windows superseded by a newer one from the same block, current and peak queue depth),
+     * or null when tuning is not running.
+     */
+    fun getPipelineStats(): FrameQueue.Stats? = frameQueue?.stats()
+
+    /**
+     * Returns audio time spent in each duty-cycle state since tuning started: analysed at
+     * full rate, found silent on raw PCM, or skipped while backed off.
+     */
+    fun getDutyCycleStats(): DutyCycleScheduler.Stats = dutyCycle.stats()
+
+    /**
+     * Enables or disables per-stage timing of the detector and state emission, plus the
+     * end-to-end latency from sample capture to emission.
+     * Disabled by default; when off, instrumentation costs one volatile read per stage.
+     */
+    fun setProfilingEnabled(enabled: Boolean) {
+        profiler.enabled = enabled
     }
 
+    /**
+     * Returns per-stage counts, totals and latency histograms collected so far.
+     */
+    fun getProfileSnapshot(): StageProfiler.Snapshot = profiler.snapshot()
+
     /**
      * Determines the tuning status based on cents deviation.
      */
@@ -161,10 +355,40 @@ class TunerViewModel : ViewModel() {
         lastValidPitchTime = UiConstants.INITIAL_TIME
         lastPitchUpdateTime = UiConstants.INITIAL_TIME
         consecutiveNullReads = UiConstants.INITIAL_NULL_READS
+        strobeTarget = null
     }
 
-    private suspend fun runTuningLoop() {
+    /**
+     * Runs capture and analysis as two coroutines joined by [FrameQueue].
+     * Capture keeps draining the device while analysis always works on the newest window;
+     * stale windows are dropped rather than queued. With warmUp, the analysis side first
+     * warms the detector up, overlapping the capture of the first window. A third
+     * coroutine publishes the strobe while strobe mode is on.
+     */
+    private suspend fun runTuningLoop(warmUp: Boolean): Unit = coroutineScope {
         Log.d(TAG, "Tuning loop started")
+        val queue = FrameQueue(FrequencyRange.MAX_WINDOW_SIZE)
+        frameQueue = queue
+
+        val analysisJob = launch(defaultDispatcher) {
+            if (warmUp) pitchDetector?.warmUp()
+            runAnalysisLoop(queue)
+        }
+        val strobeJob = launch(defaultDispatcher) { runStrobeTicker() }
+        try {
+            runCaptureLoop(queue)
+        } finally {
+            queue.close()
+            // The window belongs to the capture side, so it is cleared here rather than by
+            // the thread that stops or pauses tuning
+            analysisWindow.clear()
+        }
+        analysisJob.join()
+        strobeJob.cancel()
+        Log.d(TAG, "Tuning loop ended")
+    }
+
+    private suspend fun runCaptureLoop(queue: FrameQueue) {
         var iteration = 0
 
         while (isTuning.get()) {
@@ -175,25 +399,87 @@ class TunerViewModel : ViewModel() {
             val debug = DEBUG && (iteration <= UiConstants.DEBUG_ITERATION_THRESHOLD ||
                     iteration % UiConstants.DEBUG_ITERATION_MOD_100 == 0)
 
-            if (debug) Log.d(TAG, "Loop iteration $iteration")
+            if (debug) Log.d(TAG, "Capture iteration $iteration")
+
+            // Paced sources suspend until their next block is due rather than block in the
+            // read; rounded up so the block is due by the time it is read
+            val wait = audioSource?.nanosUntilNextBlock() ?: 0L
+            if (wait > 0L) delay((wait + NANOS_PER_MILLI - 1) / NANOS_PER_MILLI)
 
-            val audioData = audioRecorder?.readNext()
+            val frame = audioSource?.readFrame(dutyCycle)
 
-            if (audioData == null) {
+            if (frame == null) {
                 handleNullAudioData(debug)
+                // Reads normally block; back off instead of spinning when the device is gone
+                delay(UiConstants.TUNING_LOOP_DELAY_MS)
             } else {
-                handleAudioData(audioData, debug)
+                handleAudioData(frame, queue, debug)
+            }
+        }
+    }
+
+    private suspend fun runAnalysisLoop(queue: FrameQueue) {
+        var iteration = 0
+
+        while (true) {
+            val frame = queue.receive() ?: break
+
+            iteration++
+            val debug = DEBUG && (iteration <= UiConstants.DEBUG_ITERATION_THRESHOLD ||
+                    iteration % UiConstants.DEBUG_ITERATION_MOD_100 == 0)
+
+            val captureTime = frame.captureTimeNanos
+            val pitchResult = try {
+                pitchDetector?.detectPitch(frame.samples, 0, frame.size)
+            } finally {
+                queue.recycle(frame)
             }
 
-            delay(UiConstants.TUNING_LOOP_DELAY_MS)
+            val emitStart = profiler.start()
+            if (pitchResult == null) {
+                handleNoPitchDetected(debug)
+            } else {
+                handlePitchDetected(pitchResult, debug)
+            }
+            profiler.stop(StageProfiler.Stage.STATE_EMIT, emitStart)
+            if (emitStart != 0L && captureTime != 0L) {
+                profiler.record(StageProfiler.Stage.END_TO_END, System.nanoTime() - captureTime)
+            }
         }
-        Log.d(TAG, "Tuning loop ended")
+    }
+
+    /**
+     * Publishes [strobeState] every display frame while strobe mode is on, extrapolating
+     * the newest phase reading to the current time.
+     */
+    private suspend fun runStrobeTicker() {
+        strobeEnabled.collectLatest { enabled ->
+            _strobeState.value = null
+            while (enabled) {
+                _strobeState.value = currentStrobeState()
+                delay(UiConstants.DISPLAY_FRAME_INTERVAL_MS)
+            }
+        }
+    }
+
+    private fun currentStrobeState(): StrobeState? {
+        val target = strobeTarget ?: return null
+        val reading = strobeReading ?: return null
+        // Readings taken against an earlier note, or far enough off to be another note
+        if (reading.targetFrequency != target.frequency || Math.abs(reading.cents) > AudioConfig.MAX_CENTS_DEVIATION) {
+            return null
+        }
+        return StrobeState(target.noteName, reading.phaseAt(System.nanoTime()), reading.cents)
     }
 
     private fun handleNullAudioData(debug: Boolean) {
         consecutiveNullReads++
         if (debug) Log.d(TAG, "No audio data, consecutive: $consecutiveNullReads")
 
+        // A missed block breaks the phase the strobe follows
+        phaseTracker.clear()
+        strobeReading = null
+
         if (consecutiveNullReads >= UiConstants.MAX_CONSECUTIVE_NULL_READS) {
             Log.w(TAG, "Too many null reads, restarting audio recorder")
             restartAudioRecorder()
@@ -201,21 +487,81 @@ class TunerViewModel : ViewModel() {
         _currentRms.value = 0.0
     }
 
-    private fun handleAudioData(audioData: FloatArray, debug: Boolean) {
+    private fun handleAudioData(frame: AudioFrame, queue: FrameQueue, debug: Boolean) {
         consecutiveNullReads = UiConstants.INITIAL_NULL_READS
+        sessionRestartTried = false
 
-        val rms = pitchDetector?.computeRMS(audioData) ?: 0.0
+        // RMS was computed by the recorder during float conversion
+        val rms = frame.rms
         _currentRms.value = rms
 
-        if (debug) Log.d(TAG, "Audio size: ${audioData.size}, RMS: $rms")
+        if (debug) Log.d(TAG, "Audio size: ${frame.size}, RMS: $rms, duty state: ${dutyCycle.state}")
 
-        val pitchResult = pitchDetector?.detectPitch(audioData)
+        if (strobeEnabled.value) {
+            trackStrobe(frame)
+        } else if (trackedTarget != null) {
+            trackedTarget = null
+            phaseTracker.setTarget(0.0)
+            strobeReading = null
+        }
 
-        if (pitchResult == null) {
-            handleNoPitchDetected(debug)
-        } else {
-            handlePitchDetected(pitchResult, debug)
+        if (frame.size == 0) {
+            // Gated as silent: drop stale audio, and on inspected blocks pass an empty
+            // frame on so the analysis side still moves the display to Listening
+            analysisWindow.clear()
+            if (dutyCycle.state == DutyCycleScheduler.State.IDLE) {
+                queue.acquire()?.let { empty ->
+                    empty.markSkipped(rms)
+                    empty.captureTimeNanos = frame.captureTimeNanos
+                    queue.publish(empty)
+                }
+            }
+            return
         }
+
+        // Hand the newest due window to the analysis side; windows overlap by windowSize - hopSize
+        var window = analysisWindow
+        if (window.windowSize != frequencyRange.windowSize) {
+            window = windowFor(frequencyRange)
+            analysisWindow = window
+        }
+        window.write(frame.samples, 0, frame.size)
+        var start = -1
+        var due = 0
+        while (true) {
+            val next = window.nextWindow()
+            if (next < 0) break
+            start = next
+            due++
+        }
+        if (start < 0) return
+        // Older windows from the same block would only be replaced in the queue
+        if (due > 1) queue.supersede(due - 1)
+
+        val target = queue.acquire() ?: return
+        target.fillFrom(window.buffer, start, window.windowSize)
+        // Due windows end within this block, so take its capture time
+        target.captureTimeNanos = frame.captureTimeNanos
+        queue.publish(target)
+    }
+
+    /** Capture side: advances the phase tracker over every captured block. */
+    private fun trackStrobe(frame: AudioFrame) {
+        val target = strobeTarget
+        if (target !== trackedTarget) {
+            trackedTarget = target
+            phaseTracker.setTarget(target?.frequency ?: 0.0)
+        }
+        if (frame.size == 0) {
+            // Gated blocks leave a gap, so the phase has to be picked up afresh
+            phaseTracker.clear()
+            strobeReading = null
+            return
+        }
+        val start = profiler.start()
+        val time = if (frame.captureTimeNanos != 0L) frame.captureTimeNanos else System.nanoTime()
+        strobeReading = phaseTracker.process(frame.samples, 0, frame.size, time)
+        profiler.stop(StageProfiler.Stage.STROBE, start)
     }
 
     private fun handleNoPitchDetected(debug: Boolean) {
@@ -229,15 +575,23 @@ class TunerViewModel : ViewModel() {
         } else {
             // Show listening state
             _tuningState.value = TuningState.Listening
+            strobeTarget = null
         }
     }
 
     private fun handlePitchDetected(pitchResult: PitchDetector.PitchResult, debug: Boolean) {
-        Log.d(TAG, "Pitch: ${pitchResult.noteName} at ${pitchResult.frequency} Hz")
+        if (debug) Log.d(TAG, "Pitch: ${pitchResult.noteName} at ${pitchResult.frequency} Hz")
 
         lastValidPitchResult = pitchResult
         lastValidPitchTime = System.currentTimeMillis()
 
+        // The strobe follows the detected note until another one is detected
+        val strobe = strobeTarget
+        if (strobeEnabled.value && (strobe == null || strobe.noteName != pitchResult.noteName)) {
+            strobeTarget = StrobeTarget(pitchResult.noteName,
+                pitchResult.frequency / NoteFinder.centsToFrequencyRatio(pitchResult.cents))
+        }
+
         val currentTime = System.currentTimeMillis()
         val timeSinceLastUpdate = currentTime - lastPitchUpdateTime
 
@@ -249,14 +603,28 @@ class TunerViewModel : ViewModel() {
         }
     }
 
+    /**
+     * Restarts capture after repeated failed reads: first by restarting the existing
+     * session, and only if reads still fail after that by building a new source.
+     */
     private fun restartAudioRecorder() {
         synchronized(tuningLock) {
             try {
-                audioRecorder?.stop()
-                audioRecorder = AudioRecorder()
-                audioRecorder?.start()
+                val source = audioSource
+                if (source != null && !sessionRestartTried) {
+                    source.pause()
+                    source.start()
+                    sessionRestartTried = true
+                    Log.d(TAG, "Audio session restarted")
+                } else {
+                    source?.stop()
+                    audioSource = audioSourceFactory()
+                    audioSource?.start()
+                    sessionRestartTried = false
+                    Log.d(TAG, "Audio recorder rebuilt")
+                }
                 consecutiveNullReads = UiConstants.INITIAL_NULL_READS
-                Log.d(TAG, "Audio recorder restarted")
+                analysisWindow.clear()
             } catch (e: Exception) {
                 Log.e(TAG, "Failed to restart audio recorder", e)
                 _tuningState.value = TuningState.Error("Audio error")
@@ -265,6 +633,12 @@ class TunerViewModel : ViewModel() {
         }
     }
 
+    private fun windowFor(range: FrequencyRange) = SlidingWindowBuffer(
+        range.windowSize,
+        AudioConfig.ANALYSIS_HOP_SIZE,
+        range.windowSize + AudioConfig.BUFFER_SIZE
+    )
+
     override fun onCleared() {
         super.onCleared()
         stopTuning()
@@ -12,6 +12,20 @@ object AudioConfig {
     const val AUDIO_RECORD_INITIALIZED = 1
     const val AUDIO_RECORD_RECORDING = 3
     
+    // Sliding-window analysis (window and hop in samples)
+    const val ANALYSIS_WINDOW_SIZE = 2048
+    const val ANALYSIS_HOP_SIZE = 512
+    // Window for the extended low range: two periods of ~28 Hz fit in half of it
+    const val EXTENDED_ANALYSIS_WINDOW_SIZE = 4096
+    
+    // Capture -> analysis queue: frames waiting for analysis before the oldest is dropped
+    const val PIPELINE_QUEUE_CAPACITY = 1
+    
+    // Duty cycling (see DutyCycleScheduler): silent checks before each doubling of
+    // the inspection stride, and the largest stride in capture blocks
+    const val DUTY_BACKOFF_BLOCKS = 8
+    const val DUTY_MAX_STRIDE = 4
+    
     // Audio processing constants
     const val DEFAULT_REFERENCE_FREQUENCY = 440.0 // A4
     const val MAX_CENTS_DEVIATION = 50.0 // ±50 cents display range
@@ -0,0 +1,105 @@
+package com.rokid.tuner.audio
+
+/**
+ * Reusable view over one block of captured audio.
+ *
+ * The backing array is owned by whoever filled the frame (usually [AudioRecorder]) and is
+ * overwritten on the next read, so consumers must finish with - or copy - the samples
+ * before asking for another frame. Only the first [size] entries of [samples] are valid.
+ */
+class AudioFrame(capacity: Int) {
+
+    companion object {
+        private const val PCM16_SCALE = 1f / Short.MAX_VALUE
+    }
+
+    /** Normalised float PCM in [-1, 1]; valid up to [size]. */
+    val samples = FloatArray(capacity)
+
+    /** Number of valid samples in [samples]. */
+    var size = 0
+        private set
+
+    /** RMS of the normalised samples (same scale as PitchDetector.computeRMS). */
+    var rms = AudioConfig.INITIAL_SUM_SQUARES
+        private set
+
+    /** Largest absolute 16-bit sample value. */
+    var peakAmplitude = AudioConfig.INITIAL_MAX_AMPLITUDE
+        private set
+
+    /** Mean absolute 16-bit sample value. */
+    var averageAmplitude = AudioConfig.INITIAL_SUM
+        private set
+
+    /**
+     * System.nanoTime when the newest sample in this frame was captured, or 0 if unknown.
+     * Set by the [AudioSource] (or copied from the block a window ends in); the fill and
+     * skip methods leave it untouched.
+     */
+    var captureTimeNanos = 0L
+
+    val capacity: Int get() = samples.size
+
+    /**
+     * Converts count 16-bit samples to float and computes RMS, peak and average
+     * amplitude in the same pass. No allocation.
+     */
+    fun fillFromPcm16(pcm: ShortArray, count: Int) {
+        val n = Math.min(count, samples.size)
+        val out = samples
+        var sumAbs = AudioConfig.INITIAL_SUM
+        var sumSquares = AudioConfig.INITIAL_SUM_SQUARES
+        var maxAbs = AudioConfig.INITIAL_MAX_AMPLITUDE
+        for (i in 0 until n) {
+            val sample = pcm[i].toInt()
+            val absVal = if (sample < 0) -sample else sample
+            sumAbs += absVal
+            sumSquares += (sample * sample).toDouble()
+            if (absVal > maxAbs) maxAbs = absVal
+            out[i] = sample * PCM16_SCALE
+        }
+        size = n
+        peakAmplitude = maxAbs
+        averageAmplitude = if (n > 0) sumAbs / n else AudioConfig.INITIAL_SUM
+        rms = if (n > 0) Math.sqrt(sumSquares / n) / Short.MAX_VALUE else AudioConfig.INITIAL_SUM_SQUARES
+    }
+
+    /**
+     * Copies length float samples from source (e.g. a SlidingWindowBuffer window) and
+     * computes the same statistics in the same pass. No allocation.
+     */
+    fun fillFrom(source: FloatArray, offset: Int, length: Int) {
+        val n = Math.min(length, samples.size)
+        val out = samples
+        var sumAbs = AudioConfig.INITIAL_SUM
+        var sumSquares = AudioConfig.INITIAL_SUM_SQUARES
+        var maxAbs = 0f
+        for (i in 0 until n) {
+            val sample = source[offset + i]
+            val absVal = if (sample < 0f) -sample else sample
+            sumAbs += absVal
+            sumSquares += sample * sample
+            if (absVal > maxAbs) maxAbs = absVal
+            out[i] = sample
+        }
+        size = n
+        peakAmplitude = (maxAbs * Short.MAX_VALUE).toInt()
+        averageAmplitude = if (n > 0) sumAbs / n * Short.MAX_VALUE else AudioConfig.INITIAL_SUM
+        rms = if (n > 0) Math.sqrt(sumSquares / n) else AudioConfig.INITIAL_SUM_SQUARES
+    }
+
+    /**
+     * Marks the frame as gated by a [DutyCycleScheduler]: no valid samples, with rms taken
+     * from the scheduler's raw-PCM check so level meters keep updating.
+     */
+    fun markSkipped(rms: Double) {
+        size = 0
+        this.rms = rms
+        peakAmplitude = AudioConfig.INITIAL_MAX_AMPLITUDE
+        averageAmplitude = AudioConfig.INITIAL_SUM
+    }
+
+    /** Returns a standalone copy of the valid samples. */
+    fun copySamples(): FloatArray = samples.copyOf(size)
+}
@@ -5,25 +5,34 @@ import android.media.AudioFormat
 import android.media.AudioRecord
 import android.media.MediaRecorder
 import android.util.Log
+import com.rokid.tuner.constants.UiConstants
 import java.util.concurrent.atomic.AtomicBoolean
 import java.util.concurrent.atomic.AtomicInteger
-import kotlin.math.abs
 
 @SuppressLint("MissingPermission")
-class AudioRecorder {
+class AudioRecorder : AudioSource {
 
     private var audioRecord: AudioRecord? = null
     private val isRecording = AtomicBoolean(false)
     private val lock = Any()
     private val readCounter = AtomicInteger(AudioConfig.INITIAL_READ_COUNTER)
 
+    // Capture buffers, allocated once and reused for every read
+    private val pcmBuffer = ShortArray(READ_SIZE_SHORTS)
+    private val frame = AudioFrame(READ_SIZE_SHORTS)
+
     companion object {
         private const val TAG = "AudioRecorder"
+        private const val DEBUG = UiConstants.DEBUG
         private const val SAMPLE_RATE = AudioConfig.SAMPLE_RATE
         private const val CHANNEL_CONFIG = AudioFormat.CHANNEL_IN_MONO
         private const val AUDIO_FORMAT = AudioFormat.ENCODING_PCM_16BIT
         private const val BUFFER_SIZE_BYTES = AudioConfig.BUFFER_SIZE
         
+        // Samples taken per read: one analysis hop, so each read makes at most one window due.
+        // The AudioRecord buffer stays several reads deep so capture survives scheduling jitter.
+        private const val READ_SIZE_SHORTS = AudioConfig.ANALYSIS_HOP_SIZE
+        
         private const val AUDIO_SOURCE = MediaRecorder.AudioSource.MIC
         
         private val minBufferSizeBytes = AudioRecord.getMinBufferSize(
@@ -42,14 +51,15 @@ class AudioRecorder {
         private val bufferSizeShorts = minBufferSizeBytes / AudioConfig.BYTES_PER_SHORT
         
         init {
-            Log.d(TAG, "AudioRecorder config: sampleRate=$SAMPLE_RATE, minBufferSizeBytes=$minBufferSizeBytes, bufferSizeShorts=$bufferSizeShorts")
+            Log.d(TAG, "AudioRecorder config: sampleRate=$SAMPLE_RATE, minBufferSizeBytes=$minBufferSizeBytes, bufferSizeShorts=$bufferSizeShorts, readSizeShorts=$READ_SIZE_SHORTS")
         }
     }
 
     @SuppressLint("MissingPermission")
-    fun start() {
+    override fun start() {
         synchronized(lock) {
             if (isRecording.get()) return
+            if (resumePaused()) return
 
             try {
                 Log.d(TAG, "Creating AudioRecord: source=$AUDIO_SOURCE, sampleRate=$SAMPLE_RATE, channel=$CHANNEL_CONFIG, format=$AUDIO_FORMAT, bufferSize=${minBufferSizeBytes * AudioConfig.BUFFER_SIZE_MULTIPLIER}")
@@ -84,62 +94,99 @@ class AudioRecorder {
         }
     }
 
-    fun readNext(): FloatArray? {
+    /**
+     * Restarts a session kept by [pause]. Returns false, releasing it, if it will not
+     * record again. Must be called within synchronized(lock).
+     */
+    private fun resumePaused(): Boolean {
+        val paused = audioRecord ?: return false
+        try {
+            paused.startRecording()
+            if (paused.recordingState == AudioRecord.RECORDSTATE_RECORDING) {
+                isRecording.set(true)
+                readCounter.set(AudioConfig.INITIAL_READ_COUNTER)
+                Log.d(TAG, "Audio recording resumed")
+                return true
+            }
+        } catch (e: IllegalStateException) {
+            Log.w(TAG, "Paused AudioRecord could not be restarted", e)
+        }
+        paused.release()
+        audioRecord = null
+        return false
+    }
+
+    /**
+     * Reads the next block of audio into the recorder's preallocated buffers.
+     *
+     * A block is one analysis hop ([AudioConfig.ANALYSIS_HOP_SIZE] samples), not the whole
+     * AudioRecord buffer, so the sliding window has one new window due per read instead of
+     * several at once. The AudioRecord buffer stays bufferSizeShorts times the multiplier.
+     * Returns a reusable [AudioFrame] view that is overwritten by the next call, or null
+     * if nothing could be read. Conversion to float and the RMS/peak/average statistics
+     * are computed in a single pass, with no per-read allocation. With a scheduler, blocks
+     * it gates are not converted at all and come back empty (see [AudioFrame.markSkipped]).
+     * The frame is stamped with the time the read returned.
+     */
+    override fun readFrame(scheduler: DutyCycleScheduler?): AudioFrame? {
         if (!isRecording.get()) {
-            Log.d(TAG, "Not recording")
+            if (DEBUG) Log.d(TAG, "Not recording")
             return null
         }
         
         val recorder = synchronized(lock) { audioRecord } ?: run {
-            Log.d(TAG, "audioRecord is null")
+            if (DEBUG) Log.d(TAG, "audioRecord is null")
             return null
         }
 
-        val buffer = ShortArray(bufferSizeShorts)
-        val floatBuffer = FloatArray(bufferSizeShorts)
-        
-        val bytesRead = recorder.read(buffer, AudioConfig.BUFFER_READ_OFFSET, bufferSizeShorts)
+        val bytesRead = recorder.read(pcmBuffer, AudioConfig.BUFFER_READ_OFFSET, READ_SIZE_SHORTS)
+        val captureTime = System.nanoTime()
         
         if (bytesRead <= AudioConfig.NO_DATA_READ) {
-            Log.d(TAG, "No audio data read (bytesRead=$bytesRead)")
+            if (DEBUG) Log.d(TAG, "No audio data read (bytesRead=$bytesRead)")
             return null
         }
         
-        val currentCount = readCounter.incrementAndGet()
-        val shouldLog = currentCount <= AudioConfig.INITIAL_LOG_THRESHOLD || currentCount % AudioConfig.LOG_FREQUENCY_MODULUS == 0
-        
-        // Compute RMS and statistics
-        var sum = AudioConfig.INITIAL_SUM
-        var maxAbs = AudioConfig.INITIAL_MAX_AMPLITUDE
-        var sumSquares = AudioConfig.INITIAL_SUM_SQUARES
-        for (i in 0 until bytesRead) {
-            val sample = buffer[i].toInt()
-            val absVal = abs(sample)
-            sum += absVal.toDouble()
-            sumSquares += sample.toDouble() * sample.toDouble()
-            if (absVal > maxAbs) maxAbs = absVal
+        if (scheduler != null && !scheduler.onBlock(pcmBuffer, bytesRead)) {
+            frame.markSkipped(scheduler.lastRms)
+            frame.captureTimeNanos = captureTime
+            return frame
         }
-        val avgAmplitude = sum / bytesRead
-        val rms = Math.sqrt(sumSquares / bytesRead)
+        
+        // Convert to float for pitch detection and compute statistics in one pass
+        frame.fillFromPcm16(pcmBuffer, bytesRead)
+        frame.captureTimeNanos = captureTime
+        
+        val currentCount = readCounter.incrementAndGet()
+        val shouldLog = DEBUG && (currentCount <= AudioConfig.INITIAL_LOG_THRESHOLD || currentCount % AudioConfig.LOG_FREQUENCY_MODULUS == 0)
         
         if (shouldLog) {
             Log.d(TAG, "Read $bytesRead audio samples (shorts) (counter=$currentCount)")
-            Log.d(TAG, "Average amplitude: $avgAmplitude, max amplitude: $maxAbs (max ${Short.MAX_VALUE})")
-            Log.d(TAG, "RMS: $rms")
+            Log.d(TAG, "Average amplitude: ${frame.averageAmplitude}, max amplitude: ${frame.peakAmplitude} (max ${Short.MAX_VALUE})")
+            Log.d(TAG, "RMS: ${frame.rms * Short.MAX_VALUE}")
             if (bytesRead >= AudioConfig.SAMPLES_TO_LOG) {
-                Log.d(TAG, "First 5 samples: ${buffer[0]}, ${buffer[1]}, ${buffer[2]}, ${buffer[3]}, ${buffer[4]}")
+                Log.d(TAG, "First 5 samples: ${pcmBuffer[0]}, ${pcmBuffer[1]}, ${pcmBuffer[2]}, ${pcmBuffer[3]}, ${pcmBuffer[4]}")
             }
         }
         
-        // Convert to float array for pitch detection
-        for (i in 0 until bytesRead) {
-            floatBuffer[i] = buffer[i].toFloat() / Short.MAX_VALUE.toFloat()
+        return frame
+    }
+
+    /**
+     * Reads the next block of audio as a standalone float array.
+     * Prefer [readFrame] on hot paths; this makes one copy per call.
+     */
+    fun readNext(): FloatArray? = readFrame()?.copySamples()
+
+    /** Stops recording but keeps the AudioRecord, so [start] only has to restart it. */
+    override fun pause() {
+        synchronized(lock) {
+            isRecording.set(false)
+            audioRecord?.stop()
         }
-        
-        return floatBuffer.copyOf(bytesRead)
     }
 
-    fun stop() {
+    override fun stop() {
         synchronized(lock) {
             isRecording.set(false)
             audioRecord?.stop()
@@ -148,7 +195,7 @@ class AudioRecorder {
         }
     }
 
-    fun isRecording(): Boolean = isRecording.get()
+    override fun isRecording(): Boolean = isRecording.get()
 
     class AudioRecordingException(message: String, cause: Throwable? = null) : 
         Exception(message, cause)
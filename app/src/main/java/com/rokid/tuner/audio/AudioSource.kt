@@ -0,0 +1,38 @@
+package com.rokid.tuner.audio
+
+/**
+ * Source of captured audio blocks for the tuning pipeline.
+ *
+ * [AudioRecorder] reads the microphone; [ReplayAudioSource] plays back recorded or
+ * synthetic PCM so the whole capture -> detector -> ViewModel path can run in JVM tests.
+ * Frames returned by [readFrame] are reusable views, stamped with
+ * [AudioFrame.captureTimeNanos], and are overwritten by the next read.
+ */
+interface AudioSource {
+
+    /** Starts capture; throws [AudioRecorder.AudioRecordingException] if it cannot. */
+    fun start()
+
+    /**
+     * Reads the next block, or returns null if nothing could be read. With a scheduler,
+     * blocks it gates come back empty (see [AudioFrame.markSkipped]).
+     */
+    fun readFrame(scheduler: DutyCycleScheduler? = null): AudioFrame?
+
+    /**
+     * Nanoseconds until the next block is due, for sources paced by a clock rather than by
+     * a blocking read. The capture loop suspends for this long before [readFrame], so paced
+     * playback follows the coroutine clock. 0 if a read is ready or blocks until it is.
+     */
+    fun nanosUntilNextBlock(): Long = 0L
+
+    /**
+     * Stops delivering audio but keeps the session allocated, so the next [start] resumes
+     * without rebuilding it. [stop] releases it.
+     */
+    fun pause()
+
+    fun stop()
+
+    fun isRecording(): Boolean
+}
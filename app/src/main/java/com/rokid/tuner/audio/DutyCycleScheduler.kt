@@ -0,0 +1,128 @@
+package com.rokid.tuner.audio
+
+import java.util.concurrent.atomic.AtomicLong
+import java.util.concurrent.atomic.AtomicLongArray
+
+/**
+ * Decides, for each captured block, whether it is worth converting and analysing.
+ *
+ * The block's RMS is computed on the raw 16-bit PCM, before float conversion. Below
+ * [rmsThreshold] the block is silent: it is neither converted nor windowed, so YIN never
+ * runs on it. The threshold is meant to be the detector's own RMS gate, so only audio the
+ * detector would reject anyway is skipped.
+ *
+ * After backoffBlocks silent checks in a row the scheduler backs off: it skips inspecting
+ * 1, then 3, up to maxStride - 1 blocks between checks, doubling the stride every
+ * backoffBlocks further silent checks. The first inspected block above the threshold (an
+ * onset) returns to full rate at once, so backing off adds at most maxStride - 1 blocks of
+ * onset latency.
+ *
+ * Audio time handled in each [State] is accumulated for [stats]. Used by a single capture
+ * thread; [stats] may be read from any thread.
+ */
+class DutyCycleScheduler(
+    @Volatile var rmsThreshold: Double,
+    private val backoffBlocks: Int = AudioConfig.DUTY_BACKOFF_BLOCKS,
+    private val maxStride: Int = AudioConfig.DUTY_MAX_STRIDE,
+    private val sampleRate: Int = AudioConfig.SAMPLE_RATE
+) {
+
+    enum class State {
+        /** Block converted and analysed at full rate. */
+        ACTIVE,
+        /** Block inspected on raw PCM and found silent. */
+        IDLE,
+        /** Block dropped without inspection while backed off. */
+        BACKOFF
+    }
+
+    data class Stats(
+        val activeMs: Long,
+        val idleMs: Long,
+        val backoffMs: Long,
+        val onsets: Long
+    ) {
+        val totalMs: Long get() = activeMs + idleMs + backoffMs
+
+        /** Fraction of audio time analysed at full rate. */
+        val dutyCycle: Double get() = if (totalMs == 0L) 0.0 else activeMs.toDouble() / totalMs
+    }
+
+    init {
+        require(backoffBlocks > 0) { "backoffBlocks must be positive" }
+        require(maxStride > 0) { "maxStride must be positive" }
+    }
+
+    /** State the most recent block was handled in. */
+    @Volatile var state = State.ACTIVE
+        private set
+
+    /** RMS of the most recently inspected block, on the same scale as AudioFrame.rms. */
+    @Volatile var lastRms = 0.0
+        private set
+
+    private var silentChecks = 0
+    private var stride = 1
+    private var skipRemaining = 0
+
+    private val samplesByState = AtomicLongArray(State.values().size)
+    private val onsets = AtomicLong()
+
+    /**
+     * Returns true if pcm[0 until count] should be converted and analysed; false for a
+     * silent or skipped block.
+     */
+    fun onBlock(pcm: ShortArray, count: Int): Boolean {
+        if (skipRemaining > 0) {
+            skipRemaining--
+            enter(State.BACKOFF, count)
+            return false
+        }
+
+        var sumSquares = 0L
+        for (i in 0 until count) {
+            val sample = pcm[i].toLong()
+            sumSquares += sample * sample
+        }
+        lastRms = if (count > 0) Math.sqrt(sumSquares.toDouble() / count) / Short.MAX_VALUE else 0.0
+
+        if (lastRms >= rmsThreshold) {
+            if (state != State.ACTIVE) onsets.incrementAndGet()
+            silentChecks = 0
+            stride = 1
+            enter(State.ACTIVE, count)
+            return true
+        }
+
+        silentChecks++
+        if (silentChecks % backoffBlocks == 0) stride = Math.min(maxStride, stride * 2)
+        skipRemaining = stride - 1
+        enter(State.IDLE, count)
+        return false
+    }
+
+    fun stats(): Stats = Stats(
+        activeMs = toMillis(samplesByState.get(State.ACTIVE.ordinal)),
+        idleMs = toMillis(samplesByState.get(State.IDLE.ordinal)),
+        backoffMs = toMillis(samplesByState.get(State.BACKOFF.ordinal)),
+        onsets = onsets.get()
+    )
+
+    /** Returns to full rate and clears the counters. */
+    fun reset() {
+        state = State.ACTIVE
+        lastRms = 0.0
+        silentChecks = 0
+        stride = 1
+        skipRemaining = 0
+        for (i in 0 until samplesByState.length()) samplesByState.set(i, 0L)
+        onsets.set(0L)
+    }
+
+    private fun enter(newState: State, samples: Int) {
+        state = newState
+        samplesByState.addAndGet(newState.ordinal, samples.toLong())
+    }
+
+    private fun toMillis(samples: Long): Long = samples * 1000L / sampleRate
+}
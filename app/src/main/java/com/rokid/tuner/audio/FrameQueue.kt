@@ -0,0 +1,118 @@
+package com.rokid.tuner.audio
+
+import kotlinx.coroutines.channels.Channel
+import java.util.concurrent.atomic.AtomicInteger
+import java.util.concurrent.atomic.AtomicLong
+
+/**
+ * Bounded, newest-wins hand-off between the capture coroutine and the analysis coroutine.
+ *
+ * Frames come from a fixed pool (capacity + 2: one being filled, one being analysed and
+ * up to capacity queued), so steady-state operation allocates nothing. When the queue is
+ * full, [publish] drops the oldest queued frame instead of blocking, so capture never
+ * misses a device read and analysis always works on the newest audio.
+ *
+ * Single producer, single consumer.
+ */
+class FrameQueue(
+    frameSize: Int,
+    val capacity: Int = AudioConfig.PIPELINE_QUEUE_CAPACITY
+) {
+
+    data class Stats(
+        val publishedFrames: Long,
+        val analysedFrames: Long,
+        val droppedFrames: Long,
+        val supersededFrames: Long,
+        val queueDepth: Int,
+        val maxQueueDepth: Int
+    )
+
+    private val pool = Channel<AudioFrame>(capacity + POOL_SPARE_FRAMES)
+    private val queue = Channel<AudioFrame>(capacity)
+
+    private val publishedFrames = AtomicLong()
+    private val analysedFrames = AtomicLong()
+    private val droppedFrames = AtomicLong()
+    private val supersededFrames = AtomicLong()
+    private val queueDepth = AtomicInteger()
+    private val maxQueueDepth = AtomicInteger()
+
+    init {
+        require(capacity > 0) { "capacity must be positive" }
+        repeat(capacity + POOL_SPARE_FRAMES) { pool.trySend(AudioFrame(frameSize)) }
+    }
+
+    /**
+     * Producer: takes a free frame from the pool, or null if none is free (counted as a drop).
+     */
+    fun acquire(): AudioFrame? {
+        val frame = pool.tryReceive().getOrNull()
+        if (frame == null) droppedFrames.incrementAndGet()
+        return frame
+    }
+
+    /**
+     * Producer: queues a filled frame, dropping the oldest queued frame if the queue is full.
+     */
+    fun publish(frame: AudioFrame) {
+        if (!queue.trySend(frame).isSuccess) {
+            queue.tryReceive().getOrNull()?.let { stale ->
+                queueDepth.decrementAndGet()
+                droppedFrames.incrementAndGet()
+                recycle(stale)
+            }
+            if (!queue.trySend(frame).isSuccess) {
+                // Queue was closed underneath us
+                recycle(frame)
+                return
+            }
+        }
+        publishedFrames.incrementAndGet()
+        val depth = queueDepth.incrementAndGet()
+        if (depth > maxQueueDepth.get()) maxQueueDepth.set(depth)
+    }
+
+    /**
+     * Producer: records count windows that were due but never published, because a newer
+     * window from the same capture block replaced them. Counted apart from drops, which
+     * mean analysis or the pool fell behind.
+     */
+    fun supersede(count: Int) {
+        supersededFrames.addAndGet(count.toLong())
+    }
+
+    /**
+     * Consumer: suspends until a frame is available. Returns null once the queue is closed.
+     * Pass the frame back to [recycle] when done with it.
+     */
+    suspend fun receive(): AudioFrame? {
+        val frame = queue.receiveCatching().getOrNull() ?: return null
+        queueDepth.decrementAndGet()
+        analysedFrames.incrementAndGet()
+        return frame
+    }
+
+    /** Returns a frame to the pool. */
+    fun recycle(frame: AudioFrame) {
+        pool.trySend(frame)
+    }
+
+    /** Stops the consumer once queued frames are drained. */
+    fun close() {
+        queue.close()
+    }
+
+    fun stats(): Stats = Stats(
+        publishedFrames = publishedFrames.get(),
+        analysedFrames = analysedFrames.get(),
+        droppedFrames = droppedFrames.get(),
+        supersededFrames = supersededFrames.get(),
+        queueDepth = queueDepth.get(),
+        maxQueueDepth = maxQueueDepth.get()
+    )
+
+    private companion object {
+        private const val POOL_SPARE_FRAMES = 2
+    }
+}
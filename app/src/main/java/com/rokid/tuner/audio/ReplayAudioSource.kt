@@ -0,0 +1,152 @@
+package com.rokid.tuner.audio
+
+import java.util.concurrent.locks.LockSupport
+
+/**
+ * [AudioSource] that plays back 16-bit PCM instead of reading the microphone.
+ *
+ * Samples are delivered in blocks of blockSize, either paced to the sample clock
+ * ([realTime], each block is returned once its last sample would have been captured) or
+ * as fast as the caller reads. Every frame is stamped with the time it was returned, so
+ * replayed audio carries capture timestamps just like the microphone. Once the PCM is
+ * exhausted the source stops and returns null, unless it loops. [pause] keeps the
+ * playback position for the next [start]. Real-time pacing follows clock (nanoseconds),
+ * so tests can play back in virtual time; capture timestamps always use System.nanoTime.
+ *
+ * Playback is deterministic: the same PCM and blockSize always yield the same blocks.
+ */
+class ReplayAudioSource(
+    private val pcm: ShortArray,
+    val realTime: Boolean = true,
+    val loop: Boolean = false,
+    val blockSize: Int = AudioConfig.BUFFER_SIZE / AudioConfig.BYTES_PER_SHORT,
+    val sampleRate: Int = AudioConfig.SAMPLE_RATE,
+    private val clock: () -> Long = System::nanoTime
+) : AudioSource {
+
+    companion object {
+        private const val NANOS_PER_SECOND = 1_000_000_000.0
+
+        /**
+         * Synthesises leadInSeconds of silence followed by durationSeconds of a tone with
+         * the given number of harmonics (amplitude 1/h each), peaking near amplitude.
+         */
+        fun tone(
+            frequency: Double,
+            durationSeconds: Double,
+            leadInSeconds: Double = 0.0,
+            amplitude: Double = 0.5,
+            harmonics: Int = 1,
+            sampleRate: Int = AudioConfig.SAMPLE_RATE
+        ): ShortArray {
+            require(frequency > 0.0) { "frequency must be positive" }
+            require(harmonics > 0) { "harmonics must be positive" }
+            val leadIn = (leadInSeconds * sampleRate).toInt()
+            val length = leadIn + (durationSeconds * sampleRate).toInt()
+            var norm = 0.0
+            for (h in 1..harmonics) norm += 1.0 / h
+            val scale = amplitude / norm * Short.MAX_VALUE
+            val pcm = ShortArray(length)
+            for (i in leadIn until length) {
+                val phase = 2.0 * Math.PI * frequency * (i - leadIn) / sampleRate
+                var value = 0.0
+                for (h in 1..harmonics) value += Math.sin(h * phase) / h
+                pcm[i] = (value * scale).toInt().coerceIn(Short.MIN_VALUE.toInt(), Short.MAX_VALUE.toInt()).toShort()
+            }
+            return pcm
+        }
+    }
+
+    private val pcmBuffer = ShortArray(blockSize)
+    private val frame = AudioFrame(blockSize)
+
+    @Volatile private var recording = false
+    private var paused = false
+    private var position = 0
+    private var deliveredSamples = 0L
+    private var startNanos = 0L
+
+    init {
+        require(blockSize > 0) { "blockSize must be positive" }
+        require(sampleRate > 0) { "sampleRate must be positive" }
+    }
+
+    /** Plays from the beginning, or after [pause] continues where playback stopped. */
+    override fun start() {
+        if (recording) return
+        if (paused && position < pcm.size) {
+            // Rebase the clock so the next block is due one block from now
+            startNanos = clock() - (deliveredSamples * NANOS_PER_SECOND / sampleRate).toLong()
+        } else {
+            position = 0
+            deliveredSamples = 0L
+            startNanos = clock()
+        }
+        paused = false
+        recording = true
+    }
+
+    override fun readFrame(scheduler: DutyCycleScheduler?): AudioFrame? {
+        if (!recording) return null
+        val count = nextBlockSize()
+        if (count == 0) {
+            recording = false
+            return null
+        }
+        if (position >= pcm.size) position = 0
+
+        System.arraycopy(pcm, position, pcmBuffer, 0, count)
+        position += count
+        deliveredSamples += count
+
+        if (realTime) waitUntil(sampleTimeNanos(deliveredSamples))
+
+        if (scheduler != null && !scheduler.onBlock(pcmBuffer, count)) {
+            frame.markSkipped(scheduler.lastRms)
+        } else {
+            frame.fillFromPcm16(pcmBuffer, count)
+        }
+        frame.captureTimeNanos = System.nanoTime()
+        return frame
+    }
+
+    override fun nanosUntilNextBlock(): Long {
+        if (!realTime || !recording) return 0L
+        return Math.max(0L, sampleTimeNanos(deliveredSamples + nextBlockSize()) - clock())
+    }
+
+    override fun pause() {
+        if (recording) paused = true
+        recording = false
+    }
+
+    override fun stop() {
+        paused = false
+        recording = false
+    }
+
+    override fun isRecording(): Boolean = recording
+
+    /**
+     * Clock time at which the sample with the given index (counted from the first
+     * [start], across loops and pauses) is captured in real-time playback. Only samples
+     * played since the last [start] are placed correctly.
+     */
+    fun sampleTimeNanos(sampleIndex: Long): Long =
+        startNanos + (sampleIndex * NANOS_PER_SECOND / sampleRate).toLong()
+
+    /** Samples in the next block, 0 once a non-looping source is exhausted. */
+    private fun nextBlockSize(): Int = when {
+        position < pcm.size -> Math.min(blockSize, pcm.size - position)
+        loop -> Math.min(blockSize, pcm.size)
+        else -> 0
+    }
+
+    private fun waitUntil(deadlineNanos: Long) {
+        while (true) {
+            val remaining = deadlineNanos - clock()
+            if (remaining <= 0L) return
+            LockSupport.parkNanos(remaining)
+        }
+    }
+}
@@ -0,0 +1,105 @@
+package com.rokid.tuner.audio
+
+/**
+ * Circular sample buffer that turns arbitrarily sized capture blocks into overlapping
+ * analysis windows of windowSize samples, one every hopSize samples.
+ *
+ * Every sample is stored twice (at i and i + capacity), so any window is a contiguous
+ * slice of [buffer] and can be analysed in place - overlapping samples are never copied
+ * again. Consumers drain due windows with [nextWindow]:
+ *
+ *     ring.write(frame.samples, 0, frame.size)
+ *     while (true) {
+ *         val start = ring.nextWindow()
+ *         if (start < 0) break
+ *         detector.detectPitch(ring.buffer, start, ring.windowSize)
+ *     }
+ *
+ * The slice returned by [nextWindow] stays valid until the next [write].
+ * Instances are not thread-safe.
+ */
+class SlidingWindowBuffer(
+    val windowSize: Int,
+    val hopSize: Int,
+    val capacity: Int = windowSize * AudioConfig.BUFFER_SIZE_MULTIPLIER
+) {
+
+    init {
+        require(windowSize > 0) { "windowSize must be positive" }
+        require(hopSize > 0) { "hopSize must be positive" }
+        require(capacity >= windowSize) { "capacity must be at least windowSize" }
+    }
+
+    private val storage = FloatArray(capacity * 2)
+    private var writeIndex = 0
+    private var totalWritten = 0L
+    private var nextWindowEnd = windowSize.toLong()
+
+    /** Backing array; windows are slices [start, start + windowSize). */
+    val buffer: FloatArray get() = storage
+
+    /** Windows that were overwritten before the consumer reached them. */
+    var skippedWindows = 0L
+        private set
+
+    /** Appends length samples from source starting at offset. */
+    fun write(source: FloatArray, offset: Int = 0, length: Int = source.size - offset) {
+        var from = offset
+        var remaining = length
+        // Only the newest capacity samples can ever be read back
+        if (remaining > capacity) {
+            val dropped = remaining - capacity
+            from += dropped
+            remaining = capacity
+            totalWritten += dropped
+            writeIndex = (writeIndex + dropped) % capacity
+        }
+        while (remaining > 0) {
+            val chunk = Math.min(remaining, capacity - writeIndex)
+            System.arraycopy(source, from, storage, writeIndex, chunk)
+            System.arraycopy(source, from, storage, writeIndex + capacity, chunk)
+            from += chunk
+            remaining -= chunk
+            writeIndex = (writeIndex + chunk) % capacity
+            totalWritten += chunk
+        }
+    }
+
+    /**
+     * Returns the start index in [buffer] of the next due window and advances by one hop,
+     * or -1 if not enough new samples have arrived yet.
+     */
+    fun nextWindow(): Int {
+        if (totalWritten < nextWindowEnd) return -1
+
+        val oldestAvailable = totalWritten - capacity
+        var windowEnd = nextWindowEnd
+        if (windowEnd - windowSize < oldestAvailable) {
+            // Consumer fell behind: jump to the newest hop-aligned window still in the buffer
+            val behindHops = (oldestAvailable - (windowEnd - windowSize) + hopSize - 1) / hopSize
+            windowEnd += behindHops * hopSize
+            skippedWindows += behindHops
+            if (windowEnd > totalWritten) {
+                nextWindowEnd = windowEnd
+                return -1
+            }
+        }
+
+        nextWindowEnd = windowEnd + hopSize
+        return ((windowEnd - windowSize) % capacity).toInt()
+    }
+
+    /** Number of samples that can still be written before the next window is due. */
+    fun samplesUntilNextWindow(): Int = Math.max(0L, nextWindowEnd - totalWritten).toInt()
+
+    /**
+     * Discards all buffered samples, e.g. after a gap in capture. Only the positions are
+     * reset, so this is cheap enough to call on every gated block: no window is due until
+     * windowSize new samples have been written, and windows never reach back past them.
+     */
+    fun clear() {
+        writeIndex = 0
+        totalWritten = 0L
+        nextWindowEnd = windowSize.toLong()
+    }
+}
@@ -24,11 +24,49 @@ object AlgorithmConstants {
     const val YIN_THRESHOLD_MULTIPLIER = 0.2125
     const val TYPICAL_MIN_YIN_THRESHOLD = 0.1
     const val TYPICAL_MAX_YIN_THRESHOLD = 0.2
+    const val MIN_YIN_LAG = 1  // d'(0) is 1 by definition, so lag 0 is never a period
     
     // Buffer and validation limits
     const val MIN_YIN_BUFFER_SIZE = 2
     const val DIVISOR_FOR_HALF_BUFFER = 2
     
+    // Decimating front-end (see Decimator): FIR length and minimum output
+    // samples per period of the highest fundamental
+    const val DECIMATION_FILTER_TAPS = 31
+    const val DECIMATION_OVERSAMPLING = 8.0
+    
+    // Locked-note tracking: lag window around the locked period (fraction of the
+    // period), frames between forced full searches, and the frame-to-frame RMS
+    // rise treated as a new pluck
+    const val TRACKING_LAG_RATIO = 0.03
+    const val TRACKING_REVALIDATE_FRAMES = 8
+    const val TRACKING_ONSET_RMS_RATIO = 2.0
+    
+    // Targeted tuning (see GoertzelBank): harmonics scored per target, phase
+    // sub-window hop as a fraction of the frame, minimum share of frame energy
+    // at the winning target, and shortest frame analysed
+    const val TARGET_HARMONICS = 3
+    const val TARGET_PHASE_HOP_DIVISOR = 4
+    const val TARGET_MIN_ENERGY_RATIO = 0.3
+    const val MIN_TARGET_FRAME_SIZE = 512
+    
+    // Strobe phase tracking (see PhaseTracker): moving-average length in target
+    // periods, samples between phase readings, readings the drift is fitted to
+    // (~250 ms at 44.1 kHz), fewest readings before a drift is reported, and
+    // smallest amplitude at the target relative to the whole signal's
+    const val STROBE_FILTER_PERIODS = 4
+    const val STROBE_STEP_SAMPLES = 256
+    const val STROBE_DRIFT_STEPS = 43
+    const val STROBE_MIN_DRIFT_STEPS = 8
+    const val STROBE_MIN_LEVEL = 0.1
+    
+    // McLeod Pitch Method: a key maximum of the NSDF is picked once it reaches
+    // this fraction of the highest key maximum
+    const val MPM_KEY_MAXIMUM_RATIO = 0.9
+    
+    // Pitch smoothing (history window in frames)
+    const val DEFAULT_SMOOTHING_WINDOW = 5
+    
     // Parabolic interpolation constants
     const val MIN_DENOMINATOR = 1e-10
     
@@ -40,4 +78,11 @@ object AlgorithmConstants {
     
     // Default synthetic audio generation
     const val SYNTHETIC_DURATION_SECONDS = 0.1  // 100ms
+    
+    // Detector warm-up: synthetic frames run before real audio, a few per open string
+    // so the note lock and tracking paths run too
+    const val WARM_UP_FRAMES = 48
+    const val WARM_UP_FRAMES_PER_STRING = 8
+    const val WARM_UP_HARMONICS = 3
+    const val WARM_UP_AMPLITUDE = 0.5
 }
\ No newline at end of file
@@ -13,6 +13,10 @@ object MusicalConstants {
     // A4 reference note constants
     const val A_NOTE_INDEX = 9  // A is the 9th note in C-based arrays (0=C, 1=C#, ..., 9=A)
     const val A4_OCTAVE = 4
+    const val A4_MIDI_NOTE = 69
+    
+    // MIDI note numbers 0-127 (~8 Hz to ~12.5 kHz) bound the precomputed note table
+    const val MIDI_NOTE_COUNT = 128
     
     // Frequency ratio base for semitone calculations (2^(n/12))
     const val FREQUENCY_RATIO_BASE = 2.0
@@ -21,6 +25,13 @@ object MusicalConstants {
     const val MIN_GUITAR_FREQUENCY = 80.0
     const val MAX_GUITAR_FREQUENCY = 1350.0
     
+    // Extended low range (5-string bass low B0 at 30.87 Hz, 8-string F#1), tuned down a
+    // semitone or so
+    const val MIN_EXTENDED_FREQUENCY = 28.0
+    
+    // Standard guitar tuning E2 A2 D3 G3 B3 E4, in semitones from A4
+    val STANDARD_TUNING_SEMITONES = listOf(-29, -24, -19, -14, -10, -5)
+    
     // Tuning tolerance (default 10 cents, configurable via settings)
     const val IN_TUNE_THRESHOLD_CENTS = 10.0
     
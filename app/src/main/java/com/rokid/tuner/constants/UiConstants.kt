@@ -24,6 +24,10 @@ object UiConstants {
     const val MIN_PITCH_UPDATE_DELAY_MS = 0L
     const val MAX_PITCH_UPDATE_DELAY_MS = 1000L
     
+    // Shortest interval between display updates (one frame at 60 Hz), used when the
+    // display's own refresh rate is unknown
+    const val DISPLAY_FRAME_INTERVAL_MS = 16L
+    
     // Tuning loop delay (controls update frequency)
     const val TUNING_LOOP_DELAY_MS = 50L
     
@@ -43,6 +47,8 @@ object UiConstants {
     
     // Activity lifecycle
     const val MIN_ACTIVITY_LIFETIME_MS = 2000L
+    // How long a paused tuner keeps its audio session and detector for a warm restart
+    const val WARM_RESTART_TIMEOUT_MS = 30_000L
     
     // Permission request codes
     const val AUDIO_PERMISSION_REQUEST_CODE = 1001
@@ -0,0 +1,68 @@
+package com.rokid.tuner.pitch
+
+import com.rokid.tuner.audio.AudioConfig
+import com.rokid.tuner.constants.AlgorithmConstants
+import com.rokid.tuner.pitch.PitchEstimator.Estimate
+
+/**
+ * Classic autocorrelation pitch detection: one FFT correlation and a single peak search,
+ * with no normalisation pass over the lags and no threshold rule.
+ *
+ * r(t) = (m(t) - d(t)) / 2 is recovered from the FFT-based d(t) and the lag energies m(t)
+ * (see [YinDifferenceFunction.lagEnergy]). The period is the highest local maximum of r
+ * after it first drops below zero. Because r decays with the lag, that maximum favours
+ * short periods over sub-octaves, but the decay also drags the raw peak below the true
+ * lag, so the three points around it are normalised to 2 * r / m before parabolic
+ * interpolation. Near the top of the range the sampled first period can fall below the
+ * second, giving an octave-low estimate. Clarity is 1 - 2 * r / m at the peak.
+ */
+class AutocorrelationEstimator(private val sampleRate: Int = AudioConfig.SAMPLE_RATE) : PitchEstimator {
+
+    override val engine = PitchEstimator.Engine.AUTOCORRELATION
+
+    override var range = FrequencyRange.GUITAR
+
+    private val differenceFunction = YinDifferenceFunction()
+    private var correlationScratch = DoubleArray(0)
+    private var energyScratch = DoubleArray(0)
+
+    override fun estimate(buffer: FloatArray, offset: Int, length: Int, clarityThreshold: Double): Estimate {
+        val rate = sampleRate.toDouble()
+        val range = this.range
+        val tauMin = (rate / range.maxFrequency).toInt()
+        val tauMax = Math.min(length / AlgorithmConstants.DIVISOR_FOR_HALF_BUFFER, (rate / range.minFrequency).toInt())
+        if (tauMax <= tauMin + 1) return PitchEstimator.NO_PITCH
+
+        if (correlationScratch.size < tauMax) {
+            correlationScratch = DoubleArray(tauMax)
+            energyScratch = DoubleArray(tauMax)
+        }
+        val correlation = correlationScratch
+        val energy = energyScratch
+        differenceFunction.compute(buffer, offset, length, tauMax, correlation)
+        YinDifferenceFunction.lagEnergy(buffer, offset, length, tauMax, energy)
+        for (t in 0 until tauMax) {
+            correlation[t] = 0.5 * (energy[t] - correlation[t])
+        }
+
+        var start = 1
+        while (start < tauMax && correlation[start] > 0.0) start++
+        var peak = -1
+        for (t in Math.max(start, tauMin) until tauMax - 1) {
+            val value = correlation[t]
+            if (value >= correlation[t - 1] && value >= correlation[t + 1] && (peak < 0 || value > correlation[peak])) {
+                peak = t
+            }
+        }
+        if (peak < 0 || correlation[peak] <= 0.0) return PitchEstimator.NO_PITCH
+
+        val clarity = 1.0 - 2.0 * correlation[peak] / energy[peak]
+        if (clarity > clarityThreshold) return Estimate(AlgorithmConstants.INVALID_FREQUENCY, clarity)
+
+        // Normalise around the peak for interpolation (the array is rebuilt next frame)
+        for (t in peak - 1..peak + 1) {
+            correlation[t] = if (energy[t] > 0.0) 2.0 * correlation[t] / energy[t] else 0.0
+        }
+        return Estimate(rate / PitchEstimator.parabolicPeak(correlation, peak), clarity)
+    }
+}
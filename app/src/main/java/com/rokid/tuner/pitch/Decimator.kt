@@ -0,0 +1,79 @@
+package com.rokid.tuner.pitch
+
+import com.rokid.tuner.audio.AudioConfig
+import com.rokid.tuner.constants.AlgorithmConstants
+
+/**
+ * Anti-aliased integer-factor downsampler used in front of YIN.
+ *
+ * A linear-phase windowed-sinc (Hamming) low-pass with its cutoff at the output Nyquist
+ * frequency is evaluated only at the samples that are kept, so the cost is about
+ * (length / factor) * taps multiply-adds. Each frame is filtered on its own without
+ * history ("valid" convolution), so the output covers length - taps + 1 input samples;
+ * the constant group delay does not affect period estimation.
+ *
+ * With the default 31 taps and factor 4 (11.025 kHz output), content that would alias
+ * below ~2.5 kHz is attenuated by the filter's stopband, which covers the guitar
+ * fundamentals and their first harmonics. Instances are immutable and thread-safe.
+ */
+class Decimator(
+    val factor: Int,
+    val taps: Int = AlgorithmConstants.DECIMATION_FILTER_TAPS
+) {
+
+    init {
+        require(factor >= 2) { "factor must be at least 2" }
+        require(taps > 0 && taps % 2 == 1) { "taps must be odd" }
+    }
+
+    // Symmetric, so no reversal is needed for convolution
+    private val coefficients = designLowPass(0.5 / factor, taps)
+
+    /** Number of output samples produced for an input of inputLength samples. */
+    fun outputLength(inputLength: Int): Int =
+        if (inputLength < taps) 0 else (inputLength - taps) / factor + 1
+
+    /**
+     * Low-pass filters and decimates input[offset until offset + length] into out.
+     * Returns the number of samples written, [outputLength] of length.
+     */
+    fun process(input: FloatArray, offset: Int, length: Int, out: FloatArray): Int {
+        val count = outputLength(length)
+        require(out.size >= count) { "out too small: ${out.size} < $count" }
+        val h = coefficients
+        var start = offset
+        for (i in 0 until count) {
+            var acc = 0f
+            for (k in h.indices) {
+                acc += h[k] * input[start + k]
+            }
+            out[i] = acc
+            start += factor
+        }
+        return count
+    }
+
+    companion object {
+        /**
+         * Largest factor that still leaves [AlgorithmConstants.DECIMATION_OVERSAMPLING]
+         * output samples per period of maxFrequency, or 1 if decimation would not help.
+         */
+        fun factorFor(maxFrequency: Double, sampleRate: Int = AudioConfig.SAMPLE_RATE): Int =
+            Math.max(1, (sampleRate / (maxFrequency * AlgorithmConstants.DECIMATION_OVERSAMPLING)).toInt())
+
+        /** Hamming-windowed sinc low-pass with unity DC gain; cutoff in cycles per sample. */
+        internal fun designLowPass(cutoff: Double, taps: Int): FloatArray {
+            val m = taps - 1
+            val h = DoubleArray(taps)
+            var sum = 0.0
+            for (i in 0 until taps) {
+                val k = i - m / 2.0
+                val sinc = if (k == 0.0) 2.0 * cutoff else Math.sin(2.0 * Math.PI * cutoff * k) / (Math.PI * k)
+                val window = if (m == 0) 1.0 else 0.54 - 0.46 * Math.cos(2.0 * Math.PI * i / m)
+                h[i] = sinc * window
+                sum += h[i]
+            }
+            return FloatArray(taps) { (h[it] / sum).toFloat() }
+        }
+    }
+}
@@ -0,0 +1,56 @@
+package com.rokid.tuner.pitch
+
+import com.rokid.tuner.audio.AudioConfig
+import com.rokid.tuner.constants.MusicalConstants
+
+/**
+ * Pitch range the detector searches, with the analysis window and YIN decimation it needs.
+ *
+ * The lowest period must fit in half the window, so lower ranges need longer windows.
+ * d(t) is computed by FFT ([YinDifferenceFunction]), so a longer window costs
+ * O(N log N) rather than O(N * tauMax). Decimating in front of YIN also keeps the
+ * extended range cheaper per frame than the guitar range.
+ *
+ * Approximate YIN work per frame at 44.1 kHz:
+ *
+ *  - [GUITAR]: 2048-sample window (46 ms), full rate, tauMax 551; one 4096-point FFT
+ *    pair.
+ *  - [EXTENDED]: 4096-sample window (93 ms), decimated by 4 to 1017 samples, tauMax
+ *    395; a 31-tap low-pass (~32k multiply-adds), one 2048-point FFT pair and
+ *    full-rate refinement of ~11 lags (~45k multiply-adds).
+ *
+ * MPM and autocorrelation are not decimated. For them the extended range means one
+ * 8192-point FFT pair, about twice the guitar cost. Tracking sums 6% of the period's
+ * lags directly at full rate, so it grows with the period: about 90 lags of 4096 samples
+ * (~370k multiply-adds) at 30 Hz, more than the decimated full search. PitchDetector
+ * therefore only tracks in ranges with no decimation. DspBenchmarkTest reports measured
+ * detectPitch cost per range.
+ */
+enum class FrequencyRange(
+    val minFrequency: Double,
+    val maxFrequency: Double,
+    val windowSize: Int,
+    /** Decimation applied in front of YIN; 1 = full rate. */
+    val decimationFactor: Int
+) {
+    /** Standard and drop guitar tunings, E2 (82 Hz) and up. */
+    GUITAR(
+        MusicalConstants.MIN_GUITAR_FREQUENCY,
+        MusicalConstants.MAX_GUITAR_FREQUENCY,
+        AudioConfig.ANALYSIS_WINDOW_SIZE,
+        1
+    ),
+
+    /** Bass and 7- and 8-string guitars, down to ~28 Hz. */
+    EXTENDED(
+        MusicalConstants.MIN_EXTENDED_FREQUENCY,
+        MusicalConstants.MAX_GUITAR_FREQUENCY,
+        AudioConfig.EXTENDED_ANALYSIS_WINDOW_SIZE,
+        Decimator.factorFor(MusicalConstants.MAX_GUITAR_FREQUENCY)
+    );
+
+    companion object {
+        /** Largest window of any range, for buffers shared across ranges. */
+        val MAX_WINDOW_SIZE = values().maxOf { it.windowSize }
+    }
+}
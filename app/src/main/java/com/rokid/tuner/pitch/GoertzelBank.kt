@@ -0,0 +1,165 @@
+package com.rokid.tuner.pitch
+
+import com.rokid.tuner.audio.AudioConfig
+import com.rokid.tuner.constants.AlgorithmConstants
+
+/**
+ * Narrow-band analysis of a frame at a fixed set of target frequencies, for tuning to a
+ * known tuning instead of searching the whole chromatic range.
+ *
+ * Each target is scored by the energy a Hann-windowed Goertzel filter finds at its first
+ * [AlgorithmConstants.TARGET_HARMONICS] harmonics (one N-sample recurrence per filter).
+ * The best-scoring target is the active string; scoring harmonics rather than the
+ * fundamental alone keeps a string with a weak fundamental from losing to a neighbour.
+ *
+ * A 2048-sample frame only resolves ~21 Hz, several semitones at E2, so the offset from
+ * the target is read from phase instead of magnitude: each scored harmonic's filter is run
+ * over two overlapping sub-windows hop samples apart, and the phase advance between them,
+ * compared with the advance expected at the target, gives the frequency. The harmonics'
+ * estimates are combined, so a weak fundamental does not decide the reading. This is
+ * unambiguous for offsets up to sampleRate / (2 * hop), +/-43 Hz with hop = N / 4, at the
+ * highest scored harmonic.
+ *
+ * Window tables are cached per frame size. Instances are not thread-safe.
+ */
+class GoertzelBank(private val sampleRate: Int = AudioConfig.SAMPLE_RATE) {
+
+    data class Match(
+        val targetIndex: Int,
+        val frequency: Double,
+        val energyRatio: Double  // share of windowed frame energy at the target's harmonics, 0..~1
+    )
+
+    private var targets = DoubleArray(0)
+    private var frameSize = 0
+    private var frameWindow = DoubleArray(0)
+    private var phaseWindow = DoubleArray(0)
+    private var toneGain = 0.0
+
+    // Output of the last goertzel() call
+    private var outRe = 0.0
+    private var outIm = 0.0
+
+    val targetCount: Int get() = targets.size
+
+    fun targetFrequency(index: Int): Double = targets[index]
+
+    fun setTargets(frequencies: DoubleArray) {
+        require(frequencies.all { it > 0.0 && it < sampleRate / 2.0 }) { "targets must lie between 0 Hz and Nyquist" }
+        targets = frequencies.copyOf()
+    }
+
+    /**
+     * Picks the target best matching buffer[offset until offset + length] and estimates its
+     * actual frequency. Returns null without targets, for frames shorter than
+     * [AlgorithmConstants.MIN_TARGET_FRAME_SIZE], or for silence.
+     */
+    fun analyse(buffer: FloatArray, offset: Int, length: Int): Match? {
+        if (targets.isEmpty() || length < AlgorithmConstants.MIN_TARGET_FRAME_SIZE) return null
+        ensureWindows(length)
+
+        val window = frameWindow
+        var energy = 0.0
+        for (n in 0 until length) {
+            val value = buffer[offset + n] * window[n]
+            energy += value * value
+        }
+        if (energy == 0.0) return null
+
+        val nyquist = sampleRate / 2.0
+        var best = -1
+        var bestScore = 0.0
+        for (i in targets.indices) {
+            var score = 0.0
+            for (harmonic in 1..AlgorithmConstants.TARGET_HARMONICS) {
+                val frequency = targets[i] * harmonic
+                if (frequency >= nyquist) break
+                goertzel(buffer, offset, window, length, frequency)
+                score += outRe * outRe + outIm * outIm
+            }
+            if (score > bestScore) {
+                bestScore = score
+                best = i
+            }
+        }
+        if (best < 0) return null
+
+        return Match(best, estimateFrequency(buffer, offset, length, targets[best]), bestScore / (energy * toneGain))
+    }
+
+    /**
+     * Frequency near target from the phase advance between two sub-windows, measured at
+     * each scored harmonic below Nyquist and divided by its number. The per-harmonic
+     * estimates are averaged with weights of energy times h^2: a weak harmonic's phase is
+     * pulled by its neighbours' leakage, and a phase error at harmonic h moves the estimate
+     * h times less.
+     */
+    private fun estimateFrequency(buffer: FloatArray, offset: Int, length: Int, target: Double): Double {
+        val hop = length / AlgorithmConstants.TARGET_PHASE_HOP_DIVISOR
+        val span = length - hop
+        val nyquist = sampleRate / 2.0
+        var weightedSum = 0.0
+        var totalWeight = 0.0
+        for (harmonic in 1..AlgorithmConstants.TARGET_HARMONICS) {
+            val frequency = target * harmonic
+            if (frequency >= nyquist) break
+            goertzel(buffer, offset, phaseWindow, span, frequency)
+            val aRe = outRe
+            val aIm = outIm
+            goertzel(buffer, offset + hop, phaseWindow, span, frequency)
+
+            // arg(B * conj(A)) = phase advance over hop samples
+            val advance = Math.atan2(outIm * aRe - outRe * aIm, outRe * aRe + outIm * aIm)
+            val expected = 2.0 * Math.PI * frequency * hop / sampleRate
+            var deviation = (advance - expected) % (2.0 * Math.PI)
+            if (deviation > Math.PI) deviation -= 2.0 * Math.PI
+            if (deviation < -Math.PI) deviation += 2.0 * Math.PI
+            val estimate = (frequency + deviation * sampleRate / (2.0 * Math.PI * hop)) / harmonic
+
+            val energy = Math.sqrt((aRe * aRe + aIm * aIm) * (outRe * outRe + outIm * outIm))
+            val weight = energy * harmonic * harmonic
+            weightedSum += weight * estimate
+            totalWeight += weight
+        }
+        return if (totalWeight > 0.0) weightedSum / totalWeight else target
+    }
+
+    /**
+     * Windowed Goertzel filter at frequency over buffer[start until start + length];
+     * leaves the complex output (up to a phase factor fixed by length) in outRe/outIm.
+     */
+    private fun goertzel(buffer: FloatArray, start: Int, window: DoubleArray, length: Int, frequency: Double) {
+        val omega = 2.0 * Math.PI * frequency / sampleRate
+        val cosine = Math.cos(omega)
+        val coefficient = 2.0 * cosine
+        var s1 = 0.0
+        var s2 = 0.0
+        for (n in 0 until length) {
+            val s0 = buffer[start + n] * window[n] + coefficient * s1 - s2
+            s2 = s1
+            s1 = s0
+        }
+        outRe = s1 - s2 * cosine
+        outIm = s2 * Math.sin(omega)
+    }
+
+    private fun ensureWindows(length: Int) {
+        if (length == frameSize) return
+        frameSize = length
+        frameWindow = hann(length)
+        phaseWindow = hann(length - length / AlgorithmConstants.TARGET_PHASE_HOP_DIVISOR)
+
+        // |X|^2 / windowed energy for a pure tone at a filter frequency: (sum w)^2 / (2 * sum w^2)
+        var sum = 0.0
+        var sumSquares = 0.0
+        for (w in frameWindow) {
+            sum += w
+            sumSquares += w * w
+        }
+        toneGain = sum * sum / (2.0 * sumSquares)
+    }
+
+    private fun hann(length: Int) = DoubleArray(length) {
+        0.5 - 0.5 * Math.cos(2.0 * Math.PI * it / (length - 1))
+    }
+}
@@ -0,0 +1,82 @@
+package com.rokid.tuner.pitch
+
+import com.rokid.tuner.audio.AudioConfig
+import com.rokid.tuner.constants.AlgorithmConstants
+import com.rokid.tuner.pitch.PitchEstimator.Estimate
+
+/**
+ * McLeod Pitch Method (McLeod and Wyvill, "A smarter way to find pitch").
+ *
+ * The normalised square difference function
+ *
+ *     n(t) = 2 * r(t) / m(t) = 1 - d(t) / m(t)
+ *
+ * is built from the same FFT-based d(t) as YIN plus the lag energies m(t) (see
+ * [YinDifferenceFunction.lagEnergy]). It lies in [-1, 1] and, unlike the raw
+ * autocorrelation, does not decay with the lag. Between each positive-going zero crossing
+ * and the next negative-going one, the highest point is a key maximum; the first key
+ * maximum reaching [AlgorithmConstants.MPM_KEY_MAXIMUM_RATIO] of the highest one is the
+ * period, which favours the fundamental over its sub-octaves. Clarity is 1 - n at the
+ * peak.
+ */
+class MpmEstimator(private val sampleRate: Int = AudioConfig.SAMPLE_RATE) : PitchEstimator {
+
+    override val engine = PitchEstimator.Engine.MPM
+
+    override var range = FrequencyRange.GUITAR
+
+    private val differenceFunction = YinDifferenceFunction()
+    private var differenceScratch = DoubleArray(0)
+    private var energyScratch = DoubleArray(0)
+
+    override fun estimate(buffer: FloatArray, offset: Int, length: Int, clarityThreshold: Double): Estimate {
+        val rate = sampleRate.toDouble()
+        val range = this.range
+        val tauMin = (rate / range.maxFrequency).toInt()
+        val tauMax = Math.min(length / AlgorithmConstants.DIVISOR_FOR_HALF_BUFFER, (rate / range.minFrequency).toInt())
+        if (tauMax <= tauMin + 1) return PitchEstimator.NO_PITCH
+
+        if (differenceScratch.size < tauMax) {
+            differenceScratch = DoubleArray(tauMax)
+            energyScratch = DoubleArray(tauMax)
+        }
+        val nsdf = differenceScratch
+        val energy = energyScratch
+        differenceFunction.compute(buffer, offset, length, tauMax, nsdf)
+        YinDifferenceFunction.lagEnergy(buffer, offset, length, tauMax, energy)
+        for (t in 0 until tauMax) {
+            nsdf[t] = if (energy[t] > 0.0) 1.0 - nsdf[t] / energy[t] else 0.0
+        }
+
+        // Highest key maximum, then the first one close enough to it
+        var highest = 0.0
+        forEachKeyMaximum(nsdf, tauMin, tauMax) { highest = Math.max(highest, nsdf[it]) }
+        if (highest <= 0.0) return PitchEstimator.NO_PITCH
+        var peak = -1
+        forEachKeyMaximum(nsdf, tauMin, tauMax) {
+            if (peak < 0 && nsdf[it] >= AlgorithmConstants.MPM_KEY_MAXIMUM_RATIO * highest) peak = it
+        }
+
+        val clarity = 1.0 - nsdf[peak]
+        if (clarity > clarityThreshold) return Estimate(AlgorithmConstants.INVALID_FREQUENCY, clarity)
+        return Estimate(rate / PitchEstimator.parabolicPeak(nsdf, peak), clarity)
+    }
+
+    /**
+     * Calls action with each key maximum at a lag in [tauMin, tauMax - 1), skipping the
+     * lobe around lag 0. A lobe cut off by tauMax contributes its highest point so far.
+     */
+    private inline fun forEachKeyMaximum(nsdf: DoubleArray, tauMin: Int, tauMax: Int, action: (Int) -> Unit) {
+        var t = 1
+        while (t < tauMax && nsdf[t] > 0.0) t++
+        while (t < tauMax - 1) {
+            while (t < tauMax - 1 && nsdf[t] <= 0.0) t++
+            var best = -1
+            while (t < tauMax - 1 && nsdf[t] > 0.0) {
+                if (best < 0 || nsdf[t] > nsdf[best]) best = t
+                t++
+            }
+            if (best >= tauMin) action(best)
+        }
+    }
+}
@@ -17,6 +17,17 @@ class NoteFinder {
 
     private val noteNames = MusicalConstants.NOTE_NAMES
 
+    // Target frequencies by MIDI note for the last reference frequency seen
+    @Volatile private var targetTable = TargetTable(AudioConfig.DEFAULT_REFERENCE_FREQUENCY)
+
+    /**
+     * Precomputes target frequencies for a new A4 calibration so the next lookup does not
+     * have to. Lookups with any other reference rebuild the table on demand.
+     */
+    fun setReferenceFrequency(referenceFrequency: Double) {
+        targetsFor(referenceFrequency)
+    }
+
     fun findNote(frequency: Double, referenceFrequency: Double = AudioConfig.DEFAULT_REFERENCE_FREQUENCY): NoteInfo {
         if (frequency <= AlgorithmConstants.INVALID_FREQUENCY) {
             return NoteInfo("--", 0f, 0f, AlgorithmConstants.INVALID_FREQUENCY)
@@ -31,17 +42,17 @@ class NoteFinder {
         // Calculate cents deviation from nearest semitone
         val cents = ((semitonesFromA4 - roundedSemitones) * MusicalConstants.CENTS_PER_SEMITONE).toFloat()
         
-        // Get note index (A4 = index 9, since A is 9th note in our array starting from C)
-        // Add 9 because A is at index 9 in our array
-        val noteIndex = ((MusicalConstants.A_NOTE_INDEX + roundedSemitones) % MusicalConstants.NOTES_PER_OCTAVE + MusicalConstants.NOTES_PER_OCTAVE) % MusicalConstants.NOTES_PER_OCTAVE
-        
-        // Get octave (A4 is octave 4)
-        val octave = MusicalConstants.A4_OCTAVE + (roundedSemitones + MusicalConstants.A_NOTE_INDEX) / MusicalConstants.NOTES_PER_OCTAVE
-        
-        val noteName = "${noteNames[noteIndex]}${octave}"
-        
-        // Calculate target frequency for this note
-        val targetFrequency = referenceFrequency * Math.pow(MusicalConstants.FREQUENCY_RATIO_BASE, roundedSemitones / MusicalConstants.SEMITONES_PER_OCTAVE.toDouble())
+        // Name and target frequency come from the tables inside the MIDI range
+        val midiNote = roundedSemitones + MusicalConstants.A4_MIDI_NOTE
+        val noteName: String
+        val targetFrequency: Double
+        if (midiNote >= 0 && midiNote < MusicalConstants.MIDI_NOTE_COUNT) {
+            noteName = NOTE_NAME_TABLE[midiNote]
+            targetFrequency = targetsFor(referenceFrequency)[midiNote]
+        } else {
+            noteName = noteNameFor(roundedSemitones)
+            targetFrequency = targetFrequencyFor(referenceFrequency, roundedSemitones)
+        }
         
         // Simple probability based on cents (closer to 0 cents = higher probability)
         val probability = 1.0f - (Math.abs(cents) / AudioConfig.MAX_CENTS_DEVIATION.toFloat()).coerceIn(0f, 1f)
@@ -49,10 +60,97 @@ class NoteFinder {
         return NoteInfo(noteName, cents, probability, targetFrequency)
     }
 
+    /**
+     * Batch form of [findNote] that writes into caller-owned arrays and allocates nothing.
+     *
+     * For each of the first count frequencies, noteIndices receives the MIDI note number
+     * (A4 = 69; see [noteName] and [targetFrequency]) and cents the deviation from it.
+     * Invalid frequencies and notes outside MIDI 0-127 get [INVALID_NOTE_INDEX] and 0 cents.
+     */
+    fun findNotes(
+        frequencies: DoubleArray,
+        count: Int,
+        noteIndices: IntArray,
+        cents: FloatArray,
+        referenceFrequency: Double = AudioConfig.DEFAULT_REFERENCE_FREQUENCY
+    ) {
+        require(count <= frequencies.size && count <= noteIndices.size && count <= cents.size) {
+            "count exceeds array size"
+        }
+        for (i in 0 until count) {
+            val frequency = frequencies[i]
+            if (frequency <= AlgorithmConstants.INVALID_FREQUENCY) {
+                noteIndices[i] = INVALID_NOTE_INDEX
+                cents[i] = 0f
+                continue
+            }
+            val semitonesFromA4 = MusicalConstants.SEMITONES_PER_OCTAVE.toDouble() * log2(frequency / referenceFrequency)
+            val roundedSemitones = round(semitonesFromA4).toInt()
+            val midiNote = roundedSemitones + MusicalConstants.A4_MIDI_NOTE
+            if (midiNote < 0 || midiNote >= MusicalConstants.MIDI_NOTE_COUNT) {
+                noteIndices[i] = INVALID_NOTE_INDEX
+                cents[i] = 0f
+            } else {
+                noteIndices[i] = midiNote
+                cents[i] = ((semitonesFromA4 - roundedSemitones) * MusicalConstants.CENTS_PER_SEMITONE).toFloat()
+            }
+        }
+    }
+
+    /** Cached target frequency of a MIDI note index returned by [findNotes]. */
+    fun targetFrequency(noteIndex: Int, referenceFrequency: Double = AudioConfig.DEFAULT_REFERENCE_FREQUENCY): Double {
+        if (noteIndex < 0 || noteIndex >= MusicalConstants.MIDI_NOTE_COUNT) return AlgorithmConstants.INVALID_FREQUENCY
+        return targetsFor(referenceFrequency)[noteIndex]
+    }
+
+    private fun targetsFor(referenceFrequency: Double): DoubleArray {
+        var table = targetTable
+        if (table.referenceFrequency != referenceFrequency) {
+            table = TargetTable(referenceFrequency)
+            targetTable = table
+        }
+        return table.frequencies
+    }
+
+    private class TargetTable(val referenceFrequency: Double) {
+        val frequencies = DoubleArray(MusicalConstants.MIDI_NOTE_COUNT) {
+            targetFrequencyFor(referenceFrequency, it - MusicalConstants.A4_MIDI_NOTE)
+        }
+    }
+
     fun getNoteNames(): List<String> = noteNames.toList()
 
     companion object {
 
+        /** Note index used by [findNotes] for invalid or out-of-range frequencies. */
+        const val INVALID_NOTE_INDEX = -1
+
+        // Interned names by MIDI note number, built with the same octave rule as findNote
+        private val NOTE_NAME_TABLE = Array(MusicalConstants.MIDI_NOTE_COUNT) {
+            noteNameFor(it - MusicalConstants.A4_MIDI_NOTE).intern()
+        }
+
+        /** Note name for a MIDI note index, or "--" outside 0-127. */
+        fun noteName(noteIndex: Int): String {
+            if (noteIndex < 0 || noteIndex >= MusicalConstants.MIDI_NOTE_COUNT) return "--"
+            return NOTE_NAME_TABLE[noteIndex]
+        }
+
+        private fun noteNameFor(semitonesFromA4: Int): String {
+            // Get note index (A4 = index 9, since A is 9th note in our array starting from C)
+            val noteIndex = ((MusicalConstants.A_NOTE_INDEX + semitonesFromA4) % MusicalConstants.NOTES_PER_OCTAVE + MusicalConstants.NOTES_PER_OCTAVE) % MusicalConstants.NOTES_PER_OCTAVE
+            
+            // Get octave (A4 is octave 4), rounding down below C4 so that A2 is not named A3
+            val fromC4 = semitonesFromA4 + MusicalConstants.A_NOTE_INDEX
+            val octaveOffset = if (fromC4 >= 0) fromC4 / MusicalConstants.NOTES_PER_OCTAVE
+                else (fromC4 - MusicalConstants.NOTES_PER_OCTAVE + 1) / MusicalConstants.NOTES_PER_OCTAVE
+            val octave = MusicalConstants.A4_OCTAVE + octaveOffset
+            
+            return "${MusicalConstants.NOTE_NAMES[noteIndex]}${octave}"
+        }
+
+        private fun targetFrequencyFor(referenceFrequency: Double, semitonesFromA4: Int): Double =
+            referenceFrequency * Math.pow(MusicalConstants.FREQUENCY_RATIO_BASE, semitonesFromA4 / MusicalConstants.SEMITONES_PER_OCTAVE.toDouble())
         
         fun frequencyToCents(frequency: Double, targetFrequency: Double): Float {
             if (frequency <= 0.0 || targetFrequency <= 0.0) return 0f
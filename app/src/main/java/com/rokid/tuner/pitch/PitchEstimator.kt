@@ -0,0 +1,64 @@
+package com.rokid.tuner.pitch
+
+import com.rokid.tuner.constants.AlgorithmConstants
+import com.rokid.tuner.profiling.StageProfiler
+
+/**
+ * Per-frame fundamental frequency estimator: the raw estimate [PitchDetector] smooths,
+ * note-locks and reports. Engines trade cost against accuracy and octave robustness;
+ * see [Engine] and the estimator comparison benchmark.
+ *
+ * Implementations keep scratch buffers between calls and are not thread-safe.
+ */
+interface PitchEstimator {
+
+    enum class Engine {
+        /** YIN cumulative mean normalised difference (the default). */
+        YIN,
+        /** McLeod Pitch Method: normalised square difference with key-maximum picking. */
+        MPM,
+        /** Plain autocorrelation: the highest correlation peak after the first dip. */
+        AUTOCORRELATION
+    }
+
+    data class Estimate(
+        val frequency: Double,  // INVALID_FREQUENCY if no pitch was found
+        val clarity: Double     // 0 = perfectly periodic, 1 = no periodicity - lower is clearer
+    )
+
+    val engine: Engine
+
+    /** Frequencies searched by [estimate]; [FrequencyRange.GUITAR] until set. */
+    var range: FrequencyRange
+
+    /**
+     * Estimates the fundamental of buffer[offset until offset + length], searching
+     * [range]. Estimates whose clarity value exceeds clarityThreshold are reported
+     * with INVALID_FREQUENCY.
+     */
+    fun estimate(buffer: FloatArray, offset: Int, length: Int, clarityThreshold: Double): Estimate
+
+    companion object {
+        fun create(engine: Engine, profiler: StageProfiler = StageProfiler()): PitchEstimator = when (engine) {
+            Engine.YIN -> YinEstimator(profiler)
+            Engine.MPM -> MpmEstimator()
+            Engine.AUTOCORRELATION -> AutocorrelationEstimator()
+        }
+
+        internal val NO_PITCH = Estimate(AlgorithmConstants.INVALID_FREQUENCY, 1.0)
+
+        /**
+         * Vertex of the parabola through data[index - 1], data[index], data[index + 1],
+         * for sub-sample location of a minimum or maximum; index itself if the three
+         * points are collinear.
+         */
+        internal fun parabolicPeak(data: DoubleArray, index: Int): Double {
+            val s0 = data[index - 1]
+            val s1 = data[index]
+            val s2 = data[index + 1]
+            val denominator = 2.0 * (2.0 * s1 - s2 - s0)
+            if (Math.abs(denominator) < AlgorithmConstants.MIN_DENOMINATOR) return index.toDouble()
+            return index + (s2 - s0) / denominator
+        }
+    }
+}
@@ -0,0 +1,249 @@
+package com.rokid.tuner.pitch
+
+import com.rokid.tuner.constants.AlgorithmConstants
+
+/**
+ * Streaming smoother for per-frame pitch estimates.
+ *
+ * Implementations keep their history in primitive arrays sized once at construction,
+ * so [add] never allocates. Larger windows give smoother output at the cost of lag.
+ */
+interface PitchSmoother {
+
+    /** Window the smoother was built with (samples, or the equivalent EMA/Kalman span). */
+    val window: Int
+
+    /** Adds a new estimate and returns the smoothed value. */
+    fun add(value: Double): Double
+
+    /** Current smoothed value, or [AlgorithmConstants.INVALID_FREQUENCY] if empty. */
+    fun value(): Double
+
+    /** Forgets all history. */
+    fun reset()
+
+    enum class Mode {
+        /** Running median: rejects outliers (octave slips), lag of about window / 2 frames. */
+        MEDIAN,
+        /** Exponential moving average: cheapest, lag tunable via window. */
+        EMA,
+        /** Scalar Kalman filter: converges quickly, then behaves like an EMA. */
+        KALMAN
+    }
+
+    companion object {
+        fun create(mode: Mode, window: Int = AlgorithmConstants.DEFAULT_SMOOTHING_WINDOW): PitchSmoother =
+            when (mode) {
+                Mode.MEDIAN -> RunningMedian(window)
+                Mode.EMA -> ExponentialSmoother(window)
+                Mode.KALMAN -> KalmanSmoother(window)
+            }
+    }
+}
+
+/**
+ * Running median over the last window values in O(log window) per insert.
+ *
+ * Uses a max-heap / min-heap pair stored around the median in one index array, with
+ * a position table that lets the value leaving the ring buffer be replaced in place
+ * (the "mediator" scheme). For an even number of values the two middle values are
+ * averaged.
+ */
+class RunningMedian(override val window: Int) : PitchSmoother {
+
+    init {
+        require(window > 0) { "window must be positive" }
+    }
+
+    // Circular queue of values
+    private val data = DoubleArray(window)
+    // Heap position of each ring slot (negative = max-heap, 0 = median, positive = min-heap)
+    private val pos = IntArray(window)
+    // Ring slot indices; heap[center + i] for i in -maxCount..minCount
+    private val heap = IntArray(window)
+    private val center = window / 2
+    private var index = 0
+    private var count = 0
+
+    init {
+        initHeap()
+    }
+
+    private fun initHeap() {
+        for (slot in 0 until window) {
+            // Initial fill pattern: median, max, min, max, min, ...
+            val p = ((slot + 1) / 2) * (if ((slot and 1) == 1) -1 else 1)
+            pos[slot] = p
+            heap[center + p] = slot
+        }
+    }
+
+    override fun add(value: Double): Double {
+        val isNew = count < window
+        val p = pos[index]
+        val old = data[index]
+        data[index] = value
+        index = (index + 1) % window
+        if (isNew) count++
+
+        when {
+            p > 0 -> {
+                // Replaced item is in the min-heap
+                if (!isNew && old < value) minSortDown(p * 2)
+                else if (minSortUp(p)) maxSortDown(-1)
+            }
+            p < 0 -> {
+                // Replaced item is in the max-heap
+                if (!isNew && value < old) maxSortDown(p * 2)
+                else if (maxSortUp(p)) minSortDown(1)
+            }
+            else -> {
+                // Replaced item is the median
+                if (maxCount() > 0) maxSortDown(-1)
+                if (minCount() > 0) minSortDown(1)
+            }
+        }
+        return value()
+    }
+
+    override fun value(): Double {
+        if (count == 0) return AlgorithmConstants.INVALID_FREQUENCY
+        val median = data[heap[center]]
+        return if (count % 2 == 0) (median + data[heap[center - 1]]) / 2.0 else median
+    }
+
+    override fun reset() {
+        index = 0
+        count = 0
+        data.fill(0.0)
+        initHeap()
+    }
+
+    private fun minCount() = (count - 1) / 2
+
+    private fun maxCount() = count / 2
+
+    private fun less(i: Int, j: Int) = data[heap[center + i]] < data[heap[center + j]]
+
+    private fun exchange(i: Int, j: Int): Boolean {
+        val a = heap[center + i]
+        val b = heap[center + j]
+        heap[center + i] = b
+        heap[center + j] = a
+        pos[b] = i
+        pos[a] = j
+        return true
+    }
+
+    private fun compareExchange(i: Int, j: Int) = less(i, j) && exchange(i, j)
+
+    private fun minSortDown(start: Int) {
+        var i = start
+        while (i <= minCount()) {
+            if (i > 1 && i < minCount() && less(i + 1, i)) i++
+            if (!compareExchange(i, i / 2)) break
+            i *= 2
+        }
+    }
+
+    private fun maxSortDown(start: Int) {
+        var i = start
+        while (i >= -maxCount()) {
+            if (i < -1 && i > -maxCount() && less(i, i - 1)) i--
+            if (!compareExchange(i / 2, i)) break
+            i *= 2
+        }
+    }
+
+    /** Returns true if the median changed. */
+    private fun minSortUp(start: Int): Boolean {
+        var i = start
+        while (i > 0 && compareExchange(i, i / 2)) i /= 2
+        return i == 0
+    }
+
+    /** Returns true if the median changed. */
+    private fun maxSortUp(start: Int): Boolean {
+        var i = start
+        while (i < 0 && compareExchange(i / 2, i)) i /= 2
+        return i == 0
+    }
+}
+
+/**
+ * Exponential moving average with alpha = 2 / (window + 1), i.e. the same average age
+ * as a window-sample moving average.
+ */
+class ExponentialSmoother(override val window: Int) : PitchSmoother {
+
+    init {
+        require(window > 0) { "window must be positive" }
+    }
+
+    private val alpha = 2.0 / (window + 1)
+    private var current = AlgorithmConstants.INVALID_FREQUENCY
+    private var initialized = false
+
+    override fun add(value: Double): Double {
+        if (!initialized) {
+            current = value
+            initialized = true
+        } else {
+            current += alpha * (value - current)
+        }
+        return current
+    }
+
+    override fun value(): Double = current
+
+    override fun reset() {
+        current = AlgorithmConstants.INVALID_FREQUENCY
+        initialized = false
+    }
+}
+
+/**
+ * Scalar random-walk Kalman filter.
+ *
+ * The process noise is chosen so the steady-state gain equals the EMA alpha for the same
+ * window, K = 2 / (window + 1), giving Q = K^2 * R / (1 - K). Unlike the EMA, the gain
+ * starts high and decays towards K, so the first few frames converge with little lag.
+ */
+class KalmanSmoother(override val window: Int) : PitchSmoother {
+
+    init {
+        require(window > 0) { "window must be positive" }
+    }
+
+    private val measurementNoise = 1.0
+    private val steadyGain = 2.0 / (window + 1)
+    // window == 1 means no smoothing at all (K = 1)
+    private val passThrough = window == 1
+    private val processNoise = if (passThrough) 0.0
+        else steadyGain * steadyGain * measurementNoise / (1.0 - steadyGain)
+    private var estimate = AlgorithmConstants.INVALID_FREQUENCY
+    private var errorVariance = 0.0
+    private var initialized = false
+
+    override fun add(value: Double): Double {
+        if (!initialized || passThrough) {
+            estimate = value
+            errorVariance = measurementNoise
+            initialized = true
+            return estimate
+        }
+        val predicted = errorVariance + processNoise
+        val gain = predicted / (predicted + measurementNoise)
+        estimate += gain * (value - estimate)
+        errorVariance = (1.0 - gain) * predicted
+        return estimate
+    }
+
+    override fun value(): Double = estimate
+
+    override fun reset() {
+        estimate = AlgorithmConstants.INVALID_FREQUENCY
+        errorVariance = 0.0
+        initialized = false
+    }
+}
@@ -0,0 +1,222 @@
+package com.rokid.tuner.pitch
+
+/**
+ * Computes the YIN difference function
+ *
+ *     d(t) = sum_{j=0}^{N-t-1} (x[j] - x[j + t])^2
+ *
+ * in O(N log N) instead of the O(N * tauMax) double loop.
+ *
+ * The sum is expanded into two energy terms and an autocorrelation term:
+ *
+ *     d(t) = E[0, N - t) + E[t, N) - 2 * r(t)
+ *
+ * where the energies come from a prefix sum of squared samples and r(t) is obtained
+ * from the power spectrum of the zero-padded frame (Wiener-Khinchin). The FFT size is
+ * the next power of two >= N + tauMax, so the circular correlation never wraps into
+ * the lags we read.
+ *
+ * Tolerance: all arithmetic is in double precision, so each d(t) differs from the
+ * direct sum by rounding error only - well below 1e-6 of the frame energy sum(x^2).
+ * The tau picked by YIN, the clarity value dPrime[tau] and the parabolic interpolation
+ * result therefore match the direct computation to within 1e-6 (relative), which is
+ * far below the 0.01 Hz display resolution.
+ *
+ * Twiddle tables, the bit-reversal permutation and all scratch arrays are kept between
+ * calls and only rebuilt when the FFT size changes. Instances are not thread-safe.
+ */
+class YinDifferenceFunction {
+
+    private var fftSize = 0
+    private var cosTable = DoubleArray(0)
+    private var sinTable = DoubleArray(0)
+    private var bitReverse = IntArray(0)
+    private var real = DoubleArray(0)
+    private var imag = DoubleArray(0)
+    private var energyPrefix = DoubleArray(0)
+
+    /**
+     * Fills out[0 until tauMax] with d(t) for buffer[offset until offset + length].
+     * out must hold at least tauMax values, and tauMax must not exceed length.
+     */
+    fun compute(buffer: FloatArray, offset: Int, length: Int, tauMax: Int, out: DoubleArray) {
+        val n = length
+        ensureCapacity(n, tauMax)
+
+        // Prefix sums of squared samples: energyPrefix[k] = sum_{j<k} x[j]^2
+        val prefix = energyPrefix
+        prefix[0] = 0.0
+        for (j in 0 until n) {
+            val sample = buffer[offset + j].toDouble()
+            prefix[j + 1] = prefix[j] + sample * sample
+        }
+
+        // Zero-padded frame -> spectrum
+        val re = real
+        val im = imag
+        for (j in 0 until n) {
+            re[j] = buffer[offset + j].toDouble()
+        }
+        re.fill(0.0, n, fftSize)
+        im.fill(0.0)
+        transform(re, im)
+
+        // Power spectrum is real and even, so a forward transform of it is the
+        // (unscaled) inverse transform: r(t) = FFT(|X|^2)[t] / fftSize
+        for (k in 0 until fftSize) {
+            re[k] = re[k] * re[k] + im[k] * im[k]
+            im[k] = 0.0
+        }
+        transform(re, im)
+
+        val scale = 2.0 / fftSize
+        val total = prefix[n]
+        for (t in 0 until tauMax) {
+            val value = prefix[n - t] + (total - prefix[t]) - scale * re[t]
+            // Rounding can push exact zeros (e.g. t = 0) slightly negative
+            out[t] = if (value > 0.0) value else 0.0
+        }
+    }
+
+    private fun ensureCapacity(frameSize: Int, tauMax: Int) {
+        var size = 1
+        while (size < frameSize + tauMax) size = size shl 1
+
+        if (size != fftSize) {
+            fftSize = size
+            real = DoubleArray(size)
+            imag = DoubleArray(size)
+
+            val half = size / 2
+            cosTable = DoubleArray(half) { Math.cos(2.0 * Math.PI * it / size) }
+            sinTable = DoubleArray(half) { -Math.sin(2.0 * Math.PI * it / size) }
+
+            val bits = Integer.numberOfTrailingZeros(size)
+            bitReverse = IntArray(size) { Integer.reverse(it) ushr (Integer.SIZE - bits) }
+        }
+        if (energyPrefix.size < frameSize + 1) {
+            energyPrefix = DoubleArray(frameSize + 1)
+        }
+    }
+
+    /** In-place iterative radix-2 FFT using the cached tables. */
+    private fun transform(re: DoubleArray, im: DoubleArray) {
+        val n = fftSize
+        val reverse = bitReverse
+        for (i in 0 until n) {
+            val j = reverse[i]
+            if (i < j) {
+                val tr = re[i]; re[i] = re[j]; re[j] = tr
+                val ti = im[i]; im[i] = im[j]; im[j] = ti
+            }
+        }
+
+        var size = 2
+        while (size <= n) {
+            val half = size / 2
+            val step = n / size
+            var start = 0
+            while (start < n) {
+                var k = 0
+                for (m in start until start + half) {
+                    val wr = cosTable[k]
+                    val wi = sinTable[k]
+                    val p = m + half
+                    val tr = re[p] * wr - im[p] * wi
+                    val ti = re[p] * wi + im[p] * wr
+                    re[p] = re[m] - tr
+                    im[p] = im[m] - ti
+                    re[m] += tr
+                    im[m] += ti
+                    k += step
+                }
+                start += size
+            }
+            size = size shl 1
+        }
+    }
+
+    companion object {
+        /**
+         * Reference O(N * tauMax) implementation, kept for verification and for
+         * evaluating a handful of lags where an FFT would not pay off.
+         */
+        internal fun computeDirect(buffer: FloatArray, offset: Int, length: Int, tauMax: Int, out: DoubleArray) {
+            for (t in 0 until tauMax) {
+                out[t] = computeLag(buffer, offset, length, t)
+            }
+        }
+
+        /**
+         * sum_{t=1}^{lastLag} d(t) in O(length), without evaluating d at each lag.
+         *
+         * Summing the expansion d(t) = E[0, N - t) + E[t, N) - 2 * r(t) over t, the energy
+         * terms reduce to sums of the squared-sample prefix, and the correlation terms to
+         * sum_j x[j] * (x[j + 1] + ... + x[j + lastLag]), a sliding window sum. This is the
+         * running sum the cumulative mean normalisation needs before the first lag of a
+         * narrow search window.
+         */
+        fun cumulativeSum(buffer: FloatArray, offset: Int, length: Int, lastLag: Int): Double {
+            require(lastLag in 0 until length) { "lastLag must be in [0, length)" }
+            if (lastLag == 0) return 0.0
+            val n = length
+
+            // prefix(k) = sum_{j<k} x[j]^2; need sum of prefix(t) for t in 1..lastLag
+            // and sum of prefix(m) for m in n - lastLag..n - 1
+            var prefix = 0.0
+            var lowSum = 0.0
+            var highSum = 0.0
+            for (j in 0 until n) {
+                if (j >= n - lastLag) highSum += prefix
+                val sample = buffer[offset + j].toDouble()
+                prefix += sample * sample
+                if (j < lastLag) lowSum += prefix
+            }
+            val energy = highSum + lastLag * prefix - lowSum
+
+            // window = x[j + 1] + ... + x[min(j + lastLag, n - 1)]
+            var window = 0.0
+            for (k in 1..lastLag) window += buffer[offset + k]
+            var correlation = 0.0
+            for (j in 0 until n - 1) {
+                correlation += buffer[offset + j] * window
+                window -= buffer[offset + j + 1]
+                if (j + 1 + lastLag < n) window += buffer[offset + j + 1 + lastLag]
+            }
+
+            val sum = energy - 2.0 * correlation
+            return if (sum > 0.0) sum else 0.0
+        }
+
+        /**
+         * Fills out[0 until tauMax] with m(t) = E[0, N - t) + E[t, N), the energy of the
+         * two segments d(t) compares, in O(length + tauMax). Since d(t) = m(t) - 2 * r(t),
+         * this recovers the autocorrelation and the normalised square difference from d.
+         */
+        fun lagEnergy(buffer: FloatArray, offset: Int, length: Int, tauMax: Int, out: DoubleArray) {
+            var energy = 0.0
+            for (j in offset until offset + length) {
+                val sample = buffer[j].toDouble()
+                energy += sample * sample
+            }
+            var value = 2.0 * energy
+            out[0] = value
+            for (t in 1 until tauMax) {
+                val tail = buffer[offset + length - t].toDouble()
+                val head = buffer[offset + t - 1].toDouble()
+                value -= tail * tail + head * head
+                out[t] = if (value > 0.0) value else 0.0
+            }
+        }
+
+        /** d(tau) for a single lag by direct summation, O(length). */
+        fun computeLag(buffer: FloatArray, offset: Int, length: Int, tau: Int): Double {
+            var sum = 0.0
+            for (j in offset until offset + length - tau) {
+                val diff = buffer[j] - buffer[j + tau]
+                sum += diff * diff
+            }
+            return sum
+        }
+    }
+}
@@ -0,0 +1,251 @@
+package com.rokid.tuner.pitch
+
+import android.util.Log
+import com.rokid.tuner.audio.AudioConfig
+import com.rokid.tuner.constants.AlgorithmConstants
+import com.rokid.tuner.constants.UiConstants
+import com.rokid.tuner.pitch.PitchEstimator.Estimate
+import com.rokid.tuner.profiling.StageProfiler
+
+/**
+ * YIN (de Cheveigne and Kawahara): the first trough of the cumulative mean normalised
+ * difference function below a threshold scaled from the clarity threshold, falling back
+ * to the global minimum. As in the paper, the lag taken is the bottom of that trough, not
+ * the first lag under the threshold, which on a pure tone lies on the falling slope and
+ * reads 60-80 cents flat. d(t) comes from the FFT-based [YinDifferenceFunction].
+ *
+ * Searches [range]. Optionally runs on a decimated copy of the frame (see
+ * [setDecimation]), and offers [track], a narrow search around a known period used by
+ * the detector's tracking mode. Parabolic interpolation time is profiled as [StageProfiler.Stage.INTERPOLATION].
+ */
+class YinEstimator(private val profiler: StageProfiler = StageProfiler()) : PitchEstimator {
+
+    companion object {
+        private const val TAG = "YinEstimator"
+        private const val DEBUG = UiConstants.DEBUG
+    }
+
+    override val engine = PitchEstimator.Engine.YIN
+
+    @Volatile override var range = FrequencyRange.GUITAR
+
+    // Difference engine and per-frame scratch, reused across frames
+    private val differenceFunction = YinDifferenceFunction()
+    private var differenceScratch = DoubleArray(0)
+    private var normalizedScratch = DoubleArray(0)
+    private var trackingScratch = DoubleArray(0)
+
+    // Optional decimating front-end (null = full rate)
+    @Volatile private var decimator: Decimator? = null
+    @Volatile private var refineAtFullRate = true
+    private var decimatedScratch = FloatArray(0)
+    private var refineScratch = DoubleArray(0)
+
+    /**
+     * Runs YIN on a low-pass filtered, decimated copy of each frame (see [Decimator]).
+     * factor <= 1 restores full-rate analysis; with refine, d(t) is re-evaluated at full
+     * rate around the coarse period.
+     */
+    fun setDecimation(factor: Int, refine: Boolean = true) {
+        decimator = if (factor > 1) Decimator(factor) else null
+        refineAtFullRate = refine
+    }
+
+    override fun estimate(buffer: FloatArray, offset: Int, length: Int, clarityThreshold: Double): Estimate {
+        // Improved YIN pitch detection algorithm with clarity feedback
+        if (length < AlgorithmConstants.MIN_YIN_BUFFER_SIZE) return PitchEstimator.NO_PITCH
+        
+        val decimator = this.decimator
+        if (decimator != null) return estimateDecimated(decimator, buffer, offset, length, clarityThreshold)
+        
+        val sampleRate = AudioConfig.SAMPLE_RATE.toDouble()
+        
+        // Lag bounds from the selected range (guitar: 1350Hz..80Hz)
+        val range = this.range
+        val tauMin = (sampleRate / range.maxFrequency).toInt()  // ~33 samples for 1350Hz
+        val tauMax = Math.min(length / AlgorithmConstants.DIVISOR_FOR_HALF_BUFFER, (sampleRate / range.minFrequency).toInt())  // ~551 samples for 80Hz
+        
+        return searchYIN(buffer, offset, length, sampleRate, tauMin, tauMax, clarityThreshold)
+    }
+
+    /**
+     * YIN on a decimated copy of the frame: lags and frame length shrink by the factor,
+     * so the difference function costs roughly factor times less. The tau bounds get one
+     * lag of margin on each side so parabolic interpolation still works at the band edges.
+     * With refinement, d(t) is then evaluated directly at full rate for the few lags
+     * around the coarse period and interpolated there.
+     */
+    private fun estimateDecimated(decimator: Decimator, audioData: FloatArray, offset: Int, length: Int, clarityThreshold: Double): Estimate {
+        val count = decimator.outputLength(length)
+        if (decimatedScratch.size < count) decimatedScratch = FloatArray(count)
+        decimator.process(audioData, offset, length, decimatedScratch)
+        
+        val fullRate = AudioConfig.SAMPLE_RATE.toDouble()
+        val rate = fullRate / decimator.factor
+        val range = this.range
+        val tauMin = Math.max(AlgorithmConstants.MIN_YIN_LAG, (rate / range.maxFrequency).toInt() - 1)
+        val tauMax = Math.min(count / AlgorithmConstants.DIVISOR_FOR_HALF_BUFFER, (rate / range.minFrequency).toInt() + 2)
+        
+        val coarse = searchYIN(decimatedScratch, 0, count, rate, tauMin, tauMax, clarityThreshold)
+        if (coarse.frequency <= AlgorithmConstants.INVALID_FREQUENCY || !refineAtFullRate) return coarse
+        
+        val refineStart = profiler.start()
+        val lag = refineLag(audioData, offset, length, fullRate / coarse.frequency, decimator.factor)
+        profiler.stop(StageProfiler.Stage.INTERPOLATION, refineStart)
+        if (DEBUG) Log.d(TAG, "YIN: coarse freq=${coarse.frequency}, refined lag=$lag")
+        return if (lag > 0.0) Estimate(fullRate / lag, coarse.clarity) else coarse
+    }
+
+    /**
+     * Tracking-mode estimate: YIN restricted to lags within +/- TRACKING_LAG_RATIO of the
+     * period of frequency, with d(t) summed directly for those few lags (O(N) each)
+     * instead of the full FFT. The normalisation still divides by the mean of d over all
+     * lags from 1, with the part before the window taken from
+     * [YinDifferenceFunction.cumulativeSum], so dPrime matches [estimate] exactly inside
+     * the window. Decimation does not apply.
+     *
+     * Returns null - and the caller runs the full search - when the window would exceed
+     * the frame's half length, when the minimum sits on the window edge (the pitch has
+     * moved away), or when dPrime there is above the YIN threshold (clarity degraded).
+     */
+    fun track(audioData: FloatArray, offset: Int, length: Int, frequency: Double, clarityThreshold: Double): Estimate? {
+        val sampleRate = AudioConfig.SAMPLE_RATE.toDouble()
+        val period = sampleRate / frequency
+        val first = Math.max(1, (period * (1.0 - AlgorithmConstants.TRACKING_LAG_RATIO)).toInt())
+        val last = Math.ceil(period * (1.0 + AlgorithmConstants.TRACKING_LAG_RATIO)).toInt()
+        if (last >= length / AlgorithmConstants.DIVISOR_FOR_HALF_BUFFER || last - first < 2) return null
+        
+        val span = last - first + 1
+        if (trackingScratch.size < span) trackingScratch = DoubleArray(span)
+        val dPrime = trackingScratch
+        var runningSum = YinDifferenceFunction.cumulativeSum(audioData, offset, length, first - 1)
+        for (i in 0 until span) {
+            val t = first + i
+            val d = YinDifferenceFunction.computeLag(audioData, offset, length, t)
+            runningSum += d
+            dPrime[i] = if (runningSum == AlgorithmConstants.INITIAL_SUM) 1.0 else d * t / runningSum
+        }
+        
+        var best = 0
+        for (i in 1 until span) {
+            if (dPrime[i] < dPrime[best]) best = i
+        }
+        val threshold = AlgorithmConstants.YIN_THRESHOLD_OFFSET + clarityThreshold * AlgorithmConstants.YIN_THRESHOLD_MULTIPLIER
+        if (best == 0 || best == span - 1 || dPrime[best] > threshold) {
+            if (DEBUG) Log.d(TAG, "Tracking lost at lag ${first + best} (dPrime=${dPrime[best]}), falling back to full search")
+            return null
+        }
+        
+        val lag = first + PitchEstimator.parabolicPeak(dPrime, best)
+        if (DEBUG) Log.d(TAG, "Tracking: lag=$lag, dPrime=${dPrime[best]}")
+        return Estimate(sampleRate / lag, dPrime[best])
+    }
+
+    /**
+     * Minimum of the full-rate d(t) within +/- factor lags of coarseLag, with parabolic
+     * interpolation; returns 0 if the frame is too short for that range.
+     */
+    private fun refineLag(audioData: FloatArray, offset: Int, length: Int, coarseLag: Double, factor: Int): Double {
+        val centre = Math.round(coarseLag).toInt()
+        val first = Math.max(1, centre - factor - 1)
+        val last = centre + factor + 1
+        if (last >= length) return 0.0
+        
+        val span = last - first + 1
+        if (refineScratch.size < span) refineScratch = DoubleArray(span)
+        val values = refineScratch
+        for (i in 0 until span) {
+            values[i] = YinDifferenceFunction.computeLag(audioData, offset, length, first + i)
+        }
+        
+        var best = 1
+        for (i in 2 until span - 1) {
+            if (values[i] < values[best]) best = i
+        }
+        return first + PitchEstimator.parabolicPeak(values, best)
+    }
+
+    /**
+     * Core YIN search over lags [tauMin, tauMax) of buffer[offset until offset + length]
+     * sampled at sampleRate.
+     */
+    private fun searchYIN(buffer: FloatArray, offset: Int, length: Int, sampleRate: Double, tauMin: Int, tauMax: Int, clarityThreshold: Double): Estimate {
+        if (tauMax <= tauMin) return PitchEstimator.NO_PITCH
+        
+        if (DEBUG) Log.d(TAG, "YIN: buffer size=$length, tauMin=$tauMin, tauMax=$tauMax, expected tau for 440Hz=${sampleRate/AudioConfig.DEFAULT_REFERENCE_FREQUENCY}")
+        
+        // 1. Compute difference function d(t) for all t from 0 to tauMax-1 (FFT-based)
+        ensureYinScratch(tauMax)
+        val d = differenceScratch
+        differenceFunction.compute(buffer, offset, length, tauMax, d)
+        
+        // 2. Compute cumulative mean normalized difference d'(t)
+        val dPrime = normalizedScratch
+        dPrime[0] = 1.0
+        var runningSum = AlgorithmConstants.INITIAL_SUM
+        
+        for (t in 1 until tauMax) {
+            runningSum += d[t]
+            // Avoid division by zero
+            if (runningSum == AlgorithmConstants.INITIAL_SUM) {
+                dPrime[t] = 1.0
+            } else {
+                dPrime[t] = d[t] * t / runningSum
+            }
+        }
+        
+        // 3. Find first trough below threshold (scaled with clarity threshold for sensitivity)
+        // Typical YIN threshold is ${AlgorithmConstants.TYPICAL_MIN_YIN_THRESHOLD}-${AlgorithmConstants.TYPICAL_MAX_YIN_THRESHOLD}. We use ${AlgorithmConstants.YIN_THRESHOLD_OFFSET}-${AlgorithmConstants.YIN_THRESHOLD_OFFSET + AlgorithmConstants.DEFAULT_CLARITY_THRESHOLD * AlgorithmConstants.YIN_THRESHOLD_MULTIPLIER} range based on sensitivity.
+        val threshold = AlgorithmConstants.YIN_THRESHOLD_OFFSET + clarityThreshold * AlgorithmConstants.YIN_THRESHOLD_MULTIPLIER
+        var tau = AlgorithmConstants.INITIAL_TAU
+        for (t in tauMin until tauMax) {
+            if (dPrime[t] < threshold) {
+                // Walk down to the bottom of this trough so interpolation brackets the minimum
+                var bottom = t
+                while (bottom + 1 < tauMax && dPrime[bottom + 1] < dPrime[bottom]) bottom++
+                tau = bottom
+                break
+            }
+        }
+        
+        // 4. If no trough below threshold, find global minimum
+        if (tau == AlgorithmConstants.INITIAL_TAU) {
+            var minVal = Double.MAX_VALUE
+            for (t in tauMin until tauMax) {
+                if (dPrime[t] < minVal) {
+                    minVal = dPrime[t]
+                    tau = t
+                }
+            }
+        }
+        
+        if (DEBUG) Log.d(TAG, "YIN: tau=$tau, dPrime[tau]=${if (tau > 0) dPrime[tau] else "N/A"}, threshold=$threshold")
+        
+        // Check clarity of pitch detection
+        if (tau > AlgorithmConstants.INVALID_TAU && dPrime[tau] > clarityThreshold) {
+            if (DEBUG) Log.d(TAG, "YIN: pitch unclear (dPrime[tau]=${dPrime[tau]} > $clarityThreshold)")
+            return Estimate(AlgorithmConstants.INVALID_FREQUENCY, dPrime[tau])
+        }
+        
+        // 5. Parabolic interpolation for better precision
+        if (tau > tauMin && tau < tauMax - 1) {
+            val interpolationStart = profiler.start()
+            val bestTau = PitchEstimator.parabolicPeak(dPrime, tau)
+            profiler.stop(StageProfiler.Stage.INTERPOLATION, interpolationStart)
+            val freq = sampleRate / bestTau
+            if (DEBUG) Log.d(TAG, "YIN: parabolic interpolation, bestTau=$bestTau, freq=$freq")
+            return Estimate(freq, dPrime[tau])
+        }
+        
+        val freq = if (tau >= tauMin) sampleRate / tau else AlgorithmConstants.INVALID_FREQUENCY
+        if (DEBUG) Log.d(TAG, "YIN: final tau=$tau, freq=$freq")
+        return Estimate(freq, dPrime[tau])
+    }
+    
+    private fun ensureYinScratch(tauMax: Int) {
+        if (differenceScratch.size < tauMax) {
+            differenceScratch = DoubleArray(tauMax)
+            normalizedScratch = DoubleArray(tauMax)
+        }
+    }
+}
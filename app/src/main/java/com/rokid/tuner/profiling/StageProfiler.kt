@@ -0,0 +1,148 @@
+package com.rokid.tuner.profiling
+
+import java.util.concurrent.atomic.AtomicLongArray
+
+/**
+ * Per-stage timing for the pitch pipeline.
+ *
+ * Each stage keeps an invocation count, total and maximum nanoseconds and a fixed-size
+ * histogram with power-of-two buckets (bucket i holds durations in [2^i, 2^(i+1)) ns).
+ * Nothing is allocated while recording. When [enabled] is false, [start] returns 0 and
+ * [stop] returns immediately, so the cost is one volatile read per stage.
+ *
+ * Usage on the hot path:
+ *
+ *     val t = profiler.start()
+ *     doWork()
+ *     profiler.stop(StageProfiler.Stage.YIN, t)
+ */
+class StageProfiler {
+
+    enum class Stage {
+        /** Whole PitchDetector.detectPitch call. */
+        FRAME,
+        RMS,
+        /** Whole per-frame estimate by the selected PitchEstimator (YIN by default), interpolation included. */
+        YIN,
+        /** Narrow lag search around the locked period, used instead of YIN while tracking. */
+        TRACKING,
+        /** Goertzel filter bank, used instead of YIN when tuning targets are set. */
+        TARGETED,
+        INTERPOLATION,
+        SMOOTHING,
+        NOTE_FIND,
+        NOTE_LOCK,
+        /** PhaseTracker pass over one captured block in strobe mode. */
+        STROBE,
+        /** TunerViewModel state update and StateFlow emission. */
+        STATE_EMIT,
+        /** Capture of a window's newest sample to the end of its StateFlow emission. */
+        END_TO_END
+    }
+
+    data class StageStats(
+        val stage: Stage,
+        val count: Long,
+        val totalNs: Long,
+        val maxNs: Long,
+        val histogram: LongArray
+    ) {
+        val meanNs: Double get() = if (count == 0L) 0.0 else totalNs.toDouble() / count
+
+        /**
+         * Upper bound of the histogram bucket containing the given percentile (0-100),
+         * i.e. accurate to within a factor of two.
+         */
+        fun percentileNs(percentile: Double): Long {
+            if (count == 0L) return 0L
+            val target = Math.ceil(count * percentile / 100.0).toLong().coerceAtLeast(1L)
+            var seen = 0L
+            for (bucket in histogram.indices) {
+                seen += histogram[bucket]
+                if (seen >= target) return 1L shl (bucket + 1)
+            }
+            return maxNs
+        }
+
+        override fun equals(other: Any?): Boolean {
+            if (this === other) return true
+            if (other !is StageStats) return false
+            return stage == other.stage && count == other.count && totalNs == other.totalNs &&
+                maxNs == other.maxNs && histogram.contentEquals(other.histogram)
+        }
+
+        override fun hashCode(): Int {
+            var result = stage.hashCode()
+            result = 31 * result + count.hashCode()
+            result = 31 * result + totalNs.hashCode()
+            result = 31 * result + maxNs.hashCode()
+            result = 31 * result + histogram.contentHashCode()
+            return result
+        }
+    }
+
+    data class Snapshot(val stages: List<StageStats>) {
+        operator fun get(stage: Stage): StageStats = stages[stage.ordinal]
+    }
+
+    @Volatile var enabled = false
+
+    private val stageCount = Stage.values().size
+    private val counts = AtomicLongArray(stageCount)
+    private val totals = AtomicLongArray(stageCount)
+    private val maxima = AtomicLongArray(stageCount)
+    private val buckets = AtomicLongArray(stageCount * HISTOGRAM_BUCKETS)
+
+    /** Returns a start timestamp, or 0 when profiling is disabled. */
+    fun start(): Long = if (enabled) System.nanoTime() else 0L
+
+    /** Records the time since startNs for stage; no-op if startNs came from a disabled [start]. */
+    fun stop(stage: Stage, startNs: Long) {
+        if (startNs == 0L) return
+        record(stage, System.nanoTime() - startNs)
+    }
+
+    /** Records an externally measured duration. */
+    fun record(stage: Stage, durationNs: Long) {
+        val index = stage.ordinal
+        val duration = durationNs.coerceAtLeast(0L)
+        counts.incrementAndGet(index)
+        totals.addAndGet(index, duration)
+        while (true) {
+            val max = maxima.get(index)
+            if (duration <= max || maxima.compareAndSet(index, max, duration)) break
+        }
+        buckets.incrementAndGet(index * HISTOGRAM_BUCKETS + bucketFor(duration))
+    }
+
+    fun snapshot(): Snapshot = Snapshot(Stage.values().map { stage ->
+        val index = stage.ordinal
+        StageStats(
+            stage = stage,
+            count = counts.get(index),
+            totalNs = totals.get(index),
+            maxNs = maxima.get(index),
+            histogram = LongArray(HISTOGRAM_BUCKETS) { buckets.get(index * HISTOGRAM_BUCKETS + it) }
+        )
+    })
+
+    fun reset() {
+        for (i in 0 until stageCount) {
+            counts.set(i, 0L)
+            totals.set(i, 0L)
+            maxima.set(i, 0L)
+        }
+        for (i in 0 until buckets.length()) buckets.set(i, 0L)
+    }
+
+    companion object {
+        /** 2^0 ns .. 2^32 ns (~4.3 s); longer durations land in the last bucket. */
+        const val HISTOGRAM_BUCKETS = 32
+
+        internal fun bucketFor(durationNs: Long): Int {
+            if (durationNs <= 1L) return 0
+            val bucket = 63 - java.lang.Long.numberOfLeadingZeros(durationNs)
+            return Math.min(bucket, HISTOGRAM_BUCKETS - 1)
+        }
+    }
+}
@@ -0,0 +1,135 @@
+package com.rokid.tuner
+
+import com.rokid.tuner.pitch.PitchDetector
+import kotlinx.coroutines.ExperimentalCoroutinesApi
+import kotlinx.coroutines.flow.flowOf
+import kotlinx.coroutines.flow.toList
+import kotlinx.coroutines.test.runTest
+import org.junit.Assert.*
+import org.junit.Before
+import org.junit.Test
+
+/**
+ * Unit tests for TunerPresenter.
+ * Tests quantisation, change detection, string caching and rate capping.
+ */
+@OptIn(ExperimentalCoroutinesApi::class)
+class TunerPresenterTest {
+
+    private lateinit var presenter: TunerPresenter
+
+    private fun status(result: PitchDetector.PitchResult) = when {
+        result.cents > 10f -> TunerViewModel.TuningStatus.SHARP
+        result.cents < -10f -> TunerViewModel.TuningStatus.FLAT
+        else -> TunerViewModel.TuningStatus.IN_TUNE
+    }
+
+    private fun detected(frequency: Double, cents: Float, note: String = "A") =
+        TunerViewModel.TuningState.Detected(PitchDetector.PitchResult(frequency, note, cents, 0.9f))
+
+    @Before
+    fun setUp() {
+        presenter = TunerPresenter(::status, frameIntervalMs = 16L)
+    }
+
+    // ========== Formatting tests ==========
+
+    @Test
+    fun `detected result is formatted to one decimal`() {
+        val display = presenter.present(detected(110.04, 3.16f))
+
+        assertEquals("A", display.noteName)
+        assertEquals("110.0 Hz", display.frequencyText)
+        assertEquals("+3.2", display.centsText)
+        assertEquals(TunerPresenter.Status.IN_TUNE, display.status)
+    }
+
+    @Test
+    fun `formatTenths handles signs and small magnitudes`() {
+        assertEquals("0.0", TunerPresenter.formatTenths(0))
+        assertEquals("-0.5", TunerPresenter.formatTenths(-5))
+        assertEquals("12.3", TunerPresenter.formatTenths(123))
+        assertEquals("-45.0", TunerPresenter.formatTenths(-450))
+    }
+
+    @Test
+    fun `cents that round to zero show no sign`() {
+        assertEquals("0.0", presenter.present(detected(110.0, -0.04f)).centsText)
+    }
+
+    @Test
+    fun `status follows the tuning status`() {
+        assertEquals(TunerPresenter.Status.SHARP, presenter.present(detected(112.0, 30f)).status)
+        assertEquals(TunerPresenter.Status.FLAT, presenter.present(detected(108.0, -30f)).status)
+    }
+
+    @Test
+    fun `non-detected states map to fixed displays`() {
+        assertSame(TunerPresenter.IDLE, presenter.present(TunerViewModel.TuningState.Idle))
+        assertSame(TunerPresenter.LISTENING, presenter.present(TunerViewModel.TuningState.Listening))
+
+        val error = presenter.present(TunerViewModel.TuningState.Error("Audio error"))
+        assertEquals(TunerPresenter.Status.ERROR, error.status)
+        assertEquals("Audio error", error.errorMessage)
+        assertSame(error, presenter.present(TunerViewModel.TuningState.Error("Audio error")))
+    }
+
+    // ========== Change detection tests ==========
+
+    @Test
+    fun `invisible changes return the previous instance`() {
+        val first = presenter.present(detected(110.01, 2.01f))
+
+        assertSame(first, presenter.present(detected(110.04, 1.99f)))
+    }
+
+    @Test
+    fun `visible changes produce a new state`() {
+        val first = presenter.present(detected(110.0, 2.0f))
+
+        assertNotSame(first, presenter.present(detected(110.1, 2.0f)))
+        assertNotEquals(first, presenter.present(detected(110.0, 2.0f, note = "A♯")))
+    }
+
+    @Test
+    fun `detected state after listening is rebuilt`() {
+        val first = presenter.present(detected(110.0, 2.0f))
+        presenter.present(TunerViewModel.TuningState.Listening)
+
+        assertEquals(first, presenter.present(detected(110.0, 2.0f)))
+    }
+
+    @Test
+    fun `recurring values reuse cached strings`() {
+        val first = presenter.present(detected(110.0, 2.0f))
+        presenter.present(detected(220.0, 5.0f))
+        val again = presenter.present(detected(110.0, 2.0f))
+
+        assertSame(first.frequencyText, again.frequencyText)
+        assertSame(first.centsText, again.centsText)
+    }
+
+    // ========== Flow tests ==========
+
+    @Test
+    fun `displayStates skips states without visible changes`() = runTest {
+        val states = flowOf(detected(110.01, 2.0f), detected(110.02, 2.0f), detected(110.03, 2.0f))
+
+        assertEquals(1, presenter.displayStates(states).toList().size)
+    }
+
+    @Test
+    fun `displayStates keeps only the newest state within a frame`() = runTest {
+        val states = flowOf(
+            TunerViewModel.TuningState.Listening,
+            detected(110.0, 1.0f),
+            detected(111.0, 2.0f),
+            detected(112.0, 3.0f)
+        )
+
+        val emitted = presenter.displayStates(states).toList()
+
+        assertEquals(listOf(TunerPresenter.LISTENING.status, TunerPresenter.Status.IN_TUNE), emitted.map { it.status })
+        assertEquals("112.0 Hz", emitted.last().frequencyText)
+    }
+}
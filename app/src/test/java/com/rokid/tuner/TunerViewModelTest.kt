@@ -1,10 +1,17 @@
 package com.rokid.tuner
 
 import androidx.arch.core.executor.testing.InstantTaskExecutorRule
+import com.rokid.tuner.audio.AudioConfig
+import com.rokid.tuner.audio.AudioFrame
+import com.rokid.tuner.audio.AudioSource
+import com.rokid.tuner.audio.DutyCycleScheduler
+import com.rokid.tuner.audio.ReplayAudioSource
 import com.rokid.tuner.constants.UiConstants
 import com.rokid.tuner.pitch.PitchDetector
+import com.rokid.tuner.profiling.StageProfiler
 import kotlinx.coroutines.Dispatchers
 import kotlinx.coroutines.ExperimentalCoroutinesApi
+import kotlinx.coroutines.test.StandardTestDispatcher
 import kotlinx.coroutines.test.UnconfinedTestDispatcher
 import kotlinx.coroutines.test.resetMain
 import kotlinx.coroutines.test.setMain
@@ -30,6 +37,9 @@ class TunerViewModelTest {
     val instantExecutorRule = InstantTaskExecutorRule()
 
     private val testDispatcher = UnconfinedTestDispatcher()
+    private val scheduler = testDispatcher.scheduler
+    // Queues the view model's coroutines, so tests step them through virtual time
+    private val loopDispatcher = StandardTestDispatcher(scheduler)
     private lateinit var viewModel: TunerViewModel
 
     @Before
@@ -430,4 +440,300 @@ class TunerViewModelTest {
         
         assertEquals(viewModel.getTuningStatus(result1), viewModel.getTuningStatus(result2))
     }
+
+    // ========== Replay source tests ==========
+
+    @Test
+    fun `replayed tone drives the pipeline to Detected`() {
+        val replay = replayViewModel(110.0)
+        replay.startTuning()
+
+        val detected = awaitDetected(replay)
+
+        assertEquals("A2", detected.result.noteName)
+        assertEquals(0f, detected.result.cents, 5f)
+        replay.stopTuning()
+    }
+
+    @Test
+    fun `replayed frames record end-to-end latency when profiling`() {
+        val replay = replayViewModel(196.0)
+        replay.setProfilingEnabled(true)
+        replay.startTuning()
+
+        awaitDetected(replay)
+        val endToEnd = replay.getProfileSnapshot()[StageProfiler.Stage.END_TO_END]
+        replay.stopTuning()
+
+        assertTrue(endToEnd.count > 0)
+        assertTrue("max ${endToEnd.maxNs} ns", endToEnd.maxNs < REPLAY_TIMEOUT_MS * 1_000_000L)
+        assertTrue(endToEnd.totalNs > 0)
+    }
+
+    @Test
+    fun `end-to-end latency is not recorded without profiling`() {
+        val replay = replayViewModel(196.0)
+        replay.startTuning()
+
+        awaitDetected(replay)
+        replay.stopTuning()
+
+        assertEquals(0L, replay.getProfileSnapshot()[StageProfiler.Stage.END_TO_END].count)
+    }
+
+    @Test
+    fun `startTuning asks the factory for a new source each time`() {
+        var created = 0
+        val replay = TunerViewModel {
+            created++
+            ReplayAudioSource(ShortArray(0), realTime = false)
+        }
+
+        replay.startTuning()
+        replay.stopTuning()
+        replay.startTuning()
+        replay.stopTuning()
+
+        assertEquals(2, created)
+    }
+
+    // ========== Warm restart tests ==========
+
+    @Test
+    fun `pauseTuning stops running but keeps the audio source`() {
+        val source = ScriptedSource()
+        var created = 0
+        val warm = TunerViewModel({ created++; source })
+
+        warm.startTuning()
+        warm.pauseTuning()
+
+        assertFalse(warm.isRunning.value)
+        assertEquals(TunerViewModel.TuningState.Idle, warm.tuningState.value)
+        assertEquals(1, source.pauses)
+        assertEquals(0, source.stops)
+
+        warm.startTuning()
+
+        assertTrue(warm.isRunning.value)
+        assertEquals(1, created)
+        assertEquals(2, source.starts)
+        warm.stopTuning()
+    }
+
+    @Test
+    fun `stopTuning after pauseTuning releases the source`() {
+        val source = ScriptedSource()
+        var created = 0
+        val warm = TunerViewModel({ created++; source })
+
+        warm.startTuning()
+        warm.pauseTuning()
+        warm.stopTuning()
+        warm.startTuning()
+
+        assertEquals(1, source.stops)
+        assertEquals(2, created)
+        warm.stopTuning()
+    }
+
+    @Test
+    fun `paused tuner is released after the warm restart timeout`() {
+        val source = ScriptedSource()
+        val warm = TunerViewModel({ source }, warmRestartTimeoutMs = 50L,
+            ioDispatcher = loopDispatcher, defaultDispatcher = loopDispatcher)
+
+        warm.startTuning()
+        scheduler.runCurrent()
+        warm.pauseTuning()
+
+        scheduler.advanceTimeBy(49L)
+        assertEquals(0, source.stops)
+        scheduler.advanceTimeBy(1L)
+        scheduler.runCurrent()
+        assertEquals(1, source.stops)
+    }
+
+    @Test
+    fun `first window after resume reports a note`() {
+        val source = ScriptedSource()
+        val warm = TunerViewModel({ source }, ioDispatcher = loopDispatcher, defaultDispatcher = loopDispatcher)
+        warm.startTuning()
+        scheduler.runCurrent()
+        warm.pauseTuning()
+
+        // Exactly one analysis window of audio after resuming
+        source.blocks += ReplayAudioSource.tone(110.0, AudioConfig.ANALYSIS_WINDOW_SIZE.toDouble() / AudioConfig.SAMPLE_RATE, harmonics = 4)
+        warm.startTuning()
+
+        assertEquals("A2", awaitDetected(warm).result.noteName)
+        warm.stopTuning()
+    }
+
+    @Test
+    fun `pauseTuning when not running does nothing`() {
+        val source = ScriptedSource()
+        val warm = TunerViewModel({ source })
+
+        warm.pauseTuning()
+        warm.startTuning()
+
+        assertEquals(1, source.starts)
+        assertEquals(0, source.pauses)
+        warm.stopTuning()
+    }
+
+    // ========== Strobe tests ==========
+
+    @Test
+    fun `initial strobeState is null`() {
+        assertNull(viewModel.strobeState.value)
+    }
+
+    @Test
+    fun `strobe follows the detected note`() {
+        val replay = replayViewModel(110.0)
+        replay.setStrobeEnabled(true)
+        replay.startTuning()
+
+        val strobe = awaitStrobe(replay)
+        replay.stopTuning()
+
+        assertEquals("A2", strobe.noteName)
+        assertEquals(0f, strobe.cents, 0.5f)
+        assertTrue("phase ${strobe.phase}", strobe.phase >= 0.0 && strobe.phase < 2 * Math.PI)
+    }
+
+    @Test
+    fun `strobe reads a detuned note to within half a cent`() {
+        // A whole number of periods per second, so the looped tone has no phase jump
+        val replay = replayViewModel(111.0)
+        replay.setStrobeEnabled(true)
+        replay.startTuning()
+
+        // Let the drift be fitted over a full history rather than the first readings
+        awaitStrobe(replay)
+        scheduler.advanceTimeBy(STROBE_SETTLE_MS)
+        scheduler.runCurrent()
+        val strobe = replay.strobeState.value
+        replay.stopTuning()
+
+        assertNotNull(strobe)
+        assertEquals("A2", strobe!!.noteName)
+        assertEquals(1200.0 * Math.log(111.0 / 110.0) / Math.log(2.0), strobe.cents.toDouble(), 0.5)
+    }
+
+    @Test
+    fun `strobe stays off unless enabled`() {
+        val replay = replayViewModel(110.0)
+        replay.startTuning()
+
+        awaitDetected(replay)
+        scheduler.advanceTimeBy(UiConstants.DISPLAY_FRAME_INTERVAL_MS * 4)
+        scheduler.runCurrent()
+
+        assertNull(replay.strobeState.value)
+        replay.stopTuning()
+    }
+
+    @Test
+    fun `disabling strobe mode clears the strobe`() {
+        val replay = replayViewModel(110.0)
+        replay.setStrobeEnabled(true)
+        replay.startTuning()
+        awaitStrobe(replay)
+
+        replay.setStrobeEnabled(false)
+
+        advanceUntil { replay.strobeState.value == null }
+        assertNull(replay.strobeState.value)
+        replay.stopTuning()
+    }
+
+    @Test
+    fun `stopTuning clears the strobe`() {
+        val replay = replayViewModel(110.0)
+        replay.setStrobeEnabled(true)
+        replay.startTuning()
+        awaitStrobe(replay)
+
+        replay.stopTuning()
+
+        assertNull(replay.strobeState.value)
+    }
+
+    private fun replayViewModel(frequency: Double): TunerViewModel = TunerViewModel(
+        {
+            // Looped and paced by the test scheduler, so the audio plays in virtual time
+            ReplayAudioSource(ReplayAudioSource.tone(frequency, 1.0, harmonics = 4), loop = true,
+                clock = { scheduler.currentTime * 1_000_000L })
+        },
+        ioDispatcher = loopDispatcher,
+        defaultDispatcher = loopDispatcher
+    )
+
+    private fun awaitDetected(viewModel: TunerViewModel): TunerViewModel.TuningState.Detected {
+        advanceUntil { viewModel.tuningState.value is TunerViewModel.TuningState.Detected }
+        return viewModel.tuningState.value as TunerViewModel.TuningState.Detected
+    }
+
+    /** Steps virtual time a display frame at a time until condition holds. */
+    private fun advanceUntil(condition: () -> Boolean) {
+        val deadline = scheduler.currentTime + REPLAY_TIMEOUT_MS
+        while (!condition()) {
+            check(scheduler.currentTime < deadline) { "Not reached within $REPLAY_TIMEOUT_MS ms of virtual time" }
+            scheduler.advanceTimeBy(UiConstants.DISPLAY_FRAME_INTERVAL_MS)
+            scheduler.runCurrent()
+        }
+    }
+
+    private fun awaitStrobe(viewModel: TunerViewModel): TunerViewModel.StrobeState {
+        advanceUntil { viewModel.strobeState.value != null }
+        return viewModel.strobeState.value!!
+    }
+
+    /** Plays queued PCM blocks once each, then reads nothing; counts lifecycle calls. */
+    private class ScriptedSource : AudioSource {
+        val blocks = java.util.concurrent.ConcurrentLinkedQueue<ShortArray>()
+        @Volatile var starts = 0
+        @Volatile var pauses = 0
+        @Volatile var stops = 0
+        @Volatile private var recording = false
+        private val frame = AudioFrame(AudioConfig.ANALYSIS_WINDOW_SIZE)
+
+        override fun start() {
+            starts++
+            recording = true
+        }
+
+        override fun readFrame(scheduler: DutyCycleScheduler?): AudioFrame? {
+            if (!recording) return null
+            val block = blocks.poll() ?: return null
+            if (scheduler != null && !scheduler.onBlock(block, block.size)) {
+                frame.markSkipped(scheduler.lastRms)
+            } else {
+                frame.fillFromPcm16(block, block.size)
+            }
+            frame.captureTimeNanos = System.nanoTime()
+            return frame
+        }
+
+        override fun pause() {
+            pauses++
+            recording = false
+        }
+
+        override fun stop() {
+            stops++
+            recording = false
+        }
+
+        override fun isRecording(): Boolean = recording
+    }
+
+    companion object {
+        private const val REPLAY_TIMEOUT_MS = 5000L
+        // Twice the audio the phase tracker fits its drift over
+        private const val STROBE_SETTLE_MS = 500L
+    }
 }
@@ -0,0 +1,180 @@
+package com.rokid.tuner.analysis
+
+import com.rokid.tuner.audio.AudioConfig
+import com.rokid.tuner.audio.AudioFrame
+import com.rokid.tuner.audio.SlidingWindowBuffer
+import com.rokid.tuner.constants.MusicalConstants
+import com.rokid.tuner.constants.UiConstants
+import com.rokid.tuner.pitch.NoteFinder
+import com.rokid.tuner.pitch.PitchDetector
+import java.io.File
+import java.io.IOException
+import java.util.Locale
+import java.util.concurrent.ExecutionException
+import java.util.concurrent.Executors
+import java.util.concurrent.atomic.AtomicInteger
+
+/**
+ * Runs WAV recordings through the same window/detector pipeline as the live tuner, off-device.
+ *
+ * Files are streamed hop by hop through [SlidingWindowBuffer] and [PitchDetector], so memory
+ * use per file is one analysis window plus the output track. Files are spread over a fixed
+ * thread pool; each worker owns its own detector and buffers, which are reset between files.
+ *
+ *     val results = BatchAnalyzer(threads = 8).analyzeFiles(takes)
+ *     results.forEach { println("${it.job.file.name}: ${it.summary?.accuracy}") }
+ *
+ * Recordings must be 16-bit PCM at [AudioConfig.SAMPLE_RATE]; other files are reported as
+ * failed rather than resampled.
+ */
+class BatchAnalyzer(
+    private val threads: Int = Runtime.getRuntime().availableProcessors(),
+    private val windowSize: Int = AudioConfig.ANALYSIS_WINDOW_SIZE,
+    private val hopSize: Int = AudioConfig.ANALYSIS_HOP_SIZE,
+    private val sensitivity: Int = UiConstants.DEFAULT_SENSITIVITY,
+    private val referenceFrequency: Double = AudioConfig.DEFAULT_REFERENCE_FREQUENCY,
+    private val detectorFactory: () -> PitchDetector = { PitchDetector() }
+) {
+
+    init {
+        require(threads > 0) { "threads must be positive" }
+        require(windowSize > 0 && hopSize > 0) { "windowSize and hopSize must be positive" }
+    }
+
+    /** One recording; expectedFrequency enables the accuracy fields of the summary. */
+    data class Job(
+        val file: File,
+        val expectedFrequency: Double? = expectedFrequencyFromName(file.name)
+    )
+
+    /** Track and summary for a job, or an error message if the file could not be read. */
+    data class FileResult(
+        val job: Job,
+        val track: PitchTrack?,
+        val summary: PitchTrack.Summary?,
+        val error: String?
+    )
+
+    fun analyzeFiles(files: List<File>): List<FileResult> = analyze(files.map { Job(it) })
+
+    /** Analyses all jobs in parallel; results are returned in job order. */
+    fun analyze(jobs: List<Job>): List<FileResult> {
+        if (jobs.isEmpty()) return emptyList()
+        val results = arrayOfNulls<FileResult>(jobs.size)
+        val next = AtomicInteger()
+        val workerCount = Math.min(threads, jobs.size)
+        val executor = Executors.newFixedThreadPool(workerCount)
+        try {
+            val futures = (0 until workerCount).map {
+                executor.submit(Runnable {
+                    val worker = Worker()
+                    while (true) {
+                        val index = next.getAndIncrement()
+                        if (index >= jobs.size) break
+                        results[index] = worker.analyze(jobs[index])
+                    }
+                })
+            }
+            for (future in futures) {
+                try {
+                    future.get()
+                } catch (e: ExecutionException) {
+                    throw e.cause ?: e
+                }
+            }
+        } finally {
+            executor.shutdownNow()
+        }
+        return results.map { it!! }
+    }
+
+    private inner class Worker {
+        private val detector = detectorFactory().apply {
+            setSensitivity(sensitivity)
+            setReferenceFrequency(referenceFrequency)
+        }
+        private val noteFinder = NoteFinder()
+        private val pcm = ShortArray(hopSize)
+        private val frame = AudioFrame(hopSize)
+        private val window = SlidingWindowBuffer(windowSize, hopSize, windowSize + hopSize)
+
+        fun analyze(job: Job): FileResult {
+            detector.reset()
+            window.clear()
+            return try {
+                WavReader.open(job.file).use { reader ->
+                    if (reader.sampleRate != AudioConfig.SAMPLE_RATE) {
+                        throw WavReader.WavFormatException(
+                            "Sample rate ${reader.sampleRate} Hz (detector expects ${AudioConfig.SAMPLE_RATE} Hz)")
+                    }
+                    val track = PitchTrack(reader.sampleRate, hopSize, windowSize, expectedFrames(reader.frameCount))
+                    while (true) {
+                        val count = reader.read(pcm, 0, hopSize)
+                        if (count < 0) break
+                        frame.fillFromPcm16(pcm, count)
+                        window.write(frame.samples, 0, frame.size)
+                        while (true) {
+                            val start = window.nextWindow()
+                            if (start < 0) break
+                            track.add(detector.detectPitch(window.buffer, start, windowSize))
+                        }
+                    }
+                    track.resolveNotes(noteFinder, referenceFrequency)
+                    FileResult(job, track, track.summarize(job.expectedFrequency), null)
+                }
+            } catch (e: IOException) {
+                FileResult(job, null, null, e.message ?: e.javaClass.simpleName)
+            }
+        }
+
+        private fun expectedFrames(sampleFrames: Long): Int {
+            if (sampleFrames < windowSize) return PitchTrack.DEFAULT_CAPACITY
+            return ((sampleFrames - windowSize) / hopSize + 1).coerceAtMost(Int.MAX_VALUE.toLong()).toInt()
+        }
+    }
+
+    companion object {
+        // Leading note name in a file name, e.g. "E2_take3.wav" or "A#2-low.wav"
+        private val NOTE_PREFIX = Regex("^([A-G])([#♯b♭]?)(-?\\d)")
+        private val NATURAL_NOTE_INDICES = mapOf('C' to 0, 'D' to 2, 'E' to 4, 'F' to 5, 'G' to 7, 'A' to 9, 'B' to 11)
+
+        /**
+         * Expected fundamental for a file named after its note in scientific pitch notation
+         * ("E2_take1.wav" -> 82.41 Hz), or null if the name does not start with a note.
+         */
+        fun expectedFrequencyFromName(
+            fileName: String,
+            referenceFrequency: Double = AudioConfig.DEFAULT_REFERENCE_FREQUENCY
+        ): Double? {
+            val match = NOTE_PREFIX.find(fileName) ?: return null
+            val (letter, accidental, octave) = match.destructured
+            var noteIndex = NATURAL_NOTE_INDICES.getValue(letter[0])
+            when (accidental) {
+                "#", "♯" -> noteIndex++
+                "b", "♭" -> noteIndex--
+            }
+            val midiNote = (octave.toInt() + 1) * MusicalConstants.NOTES_PER_OCTAVE + noteIndex
+            val semitones = midiNote - MusicalConstants.A4_MIDI_NOTE
+            return referenceFrequency * Math.pow(MusicalConstants.FREQUENCY_RATIO_BASE,
+                semitones / MusicalConstants.SEMITONES_PER_OCTAVE.toDouble())
+        }
+
+        /** Writes one tab-separated summary row per result. */
+        fun writeSummaryTsv(results: List<FileResult>, out: Appendable) {
+            out.append("file\tframes\tdetection_rate\tmedian_hz\tdominant_note\tmean_abs_cents\t" +
+                "cents_stddev\texpected_hz\taccuracy\toctave_error_rate\tmean_abs_error_cents\terror\n")
+            for (result in results) {
+                val s = result.summary
+                out.append(result.job.file.name).append('\t')
+                if (s == null) {
+                    out.append("\t\t\t\t\t\t\t\t\t\t").append(result.error ?: "").append('\n')
+                    continue
+                }
+                out.append(String.format(Locale.ROOT, "%d\t%.3f\t%.2f\t%s\t%.2f\t%.2f\t%s\t%.3f\t%.3f\t%.2f\t\n",
+                    s.frames, s.detectionRate, s.medianFrequency, s.dominantNote, s.meanAbsCents,
+                    s.centsStdDev, s.expectedFrequency?.let { String.format(Locale.ROOT, "%.2f", it) } ?: "",
+                    s.accuracy, s.octaveErrorRate, s.meanAbsErrorCents))
+            }
+        }
+    }
+}
@@ -0,0 +1,110 @@
+package com.rokid.tuner.analysis
+
+import org.junit.Assert.*
+import org.junit.Rule
+import org.junit.Test
+import org.junit.rules.TemporaryFolder
+import org.junit.runner.RunWith
+import org.robolectric.RobolectricTestRunner
+import org.robolectric.annotation.Config
+
+/**
+ * Unit tests for BatchAnalyzer.
+ * Tests end-to-end analysis of WAV files, parallel result ordering and error reporting.
+ */
+@RunWith(RobolectricTestRunner::class)
+@Config(manifest = Config.NONE, sdk = [28])
+class BatchAnalyzerTest {
+
+    @get:Rule
+    val tempFolder = TemporaryFolder()
+
+    // ========== Expected note parsing tests ==========
+
+    @Test
+    fun `expectedFrequencyFromName parses scientific pitch names`() {
+        assertEquals(82.41, BatchAnalyzer.expectedFrequencyFromName("E2_take1.wav")!!, 0.01)
+        assertEquals(440.0, BatchAnalyzer.expectedFrequencyFromName("A4.wav")!!, 0.001)
+        assertEquals(116.54, BatchAnalyzer.expectedFrequencyFromName("A#2-low.wav")!!, 0.01)
+        assertEquals(116.54, BatchAnalyzer.expectedFrequencyFromName("Bb2.wav")!!, 0.01)
+    }
+
+    @Test
+    fun `expectedFrequencyFromName returns null without a note prefix`() {
+        assertNull(BatchAnalyzer.expectedFrequencyFromName("take1.wav"))
+        assertNull(BatchAnalyzer.expectedFrequencyFromName("e2.wav"))
+    }
+
+    // ========== Analysis tests ==========
+
+    @Test
+    fun `analyze detects the note in each file in job order`() {
+        val files = listOf(
+            TestWav.write(tempFolder.newFile("A2_sine.wav"), TestWav.sine(110.0, 1.0)),
+            TestWav.write(tempFolder.newFile("E2_sine.wav"), TestWav.sine(82.41, 1.0)),
+            TestWav.write(tempFolder.newFile("A4_sine.wav"), TestWav.sine(440.0, 1.0))
+        )
+
+        val results = BatchAnalyzer(threads = 2).analyzeFiles(files)
+
+        assertEquals(files, results.map { it.job.file })
+        for (result in results) {
+            assertNull(result.error)
+            val summary = result.summary!!
+            assertTrue("${result.job.file.name} detection rate ${summary.detectionRate}", summary.detectionRate > 0.8)
+            assertTrue("${result.job.file.name} accuracy ${summary.accuracy}", summary.accuracy > 0.95)
+            assertEquals(result.job.expectedFrequency!!, summary.medianFrequency, result.job.expectedFrequency!! * 0.01)
+        }
+    }
+
+    @Test
+    fun `analyze produces one frame per hop`() {
+        val file = TestWav.write(tempFolder.newFile("A3.wav"), TestWav.sine(220.0, 0.5))
+
+        val track = BatchAnalyzer(threads = 1, windowSize = 2048, hopSize = 512).analyzeFiles(listOf(file))[0].track!!
+
+        assertEquals((22050 - 2048) / 512 + 1, track.size)
+    }
+
+    @Test
+    fun `analyze mixes stereo files down to mono`() {
+        val mono = TestWav.sine(196.0, 0.5)
+        val stereo = ShortArray(mono.size * 2) { mono[it / 2] }
+        val file = TestWav.write(tempFolder.newFile("G3_stereo.wav"), stereo, channels = 2)
+
+        val summary = BatchAnalyzer(threads = 1).analyzeFiles(listOf(file))[0].summary!!
+
+        assertEquals(196.0, summary.medianFrequency, 2.0)
+    }
+
+    @Test
+    fun `analyze reports unreadable files without failing the batch`() {
+        val good = TestWav.write(tempFolder.newFile("A2.wav"), TestWav.sine(110.0, 0.5))
+        val garbage = tempFolder.newFile("broken.wav").apply { writeBytes(ByteArray(100)) }
+        val wrongRate = TestWav.write(tempFolder.newFile("A2_48k.wav"), TestWav.sine(110.0, 0.5, sampleRate = 48000), sampleRate = 48000)
+
+        val results = BatchAnalyzer(threads = 3).analyzeFiles(listOf(good, garbage, wrongRate))
+
+        assertNull(results[0].error)
+        assertNotNull(results[1].error)
+        assertNull(results[1].summary)
+        assertTrue(results[2].error!!.contains("48000"))
+    }
+
+    @Test
+    fun `writeSummaryTsv writes one row per file`() {
+        val file = TestWav.write(tempFolder.newFile("A2.wav"), TestWav.sine(110.0, 0.5))
+        val garbage = tempFolder.newFile("broken.wav").apply { writeBytes(ByteArray(10)) }
+        val results = BatchAnalyzer(threads = 1).analyzeFiles(listOf(file, garbage))
+
+        val out = StringBuilder()
+        BatchAnalyzer.writeSummaryTsv(results, out)
+
+        val lines = out.toString().trim('\n').lines()
+        assertEquals(3, lines.size)
+        val columns = lines[0].split('\t').size
+        assertEquals(columns, lines[1].split('\t').size)
+        assertEquals(columns, lines[2].split('\t').size)
+        assertTrue(lines[1].startsWith("A2.wav\t"))
+    }
+}
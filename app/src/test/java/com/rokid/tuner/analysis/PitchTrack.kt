@@ -0,0 +1,165 @@
+package com.rokid.tuner.analysis
+
+import com.rokid.tuner.audio.AudioConfig
+import com.rokid.tuner.constants.MusicalConstants
+import com.rokid.tuner.pitch.NoteFinder
+import com.rokid.tuner.pitch.PitchDetector
+import java.util.Arrays
+import java.util.Locale
+
+/**
+ * Per-frame detector output for one recording, stored column-wise in primitive arrays.
+ *
+ * Frame i covers samples [i * hopSize, i * hopSize + windowSize). Frames where the detector
+ * returned null have frequency 0, probability 0 and note index [NoteFinder.INVALID_NOTE_INDEX].
+ * Note indices and cents are filled in by [resolveNotes] once the recording is complete.
+ */
+class PitchTrack(
+    val sampleRate: Int,
+    val hopSize: Int,
+    val windowSize: Int,
+    initialCapacity: Int = DEFAULT_CAPACITY
+) {
+
+    companion object {
+        const val DEFAULT_CAPACITY = 1024
+    }
+
+    /**
+     * Summary statistics for a track. Fields comparing against the expected note are NaN
+     * when no expected frequency was given or nothing was detected.
+     */
+    data class Summary(
+        val frames: Int,
+        val detectedFrames: Int,
+        /** Median detected frequency in Hz, or 0 if nothing was detected. */
+        val medianFrequency: Double,
+        /** Most frequent detected note, or "--". */
+        val dominantNote: String,
+        /** Mean absolute deviation from the nearest note, in cents. */
+        val meanAbsCents: Double,
+        val centsStdDev: Double,
+        val expectedFrequency: Double?,
+        /** Fraction of detected frames within 50 cents of the expected note. */
+        val accuracy: Double,
+        /** Fraction of detected frames within 50 cents of another octave of the expected note. */
+        val octaveErrorRate: Double,
+        /** Mean absolute error against the expected frequency over correct frames, in cents. */
+        val meanAbsErrorCents: Double
+    ) {
+        val detectionRate: Double get() = if (frames == 0) 0.0 else detectedFrames.toDouble() / frames
+    }
+
+    var size = 0
+        private set
+
+    private var frequencies = DoubleArray(initialCapacity.coerceAtLeast(1))
+    private var probabilities = FloatArray(frequencies.size)
+    private var cents = FloatArray(frequencies.size)
+    private var noteIndices = IntArray(frequencies.size)
+
+    fun add(result: PitchDetector.PitchResult?) {
+        if (size == frequencies.size) grow()
+        frequencies[size] = result?.frequency ?: 0.0
+        probabilities[size] = result?.probability ?: 0f
+        size++
+    }
+
+    /** Maps every frame to a MIDI note index and cents with one batch lookup. */
+    fun resolveNotes(noteFinder: NoteFinder, referenceFrequency: Double = AudioConfig.DEFAULT_REFERENCE_FREQUENCY) {
+        noteFinder.findNotes(frequencies, size, noteIndices, cents, referenceFrequency)
+    }
+
+    /** Centre of frame i in seconds. */
+    fun timeSeconds(i: Int): Double = (i.toLong() * hopSize + windowSize / 2).toDouble() / sampleRate
+
+    fun frequency(i: Int): Double = frequencies[i]
+
+    fun probability(i: Int): Float = probabilities[i]
+
+    fun cents(i: Int): Float = cents[i]
+
+    fun noteIndex(i: Int): Int = noteIndices[i]
+
+    /** Writes one tab-separated row per frame: time, frequency, note, cents, probability. */
+    fun writeTsv(out: Appendable) {
+        out.append("time_s\tfrequency_hz\tnote\tcents\tprobability\n")
+        for (i in 0 until size) {
+            out.append(String.format(Locale.ROOT, "%.3f\t%.2f\t%s\t%.1f\t%.3f\n",
+                timeSeconds(i), frequencies[i], NoteFinder.noteName(noteIndices[i]), cents[i], probabilities[i]))
+        }
+    }
+
+    fun summarize(expectedFrequency: Double? = null): Summary {
+        val detected = DoubleArray(size)
+        val noteCounts = IntArray(MusicalConstants.MIDI_NOTE_COUNT)
+        var detectedCount = 0
+        var sumAbsCents = 0.0
+        var sumCents = 0.0
+        var sumSquaredCents = 0.0
+        var correct = 0
+        var octaveErrors = 0
+        var sumAbsError = 0.0
+
+        for (i in 0 until size) {
+            val frequency = frequencies[i]
+            if (frequency <= 0.0) continue
+            detected[detectedCount++] = frequency
+            val note = noteIndices[i]
+            if (note != NoteFinder.INVALID_NOTE_INDEX) noteCounts[note]++
+            val c = cents[i].toDouble()
+            sumAbsCents += Math.abs(c)
+            sumCents += c
+            sumSquaredCents += c * c
+
+            if (expectedFrequency != null) {
+                val error = NoteFinder.frequencyToCents(frequency, expectedFrequency).toDouble()
+                val octaves = Math.round(error / MusicalConstants.CENTS_PER_OCTAVE)
+                val residual = error - octaves * MusicalConstants.CENTS_PER_OCTAVE
+                if (Math.abs(residual) <= AudioConfig.MAX_CENTS_DEVIATION) {
+                    if (octaves == 0L) {
+                        correct++
+                        sumAbsError += Math.abs(error)
+                    } else {
+                        octaveErrors++
+                    }
+                }
+            }
+        }
+
+        var dominant = NoteFinder.INVALID_NOTE_INDEX
+        for (note in noteCounts.indices) {
+            if (noteCounts[note] > 0 && (dominant < 0 || noteCounts[note] > noteCounts[dominant])) dominant = note
+        }
+
+        val median = if (detectedCount == 0) 0.0 else {
+            Arrays.sort(detected, 0, detectedCount)
+            if (detectedCount % 2 == 1) detected[detectedCount / 2]
+            else (detected[detectedCount / 2 - 1] + detected[detectedCount / 2]) / 2.0
+        }
+        val meanCents = if (detectedCount == 0) Double.NaN else sumCents / detectedCount
+        val hasExpected = expectedFrequency != null && detectedCount > 0
+
+        return Summary(
+            frames = size,
+            detectedFrames = detectedCount,
+            medianFrequency = median,
+            dominantNote = NoteFinder.noteName(dominant),
+            meanAbsCents = if (detectedCount == 0) Double.NaN else sumAbsCents / detectedCount,
+            centsStdDev = if (detectedCount == 0) Double.NaN
+                else Math.sqrt(Math.max(0.0, sumSquaredCents / detectedCount - meanCents * meanCents)),
+            expectedFrequency = expectedFrequency,
+            accuracy = if (hasExpected) correct.toDouble() / detectedCount else Double.NaN,
+            octaveErrorRate = if (hasExpected) octaveErrors.toDouble() / detectedCount else Double.NaN,
+            meanAbsErrorCents = if (hasExpected && correct > 0) sumAbsError / correct else Double.NaN
+        )
+    }
+
+    private fun grow() {
+        val capacity = frequencies.size * 2
+        frequencies = frequencies.copyOf(capacity)
+        probabilities = probabilities.copyOf(capacity)
+        cents = cents.copyOf(capacity)
+        noteIndices = noteIndices.copyOf(capacity)
+    }
+}
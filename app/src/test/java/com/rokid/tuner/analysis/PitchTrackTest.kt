@@ -0,0 +1,97 @@
+package com.rokid.tuner.analysis
+
+import com.rokid.tuner.pitch.NoteFinder
+import com.rokid.tuner.pitch.PitchDetector
+import org.junit.Assert.*
+import org.junit.Test
+
+/**
+ * Unit tests for PitchTrack.
+ * Tests frame storage, note resolution, TSV output and summary statistics.
+ */
+class PitchTrackTest {
+
+    private fun track(vararg frequencies: Double): PitchTrack {
+        val track = PitchTrack(sampleRate = 44100, hopSize = 512, windowSize = 2048, initialCapacity = 2)
+        for (frequency in frequencies) {
+            track.add(if (frequency > 0.0) PitchDetector.PitchResult(frequency, "", 0f, 0.9f) else null)
+        }
+        track.resolveNotes(NoteFinder())
+        return track
+    }
+
+    // ========== Storage tests ==========
+
+    @Test
+    fun `stores frames beyond initial capacity`() {
+        val track = track(110.0, 0.0, 220.0, 440.0, 880.0)
+
+        assertEquals(5, track.size)
+        assertEquals(880.0, track.frequency(4), 0.0)
+        assertEquals(0f, track.probability(1), 0f)
+        assertEquals(0.9f, track.probability(0), 0f)
+    }
+
+    @Test
+    fun `resolveNotes fills note indices and cents`() {
+        val track = track(440.0, 0.0, 440.0 * Math.pow(2.0, 10.0 / 1200.0))
+
+        assertEquals(69, track.noteIndex(0))
+        assertEquals(NoteFinder.INVALID_NOTE_INDEX, track.noteIndex(1))
+        assertEquals(10f, track.cents(2), 0.01f)
+    }
+
+    @Test
+    fun `timeSeconds returns window centre`() {
+        val track = track(440.0, 440.0)
+
+        assertEquals(1024.0 / 44100, track.timeSeconds(0), 1e-9)
+        assertEquals((512.0 + 1024.0) / 44100, track.timeSeconds(1), 1e-9)
+    }
+
+    @Test
+    fun `writeTsv writes header and one row per frame`() {
+        val out = StringBuilder()
+        track(440.0, 0.0).writeTsv(out)
+
+        val lines = out.toString().trim().lines()
+        assertEquals(3, lines.size)
+        assertTrue(lines[0].startsWith("time_s"))
+        assertTrue(lines[1].contains("\t440.00\tA4\t"))
+        assertTrue(lines[2].contains("\t--\t"))
+    }
+
+    // ========== Summary tests ==========
+
+    @Test
+    fun `summarize reports detection rate median and dominant note`() {
+        val summary = track(440.0, 0.0, 441.0, 439.0, 880.0).summarize()
+
+        assertEquals(5, summary.frames)
+        assertEquals(4, summary.detectedFrames)
+        assertEquals(0.8, summary.detectionRate, 1e-9)
+        assertEquals(440.5, summary.medianFrequency, 1e-9)
+        assertEquals("A4", summary.dominantNote)
+        assertTrue(summary.accuracy.isNaN())
+    }
+
+    @Test
+    fun `summarize counts correct frames and octave errors against expected note`() {
+        val summary = track(440.0, 445.0, 880.0, 220.0, 500.0).summarize(expectedFrequency = 440.0)
+
+        assertEquals(0.4, summary.accuracy, 1e-9)
+        assertEquals(0.4, summary.octaveErrorRate, 1e-9)
+        // Mean of 0 and 19.56 cents
+        assertEquals(9.78, summary.meanAbsErrorCents, 0.05)
+    }
+
+    @Test
+    fun `summarize handles empty tracks`() {
+        val summary = track(0.0, 0.0).summarize(expectedFrequency = 440.0)
+
+        assertEquals(0, summary.detectedFrames)
+        assertEquals(0.0, summary.medianFrequency, 0.0)
+        assertEquals("--", summary.dominantNote)
+        assertTrue(summary.accuracy.isNaN())
+    }
+}
@@ -0,0 +1,72 @@
+package com.rokid.tuner.analysis
+
+import com.rokid.tuner.audio.AudioConfig
+import java.io.ByteArrayOutputStream
+import java.io.File
+
+/**
+ * Builds small WAV files for the analysis tests.
+ */
+object TestWav {
+
+    fun sine(frequency: Double, seconds: Double, amplitude: Double = 0.5, sampleRate: Int = AudioConfig.SAMPLE_RATE): ShortArray {
+        val omega = 2.0 * Math.PI * frequency / sampleRate
+        return ShortArray((seconds * sampleRate).toInt()) {
+            (amplitude * Short.MAX_VALUE * Math.sin(omega * it)).toInt().toShort()
+        }
+    }
+
+    /**
+     * Encodes interleaved 16-bit samples. extraChunk inserts an unrelated chunk before "data";
+     * dataSizeOverride replaces the declared data size (e.g. 0 for streamed files).
+     */
+    fun bytes(
+        samples: ShortArray,
+        channels: Int = 1,
+        sampleRate: Int = AudioConfig.SAMPLE_RATE,
+        bitsPerSample: Int = 16,
+        extraChunk: Boolean = false,
+        dataSizeOverride: Int? = null
+    ): ByteArray {
+        val out = ByteArrayOutputStream()
+        val dataSize = samples.size * 2
+        val blockAlign = channels * bitsPerSample / 8
+        out.writeTag("RIFF")
+        out.writeIntLE(36 + dataSize + if (extraChunk) 12 else 0)
+        out.writeTag("WAVE")
+        out.writeTag("fmt ")
+        out.writeIntLE(16)
+        out.writeShortLE(1)
+        out.writeShortLE(channels)
+        out.writeIntLE(sampleRate)
+        out.writeIntLE(sampleRate * blockAlign)
+        out.writeShortLE(blockAlign)
+        out.writeShortLE(bitsPerSample)
+        if (extraChunk) {
+            out.writeTag("LIST")
+            out.writeIntLE(3)
+            out.write(byteArrayOf(1, 2, 3, 0))  // odd size plus pad byte
+        }
+        out.writeTag("data")
+        out.writeIntLE(dataSizeOverride ?: dataSize)
+        for (sample in samples) out.writeShortLE(sample.toInt())
+        return out.toByteArray()
+    }
+
+    fun write(file: File, samples: ShortArray, channels: Int = 1, sampleRate: Int = AudioConfig.SAMPLE_RATE): File {
+        file.writeBytes(bytes(samples, channels, sampleRate))
+        return file
+    }
+
+    private fun ByteArrayOutputStream.writeTag(tag: String) = write(tag.toByteArray(Charsets.US_ASCII))
+
+    private fun ByteArrayOutputStream.writeShortLE(value: Int) {
+        write(value and 0xFF)
+        write((value shr 8) and 0xFF)
+    }
+
+    private fun ByteArrayOutputStream.writeIntLE(value: Int) {
+        writeShortLE(value and 0xFFFF)
+        writeShortLE((value shr 16) and 0xFFFF)
+    }
+}
@@ -0,0 +1,63 @@
+package com.rokid.tuner.analysis
+
+import org.junit.Assume.assumeTrue
+import org.junit.Test
+import java.io.File
+
+/**
+ * Command-line style entry point for offline analysis, run through Gradle so the detector
+ * sees the same classpath as the unit tests:
+ *
+ *     ./gradlew :app:testDebugUnitTest --tests '*WavBatchRunner' -Ptuner.analysis.input=/path/to/takes
+ *
+ * The input may be a single WAV file or a directory (searched recursively). Per-file tracks,
+ * laid out in the input's subdirectories, and summary.tsv are written to
+ * tuner.analysis.output (default app/build/analysis); set tuner.analysis.threads to limit
+ * parallelism. Skipped when no input is given.
+ */
+class WavBatchRunner {
+
+    companion object {
+        private const val INPUT_PROPERTY = "tuner.analysis.input"
+        private const val OUTPUT_PROPERTY = "tuner.analysis.output"
+        private const val THREADS_PROPERTY = "tuner.analysis.threads"
+        private const val DEFAULT_OUTPUT_DIR = "build/analysis"
+    }
+
+    @Test
+    fun `analyse WAV recordings`() {
+        val inputPath = System.getProperty(INPUT_PROPERTY)
+        assumeTrue("Offline analysis disabled; run with -P$INPUT_PROPERTY=<file or directory>", !inputPath.isNullOrEmpty())
+
+        val input = File(inputPath!!)
+        val files = if (input.isDirectory) {
+            input.walkTopDown().filter { it.isFile && it.extension.equals("wav", ignoreCase = true) }.sorted().toList()
+        } else {
+            listOf(input)
+        }
+        val outputDir = File(System.getProperty(OUTPUT_PROPERTY) ?: DEFAULT_OUTPUT_DIR)
+        outputDir.mkdirs()
+        val threads = System.getProperty(THREADS_PROPERTY)?.toIntOrNull() ?: Runtime.getRuntime().availableProcessors()
+
+        val start = System.nanoTime()
+        val results = BatchAnalyzer(threads = threads).analyzeFiles(files)
+        val elapsedMs = (System.nanoTime() - start) / 1_000_000
+
+        // Named by path under the input, so takes with the same name in different
+        // directories do not overwrite each other's track
+        val root = if (input.isDirectory) input.absoluteFile else input.absoluteFile.parentFile
+        for (result in results) {
+            val track = result.track ?: continue
+            val relative = result.job.file.absoluteFile.relativeTo(root)
+            val trackFile = File(outputDir, relative.path).resolveSibling(relative.nameWithoutExtension + ".tsv")
+            trackFile.parentFile.mkdirs()
+            trackFile.bufferedWriter().use { track.writeTsv(it) }
+        }
+        val summary = StringBuilder()
+        BatchAnalyzer.writeSummaryTsv(results, summary)
+        File(outputDir, "summary.tsv").writeText(summary.toString())
+
+        println(summary)
+        println("Analysed ${files.size} files in $elapsedMs ms on $threads threads; output in ${outputDir.absolutePath}")
+    }
+}
@@ -0,0 +1,180 @@
+package com.rokid.tuner.analysis
+
+import java.io.BufferedInputStream
+import java.io.Closeable
+import java.io.EOFException
+import java.io.File
+import java.io.FileInputStream
+import java.io.IOException
+import java.io.InputStream
+
+/**
+ * Streaming reader for 16-bit PCM WAV files.
+ *
+ * Only the header is parsed up front; [read] then pulls samples through a fixed-size byte
+ * buffer, so memory use does not depend on file length. Multi-channel files are mixed
+ * down to mono by averaging channels.
+ */
+class WavReader(stream: InputStream) : Closeable {
+
+    class WavFormatException(message: String) : IOException(message)
+
+    companion object {
+        private const val WAVE_FORMAT_PCM = 1
+        private const val WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+        private const val SUPPORTED_BITS_PER_SAMPLE = 16
+        private const val READ_CHUNK_FRAMES = 4096
+        // Data size written by recorders that stream without seeking back to the header
+        private const val UNKNOWN_DATA_SIZE = 0xFFFFFFFFL
+
+        fun open(file: File): WavReader {
+            val stream = FileInputStream(file)
+            try {
+                return WavReader(stream)
+            } catch (e: IOException) {
+                stream.close()
+                throw e
+            }
+        }
+    }
+
+    private val input: InputStream = if (stream is BufferedInputStream) stream else BufferedInputStream(stream)
+
+    val sampleRate: Int
+    val channels: Int
+    val bitsPerSample: Int
+
+    /** Samples per channel declared by the data chunk, or -1 if the header does not say. */
+    val frameCount: Long
+
+    private val blockAlign: Int
+    private var remainingBytes: Long
+    private val byteBuffer: ByteArray
+
+    init {
+        if (readTag() != "RIFF") throw WavFormatException("Not a RIFF file")
+        readIntLE()
+        if (readTag() != "WAVE") throw WavFormatException("Not a WAVE file")
+
+        var format = -1
+        var channelCount = 0
+        var rate = 0
+        var bits = 0
+        var align = 0
+        var dataSize = -1L
+        while (dataSize < 0) {
+            val chunkId = readTag()
+            val chunkSize = readIntLE().toLong() and 0xFFFFFFFFL
+            when (chunkId) {
+                "fmt " -> {
+                    format = readShortLE()
+                    channelCount = readShortLE()
+                    rate = readIntLE()
+                    readIntLE()  // byte rate
+                    align = readShortLE()
+                    bits = readShortLE()
+                    skipFully(chunkSize - 16 + (chunkSize and 1))
+                }
+                "data" -> {
+                    if (format < 0) throw WavFormatException("data chunk before fmt chunk")
+                    dataSize = chunkSize
+                }
+                else -> skipFully(chunkSize + (chunkSize and 1))
+            }
+        }
+
+        if (format != WAVE_FORMAT_PCM && format != WAVE_FORMAT_EXTENSIBLE) {
+            throw WavFormatException("Unsupported WAV format $format (PCM only)")
+        }
+        if (bits != SUPPORTED_BITS_PER_SAMPLE) {
+            throw WavFormatException("Unsupported bit depth $bits (16-bit only)")
+        }
+        if (channelCount <= 0 || align != channelCount * bits / 8) {
+            throw WavFormatException("Invalid channel layout ($channelCount channels, block align $align)")
+        }
+
+        sampleRate = rate
+        channels = channelCount
+        bitsPerSample = bits
+        blockAlign = align
+        val sizeKnown = dataSize != 0L && dataSize != UNKNOWN_DATA_SIZE
+        remainingBytes = if (sizeKnown) dataSize else Long.MAX_VALUE
+        frameCount = if (sizeKnown) dataSize / align else -1L
+        byteBuffer = ByteArray(READ_CHUNK_FRAMES * align)
+    }
+
+    /**
+     * Reads up to length mono samples into dest[offset until offset + length].
+     * Returns the number of samples read, or -1 at the end of the data chunk.
+     */
+    fun read(dest: ShortArray, offset: Int = 0, length: Int = dest.size - offset): Int {
+        if (remainingBytes < blockAlign) return -1
+        var framesWanted = Math.min(length, READ_CHUNK_FRAMES)
+        framesWanted = Math.min(framesWanted.toLong(), remainingBytes / blockAlign).toInt()
+        if (framesWanted <= 0) return 0
+
+        var bytesRead = 0
+        val bytesWanted = framesWanted * blockAlign
+        while (bytesRead < bytesWanted) {
+            val n = input.read(byteBuffer, bytesRead, bytesWanted - bytesRead)
+            if (n < 0) break
+            bytesRead += n
+        }
+        // A truncated file ends at the last complete sample frame
+        val frames = bytesRead / blockAlign
+        remainingBytes = if (bytesRead < bytesWanted) 0L else remainingBytes - bytesRead
+        if (frames == 0) return -1
+
+        val bytes = byteBuffer
+        if (channels == 1) {
+            for (i in 0 until frames) {
+                val b = i * 2
+                dest[offset + i] = ((bytes[b].toInt() and 0xFF) or (bytes[b + 1].toInt() shl 8)).toShort()
+            }
+        } else {
+            for (i in 0 until frames) {
+                var sum = 0
+                var b = i * blockAlign
+                for (c in 0 until channels) {
+                    sum += (bytes[b].toInt() and 0xFF) or (bytes[b + 1].toInt() shl 8)
+                    b += 2
+                }
+                dest[offset + i] = (sum / channels).toShort()
+            }
+        }
+        return frames
+    }
+
+    override fun close() {
+        input.close()
+    }
+
+    private fun readTag(): String {
+        val tag = CharArray(4)
+        for (i in 0 until 4) tag[i] = readByte().toChar()
+        return String(tag)
+    }
+
+    private fun readShortLE(): Int = readByte() or (readByte() shl 8)
+
+    private fun readIntLE(): Int = readByte() or (readByte() shl 8) or (readByte() shl 16) or (readByte() shl 24)
+
+    private fun readByte(): Int {
+        val b = input.read()
+        if (b < 0) throw EOFException("Unexpected end of WAV header")
+        return b
+    }
+
+    private fun skipFully(count: Long) {
+        var remaining = count
+        while (remaining > 0) {
+            val skipped = input.skip(remaining)
+            if (skipped <= 0) {
+                readByte()
+                remaining--
+            } else {
+                remaining -= skipped
+            }
+        }
+    }
+}
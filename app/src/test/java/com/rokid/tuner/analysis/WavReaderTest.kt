@@ -0,0 +1,104 @@
+package com.rokid.tuner.analysis
+
+import org.junit.Assert.*
+import org.junit.Test
+import java.io.ByteArrayInputStream
+
+/**
+ * Unit tests for WavReader.
+ * Tests header parsing, streaming reads, channel mixdown and format validation.
+ */
+class WavReaderTest {
+
+    private fun reader(bytes: ByteArray) = WavReader(ByteArrayInputStream(bytes))
+
+    private fun readAll(reader: WavReader, chunk: Int = 256): ShortArray {
+        val out = mutableListOf<Short>()
+        val buffer = ShortArray(chunk)
+        while (true) {
+            val n = reader.read(buffer)
+            if (n < 0) break
+            for (i in 0 until n) out.add(buffer[i])
+        }
+        return out.toShortArray()
+    }
+
+    // ========== Header tests ==========
+
+    @Test
+    fun `parses format fields`() {
+        val reader = reader(TestWav.bytes(ShortArray(100), channels = 2, sampleRate = 48000))
+
+        assertEquals(48000, reader.sampleRate)
+        assertEquals(2, reader.channels)
+        assertEquals(16, reader.bitsPerSample)
+        assertEquals(50L, reader.frameCount)
+    }
+
+    @Test
+    fun `skips unknown chunks before data`() {
+        val samples = shortArrayOf(1, -2, 3, -4)
+        val reader = reader(TestWav.bytes(samples, extraChunk = true))
+
+        assertArrayEquals(samples, readAll(reader))
+    }
+
+    @Test(expected = WavReader.WavFormatException::class)
+    fun `rejects non RIFF input`() {
+        reader(ByteArray(64))
+    }
+
+    @Test(expected = WavReader.WavFormatException::class)
+    fun `rejects 8 bit files`() {
+        reader(TestWav.bytes(ShortArray(10), bitsPerSample = 8))
+    }
+
+    @Test(expected = java.io.EOFException::class)
+    fun `rejects truncated header`() {
+        reader(TestWav.bytes(ShortArray(10)).copyOf(30))
+    }
+
+    // ========== Streaming read tests ==========
+
+    @Test
+    fun `reads mono samples in small chunks`() {
+        val samples = ShortArray(1000) { (it * 7 - 3000).toShort() }
+        val reader = reader(TestWav.bytes(samples))
+
+        assertArrayEquals(samples, readAll(reader, chunk = 37))
+    }
+
+    @Test
+    fun `averages stereo channels`() {
+        val interleaved = shortArrayOf(100, 300, -1000, -2000, Short.MAX_VALUE, Short.MAX_VALUE)
+        val reader = reader(TestWav.bytes(interleaved, channels = 2))
+
+        assertArrayEquals(shortArrayOf(200, -1500, Short.MAX_VALUE), readAll(reader))
+    }
+
+    @Test
+    fun `returns -1 at end of data`() {
+        val reader = reader(TestWav.bytes(shortArrayOf(5, 6)))
+        val buffer = ShortArray(8)
+
+        assertEquals(2, reader.read(buffer))
+        assertEquals(-1, reader.read(buffer))
+    }
+
+    @Test
+    fun `stops at last complete sample of truncated data`() {
+        val bytes = TestWav.bytes(ShortArray(10) { it.toShort() })
+        val reader = reader(bytes.copyOf(bytes.size - 3))
+
+        assertEquals(8, readAll(reader).size)
+    }
+
+    @Test
+    fun `reads to end of stream when data size is unknown`() {
+        val samples = ShortArray(300) { it.toShort() }
+        val reader = reader(TestWav.bytes(samples, dataSizeOverride = 0))
+
+        assertEquals(-1L, reader.frameCount)
+        assertArrayEquals(samples, readAll(reader))
+    }
+}
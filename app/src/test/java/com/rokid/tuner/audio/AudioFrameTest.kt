@@ -0,0 +1,119 @@
+package com.rokid.tuner.audio
+
+import org.junit.Assert.*
+import org.junit.Test
+
+/**
+ * Unit tests for AudioFrame.
+ * Tests single-pass PCM conversion and statistics.
+ */
+class AudioFrameTest {
+
+    @Test
+    fun `new frame is empty`() {
+        val frame = AudioFrame(256)
+
+        assertEquals(0, frame.size)
+        assertEquals(256, frame.capacity)
+        assertEquals(0.0, frame.rms, 0.0)
+    }
+
+    @Test
+    fun `fillFromPcm16 converts samples to normalised floats`() {
+        val frame = AudioFrame(4)
+        frame.fillFromPcm16(shortArrayOf(0, Short.MAX_VALUE, (-16384).toShort(), 16384), 4)
+
+        assertEquals(4, frame.size)
+        assertEquals(0f, frame.samples[0], 1e-6f)
+        assertEquals(1f, frame.samples[1], 1e-6f)
+        assertEquals(-0.5f, frame.samples[2], 1e-4f)
+        assertEquals(0.5f, frame.samples[3], 1e-4f)
+    }
+
+    @Test
+    fun `fillFromPcm16 computes statistics in the same pass`() {
+        val frame = AudioFrame(4)
+        frame.fillFromPcm16(shortArrayOf(100, -300, 200, -400), 4)
+
+        assertEquals(400, frame.peakAmplitude)
+        assertEquals(250.0, frame.averageAmplitude, 1e-9)
+        val expectedRms = Math.sqrt((100.0 * 100 + 300.0 * 300 + 200.0 * 200 + 400.0 * 400) / 4) / Short.MAX_VALUE
+        assertEquals(expectedRms, frame.rms, 1e-12)
+    }
+
+    @Test
+    fun `rms matches float domain computation`() {
+        val pcm = ShortArray(1024) { i -> (8000 * Math.sin(2 * Math.PI * i / 64.0)).toInt().toShort() }
+        val frame = AudioFrame(1024)
+        frame.fillFromPcm16(pcm, pcm.size)
+
+        var sum = 0.0
+        for (i in 0 until frame.size) sum += frame.samples[i] * frame.samples[i]
+        assertEquals(Math.sqrt(sum / frame.size), frame.rms, 1e-6)
+    }
+
+    @Test
+    fun `partial read only exposes valid samples`() {
+        val frame = AudioFrame(8)
+        frame.fillFromPcm16(ShortArray(8) { 1000.toShort() }, 8)
+        frame.fillFromPcm16(ShortArray(8) { 2000.toShort() }, 3)
+
+        assertEquals(3, frame.size)
+        assertEquals(3, frame.copySamples().size)
+        assertEquals(2000, frame.peakAmplitude)
+    }
+
+    @Test
+    fun `fillFromPcm16 reuses the same backing array`() {
+        val frame = AudioFrame(16)
+        val backing = frame.samples
+        frame.fillFromPcm16(ShortArray(16) { 10.toShort() }, 16)
+        frame.fillFromPcm16(ShortArray(16) { 20.toShort() }, 16)
+
+        assertSame(backing, frame.samples)
+    }
+
+    @Test
+    fun `count larger than capacity is clamped`() {
+        val frame = AudioFrame(4)
+        frame.fillFromPcm16(ShortArray(10) { 5.toShort() }, 10)
+
+        assertEquals(4, frame.size)
+    }
+
+    @Test
+    fun `zero count yields zero statistics`() {
+        val frame = AudioFrame(4)
+        frame.fillFromPcm16(ShortArray(4), 0)
+
+        assertEquals(0, frame.size)
+        assertEquals(0.0, frame.rms, 0.0)
+        assertEquals(0.0, frame.averageAmplitude, 0.0)
+    }
+
+    @Test
+    fun `markSkipped empties the frame but keeps the rms`() {
+        val frame = AudioFrame(4)
+        frame.fillFromPcm16(shortArrayOf(100, -300, 200, -400), 4)
+
+        frame.markSkipped(0.002)
+
+        assertEquals(0, frame.size)
+        assertEquals(0.002, frame.rms, 0.0)
+        assertEquals(0, frame.peakAmplitude)
+        assertEquals(0.0, frame.averageAmplitude, 0.0)
+    }
+
+    @Test
+    fun `capture time defaults to zero and survives refills`() {
+        val frame = AudioFrame(4)
+        assertEquals(0L, frame.captureTimeNanos)
+
+        frame.captureTimeNanos = 12345L
+        frame.fillFromPcm16(shortArrayOf(1, 2, 3, 4), 4)
+        frame.fillFrom(floatArrayOf(0.1f, 0.2f), 0, 2)
+        frame.markSkipped(0.0)
+
+        assertEquals(12345L, frame.captureTimeNanos)
+    }
+}
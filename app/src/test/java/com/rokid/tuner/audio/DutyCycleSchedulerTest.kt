@@ -0,0 +1,110 @@
+package com.rokid.tuner.audio
+
+import org.junit.Assert.*
+import org.junit.Before
+import org.junit.Test
+
+/**
+ * Unit tests for DutyCycleScheduler.
+ * Tests the raw-PCM energy gate, progressive back-off, onset recovery and time accounting.
+ */
+class DutyCycleSchedulerTest {
+
+    private val blockSize = 4410  // 100 ms at 44.1 kHz
+    private val silent = ShortArray(blockSize)
+    private val loud = ShortArray(blockSize) { (if (it % 2 == 0) 3000 else -3000).toShort() }
+
+    private lateinit var scheduler: DutyCycleScheduler
+
+    @Before
+    fun setUp() {
+        scheduler = DutyCycleScheduler(rmsThreshold = 0.01, backoffBlocks = 2, maxStride = 4)
+    }
+
+    // ========== Gating tests ==========
+
+    @Test
+    fun `loud block is analysed`() {
+        assertTrue(scheduler.onBlock(loud, blockSize))
+        assertEquals(DutyCycleScheduler.State.ACTIVE, scheduler.state)
+        assertEquals(3000.0 / Short.MAX_VALUE, scheduler.lastRms, 1e-9)
+    }
+
+    @Test
+    fun `silent block is skipped`() {
+        assertFalse(scheduler.onBlock(silent, blockSize))
+        assertEquals(DutyCycleScheduler.State.IDLE, scheduler.state)
+    }
+
+    @Test
+    fun `rmsThreshold can be changed at runtime`() {
+        scheduler.rmsThreshold = 0.5
+
+        assertFalse(scheduler.onBlock(loud, blockSize))
+    }
+
+    // ========== Back-off tests ==========
+
+    @Test
+    fun `inspection stride doubles up to maxStride while silent`() {
+        val states = List(16) {
+            scheduler.onBlock(silent, blockSize)
+            scheduler.state
+        }
+
+        val idle = DutyCycleScheduler.State.IDLE
+        val backoff = DutyCycleScheduler.State.BACKOFF
+        // The stride doubles after every second silent check: 1, 2, then capped at 4
+        assertEquals(
+            listOf(idle, idle, backoff, idle, backoff, idle, backoff, backoff, backoff, idle, backoff, backoff, backoff, idle, backoff, backoff),
+            states
+        )
+    }
+
+    @Test
+    fun `onset returns to full rate immediately after an inspection`() {
+        repeat(12) { scheduler.onBlock(silent, blockSize) }
+
+        // Skipped blocks are not inspected, so the onset is seen at the next check
+        var skipped = 0
+        while (!scheduler.onBlock(loud, blockSize)) skipped++
+
+        assertTrue("Onset seen after $skipped skipped blocks", skipped <= 3)
+        assertTrue(scheduler.onBlock(loud, blockSize))
+        assertFalse(scheduler.onBlock(silent, blockSize))
+        assertEquals(DutyCycleScheduler.State.IDLE, scheduler.state)
+    }
+
+    // ========== Stats tests ==========
+
+    @Test
+    fun `stats report audio time per state`() {
+        repeat(3) { scheduler.onBlock(loud, blockSize) }
+        repeat(3) { scheduler.onBlock(silent, blockSize) }  // idle, idle, backoff
+        scheduler.onBlock(loud, blockSize)
+
+        val stats = scheduler.stats()
+        assertEquals(400L, stats.activeMs)
+        assertEquals(200L, stats.idleMs)
+        assertEquals(100L, stats.backoffMs)
+        assertEquals(1L, stats.onsets)
+        assertEquals(4.0 / 7.0, stats.dutyCycle, 1e-9)
+    }
+
+    @Test
+    fun `reset clears counters and back-off`() {
+        repeat(10) { scheduler.onBlock(silent, blockSize) }
+
+        scheduler.reset()
+
+        assertEquals(0L, scheduler.stats().totalMs)
+        assertEquals(DutyCycleScheduler.State.ACTIVE, scheduler.state)
+        scheduler.onBlock(silent, blockSize)
+        assertEquals(DutyCycleScheduler.State.IDLE, scheduler.state)
+    }
+
+    @Test(expected = IllegalArgumentException::class)
+    fun `constructor rejects non-positive maxStride`() {
+        DutyCycleScheduler(rmsThreshold = 0.01, maxStride = 0)
+    }
+}
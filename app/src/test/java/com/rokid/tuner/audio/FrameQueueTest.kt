@@ -0,0 +1,102 @@
+package com.rokid.tuner.audio
+
+import kotlinx.coroutines.ExperimentalCoroutinesApi
+import kotlinx.coroutines.test.runTest
+import org.junit.Assert.*
+import org.junit.Test
+
+/**
+ * Unit tests for FrameQueue.
+ * Tests pooling, newest-wins dropping and the exposed counters.
+ */
+@OptIn(ExperimentalCoroutinesApi::class)
+class FrameQueueTest {
+
+    @Test
+    fun `published frame is received by consumer`() = runTest {
+        val queue = FrameQueue(frameSize = 4)
+        val frame = queue.acquire()!!
+        frame.fillFrom(floatArrayOf(1f, 2f, 3f, 4f), 0, 4)
+        queue.publish(frame)
+
+        val received = queue.receive()
+        assertSame(frame, received)
+        assertEquals(4, received!!.size)
+    }
+
+    @Test
+    fun `full queue drops the oldest frame`() = runTest {
+        val queue = FrameQueue(frameSize = 1, capacity = 1)
+        val first = queue.acquire()!!
+        first.fillFrom(floatArrayOf(1f), 0, 1)
+        queue.publish(first)
+        val second = queue.acquire()!!
+        second.fillFrom(floatArrayOf(2f), 0, 1)
+        queue.publish(second)
+
+        val received = queue.receive()!!
+        assertEquals(2f, received.samples[0], 0f)
+        assertEquals(1L, queue.stats().droppedFrames)
+    }
+
+    @Test
+    fun `dropped frames return to the pool`() = runTest {
+        val queue = FrameQueue(frameSize = 1, capacity = 1)
+        // Far more publishes than pool frames without any consumer
+        repeat(50) {
+            val frame = queue.acquire()
+            assertNotNull("Pool should never run dry with a single producer", frame)
+            queue.publish(frame!!)
+        }
+
+        assertEquals(49L, queue.stats().droppedFrames)
+        assertEquals(1, queue.stats().queueDepth)
+    }
+
+    @Test
+    fun `stats track depth and analysed frames`() = runTest {
+        val queue = FrameQueue(frameSize = 1, capacity = 2)
+        queue.publish(queue.acquire()!!)
+        queue.publish(queue.acquire()!!)
+
+        assertEquals(2, queue.stats().queueDepth)
+        assertEquals(2, queue.stats().maxQueueDepth)
+
+        queue.recycle(queue.receive()!!)
+        val stats = queue.stats()
+        assertEquals(1, stats.queueDepth)
+        assertEquals(2L, stats.publishedFrames)
+        assertEquals(1L, stats.analysedFrames)
+        assertEquals(0L, stats.droppedFrames)
+    }
+
+    @Test
+    fun `superseded windows are counted apart from drops`() = runTest {
+        val queue = FrameQueue(frameSize = 1, capacity = 1)
+        queue.supersede(3)
+        queue.publish(queue.acquire()!!)
+
+        val stats = queue.stats()
+        assertEquals(3L, stats.supersededFrames)
+        assertEquals(0L, stats.droppedFrames)
+        assertEquals(1L, stats.publishedFrames)
+    }
+
+    @Test
+    fun `receive returns null after close`() = runTest {
+        val queue = FrameQueue(frameSize = 1)
+        queue.close()
+
+        assertNull(queue.receive())
+    }
+
+    @Test
+    fun `queued frames are drained before close takes effect`() = runTest {
+        val queue = FrameQueue(frameSize = 1)
+        queue.publish(queue.acquire()!!)
+        queue.close()
+
+        assertNotNull(queue.receive())
+        assertNull(queue.receive())
+    }
+}
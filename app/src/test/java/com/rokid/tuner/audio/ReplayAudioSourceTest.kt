@@ -0,0 +1,243 @@
+package com.rokid.tuner.audio
+
+import com.rokid.tuner.analysis.TestWav
+import org.junit.Assert.*
+import org.junit.Rule
+import org.junit.Test
+import org.junit.rules.TemporaryFolder
+
+/**
+ * Unit tests for ReplayAudioSource.
+ * Tests block delivery, pacing, looping, timestamps and WAV loading.
+ */
+class ReplayAudioSourceTest {
+
+    @get:Rule
+    val tempFolder = TemporaryFolder()
+
+    // ========== Playback tests ==========
+
+    @Test
+    fun `returns null before start`() {
+        val source = ReplayAudioSource(ShortArray(100), realTime = false)
+
+        assertFalse(source.isRecording())
+        assertNull(source.readFrame())
+    }
+
+    @Test
+    fun `delivers the pcm in blocks and then stops`() {
+        val pcm = ShortArray(250) { it.toShort() }
+        val source = ReplayAudioSource(pcm, realTime = false, blockSize = 100)
+        source.start()
+
+        val sizes = mutableListOf<Int>()
+        val firstSamples = mutableListOf<Float>()
+        while (true) {
+            val frame = source.readFrame() ?: break
+            sizes += frame.size
+            firstSamples += frame.samples[0]
+        }
+
+        assertEquals(listOf(100, 100, 50), sizes)
+        assertEquals(100f / Short.MAX_VALUE, firstSamples[1], 1e-7f)
+        assertEquals(200f / Short.MAX_VALUE, firstSamples[2], 1e-7f)
+        assertFalse(source.isRecording())
+    }
+
+    @Test
+    fun `playback is deterministic across restarts`() {
+        val pcm = ReplayAudioSource.tone(220.0, 0.1, harmonics = 3)
+        val source = ReplayAudioSource(pcm, realTime = false, blockSize = 512)
+
+        val first = readAll(source)
+        val second = readAll(source)
+
+        assertArrayEquals(first, second, 0f)
+        assertEquals(pcm.size, first.size)
+    }
+
+    @Test
+    fun `loop restarts from the beginning`() {
+        val pcm = ShortArray(150) { (it + 1).toShort() }
+        val source = ReplayAudioSource(pcm, realTime = false, loop = true, blockSize = 100)
+        source.start()
+
+        assertEquals(100, source.readFrame()!!.size)
+        assertEquals(50, source.readFrame()!!.size)
+        val wrapped = source.readFrame()!!
+        assertEquals(100, wrapped.size)
+        assertEquals(1f / Short.MAX_VALUE, wrapped.samples[0], 1e-7f)
+        assertTrue(source.isRecording())
+    }
+
+    @Test
+    fun `start after pause continues where playback stopped`() {
+        val pcm = ShortArray(300) { it.toShort() }
+        val source = ReplayAudioSource(pcm, realTime = false, blockSize = 100)
+        source.start()
+        source.readFrame()
+
+        source.pause()
+        assertNull(source.readFrame())
+        source.start()
+
+        assertEquals(100f / Short.MAX_VALUE, source.readFrame()!!.samples[0], 1e-7f)
+    }
+
+    @Test
+    fun `start after stop plays from the beginning`() {
+        val pcm = ShortArray(300) { it.toShort() }
+        val source = ReplayAudioSource(pcm, realTime = false, blockSize = 100)
+        source.start()
+        source.readFrame()
+
+        source.stop()
+        source.start()
+
+        assertEquals(0f, source.readFrame()!!.samples[0], 0f)
+    }
+
+    @Test
+    fun `stop ends playback`() {
+        val source = ReplayAudioSource(ShortArray(1000), realTime = false, blockSize = 100)
+        source.start()
+        source.stop()
+
+        assertNull(source.readFrame())
+    }
+
+    @Test
+    fun `scheduler gating yields empty frames`() {
+        val source = ReplayAudioSource(ShortArray(4096), realTime = false, blockSize = 1024)
+        val scheduler = DutyCycleScheduler(rmsThreshold = 0.01)
+        source.start()
+
+        val frame = source.readFrame(scheduler)!!
+
+        assertEquals(0, frame.size)
+    }
+
+    @Test(expected = IllegalArgumentException::class)
+    fun `rejects non-positive block size`() {
+        ReplayAudioSource(ShortArray(10), blockSize = 0)
+    }
+
+    // ========== Timing tests ==========
+
+    @Test
+    fun `frames are stamped with the read time`() {
+        val source = ReplayAudioSource(ShortArray(300), realTime = false, blockSize = 100)
+        source.start()
+
+        var previous = 0L
+        while (true) {
+            val before = System.nanoTime()
+            val frame = source.readFrame() ?: break
+            assertTrue(frame.captureTimeNanos >= before)
+            assertTrue(frame.captureTimeNanos >= previous)
+            previous = frame.captureTimeNanos
+        }
+    }
+
+    @Test
+    fun `real-time playback is paced to the sample clock`() {
+        // 0.1 s of audio in 441-sample (10 ms) blocks
+        val source = ReplayAudioSource(ShortArray(4410), realTime = true, blockSize = 441)
+        val start = System.nanoTime()
+        source.start()
+
+        var blocks = 0L
+        while (true) {
+            val frame = source.readFrame() ?: break
+            blocks++
+            assertTrue("block $blocks returned early", frame.captureTimeNanos >= source.sampleTimeNanos(blocks * 441))
+        }
+
+        val elapsedMs = (System.nanoTime() - start) / 1_000_000
+        assertEquals(10L, blocks)
+        assertTrue("elapsed $elapsedMs ms", elapsedMs >= 100)
+    }
+
+    @Test
+    fun `real-time playback says when the next block is due on its clock`() {
+        // Two 441-sample (10 ms) blocks, paced by a clock the test moves
+        var now = 0L
+        val source = ReplayAudioSource(ShortArray(882), realTime = true, blockSize = 441, clock = { now })
+        assertEquals(0L, source.nanosUntilNextBlock())
+
+        source.start()
+        assertEquals(10_000_000L, source.nanosUntilNextBlock())
+        now = 10_000_000L
+        assertEquals(0L, source.nanosUntilNextBlock())
+        assertNotNull(source.readFrame())
+        assertEquals(10_000_000L, source.nanosUntilNextBlock())
+
+        now = 20_000_000L
+        assertNotNull(source.readFrame())
+        assertNull(source.readFrame())
+        assertEquals(0L, source.nanosUntilNextBlock())
+    }
+
+    @Test
+    fun `unpaced playback is always due`() {
+        val source = ReplayAudioSource(ShortArray(882), realTime = false, blockSize = 441, clock = { 0L })
+        source.start()
+
+        assertEquals(0L, source.nanosUntilNextBlock())
+    }
+
+    // ========== Signal tests ==========
+
+    @Test
+    fun `tone starts after the lead-in`() {
+        val pcm = ReplayAudioSource.tone(440.0, durationSeconds = 0.1, leadInSeconds = 0.05)
+        val leadIn = (0.05 * AudioConfig.SAMPLE_RATE).toInt()
+
+        assertEquals(leadIn + (0.1 * AudioConfig.SAMPLE_RATE).toInt(), pcm.size)
+        for (i in 0 until leadIn) assertEquals(0.toShort(), pcm[i])
+        assertTrue(pcm.drop(leadIn).any { Math.abs(it.toInt()) > Short.MAX_VALUE / 4 })
+    }
+
+    @Test
+    fun `tone stays within amplitude`() {
+        val pcm = ReplayAudioSource.tone(110.0, durationSeconds = 0.2, amplitude = 0.5, harmonics = 6)
+
+        val peak = pcm.maxOf { Math.abs(it.toInt()) }
+        assertTrue("peak $peak", peak <= Short.MAX_VALUE / 2 + 1)
+    }
+
+    // ========== WAV tests ==========
+
+    @Test
+    fun `fromWav replays the file samples`() {
+        val samples = TestWav.sine(330.0, 0.3)
+        val file = tempFolder.newFile("tone.wav")
+        file.writeBytes(TestWav.bytes(samples))
+
+        val replayed = readAll(ReplayAudioSource.fromWav(file, realTime = false))
+
+        assertEquals(samples.size, replayed.size)
+        for (i in samples.indices step 97) {
+            assertEquals(samples[i].toFloat() / Short.MAX_VALUE, replayed[i], 1e-7f)
+        }
+    }
+
+    @Test(expected = IllegalArgumentException::class)
+    fun `fromWav rejects a different sample rate`() {
+        val file = tempFolder.newFile("tone.wav")
+        file.writeBytes(TestWav.bytes(TestWav.sine(330.0, 0.1, sampleRate = 22050), sampleRate = 22050))
+
+        ReplayAudioSource.fromWav(file)
+    }
+
+    private fun readAll(source: ReplayAudioSource): FloatArray {
+        source.start()
+        val out = mutableListOf<Float>()
+        while (true) {
+            val frame = source.readFrame() ?: break
+            for (i in 0 until frame.size) out += frame.samples[i]
+        }
+        return out.toFloatArray()
+    }
+}
@@ -0,0 +1,39 @@
+package com.rokid.tuner.audio
+
+import com.rokid.tuner.analysis.WavReader
+import java.io.File
+
+/**
+ * Loads a whole mono or multi-channel 16-bit WAV file (mixed down to mono) for replay. The
+ * file must be recorded at sampleRate. Kept with the tests, like [WavReader], so WAV
+ * parsing does not ship in the app.
+ */
+fun ReplayAudioSource.Companion.fromWav(
+    file: File,
+    realTime: Boolean = true,
+    loop: Boolean = false,
+    sampleRate: Int = AudioConfig.SAMPLE_RATE
+): ReplayAudioSource {
+    val pcm = WavReader.open(file).use { reader ->
+        require(reader.sampleRate == sampleRate) {
+            "WAV sample rate ${reader.sampleRate} does not match $sampleRate"
+        }
+        val chunks = mutableListOf<ShortArray>()
+        var total = 0
+        while (true) {
+            val chunk = ShortArray(sampleRate)
+            val read = reader.read(chunk, 0, chunk.size)
+            if (read <= 0) break
+            chunks += if (read == chunk.size) chunk else chunk.copyOf(read)
+            total += read
+        }
+        val out = ShortArray(total)
+        var position = 0
+        for (chunk in chunks) {
+            System.arraycopy(chunk, 0, out, position, chunk.size)
+            position += chunk.size
+        }
+        out
+    }
+    return ReplayAudioSource(pcm, realTime, loop, sampleRate = sampleRate)
+}
@@ -0,0 +1,132 @@
+package com.rokid.tuner.audio
+
+import org.junit.Assert.*
+import org.junit.Test
+
+/**
+ * Unit tests for SlidingWindowBuffer.
+ * Tests window/hop scheduling, contiguous window views and overrun handling.
+ */
+class SlidingWindowBufferTest {
+
+    @Test
+    fun `no window until windowSize samples are written`() {
+        val ring = SlidingWindowBuffer(windowSize = 8, hopSize = 4)
+        ring.write(ramp(0, 7))
+
+        assertEquals(-1, ring.nextWindow())
+        assertEquals(1, ring.samplesUntilNextWindow())
+    }
+
+    @Test
+    fun `first window contains the first windowSize samples`() {
+        val ring = SlidingWindowBuffer(windowSize = 8, hopSize = 4)
+        ring.write(ramp(0, 8))
+
+        val start = ring.nextWindow()
+        assertTrue(start >= 0)
+        assertWindow(ring, start, 0)
+        assertEquals(-1, ring.nextWindow())
+    }
+
+    @Test
+    fun `windows advance by hopSize`() {
+        val ring = SlidingWindowBuffer(windowSize = 8, hopSize = 4, capacity = 32)
+        ring.write(ramp(0, 20))
+
+        val starts = mutableListOf<Int>()
+        while (true) {
+            val start = ring.nextWindow()
+            if (start < 0) break
+            starts.add(start)
+        }
+
+        // Windows end at 8, 12, 16, 20
+        assertEquals(4, starts.size)
+        starts.forEachIndexed { i, start -> assertWindow(ring, start, i * 4) }
+    }
+
+    @Test
+    fun `windows are contiguous across the wrap point`() {
+        val ring = SlidingWindowBuffer(windowSize = 8, hopSize = 3, capacity = 10)
+        var next = 0
+        var expectedFirst = 0
+        repeat(20) {
+            ring.write(ramp(next, 5))
+            next += 5
+            while (true) {
+                val start = ring.nextWindow()
+                if (start < 0) break
+                assertWindow(ring, start, expectedFirst)
+                expectedFirst += 3
+            }
+        }
+        assertEquals(0L, ring.skippedWindows)
+    }
+
+    @Test
+    fun `slow consumer skips overwritten windows`() {
+        val ring = SlidingWindowBuffer(windowSize = 4, hopSize = 2, capacity = 8)
+        ring.write(ramp(0, 40))
+
+        val start = ring.nextWindow()
+        assertTrue(start >= 0)
+        assertTrue(ring.skippedWindows > 0)
+        // The window returned must still be intact and hop-aligned
+        val first = ring.buffer[start].toInt()
+        assertEquals(0, first % 2)
+        assertWindow(ring, start, first)
+    }
+
+    @Test
+    fun `write honours offset and length`() {
+        val ring = SlidingWindowBuffer(windowSize = 4, hopSize = 4)
+        val source = ramp(0, 10)
+        ring.write(source, 3, 4)
+
+        val start = ring.nextWindow()
+        assertWindow(ring, start, 3)
+    }
+
+    @Test
+    fun `clear discards buffered samples`() {
+        val ring = SlidingWindowBuffer(windowSize = 4, hopSize = 2)
+        ring.write(ramp(0, 3))
+        ring.clear()
+        ring.write(ramp(100, 3))
+
+        assertEquals(-1, ring.nextWindow())
+        ring.write(ramp(103, 1))
+        assertWindow(ring, ring.nextWindow(), 100)
+    }
+
+    @Test
+    fun `clear keeps old samples out of later windows`() {
+        val ring = SlidingWindowBuffer(windowSize = 4, hopSize = 2)
+        ring.write(ramp(0, 7))
+        ring.clear()
+        ring.write(ramp(100, 10))
+
+        var expected = 102
+        while (true) {
+            val start = ring.nextWindow()
+            if (start < 0) break
+            assertWindow(ring, start, expected)
+            expected += 2
+        }
+        assertEquals(108, expected)
+    }
+
+    @Test(expected = IllegalArgumentException::class)
+    fun `capacity smaller than window is rejected`() {
+        SlidingWindowBuffer(windowSize = 16, hopSize = 4, capacity = 8)
+    }
+
+    private fun ramp(first: Int, count: Int): FloatArray = FloatArray(count) { (first + it).toFloat() }
+
+    private fun assertWindow(ring: SlidingWindowBuffer, start: Int, firstValue: Int) {
+        for (i in 0 until ring.windowSize) {
+            assertEquals((firstValue + i).toFloat(), ring.buffer[start + i], 0f)
+        }
+    }
+}
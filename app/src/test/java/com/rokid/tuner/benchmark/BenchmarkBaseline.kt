@@ -0,0 +1,100 @@
+package com.rokid.tuner.benchmark
+
+import java.io.File
+import java.util.Locale
+import java.util.Properties
+
+/**
+ * Stored benchmark results keyed by benchmark name.
+ *
+ * The file is a plain properties file with "<name>.ns" and "<name>.bytes" entries, so it
+ * diffs cleanly in review when it is re-recorded. Benchmarks missing from the baseline are
+ * reported as new rather than failing.
+ */
+class BenchmarkBaseline(private val entries: Map<String, Entry>) {
+
+    data class Entry(val nsPerOp: Double, val bytesPerOp: Double)
+
+    data class Regression(
+        val name: String,
+        val metric: String,
+        val baseline: Double,
+        val actual: Double
+    ) {
+        override fun toString(): String =
+            "$name $metric: ${"%.1f".format(Locale.ROOT, baseline)} -> ${"%.1f".format(Locale.ROOT, actual)}"
+    }
+
+    val size: Int get() = entries.size
+
+    operator fun get(name: String): Entry? = entries[name]
+
+    /**
+     * Returns every result slower than baseline * (1 + timeTolerance), or allocating more
+     * than baseline * (1 + allocationTolerance) + [ALLOCATION_SLACK_BYTES].
+     */
+    fun compare(
+        results: List<MicroBenchmark.Result>,
+        timeTolerance: Double,
+        allocationTolerance: Double = DEFAULT_ALLOCATION_TOLERANCE
+    ): List<Regression> {
+        val regressions = mutableListOf<Regression>()
+        for (result in results) {
+            val entry = entries[result.name] ?: continue
+            if (result.nsPerOp > entry.nsPerOp * (1.0 + timeTolerance)) {
+                regressions.add(Regression(result.name, "ns/op", entry.nsPerOp, result.nsPerOp))
+            }
+            if (!result.bytesPerOp.isNaN() && !entry.bytesPerOp.isNaN() &&
+                result.bytesPerOp > entry.bytesPerOp * (1.0 + allocationTolerance) + ALLOCATION_SLACK_BYTES) {
+                regressions.add(Regression(result.name, "bytes/op", entry.bytesPerOp, result.bytesPerOp))
+            }
+        }
+        return regressions
+    }
+
+    companion object {
+        const val DEFAULT_ALLOCATION_TOLERANCE = 0.10
+        /** Absorbs counter noise around benchmarks that allocate nothing. */
+        const val ALLOCATION_SLACK_BYTES = 8.0
+
+        private const val NS_SUFFIX = ".ns"
+        private const val BYTES_SUFFIX = ".bytes"
+
+        fun load(file: File): BenchmarkBaseline {
+            if (!file.isFile) return BenchmarkBaseline(emptyMap())
+            val properties = Properties()
+            file.inputStream().use { properties.load(it) }
+            return fromProperties(properties)
+        }
+
+        fun fromProperties(properties: Properties): BenchmarkBaseline {
+            val entries = mutableMapOf<String, Entry>()
+            for (key in properties.stringPropertyNames()) {
+                if (!key.endsWith(NS_SUFFIX)) continue
+                val name = key.removeSuffix(NS_SUFFIX)
+                val ns = properties.getProperty(key).toDoubleOrNull() ?: continue
+                val bytes = properties.getProperty(name + BYTES_SUFFIX)?.toDoubleOrNull() ?: Double.NaN
+                entries[name] = Entry(ns, bytes)
+            }
+            return BenchmarkBaseline(entries)
+        }
+
+        fun toProperties(results: List<MicroBenchmark.Result>): Properties {
+            val properties = Properties()
+            for (result in results) {
+                properties.setProperty(result.name + NS_SUFFIX, "%.1f".format(Locale.ROOT, result.nsPerOp))
+                if (!result.bytesPerOp.isNaN()) {
+                    properties.setProperty(result.name + BYTES_SUFFIX, "%.1f".format(Locale.ROOT, result.bytesPerOp))
+                }
+            }
+            return properties
+        }
+
+        fun write(results: List<MicroBenchmark.Result>, file: File) {
+            file.parentFile?.mkdirs()
+            file.outputStream().use {
+                toProperties(results).store(it, "DSP benchmark baseline (ns/op and bytes/op)")
+            }
+        }
+    }
+}
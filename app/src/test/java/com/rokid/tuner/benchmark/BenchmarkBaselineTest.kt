@@ -0,0 +1,88 @@
+package com.rokid.tuner.benchmark
+
+import org.junit.Assert.*
+import org.junit.Test
+import java.util.Locale
+import java.util.Properties
+
+/**
+ * Unit tests for BenchmarkBaseline.
+ * Verifies round-tripping through properties and regression detection.
+ */
+class BenchmarkBaselineTest {
+
+    private fun result(name: String, ns: Double, bytes: Double) = MicroBenchmark.Result(name, ns, bytes, 1000L)
+
+    // ========== Properties round trip tests ==========
+
+    @Test
+    fun `toProperties and fromProperties round trip`() {
+        val results = listOf(result("detectPitch/2048/sine/s100", 12345.6, 48.0), result("findNote", 80.0, 40.0))
+
+        val baseline = BenchmarkBaseline.fromProperties(BenchmarkBaseline.toProperties(results))
+
+        assertEquals(2, baseline.size)
+        assertEquals(12345.6, baseline["detectPitch/2048/sine/s100"]!!.nsPerOp, 0.01)
+        assertEquals(48.0, baseline["detectPitch/2048/sine/s100"]!!.bytesPerOp, 0.01)
+    }
+
+    @Test
+    fun `fromProperties treats missing bytes as unknown`() {
+        val properties = Properties().apply { setProperty("computeRMS/1024.ns", "500.0") }
+
+        val entry = BenchmarkBaseline.fromProperties(properties)["computeRMS/1024"]!!
+
+        assertTrue(entry.bytesPerOp.isNaN())
+    }
+
+    // ========== Regression detection tests ==========
+
+    @Test
+    fun `compare flags results slower than tolerance`() {
+        val baseline = BenchmarkBaseline(mapOf("yin" to BenchmarkBaseline.Entry(1000.0, 0.0)))
+
+        val regressions = baseline.compare(listOf(result("yin", 1400.0, 0.0)), timeTolerance = 0.30)
+
+        assertEquals(1, regressions.size)
+        assertEquals("ns/op", regressions[0].metric)
+    }
+
+    @Test
+    fun `compare accepts results within tolerance`() {
+        val baseline = BenchmarkBaseline(mapOf("yin" to BenchmarkBaseline.Entry(1000.0, 0.0)))
+
+        val regressions = baseline.compare(listOf(result("yin", 1250.0, 4.0)), timeTolerance = 0.30)
+
+        assertTrue(regressions.isEmpty())
+    }
+
+    @Test
+    fun `compare flags new allocations`() {
+        val baseline = BenchmarkBaseline(mapOf("rms" to BenchmarkBaseline.Entry(100.0, 0.0)))
+
+        val regressions = baseline.compare(listOf(result("rms", 100.0, 64.0)), timeTolerance = 0.30)
+
+        assertEquals(1, regressions.size)
+        assertEquals("bytes/op", regressions[0].metric)
+    }
+
+    @Test
+    fun `compare ignores benchmarks missing from baseline`() {
+        val baseline = BenchmarkBaseline(emptyMap())
+
+        assertTrue(baseline.compare(listOf(result("new", 1e9, 1e6)), timeTolerance = 0.0).isEmpty())
+    }
+
+    @Test
+    fun `regressions format independently of the default locale`() {
+        val default = Locale.getDefault()
+        try {
+            Locale.setDefault(Locale.GERMANY)
+            val regression = BenchmarkBaseline.Regression("yin", "ns/op", 1000.0, 1400.25)
+
+            assertEquals("yin ns/op: 1000.0 -> 1400.3", regression.toString())
+        } finally {
+            Locale.setDefault(default)
+        }
+    }
+}
@@ -0,0 +1,56 @@
+package com.rokid.tuner.benchmark
+
+import com.rokid.tuner.audio.AudioConfig
+import java.util.Random
+
+/**
+ * Deterministic test signals for the DSP benchmarks.
+ * All generators use a fixed seed so runs are comparable against the stored baseline.
+ */
+enum class BenchmarkSignal {
+    /** All zeros; exercises the early RMS rejection path. */
+    SILENCE,
+    /** Pure tone at the fundamental. */
+    SINE,
+    /** Plucked-string-like spectrum: fundamental plus decaying harmonics 2-8. */
+    HARMONIC,
+    /** Fundamental buried in white noise at roughly 0 dB SNR. */
+    NOISY;
+
+    fun generate(
+        size: Int,
+        frequency: Double = DEFAULT_FREQUENCY,
+        amplitude: Double = DEFAULT_AMPLITUDE
+    ): FloatArray {
+        val omega = 2.0 * Math.PI * frequency / AudioConfig.SAMPLE_RATE
+        val random = Random(SEED)
+        return when (this) {
+            SILENCE -> FloatArray(size)
+            SINE -> FloatArray(size) { (amplitude * Math.sin(omega * it)).toFloat() }
+            HARMONIC -> FloatArray(size) { i ->
+                var sample = 0.0
+                for (harmonic in 1..HARMONIC_COUNT) {
+                    sample += Math.sin(omega * harmonic * i) / harmonic
+                }
+                (amplitude * sample / HARMONIC_NORMALISATION).toFloat()
+            }
+            NOISY -> FloatArray(size) {
+                (amplitude * (Math.sin(omega * it) + random.nextGaussian() * NOISE_STDDEV) / 2.0).toFloat()
+            }
+        }
+    }
+
+    companion object {
+        const val DEFAULT_FREQUENCY = 110.0  // A2 string
+        const val DEFAULT_AMPLITUDE = 0.5
+        private const val SEED = 20240101L
+        private const val HARMONIC_COUNT = 8
+        private const val HARMONIC_NORMALISATION = 2.72  // sum of 1/h for h = 1..8
+        private const val NOISE_STDDEV = 0.7071  // unit-power noise against a unit sine
+
+        /** Scales a float signal to the 16-bit PCM the recorder would deliver. */
+        fun toPcm16(samples: FloatArray): ShortArray = ShortArray(samples.size) {
+            (samples[it].coerceIn(-1f, 1f) * Short.MAX_VALUE).toInt().toShort()
+        }
+    }
+}
@@ -0,0 +1,174 @@
+package com.rokid.tuner.benchmark
+
+import com.rokid.tuner.audio.AudioFrame
+import com.rokid.tuner.pitch.FrequencyRange
+import com.rokid.tuner.pitch.NoteFinder
+import com.rokid.tuner.pitch.PitchDetector
+import org.junit.Assert.assertTrue
+import org.junit.Assume.assumeTrue
+import org.junit.Before
+import org.junit.Test
+import java.io.File
+
+/**
+ * Throughput and allocation benchmarks for the DSP core.
+ *
+ * Skipped unless enabled, because a run takes about a minute:
+ *
+ *     ./gradlew :app:testDebugUnitTest --tests '*DspBenchmarkTest' -Ptuner.benchmark=true
+ *
+ * Results are printed and written to build/benchmark/report.txt, then compared with
+ * src/test/resources/benchmark/baseline.properties; any benchmark slower than the baseline
+ * by more than tuner.benchmark.tolerance (default 0.30) or allocating more fails the run.
+ * A stored baseline without entries fails the run too, since nothing could regress.
+ * Pass -Ptuner.benchmark.record=true to write build/benchmark/baseline.properties from the
+ * current run instead of comparing; copy it over the stored baseline to accept new numbers.
+ */
+class DspBenchmarkTest {
+
+    companion object {
+        private const val ENABLED_PROPERTY = "tuner.benchmark"
+        private const val RECORD_PROPERTY = "tuner.benchmark.record"
+        private const val TOLERANCE_PROPERTY = "tuner.benchmark.tolerance"
+        private const val DEFAULT_TIME_TOLERANCE = 0.30
+
+        private const val BASELINE_PATH = "src/test/resources/benchmark/baseline.properties"
+        private const val OUTPUT_DIR = "build/benchmark"
+
+        private val BUFFER_SIZES = intArrayOf(1024, 2048, 4096, 8192)
+        private val SENSITIVITIES = intArrayOf(0, 50, 100)
+
+        // Spread over the guitar range so lookups hit different table entries
+        private val NOTE_FREQUENCIES = DoubleArray(64) { 82.41 * Math.pow(2.0, it / 16.0) }
+    }
+
+    private lateinit var benchmark: MicroBenchmark
+
+    @Before
+    fun setUp() {
+        assumeTrue("DSP benchmarks disabled; run with -P$ENABLED_PROPERTY=true",
+            System.getProperty(ENABLED_PROPERTY)?.toBoolean() == true)
+        benchmark = MicroBenchmark()
+    }
+
+    @Test
+    fun `DSP core stays within baseline`() {
+        val results = mutableListOf<MicroBenchmark.Result>()
+        results += benchmarkComputeRms()
+        results += benchmarkPcmConversion()
+        results += benchmarkYin()
+        results += benchmarkDetectPitch()
+        results += benchmarkRanges()
+        results += benchmarkFindNote()
+
+        val baseline = BenchmarkBaseline.load(File(BASELINE_PATH))
+        val report = formatReport(results, baseline)
+        println(report)
+        File(OUTPUT_DIR).mkdirs()
+        File(OUTPUT_DIR, "report.txt").writeText(report)
+
+        if (System.getProperty(RECORD_PROPERTY)?.toBoolean() == true) {
+            BenchmarkBaseline.write(results, File(OUTPUT_DIR, "baseline.properties"))
+            return
+        }
+
+        assertTrue("No entries in $BASELINE_PATH, so no result can regress; record a baseline with " +
+            "-P$RECORD_PROPERTY=true and copy $OUTPUT_DIR/baseline.properties over it", baseline.size > 0)
+        val tolerance = System.getProperty(TOLERANCE_PROPERTY)?.toDoubleOrNull() ?: DEFAULT_TIME_TOLERANCE
+        val regressions = baseline.compare(results, tolerance)
+        assertTrue("Benchmark regressions:\n" + regressions.joinToString("\n"), regressions.isEmpty())
+    }
+
+    // ========== Benchmarks ==========
+
+    private fun benchmarkComputeRms(): List<MicroBenchmark.Result> = BUFFER_SIZES.map { size ->
+        val detector = PitchDetector()
+        val samples = BenchmarkSignal.SINE.generate(size)
+        val sink = benchmark.blackhole
+        benchmark.measure("computeRMS/$size") { sink.consume(detector.computeRMS(samples)) }
+    }
+
+    private fun benchmarkPcmConversion(): List<MicroBenchmark.Result> = BUFFER_SIZES.map { size ->
+        val pcm = BenchmarkSignal.toPcm16(BenchmarkSignal.SINE.generate(size))
+        val frame = AudioFrame(size)
+        val sink = benchmark.blackhole
+        benchmark.measure("pcm16ToFloat/$size") {
+            frame.fillFromPcm16(pcm, size)
+            sink.consume(frame.rms)
+        }
+    }
+
+    private fun benchmarkYin(): List<MicroBenchmark.Result> {
+        val results = mutableListOf<MicroBenchmark.Result>()
+        for (size in BUFFER_SIZES) {
+            for (signal in BenchmarkSignal.values()) {
+                val detector = PitchDetector()
+                val samples = signal.generate(size)
+                val sink = benchmark.blackhole
+                results += benchmark.measure("estimateFrequencyYIN/$size/${signal.label()}") {
+                    sink.consume(detector.estimateFrequencyYIN(samples, 0, size))
+                }
+            }
+        }
+        return results
+    }
+
+    private fun benchmarkDetectPitch(): List<MicroBenchmark.Result> {
+        val results = mutableListOf<MicroBenchmark.Result>()
+        for (size in BUFFER_SIZES) {
+            for (signal in BenchmarkSignal.values()) {
+                for (sensitivity in SENSITIVITIES) {
+                    val detector = PitchDetector().apply { setSensitivity(sensitivity) }
+                    val samples = signal.generate(size)
+                    val sink = benchmark.blackhole
+                    results += benchmark.measure("detectPitch/$size/${signal.label()}/s$sensitivity") {
+                        sink.consume(detector.detectPitch(samples))
+                    }
+                }
+            }
+        }
+        return results
+    }
+
+    private fun benchmarkRanges(): List<MicroBenchmark.Result> {
+        val results = mutableListOf<MicroBenchmark.Result>()
+        for (range in FrequencyRange.values()) {
+            for (signal in BenchmarkSignal.values()) {
+                val detector = PitchDetector().apply { setFrequencyRange(range) }
+                val samples = signal.generate(range.windowSize)
+                val sink = benchmark.blackhole
+                results += benchmark.measure("detectPitch/range/${range.name.lowercase()}/${signal.label()}") {
+                    sink.consume(detector.detectPitch(samples))
+                }
+            }
+        }
+        return results
+    }
+
+    private fun benchmarkFindNote(): List<MicroBenchmark.Result> {
+        val noteFinder = NoteFinder()
+        val frequencies = NOTE_FREQUENCIES
+        val sink = benchmark.blackhole
+        var next = 0
+        return listOf(benchmark.measure("findNote") {
+            sink.consume(noteFinder.findNote(frequencies[next]))
+            next = (next + 1) and (frequencies.size - 1)
+        })
+    }
+
+    // ========== Reporting ==========
+
+    private fun BenchmarkSignal.label() = name.lowercase()
+
+    private fun formatReport(results: List<MicroBenchmark.Result>, baseline: BenchmarkBaseline): String {
+        val builder = StringBuilder()
+        builder.append("%-44s %14s %12s %10s%n".format("benchmark", "ns/frame", "bytes/frame", "vs base"))
+        for (result in results) {
+            val entry = baseline[result.name]
+            val delta = if (entry == null) "new"
+                else "%+.1f%%".format((result.nsPerOp / entry.nsPerOp - 1.0) * 100.0)
+            builder.append("%-44s %14.1f %12.1f %10s%n".format(result.name, result.nsPerOp, result.bytesPerOp, delta))
+        }
+        return builder.toString()
+    }
+}
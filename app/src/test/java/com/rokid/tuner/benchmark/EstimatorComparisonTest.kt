@@ -0,0 +1,145 @@
+package com.rokid.tuner.benchmark
+
+import com.rokid.tuner.audio.AudioConfig
+import com.rokid.tuner.constants.AlgorithmConstants
+import com.rokid.tuner.pitch.NoteFinder
+import com.rokid.tuner.pitch.PitchEstimator
+import org.junit.Assume.assumeTrue
+import org.junit.Before
+import org.junit.Test
+import java.io.File
+
+/**
+ * Runs every [PitchEstimator.Engine] over the same frames and compares cost and accuracy.
+ *
+ * Skipped unless enabled, like [DspBenchmarkTest]:
+ *
+ *     ./gradlew :app:testDebugUnitTest --tests '*EstimatorComparisonTest' -Ptuner.benchmark=true
+ *
+ * Frames are analysis windows of sine, harmonic and noisy signals at pitches spread over
+ * the guitar range. For each engine and signal the report gives ns and bytes allocated
+ * per frame, the share of frames with a pitch, the octave-error rate (estimates more than
+ * half an octave off) and the mean and worst cents error of the remaining estimates. It
+ * ends with the cheapest engine meeting tuner.benchmark.cents (default 5) mean cents
+ * error and no octave errors on every signal. Results are printed and written to
+ * build/benchmark/estimators.txt; nothing is compared against a baseline.
+ */
+class EstimatorComparisonTest {
+
+    companion object {
+        private const val ENABLED_PROPERTY = "tuner.benchmark"
+        private const val CENTS_TARGET_PROPERTY = "tuner.benchmark.cents"
+        private const val DEFAULT_CENTS_TARGET = 5.0
+        private const val OUTPUT_DIR = "build/benchmark"
+
+        private const val FRAME_SIZE = AudioConfig.ANALYSIS_WINDOW_SIZE
+        private const val OCTAVE_ERROR_CENTS = 600f
+
+        private val SIGNALS = listOf(BenchmarkSignal.SINE, BenchmarkSignal.HARMONIC, BenchmarkSignal.NOISY)
+
+        // E2 to E6 in sixth-of-an-octave steps
+        private val FREQUENCIES = DoubleArray(25) { 82.41 * Math.pow(2.0, it / 6.0) }
+    }
+
+    data class Comparison(
+        val engine: PitchEstimator.Engine,
+        val signal: BenchmarkSignal,
+        val timing: MicroBenchmark.Result,
+        val detectionRate: Double,
+        val octaveErrorRate: Double,
+        val meanCents: Double,
+        val maxCents: Double
+    )
+
+    private lateinit var benchmark: MicroBenchmark
+
+    @Before
+    fun setUp() {
+        assumeTrue("DSP benchmarks disabled; run with -P$ENABLED_PROPERTY=true",
+            System.getProperty(ENABLED_PROPERTY)?.toBoolean() == true)
+        benchmark = MicroBenchmark()
+    }
+
+    @Test
+    fun `compare pitch estimators`() {
+        val comparisons = mutableListOf<Comparison>()
+        for (signal in SIGNALS) {
+            val frames = FREQUENCIES.map { signal.generate(FRAME_SIZE, it) }
+            for (engine in PitchEstimator.Engine.values()) {
+                comparisons += compare(engine, signal, frames)
+            }
+        }
+
+        val target = System.getProperty(CENTS_TARGET_PROPERTY)?.toDoubleOrNull() ?: DEFAULT_CENTS_TARGET
+        val report = formatReport(comparisons, target)
+        println(report)
+        File(OUTPUT_DIR).mkdirs()
+        File(OUTPUT_DIR, "estimators.txt").writeText(report)
+    }
+
+    private fun compare(engine: PitchEstimator.Engine, signal: BenchmarkSignal, frames: List<FloatArray>): Comparison {
+        val estimator = PitchEstimator.create(engine)
+        val threshold = AlgorithmConstants.DEFAULT_CLARITY_THRESHOLD
+
+        var detected = 0
+        var octaveErrors = 0
+        var centsSum = 0.0
+        var centsMax = 0.0
+        for (i in frames.indices) {
+            val estimate = estimator.estimate(frames[i], 0, FRAME_SIZE, threshold)
+            if (estimate.frequency <= AlgorithmConstants.INVALID_FREQUENCY) continue
+            detected++
+            val cents = Math.abs(NoteFinder.frequencyToCents(estimate.frequency, FREQUENCIES[i]))
+            if (cents > OCTAVE_ERROR_CENTS) {
+                octaveErrors++
+            } else {
+                centsSum += cents
+                centsMax = Math.max(centsMax, cents.toDouble())
+            }
+        }
+
+        val sink = benchmark.blackhole
+        var next = 0
+        val timing = benchmark.measure("${engine.label()}/${signal.label()}") {
+            sink.consume(estimator.estimate(frames[next], 0, FRAME_SIZE, threshold))
+            next = if (next + 1 == frames.size) 0 else next + 1
+        }
+
+        val accurate = detected - octaveErrors
+        return Comparison(
+            engine = engine,
+            signal = signal,
+            timing = timing,
+            detectionRate = detected.toDouble() / frames.size,
+            octaveErrorRate = if (detected == 0) 0.0 else octaveErrors.toDouble() / detected,
+            meanCents = if (accurate == 0) Double.NaN else centsSum / accurate,
+            maxCents = centsMax
+        )
+    }
+
+    // ========== Reporting ==========
+
+    private fun PitchEstimator.Engine.label() = name.lowercase()
+
+    private fun BenchmarkSignal.label() = name.lowercase()
+
+    private fun formatReport(comparisons: List<Comparison>, centsTarget: Double): String {
+        val builder = StringBuilder()
+        builder.append("%-28s %12s %12s %9s %9s %10s %10s%n".format(
+            "estimator", "ns/frame", "bytes/frame", "detected", "octave", "mean cents", "max cents"))
+        for (comparison in comparisons) {
+            builder.append("%-28s %12.1f %12.1f %8.1f%% %8.1f%% %10.2f %10.2f%n".format(
+                comparison.timing.name, comparison.timing.nsPerOp, comparison.timing.bytesPerOp,
+                comparison.detectionRate * 100.0, comparison.octaveErrorRate * 100.0,
+                comparison.meanCents, comparison.maxCents))
+        }
+
+        val cheapest = comparisons.groupBy { it.engine }
+            .filterValues { results -> results.all { it.octaveErrorRate == 0.0 && it.meanCents <= centsTarget } }
+            .minByOrNull { (_, results) -> results.sumOf { it.timing.nsPerOp } }
+            ?.key
+        builder.append("%nCheapest engine within %.1f cents and without octave errors: %s%n".format(
+            centsTarget, cheapest?.label() ?: "none"))
+        return builder.toString()
+    }
+}
@@ -0,0 +1,90 @@
+package com.rokid.tuner.benchmark
+
+import java.lang.management.ManagementFactory
+
+/**
+ * Minimal JVM microbenchmark runner for the unit-test classpath.
+ *
+ * Each benchmark is warmed up for [warmupNs], then timed over [rounds] rounds of at least
+ * [roundNs]; the reported time is the median round, which keeps one GC pause or JIT
+ * recompilation from skewing the result. Allocations are read from the HotSpot per-thread
+ * allocation counter, so the operation must run on the calling thread.
+ */
+class MicroBenchmark(
+    private val warmupNs: Long = DEFAULT_WARMUP_NS,
+    private val roundNs: Long = DEFAULT_ROUND_NS,
+    private val rounds: Int = DEFAULT_ROUNDS
+) {
+
+    data class Result(
+        val name: String,
+        val nsPerOp: Double,
+        /** Bytes allocated per operation, or NaN when the JVM cannot report it. */
+        val bytesPerOp: Double,
+        val operations: Long
+    )
+
+    /** Keeps results observable so the JIT cannot eliminate the measured work. */
+    class Blackhole {
+        @Volatile private var doubleSink = 0.0
+        @Volatile private var intSink = 0
+        @Volatile private var refSink: Any? = null
+
+        fun consume(value: Double) { doubleSink = value }
+        fun consume(value: Int) { intSink = value }
+        fun consume(value: Any?) { refSink = value }
+    }
+
+    val blackhole = Blackhole()
+
+    private val threadBean = ManagementFactory.getThreadMXBean() as? com.sun.management.ThreadMXBean
+    private var lastElapsedNs = 0L
+
+    fun measure(name: String, operation: () -> Unit): Result {
+        runFor(warmupNs, operation)
+
+        val roundTimes = DoubleArray(rounds)
+        var totalOps = 0L
+        val allocStart = allocatedBytes()
+        for (round in 0 until rounds) {
+            val ops = runFor(roundNs, operation)
+            roundTimes[round] = lastElapsedNs.toDouble() / ops
+            totalOps += ops
+        }
+        val allocEnd = allocatedBytes()
+
+        roundTimes.sort()
+        val bytesPerOp = if (allocStart < 0 || allocEnd < 0) Double.NaN
+            else (allocEnd - allocStart).toDouble() / totalOps
+        return Result(name, roundTimes[rounds / 2], bytesPerOp, totalOps)
+    }
+
+    /** Runs operation in batches until at least durationNs has passed; returns the op count. */
+    private fun runFor(durationNs: Long, operation: () -> Unit): Long {
+        var ops = 0L
+        var batch = 1
+        val start = System.nanoTime()
+        var elapsed: Long
+        do {
+            for (i in 0 until batch) operation()
+            ops += batch
+            if (batch < MAX_BATCH) batch *= 2
+            elapsed = System.nanoTime() - start
+        } while (elapsed < durationNs)
+        lastElapsedNs = elapsed
+        return ops
+    }
+
+    private fun allocatedBytes(): Long {
+        val bean = threadBean ?: return -1L
+        if (!bean.isThreadAllocatedMemorySupported || !bean.isThreadAllocatedMemoryEnabled) return -1L
+        return bean.getThreadAllocatedBytes(Thread.currentThread().id)
+    }
+
+    companion object {
+        const val DEFAULT_WARMUP_NS = 300_000_000L
+        const val DEFAULT_ROUND_NS = 100_000_000L
+        const val DEFAULT_ROUNDS = 5
+        private const val MAX_BATCH = 1024
+    }
+}
@@ -0,0 +1,162 @@
+package com.rokid.tuner.benchmark
+
+import androidx.arch.core.executor.testing.InstantTaskExecutorRule
+import com.rokid.tuner.TunerViewModel
+import com.rokid.tuner.audio.AudioConfig
+import com.rokid.tuner.audio.ReplayAudioSource
+import com.rokid.tuner.constants.UiConstants
+import com.rokid.tuner.profiling.StageProfiler
+import kotlinx.coroutines.Dispatchers
+import kotlinx.coroutines.ExperimentalCoroutinesApi
+import kotlinx.coroutines.flow.first
+import kotlinx.coroutines.runBlocking
+import kotlinx.coroutines.test.UnconfinedTestDispatcher
+import kotlinx.coroutines.test.resetMain
+import kotlinx.coroutines.test.setMain
+import kotlinx.coroutines.withTimeout
+import org.junit.After
+import org.junit.Assume.assumeTrue
+import org.junit.Before
+import org.junit.Rule
+import org.junit.Test
+import org.junit.runner.RunWith
+import org.robolectric.RobolectricTestRunner
+import org.robolectric.annotation.Config
+import java.io.File
+
+/**
+ * End-to-end latency of the recorder -> detector -> ViewModel path, driven by a
+ * real-time [ReplayAudioSource] instead of the microphone.
+ *
+ * Skipped unless enabled, like [DspBenchmarkTest]:
+ *
+ *     ./gradlew :app:testDebugUnitTest --tests '*PipelineLatencyTest' -Ptuner.benchmark=true
+ *
+ * Each open string is replayed at the sample clock after half a second of silence. The
+ * report gives, per note, the time from the tone's first sample to the first Detected
+ * state and to the first Detected state within the in-tune threshold, the analysis rate,
+ * and the END_TO_END (capture to StateFlow emission) percentiles and histogram. Results
+ * are printed and written to build/benchmark/latency.txt; nothing is compared against a
+ * baseline.
+ */
+@OptIn(ExperimentalCoroutinesApi::class)
+@RunWith(RobolectricTestRunner::class)
+@Config(manifest = Config.NONE, sdk = [28])
+class PipelineLatencyTest {
+
+    companion object {
+        private const val ENABLED_PROPERTY = "tuner.benchmark"
+        private const val OUTPUT_DIR = "build/benchmark"
+
+        private const val LEAD_IN_SECONDS = 0.5
+        private const val TONE_SECONDS = 2.0
+        private const val TIMEOUT_MS = 5000L
+        private const val NANOS_PER_MS = 1_000_000.0
+        private const val POLL_MS = 10L
+
+        private val OPEN_STRINGS = linkedMapOf(
+            "E2" to 82.41, "A2" to 110.0, "D3" to 146.83, "G3" to 196.0, "B3" to 246.94, "E4" to 329.63
+        )
+    }
+
+    data class Measurement(
+        val note: String,
+        val firstNoteMs: Double,
+        val lockMs: Double,
+        val framesPerSecond: Double,
+        val endToEnd: StageProfiler.StageStats
+    )
+
+    @get:Rule
+    val instantExecutorRule = InstantTaskExecutorRule()
+
+    @Before
+    fun setUp() {
+        assumeTrue("DSP benchmarks disabled; run with -P$ENABLED_PROPERTY=true",
+            System.getProperty(ENABLED_PROPERTY)?.toBoolean() == true)
+        Dispatchers.setMain(UnconfinedTestDispatcher())
+    }
+
+    @After
+    fun tearDown() {
+        Dispatchers.resetMain()
+    }
+
+    @Test
+    fun `measure capture to emission latency`() {
+        val measurements = OPEN_STRINGS.map { (note, frequency) -> measure(note, frequency) }
+
+        val report = formatReport(measurements)
+        println(report)
+        File(OUTPUT_DIR).mkdirs()
+        File(OUTPUT_DIR, "latency.txt").writeText(report)
+    }
+
+    private fun measure(note: String, frequency: Double): Measurement {
+        val pcm = ReplayAudioSource.tone(frequency, TONE_SECONDS, LEAD_IN_SECONDS, harmonics = 6)
+        val source = ReplayAudioSource(pcm, realTime = true)
+        val viewModel = TunerViewModel { source }
+        viewModel.setProfilingEnabled(true)
+        viewModel.startTuning()
+
+        try {
+            val onset = source.sampleTimeNanos((LEAD_IN_SECONDS * source.sampleRate).toLong())
+            var firstNote = 0L
+            var lock = 0L
+            runBlocking {
+                withTimeout(TIMEOUT_MS) {
+                    viewModel.tuningState.first { state ->
+                        if (state !is TunerViewModel.TuningState.Detected) return@first false
+                        val now = System.nanoTime()
+                        if (firstNote == 0L) firstNote = now
+                        val locked = state.result.noteName == note &&
+                            Math.abs(state.result.cents) < UiConstants.DEFAULT_IN_TUNE_THRESHOLD_CENTS
+                        if (locked) lock = now
+                        locked
+                    }
+                }
+            }
+
+            // Let the rest of the tone play so the histogram covers steady state
+            val deadline = System.nanoTime() + (TIMEOUT_MS * NANOS_PER_MS).toLong()
+            while (source.isRecording() && System.nanoTime() < deadline) Thread.sleep(POLL_MS)
+            val analysed = viewModel.getPipelineStats()?.analysedFrames ?: 0L
+            val playedSeconds = pcm.size.toDouble() / AudioConfig.SAMPLE_RATE
+            return Measurement(
+                note = note,
+                firstNoteMs = (firstNote - onset) / NANOS_PER_MS,
+                lockMs = (lock - onset) / NANOS_PER_MS,
+                framesPerSecond = analysed / playedSeconds,
+                endToEnd = viewModel.getProfileSnapshot()[StageProfiler.Stage.END_TO_END]
+            )
+        } finally {
+            viewModel.stopTuning()
+        }
+    }
+
+    // ========== Reporting ==========
+
+    private fun formatReport(measurements: List<Measurement>): String {
+        val builder = StringBuilder()
+        builder.append("%-6s %14s %10s %10s %10s %10s %10s%n".format(
+            "note", "first note ms", "lock ms", "frames/s", "e2e p50", "e2e p95", "e2e max"))
+        for (m in measurements) {
+            builder.append("%-6s %14.1f %10.1f %10.1f %10.2f %10.2f %10.2f%n".format(
+                m.note, m.firstNoteMs, m.lockMs, m.framesPerSecond,
+                m.endToEnd.percentileNs(50.0) / NANOS_PER_MS,
+                m.endToEnd.percentileNs(95.0) / NANOS_PER_MS,
+                m.endToEnd.maxNs / NANOS_PER_MS))
+        }
+
+        builder.append("%nEND_TO_END histogram, all notes (bucket upper bound ms: windows)%n".format())
+        val histogram = LongArray(StageProfiler.HISTOGRAM_BUCKETS)
+        for (m in measurements) {
+            for (i in histogram.indices) histogram[i] += m.endToEnd.histogram[i]
+        }
+        for (i in histogram.indices) {
+            if (histogram[i] == 0L) continue
+            builder.append("%10.3f: %d%n".format((1L shl (i + 1)) / NANOS_PER_MS, histogram[i]))
+        }
+        return builder.toString()
+    }
+}
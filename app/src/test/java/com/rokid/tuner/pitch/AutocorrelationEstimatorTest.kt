@@ -0,0 +1,105 @@
+package com.rokid.tuner.pitch
+
+import com.rokid.tuner.audio.AudioConfig
+import com.rokid.tuner.constants.AlgorithmConstants
+import org.junit.Assert.*
+import org.junit.Before
+import org.junit.Test
+import java.util.Random
+
+/**
+ * Unit tests for AutocorrelationEstimator.
+ * Tests accuracy, peak selection and clarity rejection.
+ */
+class AutocorrelationEstimatorTest {
+
+    private lateinit var estimator: AutocorrelationEstimator
+
+    private val frequencies = listOf(82.41, 110.0, 146.83, 196.0, 246.94, 329.63, 440.0, 659.26, 987.77, 1318.5)
+
+    @Before
+    fun setUp() {
+        estimator = AutocorrelationEstimator()
+    }
+
+    private fun tone(frequency: Double, amplitudes: DoubleArray, samples: Int = 2048) = FloatArray(samples) { i ->
+        var value = 0.0
+        for (h in amplitudes.indices) {
+            value += amplitudes[h] * Math.sin(2.0 * Math.PI * frequency * (h + 1) * i / AudioConfig.SAMPLE_RATE + h)
+        }
+        (0.3 * value).toFloat()
+    }
+
+    private fun centsError(buffer: FloatArray, frequency: Double): Float {
+        val estimate = estimator.estimate(buffer, 0, buffer.size, AlgorithmConstants.DEFAULT_CLARITY_THRESHOLD)
+        assertTrue("no pitch at $frequency Hz", estimate.frequency > AlgorithmConstants.INVALID_FREQUENCY)
+        return NoteFinder.frequencyToCents(estimate.frequency, frequency)
+    }
+
+    // ========== Accuracy tests ==========
+
+    @Test
+    fun `estimate is within 0_1 cent for sine input`() {
+        for (frequency in frequencies) {
+            assertEquals("$frequency Hz", 0f, centsError(tone(frequency, doubleArrayOf(2.5)), frequency), 0.1f)
+        }
+    }
+
+    @Test
+    fun `estimate is within 1 cent for harmonic tones`() {
+        val amplitudes = DoubleArray(6) { 1.0 / (it + 1) }
+        for (frequency in frequencies) {
+            assertEquals("$frequency Hz", 0f, centsError(tone(frequency, amplitudes), frequency), 1f)
+        }
+    }
+
+    @Test
+    fun `estimate picks the fundamental under a strong second harmonic`() {
+        val amplitudes = doubleArrayOf(0.3, 1.0, 0.5)
+        for (frequency in frequencies) {
+            assertEquals("$frequency Hz", 0f, centsError(tone(frequency, amplitudes), frequency), 1f)
+        }
+    }
+
+    @Test
+    fun `estimate honours offset`() {
+        val signal = tone(196.0, doubleArrayOf(1.0, 0.5))
+        val shifted = FloatArray(3000)
+        System.arraycopy(signal, 0, shifted, 700, signal.size)
+
+        assertEquals(estimator.estimate(signal, 0, 2048, 0.6), estimator.estimate(shifted, 700, 2048, 0.6))
+    }
+
+    // ========== Clarity tests ==========
+
+    @Test
+    fun `clarity is near 0 for a periodic signal`() {
+        assertEquals(0.0, estimator.estimate(tone(220.0, doubleArrayOf(1.0, 0.5)), 0, 2048, 0.6).clarity, 0.01)
+    }
+
+    @Test
+    fun `noise is rejected`() {
+        val random = Random(3)
+        val noise = FloatArray(2048) { (random.nextGaussian() * 0.3).toFloat() }
+
+        assertEquals(AlgorithmConstants.INVALID_FREQUENCY, estimator.estimate(noise, 0, 2048, 0.6).frequency, 0.0)
+    }
+
+    @Test
+    fun `silence and short frames give no pitch`() {
+        assertEquals(PitchEstimator.NO_PITCH, estimator.estimate(FloatArray(2048), 0, 2048, 0.6))
+        assertEquals(PitchEstimator.NO_PITCH, estimator.estimate(FloatArray(40), 0, 40, 0.6))
+    }
+
+    // ========== Range tests ==========
+
+    @Test
+    fun `extended range finds low bass notes`() {
+        estimator.range = FrequencyRange.EXTENDED
+        val amplitudes = DoubleArray(6) { 1.0 / (it + 1) }
+        for (frequency in listOf(30.87, 41.2, 55.0)) {
+            val signal = tone(frequency, amplitudes, FrequencyRange.EXTENDED.windowSize)
+            assertEquals("$frequency Hz", 0f, centsError(signal, frequency), 1f)
+        }
+    }
+}
@@ -0,0 +1,104 @@
+package com.rokid.tuner.pitch
+
+import com.rokid.tuner.audio.AudioConfig
+import org.junit.Assert.*
+import org.junit.Test
+
+/**
+ * Unit tests for Decimator.
+ * Tests output sizing, filter response and factor selection.
+ */
+class DecimatorTest {
+
+    private fun sine(frequency: Double, samples: Int) = FloatArray(samples) {
+        Math.sin(2 * Math.PI * frequency * it / AudioConfig.SAMPLE_RATE).toFloat()
+    }
+
+    private fun rms(data: FloatArray, count: Int): Double {
+        var sum = 0.0
+        for (i in 0 until count) sum += data[i] * data[i]
+        return Math.sqrt(sum / count)
+    }
+
+    // ========== Output sizing tests ==========
+
+    @Test
+    fun `outputLength covers complete filter spans only`() {
+        val decimator = Decimator(factor = 4, taps = 31)
+
+        assertEquals(0, decimator.outputLength(30))
+        assertEquals(1, decimator.outputLength(31))
+        assertEquals((2048 - 31) / 4 + 1, decimator.outputLength(2048))
+    }
+
+    @Test
+    fun `process writes outputLength samples`() {
+        val decimator = Decimator(factor = 4)
+        val out = FloatArray(1024)
+
+        assertEquals(decimator.outputLength(2048), decimator.process(FloatArray(2048), 0, 2048, out))
+    }
+
+    @Test
+    fun `process honours offset`() {
+        val decimator = Decimator(factor = 2, taps = 1)
+        val input = FloatArray(10) { it.toFloat() }
+        val out = FloatArray(4)
+
+        decimator.process(input, 2, 8, out)
+
+        assertArrayEquals(floatArrayOf(2f, 4f, 6f, 8f), out, 1e-6f)
+    }
+
+    // ========== Filter response tests ==========
+
+    @Test
+    fun `filter has unity gain at DC`() {
+        val decimator = Decimator(factor = 4)
+        val out = FloatArray(256)
+        val count = decimator.process(FloatArray(1024) { 0.25f }, 0, 1024, out)
+
+        for (i in 0 until count) assertEquals(0.25f, out[i], 1e-5f)
+    }
+
+    @Test
+    fun `filter passes guitar fundamentals`() {
+        val decimator = Decimator(factor = 4)
+        val out = FloatArray(1024)
+        val count = decimator.process(sine(440.0, 4096), 0, 4096, out)
+
+        assertEquals(Math.sqrt(0.5), rms(out, count), 0.02)
+    }
+
+    @Test
+    fun `filter rejects content that would alias into the guitar band`() {
+        val decimator = Decimator(factor = 4)
+        val out = FloatArray(1024)
+        // 10 kHz folds to ~1 kHz at the 11.025 kHz output rate
+        val count = decimator.process(sine(10000.0, 4096), 0, 4096, out)
+
+        assertTrue("Aliased RMS ${rms(out, count)}", rms(out, count) < 0.01)
+    }
+
+    // ========== Factor selection tests ==========
+
+    @Test
+    fun `factorFor picks 4 for the guitar band at 44_1 kHz`() {
+        assertEquals(4, Decimator.factorFor(1350.0, 44100))
+    }
+
+    @Test
+    fun `factorFor returns 1 when decimation would undersample`() {
+        assertEquals(1, Decimator.factorFor(5000.0, 44100))
+    }
+
+    @Test(expected = IllegalArgumentException::class)
+    fun `constructor rejects factor below 2`() {
+        Decimator(factor = 1)
+    }
+
+    @Test(expected = IllegalArgumentException::class)
+    fun `constructor rejects even tap counts`() {
+        Decimator(factor = 4, taps = 30)
+    }
+}
@@ -0,0 +1,56 @@
+package com.rokid.tuner.pitch
+
+import com.rokid.tuner.audio.AudioConfig
+import com.rokid.tuner.constants.AlgorithmConstants
+import org.junit.Assert.*
+import org.junit.Test
+
+/**
+ * Unit tests for FrequencyRange.
+ * Tests that each range's window and decimation can hold its lowest period.
+ */
+class FrequencyRangeTest {
+
+    @Test
+    fun `guitar range matches the default analysis window`() {
+        assertEquals(AudioConfig.ANALYSIS_WINDOW_SIZE, FrequencyRange.GUITAR.windowSize)
+        assertEquals(1, FrequencyRange.GUITAR.decimationFactor)
+    }
+
+    @Test
+    fun `extended range reaches below low B`() {
+        assertTrue(FrequencyRange.EXTENDED.minFrequency < 30.87)
+        assertTrue(FrequencyRange.EXTENDED.minFrequency < FrequencyRange.GUITAR.minFrequency)
+        assertEquals(FrequencyRange.GUITAR.maxFrequency, FrequencyRange.EXTENDED.maxFrequency, 0.0)
+    }
+
+    @Test
+    fun `every range fits its lowest period in half the window`() {
+        for (range in FrequencyRange.values()) {
+            val period = AudioConfig.SAMPLE_RATE / range.minFrequency
+            assertTrue("$range", period <= range.windowSize / AlgorithmConstants.DIVISOR_FOR_HALF_BUFFER)
+        }
+    }
+
+    @Test
+    fun `every decimated range fits its lowest period in half the decimated window`() {
+        for (range in FrequencyRange.values().filter { it.decimationFactor > 1 }) {
+            val decimator = Decimator(range.decimationFactor)
+            val period = AudioConfig.SAMPLE_RATE.toDouble() / range.decimationFactor / range.minFrequency
+            assertTrue("$range", period + 2 <= decimator.outputLength(range.windowSize) / AlgorithmConstants.DIVISOR_FOR_HALF_BUFFER)
+        }
+    }
+
+    @Test
+    fun `extended range decimation follows the top of the band`() {
+        assertEquals(Decimator.factorFor(FrequencyRange.EXTENDED.maxFrequency), FrequencyRange.EXTENDED.decimationFactor)
+    }
+
+    @Test
+    fun `MAX_WINDOW_SIZE covers every range`() {
+        for (range in FrequencyRange.values()) {
+            assertTrue("$range", range.windowSize <= FrequencyRange.MAX_WINDOW_SIZE)
+        }
+        assertEquals(AudioConfig.EXTENDED_ANALYSIS_WINDOW_SIZE, FrequencyRange.MAX_WINDOW_SIZE)
+    }
+}
@@ -0,0 +1,122 @@
+package com.rokid.tuner.pitch
+
+import com.rokid.tuner.audio.AudioConfig
+import com.rokid.tuner.constants.MusicalConstants
+import org.junit.Assert.*
+import org.junit.Before
+import org.junit.Test
+import java.util.Random
+
+/**
+ * Unit tests for GoertzelBank.
+ * Tests string identification, phase-based frequency estimation and energy scoring.
+ */
+class GoertzelBankTest {
+
+    private lateinit var bank: GoertzelBank
+    private lateinit var standardTargets: DoubleArray
+
+    @Before
+    fun setUp() {
+        standardTargets = DoubleArray(MusicalConstants.STANDARD_TUNING_SEMITONES.size) {
+            440.0 * Math.pow(2.0, MusicalConstants.STANDARD_TUNING_SEMITONES[it] / 12.0)
+        }
+        bank = GoertzelBank().apply { setTargets(standardTargets) }
+    }
+
+    /** Sum of harmonics with 1/h amplitudes, like a plucked string. */
+    private fun harmonicTone(frequency: Double, samples: Int, amplitudes: DoubleArray = DoubleArray(6) { 1.0 / (it + 1) }): FloatArray {
+        val sampleRate = AudioConfig.SAMPLE_RATE.toDouble()
+        return FloatArray(samples) { i ->
+            var value = 0.0
+            for (h in amplitudes.indices) {
+                value += amplitudes[h] * Math.sin(2.0 * Math.PI * frequency * (h + 1) * i / sampleRate + h)
+            }
+            (0.3 * value).toFloat()
+        }
+    }
+
+    private fun detune(frequency: Double, cents: Double) = frequency * Math.pow(2.0, cents / 1200.0)
+
+    // ========== Identification tests ==========
+
+    @Test
+    fun `analyse identifies each standard string`() {
+        for (index in standardTargets.indices) {
+            for (cents in listOf(-40.0, 0.0, 40.0)) {
+                val match = bank.analyse(harmonicTone(detune(standardTargets[index], cents), 2048), 0, 2048)!!
+
+                assertEquals("string $index at $cents cents", index, match.targetIndex)
+            }
+        }
+    }
+
+    @Test
+    fun `analyse identifies strings with a weak fundamental`() {
+        for (amplitudes in listOf(doubleArrayOf(0.2, 1.0, 0.8, 0.5, 0.3, 0.2), doubleArrayOf(0.2, 1.0, 0.7, 0.5))) {
+            for (index in standardTargets.indices) {
+                for (cents in listOf(-40.0, 0.0, 40.0)) {
+                    val frequency = detune(standardTargets[index], cents)
+                    val match = bank.analyse(harmonicTone(frequency, 2048, amplitudes), 0, 2048)!!
+                    val error = NoteFinder.frequencyToCents(match.frequency, frequency)
+
+                    assertEquals("string $index at $cents cents", index, match.targetIndex)
+                    assertEquals("string $index at $cents cents off by $error", 0f, error, 2f)
+                }
+            }
+        }
+    }
+
+    // ========== Frequency estimation tests ==========
+
+    @Test
+    fun `analyse estimates detuned strings within 2 cents`() {
+        for (index in standardTargets.indices) {
+            for (cents in listOf(-45.0, -20.0, 0.0, 10.0, 30.0, 45.0)) {
+                val frequency = detune(standardTargets[index], cents)
+                val match = bank.analyse(harmonicTone(frequency, 2048), 0, 2048)!!
+                val error = NoteFinder.frequencyToCents(match.frequency, frequency)
+
+                assertEquals("string $index at $cents cents off by $error", 0f, error, 2f)
+            }
+        }
+    }
+
+    @Test
+    fun `analyse honours offset`() {
+        val tone = harmonicTone(110.0, 2048)
+        val shifted = FloatArray(3000)
+        System.arraycopy(tone, 0, shifted, 500, tone.size)
+
+        assertEquals(bank.analyse(tone, 0, 2048), bank.analyse(shifted, 500, 2048))
+    }
+
+    // ========== Energy scoring tests ==========
+
+    @Test
+    fun `energyRatio is close to 1 for a pure tone at a target`() {
+        val match = bank.analyse(harmonicTone(110.0, 2048, doubleArrayOf(1.0)), 0, 2048)!!
+
+        assertEquals(1.0, match.energyRatio, 0.02)
+    }
+
+    @Test
+    fun `energyRatio is low for noise`() {
+        val random = Random(42)
+        val noise = FloatArray(2048) { (random.nextGaussian() * 0.3).toFloat() }
+
+        assertTrue(bank.analyse(noise, 0, 2048)!!.energyRatio < 0.1)
+    }
+
+    @Test
+    fun `analyse returns null for silence, short frames and no targets`() {
+        assertNull(bank.analyse(FloatArray(2048), 0, 2048))
+        assertNull(bank.analyse(harmonicTone(110.0, 256), 0, 256))
+        assertNull(GoertzelBank().analyse(harmonicTone(110.0, 2048), 0, 2048))
+    }
+
+    @Test(expected = IllegalArgumentException::class)
+    fun `setTargets rejects frequencies above Nyquist`() {
+        bank.setTargets(doubleArrayOf(110.0, 30000.0))
+    }
+}
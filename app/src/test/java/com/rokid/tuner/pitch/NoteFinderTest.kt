@@ -50,11 +50,8 @@ class NoteFinderTest {
     @Test
     fun `findNote returns correct note for A3`() {
         // A3 = 220Hz (one octave below A4)
-        // Note: Due to implementation using integer division for octave calculation,
-        // we verify the actual behavior matches the expected output
         val result = noteFinder.findNote(220.0)
-        // The note name should contain "A" and the cents should be ~0
-        assertTrue(result.noteName.startsWith("A"))
+        assertEquals("A3", result.noteName)
         assertEquals(0f, result.cents, 0.5f)
     }
 
@@ -62,8 +59,7 @@ class NoteFinderTest {
     fun `findNote returns correct note for A2`() {
         // A2 = 110Hz (two octaves below A4)
         val result = noteFinder.findNote(110.0)
-        // The note name should contain "A" and the cents should be ~0
-        assertTrue(result.noteName.startsWith("A"))
+        assertEquals("A2", result.noteName)
         assertEquals(0f, result.cents, 0.5f)
     }
 
@@ -197,29 +193,42 @@ class NoteFinderTest {
         val e2Frequency = 440.0 * Math.pow(2.0, -29.0 / 12.0)
         val result = noteFinder.findNote(e2Frequency)
         
-        // Note should be E (regardless of octave number due to implementation quirk)
-        assertTrue("Note should be E", result.noteName.startsWith("E"))
+        assertEquals("E2", result.noteName)
         assertEquals(0f, result.cents, 1.0f)
     }
 
+    @Test
+    fun `findNote names octaves below C4 correctly`() {
+        val expected = mapOf(
+            -46 to "B0",
+            -41 to "E1",
+            -36 to "A1",
+            -24 to "A2",
+            -22 to "B2",
+            -10 to "B3",
+            -9 to "C4"
+        )
+        for ((semitones, name) in expected) {
+            val frequency = 440.0 * Math.pow(2.0, semitones / 12.0)
+            assertEquals("$semitones semitones from A4", name, noteFinder.findNote(frequency).noteName)
+        }
+    }
+
     @Test
     fun `findNote handles guitar string frequencies correctly`() {
         // Standard guitar tuning frequencies (approximations)
-        // We test that the correct note letter is detected, regardless of octave
-        // due to the implementation's integer division behavior for octave calculation
         val guitarStrings = mapOf(
-            82.41 to "E",   // Low E
-            110.0 to "A",   // A
-            146.83 to "D",  // D
-            196.0 to "G",   // G
-            246.94 to "B",  // B
-            329.63 to "E"   // High E
+            82.41 to "E2",   // Low E
+            110.0 to "A2",   // A
+            146.83 to "D3",  // D
+            196.0 to "G3",   // G
+            246.94 to "B3",  // B
+            329.63 to "E4"   // High E
         )
         
-        guitarStrings.forEach { (frequency, expectedNoteLetter) ->
+        guitarStrings.forEach { (frequency, expectedNote) ->
             val result = noteFinder.findNote(frequency)
-            assertTrue("Expected note to start with $expectedNoteLetter for frequency $frequency Hz, got ${result.noteName}", 
-                result.noteName.startsWith(expectedNoteLetter))
+            assertEquals("Note for frequency $frequency Hz", expectedNote, result.noteName)
             // Cents should be close to 0 for these standard frequencies
             assertEquals("Cents should be near 0 for $frequency Hz", 0f, result.cents, 5f)
         }
@@ -376,4 +385,90 @@ class NoteFinderTest {
         assertNotNull(result.probability)
         assertNotNull(result.targetFrequency)
     }
+
+    // ========== Note table tests ==========
+
+    @Test
+    fun `findNote returns interned note names`() {
+        val first = noteFinder.findNote(440.0)
+        val second = noteFinder.findNote(441.0)
+        
+        assertSame(first.noteName, second.noteName)
+    }
+
+    @Test
+    fun `findNote target frequency follows reference frequency changes`() {
+        noteFinder.setReferenceFrequency(432.0)
+        assertEquals(432.0, noteFinder.findNote(432.0, 432.0).targetFrequency, 0.0001)
+        
+        // A different reference rebuilds the table on demand
+        assertEquals(440.0, noteFinder.findNote(440.0).targetFrequency, 0.0001)
+        assertEquals(432.0, noteFinder.findNote(432.0, 432.0).targetFrequency, 0.0001)
+    }
+
+    @Test
+    fun `findNote keeps octave naming for notes below A4`() {
+        // Octaves change at C, so the B just below middle C is B3
+        val b3Frequency = 440.0 * Math.pow(2.0, -10.0 / 12.0)
+        assertEquals("B3", noteFinder.findNote(b3Frequency).noteName)
+        assertEquals("C4", noteFinder.findNote(440.0 * Math.pow(2.0, -9.0 / 12.0)).noteName)
+    }
+
+    @Test
+    fun `findNotes matches findNote for each frequency`() {
+        val frequencies = doubleArrayOf(82.41, 110.0, 146.83, 196.0, 246.94, 329.63, 445.0, 1000.0)
+        val noteIndices = IntArray(frequencies.size)
+        val cents = FloatArray(frequencies.size)
+        
+        noteFinder.findNotes(frequencies, frequencies.size, noteIndices, cents)
+        
+        for (i in frequencies.indices) {
+            val expected = noteFinder.findNote(frequencies[i])
+            assertEquals(expected.noteName, NoteFinder.noteName(noteIndices[i]))
+            assertEquals(expected.cents, cents[i], 0.0001f)
+            assertEquals(expected.targetFrequency, noteFinder.targetFrequency(noteIndices[i]), 0.0001)
+        }
+    }
+
+    @Test
+    fun `findNotes returns MIDI note numbers`() {
+        val frequencies = doubleArrayOf(440.0, 261.63, 880.0)
+        val noteIndices = IntArray(3)
+        val cents = FloatArray(3)
+        
+        noteFinder.findNotes(frequencies, 3, noteIndices, cents)
+        
+        assertArrayEquals(intArrayOf(69, 60, 81), noteIndices)
+    }
+
+    @Test
+    fun `findNotes marks invalid and out of range frequencies`() {
+        val frequencies = doubleArrayOf(0.0, -5.0, 1.0, 100000.0)
+        val noteIndices = IntArray(4)
+        val cents = FloatArray(4) { 12f }
+        
+        noteFinder.findNotes(frequencies, 4, noteIndices, cents)
+        
+        for (i in 0 until 4) {
+            assertEquals(NoteFinder.INVALID_NOTE_INDEX, noteIndices[i])
+            assertEquals(0f, cents[i], 0f)
+        }
+        assertEquals("--", NoteFinder.noteName(NoteFinder.INVALID_NOTE_INDEX))
+    }
+
+    @Test
+    fun `findNotes only writes count entries`() {
+        val noteIndices = intArrayOf(-7, -7)
+        val cents = FloatArray(2)
+        
+        noteFinder.findNotes(doubleArrayOf(440.0, 440.0), 1, noteIndices, cents)
+        
+        assertEquals(69, noteIndices[0])
+        assertEquals(-7, noteIndices[1])
+    }
+
+    @Test(expected = IllegalArgumentException::class)
+    fun `findNotes rejects count larger than arrays`() {
+        noteFinder.findNotes(DoubleArray(2), 3, IntArray(3), FloatArray(3))
+    }
 }
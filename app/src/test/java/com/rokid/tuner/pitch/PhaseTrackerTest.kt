@@ -0,0 +1,178 @@
+package com.rokid.tuner.pitch
+
+import com.rokid.tuner.audio.AudioConfig
+import org.junit.Assert.*
+import org.junit.Before
+import org.junit.Test
+
+/**
+ * Unit tests for PhaseTracker.
+ * Tests drift accuracy, phase extrapolation, block-size independence and rejection of
+ * signals away from the target.
+ */
+class PhaseTrackerTest {
+
+    private lateinit var tracker: PhaseTracker
+
+    @Before
+    fun setUp() {
+        tracker = PhaseTracker()
+    }
+
+    /** Sum of 4 harmonics with 1/h amplitudes, like a plucked string. */
+    private fun harmonicTone(frequency: Double, samples: Int): FloatArray {
+        val sampleRate = AudioConfig.SAMPLE_RATE.toDouble()
+        return FloatArray(samples) { i ->
+            var value = 0.0
+            for (h in 0 until 4) {
+                value += Math.sin(2.0 * Math.PI * frequency * (h + 1) * i / sampleRate + h) / (h + 1)
+            }
+            (0.3 * value).toFloat()
+        }
+    }
+
+    private fun detune(frequency: Double, cents: Double) = frequency * Math.pow(2.0, cents / 1200.0)
+
+    /** Feeds signal in blocks and returns the reading after the last one. */
+    private fun track(target: Double, signal: FloatArray, blockSize: Int = BLOCK_SIZE): PhaseTracker.Reading? {
+        tracker.setTarget(target)
+        var reading: PhaseTracker.Reading? = null
+        var offset = 0
+        while (offset + blockSize <= signal.size) {
+            reading = tracker.process(signal, offset, blockSize, offset.toLong())
+            offset += blockSize
+        }
+        return reading
+    }
+
+    // ========== Accuracy tests ==========
+
+    @Test
+    fun `in-tune tone reads near zero cents`() {
+        for (target in doubleArrayOf(82.41, 329.63, 1318.5)) {
+            val reading = track(target, harmonicTone(target, SETTLED_SAMPLES))!!
+
+            assertEquals("$target Hz", 0f, reading.cents, 0.05f)
+        }
+    }
+
+    @Test
+    fun `small offsets are resolved to a tenth of a cent`() {
+        for (cents in doubleArrayOf(-2.0, -0.5, 0.3, 2.0)) {
+            val reading = track(82.41, harmonicTone(detune(82.41, cents), SETTLED_SAMPLES))!!
+
+            assertEquals("$cents cents", cents.toFloat(), reading.cents, 0.1f)
+        }
+    }
+
+    @Test
+    fun `large offsets stay within half a cent`() {
+        for (cents in doubleArrayOf(-40.0, 40.0)) {
+            val reading = track(110.0, harmonicTone(detune(110.0, cents), SETTLED_SAMPLES))!!
+
+            assertEquals("$cents cents", cents.toFloat(), reading.cents, 0.5f)
+        }
+    }
+
+    @Test
+    fun `drift is the frequency difference from the target`() {
+        val sharp = track(196.0, harmonicTone(196.5, SETTLED_SAMPLES))!!
+        val flat = track(196.0, harmonicTone(195.5, SETTLED_SAMPLES))!!
+
+        assertEquals(0.5, sharp.driftHz, 0.01)
+        assertEquals(-0.5, flat.driftHz, 0.01)
+        assertEquals(196.0, sharp.targetFrequency, 0.0)
+    }
+
+    @Test
+    fun `readings do not depend on block size`() {
+        val signal = harmonicTone(detune(146.83, 3.0), SETTLED_SAMPLES)
+
+        val large = track(146.83, signal, BLOCK_SIZE)!!
+        val small = track(146.83, signal, BLOCK_SIZE / 8)!!
+
+        assertEquals(large.driftHz, small.driftHz, 1e-9)
+        assertEquals(large.phase, small.phase, 1e-9)
+    }
+
+    // ========== Phase tests ==========
+
+    @Test
+    fun `phaseAt extrapolates at the drift`() {
+        val sharp = PhaseTracker.Reading(110.0, 0.0, 1.0, 15.7f, 1_000L)
+        val flat = sharp.copy(driftHz = -1.0)
+
+        assertEquals(Math.PI / 2, sharp.phaseAt(250_001_000L), 1e-9)
+        assertEquals(3 * Math.PI / 2, flat.phaseAt(250_001_000L), 1e-9)
+    }
+
+    @Test
+    fun `phaseAt wraps into one turn`() {
+        val reading = PhaseTracker.Reading(110.0, -Math.PI / 2, 3.0, 47f, 0L)
+
+        for (nanos in longArrayOf(0L, 100_000_000L, 1_000_000_000L, 7_333_000_000L)) {
+            val phase = reading.phaseAt(nanos)
+            assertTrue("$phase at $nanos ns", phase >= 0.0 && phase < 2 * Math.PI)
+        }
+        assertEquals(3 * Math.PI / 2, reading.phaseAt(0L), 1e-9)
+    }
+
+    @Test
+    fun `phase stands still on the target`() {
+        val signal = harmonicTone(220.0, SETTLED_SAMPLES + BLOCK_SIZE)
+        val before = track(220.0, signal.copyOf(SETTLED_SAMPLES))!!
+        val after = tracker.process(signal, SETTLED_SAMPLES, BLOCK_SIZE, SETTLED_SAMPLES.toLong())!!
+
+        assertEquals(before.phase, after.phase, 0.01)
+    }
+
+    // ========== Rejection tests ==========
+
+    @Test
+    fun `process returns null without a target or before a drift is measured`() {
+        val signal = harmonicTone(110.0, BLOCK_SIZE)
+
+        assertNull(tracker.process(signal, 0, BLOCK_SIZE, 0L))
+        tracker.setTarget(110.0)
+        assertNull(tracker.process(signal, 0, 256, 0L))
+    }
+
+    @Test
+    fun `process returns null for a signal away from the target`() {
+        assertNull(track(82.41, harmonicTone(164.81, SETTLED_SAMPLES)))
+        assertNull(track(82.41, FloatArray(SETTLED_SAMPLES)))
+    }
+
+    @Test
+    fun `clear restarts the measurement`() {
+        val signal = harmonicTone(110.0, SETTLED_SAMPLES)
+        assertNotNull(track(110.0, signal))
+
+        tracker.clear()
+
+        assertNull(tracker.process(signal, 0, 256, 0L))
+        assertEquals(110.0, tracker.targetFrequency, 0.0)
+    }
+
+    @Test
+    fun `a zero target stops tracking`() {
+        val signal = harmonicTone(110.0, SETTLED_SAMPLES)
+        track(110.0, signal)
+
+        tracker.setTarget(0.0)
+
+        assertNull(tracker.process(signal, 0, BLOCK_SIZE, 0L))
+    }
+
+    @Test(expected = IllegalArgumentException::class)
+    fun `setTarget rejects frequencies above Nyquist`() {
+        tracker.setTarget(30000.0)
+    }
+
+    companion object {
+        private const val BLOCK_SIZE = 2048
+
+        // ~1 s, a whole number of blocks of either size used above
+        private const val SETTLED_SAMPLES = 21 * BLOCK_SIZE
+    }
+}
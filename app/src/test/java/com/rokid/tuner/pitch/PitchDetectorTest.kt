@@ -4,6 +4,7 @@ import com.rokid.tuner.audio.AudioConfig
 import com.rokid.tuner.constants.AlgorithmConstants
 import com.rokid.tuner.constants.MusicalConstants
 import com.rokid.tuner.constants.UiConstants
+import com.rokid.tuner.profiling.StageProfiler
 import org.junit.Assert.*
 import org.junit.Before
 import org.junit.Test
@@ -551,6 +552,36 @@ class PitchDetectorTest {
         }
     }
 
+    @Test
+    fun `setSmoothing with EMA still detects pitch`() {
+        pitchDetector.setSensitivity(100)
+        pitchDetector.setSmoothing(PitchSmoother.Mode.EMA, 3)
+        
+        val sineWave = generateSineWave(330.0, 0.8f, 4096)
+        var result: PitchDetector.PitchResult? = null
+        for (i in 0 until 5) {
+            result = pitchDetector.detectPitch(sineWave)
+        }
+        
+        assertNotNull("Should detect pitch with EMA smoothing", result)
+        assertEquals(330.0, result!!.frequency, 2.0)
+    }
+
+    @Test
+    fun `setSmoothing with Kalman still detects pitch`() {
+        pitchDetector.setSensitivity(100)
+        pitchDetector.setSmoothing(PitchSmoother.Mode.KALMAN, 5)
+        
+        val sineWave = generateSineWave(196.0, 0.8f, 4096)
+        var result: PitchDetector.PitchResult? = null
+        for (i in 0 until 5) {
+            result = pitchDetector.detectPitch(sineWave)
+        }
+        
+        assertNotNull("Should detect pitch with Kalman smoothing", result)
+        assertEquals(196.0, result!!.frequency, 2.0)
+    }
+
     // ========== Note locking tests ==========
 
     @Test
@@ -576,8 +607,503 @@ class PitchDetectorTest {
         // or still show the locked note
     }
 
+    // ========== Decimation tests ==========
+
+    @Test
+    fun `full rate estimate is within a few cents for sine input`() {
+        val frequency = 246.94
+        val yin = pitchDetector.estimateFrequencyYIN(generateSineWave(frequency, 0.8f, 2048), 0, 2048)
+
+        assertEquals(0.0, NoteFinder.frequencyToCents(yin.frequency, frequency).toDouble(), 2.0)
+    }
+
+    @Test
+    fun `full rate estimate interpolates at the bottom of the first trough`() {
+        val sampleRate = AudioConfig.SAMPLE_RATE.toDouble()
+        val threshold = AlgorithmConstants.YIN_THRESHOLD_OFFSET +
+            AlgorithmConstants.DEFAULT_CLARITY_THRESHOLD * AlgorithmConstants.YIN_THRESHOLD_MULTIPLIER
+        val tauMin = (sampleRate / MusicalConstants.MAX_GUITAR_FREQUENCY).toInt()
+        val tauMax = (sampleRate / MusicalConstants.MIN_GUITAR_FREQUENCY).toInt()
+
+        for (frequency in listOf(82.41, 110.0, 146.83, 196.0, 246.94, 329.63)) {
+            val signal = generateSineWave(frequency, 0.8f, 2048)
+            val d = DoubleArray(tauMax)
+            YinDifferenceFunction().compute(signal, 0, signal.size, tauMax, d)
+            val dPrime = DoubleArray(tauMax) { 1.0 }
+            var runningSum = 0.0
+            for (t in 1 until tauMax) {
+                runningSum += d[t]
+                dPrime[t] = d[t] * t / runningSum
+            }
+            val crossing = (tauMin until tauMax).first { dPrime[it] < threshold }
+            var bottom = crossing
+            while (dPrime[bottom + 1] < dPrime[bottom]) bottom++
+
+            // Before: interpolating where the threshold is crossed, on the falling slope
+            val before = sampleRate / parabolaMinimum(dPrime, crossing)
+            // After: interpolating around the trough's minimum
+            val after = pitchDetector.estimateFrequencyYIN(signal, 0, signal.size).frequency
+
+            assertTrue("$frequency Hz", bottom > crossing)
+            assertTrue("$frequency Hz", NoteFinder.frequencyToCents(before, frequency) < -50f)
+            assertEquals("$frequency Hz", sampleRate / parabolaMinimum(dPrime, bottom), after, 1e-3)
+            assertEquals("$frequency Hz", 0f, NoteFinder.frequencyToCents(after, frequency), 0.1f)
+        }
+    }
+
+    @Test
+    fun `setDecimation with refinement stays within 1 cent`() {
+        pitchDetector.setDecimation(Decimator.factorFor(MusicalConstants.MAX_GUITAR_FREQUENCY))
+
+        for (frequency in listOf(82.41, 110.0, 196.0, 329.63, 659.26, 1318.5)) {
+            val yin = pitchDetector.estimateFrequencyYIN(generateSineWave(frequency, 0.8f, 2048), 0, 2048)
+            val cents = NoteFinder.frequencyToCents(yin.frequency, frequency)
+            assertEquals("$frequency Hz off by $cents cents", 0f, cents, 1f)
+        }
+    }
+
+    @Test
+    fun `setDecimation without refinement stays within 20 cents`() {
+        pitchDetector.setDecimation(Decimator.factorFor(MusicalConstants.MAX_GUITAR_FREQUENCY), refine = false)
+
+        for (frequency in listOf(82.41, 110.0, 196.0, 329.63, 659.26, 1318.5)) {
+            val yin = pitchDetector.estimateFrequencyYIN(generateSineWave(frequency, 0.8f, 2048), 0, 2048)
+            val cents = NoteFinder.frequencyToCents(yin.frequency, frequency)
+            assertEquals("$frequency Hz off by $cents cents", 0f, cents, 20f)
+        }
+    }
+
+    @Test
+    fun `detectPitch works with decimation enabled`() {
+        pitchDetector.setSensitivity(100)
+        pitchDetector.setDecimation(Decimator.factorFor(MusicalConstants.MAX_GUITAR_FREQUENCY))
+
+        val sineWave = generateSineWave(110.0, 0.8f, 2048)
+        var result: PitchDetector.PitchResult? = null
+        for (i in 0 until 5) {
+            result = pitchDetector.detectPitch(sineWave)
+        }
+
+        assertNotNull(result)
+        assertEquals(110.0, result!!.frequency, 0.2)
+    }
+
+    @Test
+    fun `setDecimation with factor 1 restores full rate analysis`() {
+        val sineWave = generateSineWave(440.0, 0.8f, 2048)
+        val fullRate = pitchDetector.estimateFrequencyYIN(sineWave, 0, 2048)
+
+        pitchDetector.setDecimation(4)
+        pitchDetector.setDecimation(1)
+
+        assertEquals(fullRate, pitchDetector.estimateFrequencyYIN(sineWave, 0, 2048))
+    }
+
+    // ========== Tracking tests ==========
+
+    @Test
+    fun `tracking matches the full search on a sustained note`() {
+        val profiler = StageProfiler().apply { enabled = true }
+        val tracking = PitchDetector(profiler).apply { setSensitivity(100); setTrackingEnabled(true) }
+        val fullSearch = PitchDetector().apply { setSensitivity(100) }
+
+        for (frequency in listOf(82.41, 110.0, 329.63, 1318.5)) {
+            tracking.reset()
+            fullSearch.reset()
+            val sineWave = generateSineWave(frequency, 0.8f, 2048)
+            for (i in 0 until 6) {
+                val tracked = tracking.detectPitch(sineWave)
+                val expected = fullSearch.detectPitch(sineWave)
+                assertEquals("$frequency Hz frame $i", expected!!.frequency, tracked!!.frequency, 1e-6)
+            }
+        }
+
+        assertTrue(profiler.snapshot()[StageProfiler.Stage.TRACKING].count > 0)
+    }
+
+    @Test
+    fun `tracking is disabled by default`() {
+        val profiler = StageProfiler().apply { enabled = true }
+        val detector = PitchDetector(profiler).apply { setSensitivity(100) }
+        val sineWave = generateSineWave(110.0, 0.8f, 2048)
+
+        repeat(6) { detector.detectPitch(sineWave) }
+
+        assertEquals(0L, profiler.snapshot()[StageProfiler.Stage.TRACKING].count)
+        assertEquals(6L, profiler.snapshot()[StageProfiler.Stage.YIN].count)
+    }
+
+    @Test
+    fun `tracking runs a full search on a new pluck`() {
+        val profiler = StageProfiler().apply { enabled = true }
+        val detector = PitchDetector(profiler).apply { setSensitivity(100); setTrackingEnabled(true) }
+        val quiet = generateSineWave(110.0, 0.1f, 2048)
+        repeat(4) { detector.detectPitch(quiet) }
+        val fullSearches = profiler.snapshot()[StageProfiler.Stage.YIN].count
+
+        detector.detectPitch(generateSineWave(110.0, 0.8f, 2048))
+
+        assertEquals(fullSearches + 1, profiler.snapshot()[StageProfiler.Stage.YIN].count)
+    }
+
+    @Test
+    fun `tracking follows an octave jump without a new pluck`() {
+        val detector = PitchDetector().apply { setSensitivity(100); setTrackingEnabled(true) }
+        val low = generateSineWave(110.0, 0.8f, 2048)
+        repeat(6) { detector.detectPitch(low) }
+
+        // 220 Hz also has a trough at the 110 Hz period, so only a full search sees the jump
+        val high = generateSineWave(220.0, 0.8f, 2048)
+        var result: PitchDetector.PitchResult? = null
+        repeat(AlgorithmConstants.TRACKING_REVALIDATE_FRAMES + 6) { result = detector.detectPitch(high) ?: result }
+
+        assertNotNull(result)
+        assertEquals(220.0, result!!.frequency, 1.0)
+    }
+
+    @Test
+    fun `tracking runs only in ranges analysed at full rate`() {
+        for (range in FrequencyRange.values()) {
+            val profiler = StageProfiler().apply { enabled = true }
+            val detector = PitchDetector(profiler).apply {
+                setSensitivity(100)
+                setTrackingEnabled(true)
+                setFrequencyRange(range)
+            }
+            val sineWave = generateSineWave(110.0, 0.8f, range.windowSize)
+
+            repeat(6) { detector.detectPitch(sineWave) }
+
+            val tracked = profiler.snapshot()[StageProfiler.Stage.TRACKING].count
+            val fullSearches = profiler.snapshot()[StageProfiler.Stage.YIN].count
+            if (range.decimationFactor == 1) {
+                assertTrue("$range should track", tracked > 0)
+                assertEquals("$range", 6L, tracked + fullSearches)
+            } else {
+                assertEquals("$range should not track", 0L, tracked)
+                assertEquals("$range", 6L, fullSearches)
+            }
+        }
+    }
+
+    // ========== Estimator selection tests ==========
+
+    @Test
+    fun `YIN is the default estimator`() {
+        assertEquals(PitchEstimator.Engine.YIN, pitchDetector.getEstimator())
+    }
+
+    @Test
+    fun `every estimator detects guitar frequencies`() {
+        for (engine in PitchEstimator.Engine.values()) {
+            pitchDetector.setEstimator(engine)
+            for (frequency in listOf(82.41, 196.0, 659.26)) {
+                pitchDetector.reset()
+                val result = pitchDetector.detectPitch(generateSineWave(frequency, 0.8f, 2048))
+
+                assertEquals(engine, pitchDetector.getEstimator())
+                assertNotNull("$engine at $frequency Hz", result)
+                assertEquals("$engine at $frequency Hz", frequency, result!!.frequency, frequency * 0.005)
+            }
+        }
+    }
+
+    @Test
+    fun `setEstimator takes effect without resetting the note lock`() {
+        pitchDetector.setSensitivity(100)
+        val sineWave = generateSineWave(110.0, 0.8f, 2048)
+        repeat(3) { pitchDetector.detectPitch(sineWave) }
+
+        pitchDetector.setEstimator(PitchEstimator.Engine.MPM)
+
+        assertEquals(110.0, pitchDetector.detectPitch(sineWave)!!.frequency, 0.5)
+        assertEquals(110.0, pitchDetector.estimateFrequency(sineWave, 0, 2048).frequency, 0.05)
+    }
+
+    @Test
+    fun `tracking only runs with the YIN estimator`() {
+        val profiler = StageProfiler().apply { enabled = true }
+        val detector = PitchDetector(profiler).apply {
+            setSensitivity(100)
+            setTrackingEnabled(true)
+            setEstimator(PitchEstimator.Engine.MPM)
+        }
+        val sineWave = generateSineWave(110.0, 0.8f, 2048)
+
+        repeat(6) { detector.detectPitch(sineWave) }
+
+        assertEquals(0L, profiler.snapshot()[StageProfiler.Stage.TRACKING].count)
+        assertEquals(6L, profiler.snapshot()[StageProfiler.Stage.YIN].count)
+    }
+
+    // ========== Configuration snapshot tests ==========
+
+    @Test
+    fun `setters publish a new snapshot immediately`() {
+        val before = pitchDetector.getConfig()
+
+        pitchDetector.setSensitivity(0)
+        pitchDetector.setReferenceFrequency(432.0)
+
+        val after = pitchDetector.getConfig()
+        assertNotSame(before, after)
+        assertEquals(AlgorithmConstants.MAX_RMS_THRESHOLD, after.minRmsThreshold, 1e-9)
+        assertEquals(AlgorithmConstants.MIN_CLARITY_THRESHOLD, after.clarityThreshold, 1e-9)
+        assertEquals(432.0, after.referenceFrequency, 0.0)
+    }
+
+    @Test
+    fun `concurrent setters do not lose updates`() {
+        val threads = listOf(
+            Thread {
+                repeat(1000) { pitchDetector.setReferenceFrequency(430.0 + it % 10) }
+                pitchDetector.setReferenceFrequency(442.0)
+            },
+            Thread {
+                repeat(1000) { pitchDetector.setSensitivity(it % 100) }
+                pitchDetector.setSensitivity(100)
+            },
+            Thread {
+                repeat(1000) { pitchDetector.setTrackingEnabled(it % 2 == 0) }
+                pitchDetector.setTrackingEnabled(true)
+            }
+        )
+        threads.forEach { it.start() }
+        threads.forEach { it.join() }
+
+        val config = pitchDetector.getConfig()
+        assertEquals(442.0, config.referenceFrequency, 0.0)
+        assertEquals(PitchDetector.rmsThresholdFromSensitivity(100), config.minRmsThreshold, 0.0)
+        assertTrue(config.trackingEnabled)
+    }
+
+    @Test
+    fun `settings changed between frames apply to the next frame`() {
+        pitchDetector.setSensitivity(100)
+        val sineWave = generateSineWave(432.0, 0.8f, 2048)
+        repeat(3) { pitchDetector.detectPitch(sineWave) }
+
+        pitchDetector.setReferenceFrequency(432.0)
+        pitchDetector.setSmoothing(PitchSmoother.Mode.EMA, 3)
+
+        val result = pitchDetector.detectPitch(sineWave)
+        assertNotNull(result)
+        assertEquals(0f, result!!.cents, 2f)
+    }
+
+    @Test
+    fun `reset applies at the start of the next frame`() {
+        pitchDetector.setSensitivity(100)
+        repeat(10) { pitchDetector.detectPitch(generateSineWave(220.0, 0.8f, 2048)) }
+
+        pitchDetector.reset()
+        val result = pitchDetector.detectPitch(generateSineWave(440.0, 0.8f, 2048))
+
+        assertNotNull(result)
+        assertEquals(440.0, result!!.frequency, 1.0)
+    }
+
+    // ========== Targeted tuning tests ==========
+
+    @Test
+    fun `setTuningTargets reports the active string and its cents offset`() {
+        pitchDetector.setSensitivity(100)
+        pitchDetector.setTuningTargets(MusicalConstants.STANDARD_TUNING_SEMITONES)
+
+        val sineWave = generateSineWave(110.0 * Math.pow(2.0, 20.0 / 1200.0), 0.8f, 2048)
+        var result: PitchDetector.PitchResult? = null
+        for (i in 0 until 5) {
+            result = pitchDetector.detectPitch(sineWave)
+        }
+
+        assertNotNull(result)
+        assertEquals(NoteFinder.noteName(MusicalConstants.A4_MIDI_NOTE - 24), result!!.noteName)
+        assertEquals(20f, result.cents, 2f)
+    }
+
+    @Test
+    fun `targeted mode does not jump to a strong second harmonic`() {
+        pitchDetector.setSensitivity(100)
+        pitchDetector.setTuningTargets(MusicalConstants.STANDARD_TUNING_SEMITONES)
+
+        val fundamental = generateSineWave(110.0, 0.15f, 2048)
+        val second = generateSineWave(220.0, 0.6f, 2048)
+        val third = generateSineWave(330.0, 0.3f, 2048)
+        val tone = FloatArray(2048) { fundamental[it] + second[it] + third[it] }
+        val result = pitchDetector.detectPitch(tone)
+
+        assertNotNull(result)
+        assertEquals(NoteFinder.noteName(MusicalConstants.A4_MIDI_NOTE - 24), result!!.noteName)
+    }
+
+    @Test
+    fun `targeted mode follows the reference frequency`() {
+        pitchDetector.setSensitivity(100)
+        pitchDetector.setTuningTargets(MusicalConstants.STANDARD_TUNING_SEMITONES)
+        pitchDetector.setReferenceFrequency(432.0)
+
+        val result = pitchDetector.detectPitch(generateSineWave(108.0, 0.8f, 2048))
+
+        assertNotNull(result)
+        assertEquals(0f, result!!.cents, 2f)
+    }
+
+    @Test
+    fun `targeted mode ignores noise`() {
+        pitchDetector.setSensitivity(100)
+        pitchDetector.setTuningTargets(MusicalConstants.STANDARD_TUNING_SEMITONES)
+        val random = java.util.Random(1)
+
+        assertNull(pitchDetector.detectPitch(FloatArray(2048) { (random.nextGaussian() * 0.3).toFloat() }))
+    }
+
+    @Test
+    fun `setTuningTargets with null restores chromatic detection`() {
+        pitchDetector.setSensitivity(100)
+        val sineWave = generateSineWave(440.0, 0.8f, 2048)
+        val chromatic = PitchDetector().apply { setSensitivity(100) }.detectPitch(sineWave)
+
+        pitchDetector.setTuningTargets(MusicalConstants.STANDARD_TUNING_SEMITONES)
+        pitchDetector.setTuningTargets(null)
+
+        assertEquals(chromatic, pitchDetector.detectPitch(sineWave))
+    }
+
+    @Test
+    fun `setTuningTargets compares targets by value`() {
+        val targets = mutableListOf(-29, -24)
+        pitchDetector.setTuningTargets(targets)
+        val before = pitchDetector.getConfig()
+
+        targets[0] = -5
+        pitchDetector.setTuningTargets(listOf(-29, -24))
+
+        assertEquals(listOf(-29, -24), pitchDetector.getConfig().tuningTargets)
+        assertEquals(before, pitchDetector.getConfig())
+        assertEquals(before.hashCode(), pitchDetector.getConfig().hashCode())
+    }
+
+    @Test(expected = IllegalArgumentException::class)
+    fun `setTuningTargets rejects notes outside the MIDI range`() {
+        pitchDetector.setTuningTargets(listOf(-29, 100))
+    }
+
+    // ========== Frequency range tests ==========
+
+    @Test
+    fun `frequency range defaults to guitar`() {
+        assertEquals(FrequencyRange.GUITAR, pitchDetector.getFrequencyRange())
+    }
+
+    @Test
+    fun `guitar range reports nothing for a low bass note`() {
+        pitchDetector.setSensitivity(100)
+
+        val result = pitchDetector.detectPitch(generateSineWave(41.2, 0.8f, 4096))
+
+        assertTrue(result == null || result.frequency >= FrequencyRange.GUITAR.minFrequency)
+    }
+
+    @Test
+    fun `extended range detects bass notes`() {
+        val expected = mapOf(30.87 to "B0", 41.2 to "E1", 55.0 to "A1")
+        for ((frequency, note) in expected) {
+            val detector = PitchDetector().apply {
+                setSensitivity(100)
+                setFrequencyRange(FrequencyRange.EXTENDED)
+            }
+
+            val result = detector.detectPitch(generateSineWave(frequency, 0.8f, FrequencyRange.EXTENDED.windowSize))
+
+            assertNotNull("$frequency Hz", result)
+            assertEquals("$frequency Hz", note, result!!.noteName)
+            assertEquals("$frequency Hz", 0f, result.cents, 2f)
+        }
+    }
+
+    @Test
+    fun `extended range still detects guitar notes`() {
+        pitchDetector.setSensitivity(100)
+        pitchDetector.setFrequencyRange(FrequencyRange.EXTENDED)
+
+        val result = pitchDetector.detectPitch(generateSineWave(440.0, 0.8f, FrequencyRange.EXTENDED.windowSize))
+
+        assertEquals("A4", result?.noteName)
+    }
+
+    @Test
+    fun `extended range decimation is a floor for setDecimation`() {
+        pitchDetector.setFrequencyRange(FrequencyRange.EXTENDED)
+        pitchDetector.setDecimation(1)
+
+        assertEquals(1, pitchDetector.getConfig().decimationFactor)
+        assertEquals(FrequencyRange.EXTENDED, pitchDetector.getConfig().range)
+        // Detection still runs on the decimated path and finds the low note
+        pitchDetector.setSensitivity(100)
+        val result = pitchDetector.detectPitch(generateSineWave(36.71, 0.8f, FrequencyRange.EXTENDED.windowSize))
+        assertEquals("D1", result?.noteName)
+    }
+
+    @Test
+    fun `extended range applies to engines selected later`() {
+        pitchDetector.setSensitivity(100)
+        pitchDetector.setFrequencyRange(FrequencyRange.EXTENDED)
+        pitchDetector.setEstimator(PitchEstimator.Engine.MPM)
+
+        val result = pitchDetector.detectPitch(generateSineWave(41.2, 0.8f, FrequencyRange.EXTENDED.windowSize))
+
+        assertEquals("E1", result?.noteName)
+    }
+
+    // ========== Warm-up tests ==========
+
+    @Test
+    fun `warmUp leaves no result or note lock behind`() {
+        pitchDetector.setSensitivity(100)
+        pitchDetector.warmUp()
+
+        assertNull(pitchDetector.getCurrentPitchResult())
+
+        // The last warm-up string was E4; a lock on it would hold off A2 for several frames
+        val result = pitchDetector.detectPitch(generateSineWave(110.0, 0.8f, 2048))
+        assertNotNull(result)
+        assertEquals("A2", result!!.noteName)
+    }
+
+    @Test
+    fun `first frame after warmUp matches a cold detector`() {
+        val sineWave = generateSineWave(196.0, 0.8f, 2048)
+        val cold = PitchDetector().apply { setSensitivity(100) }.detectPitch(sineWave)
+
+        pitchDetector.setSensitivity(100)
+        pitchDetector.warmUp()
+
+        assertEquals(cold, pitchDetector.detectPitch(sineWave))
+    }
+
+    @Test
+    fun `warmUp runs every frame through the detector`() {
+        pitchDetector.profiler.enabled = true
+        pitchDetector.warmUp(frames = 12)
+
+        assertEquals(12L, pitchDetector.profiler.snapshot()[StageProfiler.Stage.FRAME].count)
+    }
+
+    @Test(expected = IllegalArgumentException::class)
+    fun `warmUp rejects non-positive frame size`() {
+        pitchDetector.warmUp(frameSize = 0)
+    }
+
     // ========== Helper methods ==========
 
+    /**
+     * Lag of the minimum of the parabola through data[tau - 1], data[tau] and data[tau + 1].
+     */
+    private fun parabolaMinimum(data: DoubleArray, tau: Int): Double {
+        val denominator = 2.0 * (2.0 * data[tau] - data[tau + 1] - data[tau - 1])
+        return tau + (data[tau + 1] - data[tau - 1]) / denominator
+    }
+
     /**
      * Generates a sine wave at the given frequency.
      * @param frequency The frequency in Hz
@@ -0,0 +1,35 @@
+package com.rokid.tuner.pitch
+
+import org.junit.Assert.*
+import org.junit.Test
+
+/**
+ * Unit tests for PitchEstimator.
+ * Tests engine creation and the shared peak interpolation.
+ */
+class PitchEstimatorTest {
+
+    @Test
+    fun `create returns an estimator for every engine`() {
+        for (engine in PitchEstimator.Engine.values()) {
+            assertEquals(engine, PitchEstimator.create(engine).engine)
+        }
+    }
+
+    @Test
+    fun `create returns independent instances`() {
+        assertNotSame(PitchEstimator.create(PitchEstimator.Engine.MPM), PitchEstimator.create(PitchEstimator.Engine.MPM))
+    }
+
+    @Test
+    fun `parabolicPeak finds the vertex of a parabola`() {
+        val data = DoubleArray(5) { val x = it - 2.3; 1.0 - x * x }
+
+        assertEquals(2.3, PitchEstimator.parabolicPeak(data, 2), 1e-12)
+    }
+
+    @Test
+    fun `parabolicPeak returns the index for collinear points`() {
+        assertEquals(2.0, PitchEstimator.parabolicPeak(doubleArrayOf(0.0, 1.0, 2.0, 3.0, 4.0), 2), 0.0)
+    }
+}
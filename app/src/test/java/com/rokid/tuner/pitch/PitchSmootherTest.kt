@@ -0,0 +1,139 @@
+package com.rokid.tuner.pitch
+
+import com.rokid.tuner.constants.AlgorithmConstants
+import org.junit.Assert.*
+import org.junit.Test
+import java.util.Random
+
+/**
+ * Unit tests for the PitchSmoother implementations.
+ * Tests the running median against a sorted reference, and EMA/Kalman convergence.
+ */
+class PitchSmootherTest {
+
+    // ========== RunningMedian tests ==========
+
+    @Test
+    fun `running median of empty window is invalid`() {
+        assertEquals(AlgorithmConstants.INVALID_FREQUENCY, RunningMedian(5).value(), 0.0)
+    }
+
+    @Test
+    fun `running median averages middle values for even counts`() {
+        val median = RunningMedian(5)
+        median.add(438.0)
+        assertEquals(440.0, median.add(442.0), 1e-12)
+    }
+
+    @Test
+    fun `running median matches sorted reference`() {
+        val random = Random(7)
+        for (window in 1..9) {
+            val median = RunningMedian(window)
+            val history = ArrayDeque<Double>()
+            repeat(200) {
+                // Mix of continuous values and duplicates
+                val value = if (random.nextBoolean()) random.nextDouble() * 1000 else random.nextInt(4).toDouble()
+                history.addLast(value)
+                if (history.size > window) history.removeFirst()
+
+                assertEquals("window=$window", referenceMedian(history), median.add(value), 1e-12)
+            }
+        }
+    }
+
+    @Test
+    fun `running median rejects a single octave outlier`() {
+        val median = RunningMedian(5)
+        listOf(110.0, 110.2, 220.4, 109.9, 110.1).forEach { median.add(it) }
+
+        assertEquals(110.1, median.value(), 1e-9)
+    }
+
+    @Test
+    fun `running median reset forgets history`() {
+        val median = RunningMedian(3)
+        median.add(1.0)
+        median.add(2.0)
+        median.reset()
+
+        assertEquals(AlgorithmConstants.INVALID_FREQUENCY, median.value(), 0.0)
+        assertEquals(5.0, median.add(5.0), 0.0)
+    }
+
+    // ========== ExponentialSmoother tests ==========
+
+    @Test
+    fun `ema starts at the first value`() {
+        assertEquals(440.0, ExponentialSmoother(5).add(440.0), 0.0)
+    }
+
+    @Test
+    fun `ema moves towards new values by alpha`() {
+        val ema = ExponentialSmoother(3)  // alpha = 0.5
+        ema.add(100.0)
+
+        assertEquals(150.0, ema.add(200.0), 1e-12)
+    }
+
+    @Test
+    fun `larger ema window lags more`() {
+        val fast = ExponentialSmoother(2)
+        val slow = ExponentialSmoother(10)
+        fast.add(100.0); slow.add(100.0)
+        fast.add(200.0); slow.add(200.0)
+
+        assertTrue(fast.value() > slow.value())
+    }
+
+    // ========== KalmanSmoother tests ==========
+
+    @Test
+    fun `kalman converges to a constant input`() {
+        val kalman = KalmanSmoother(5)
+        kalman.add(0.0)
+        repeat(50) { kalman.add(330.0) }
+
+        assertEquals(330.0, kalman.value(), 0.01)
+    }
+
+    @Test
+    fun `kalman gain settles at the ema alpha`() {
+        val kalman = KalmanSmoother(5)
+        repeat(200) { kalman.add(100.0) }
+        val before = kalman.value()
+        val after = kalman.add(200.0)
+
+        // Steady-state gain is 2 / (window + 1)
+        assertEquals(2.0 / 6.0, (after - before) / 100.0, 1e-3)
+    }
+
+    @Test
+    fun `kalman with window 1 passes values through`() {
+        val kalman = KalmanSmoother(1)
+        kalman.add(100.0)
+
+        assertEquals(250.0, kalman.add(250.0), 0.0)
+    }
+
+    // ========== Factory tests ==========
+
+    @Test
+    fun `create builds the requested smoother`() {
+        assertTrue(PitchSmoother.create(PitchSmoother.Mode.MEDIAN) is RunningMedian)
+        assertTrue(PitchSmoother.create(PitchSmoother.Mode.EMA, 4) is ExponentialSmoother)
+        assertTrue(PitchSmoother.create(PitchSmoother.Mode.KALMAN, 4) is KalmanSmoother)
+        assertEquals(AlgorithmConstants.DEFAULT_SMOOTHING_WINDOW, PitchSmoother.create(PitchSmoother.Mode.MEDIAN).window)
+    }
+
+    @Test(expected = IllegalArgumentException::class)
+    fun `zero window is rejected`() {
+        RunningMedian(0)
+    }
+
+    private fun referenceMedian(values: Collection<Double>): Double {
+        val sorted = values.sorted()
+        val mid = sorted.size / 2
+        return if (sorted.size % 2 == 0) (sorted[mid - 1] + sorted[mid]) / 2.0 else sorted[mid]
+    }
+}
@@ -0,0 +1,168 @@
+package com.rokid.tuner.pitch
+
+import com.rokid.tuner.audio.AudioConfig
+import org.junit.Assert.*
+import org.junit.Before
+import org.junit.Test
+import java.util.Random
+
+/**
+ * Unit tests for YinDifferenceFunction.
+ * Verifies the FFT-based difference function against the direct O(N * tauMax) sum.
+ */
+class YinDifferenceFunctionTest {
+
+    private lateinit var differenceFunction: YinDifferenceFunction
+
+    @Before
+    fun setUp() {
+        differenceFunction = YinDifferenceFunction()
+    }
+
+    @Test
+    fun `compute matches direct sum for sine wave`() {
+        assertMatchesDirect(generateSineWave(440.0, 0.8f, 4096), 551)
+    }
+
+    @Test
+    fun `compute matches direct sum for harmonic-rich signal`() {
+        val sampleRate = AudioConfig.SAMPLE_RATE.toDouble()
+        val signal = FloatArray(2048) { i ->
+            var value = 0.0
+            for (harmonic in 1..6) {
+                value += Math.sin(2.0 * Math.PI * 82.41 * harmonic * i / sampleRate) / harmonic
+            }
+            (0.4 * value).toFloat()
+        }
+        assertMatchesDirect(signal, 551)
+    }
+
+    @Test
+    fun `compute matches direct sum for noise`() {
+        val random = Random(42)
+        val noise = FloatArray(1024) { (random.nextGaussian() * 0.3).toFloat() }
+        assertMatchesDirect(noise, 512)
+    }
+
+    @Test
+    fun `compute returns zeros for silence`() {
+        val out = DoubleArray(100)
+        differenceFunction.compute(FloatArray(1024), 0, 1024, 100, out)
+
+        out.forEach { assertEquals(0.0, it, 0.0) }
+    }
+
+    @Test
+    fun `compute never returns negative values`() {
+        val out = DoubleArray(551)
+        differenceFunction.compute(generateSineWave(196.0, 1.0f, 4096), 0, 4096, 551, out)
+
+        out.forEach { assertTrue("d(t) should be non-negative", it >= 0.0) }
+    }
+
+    @Test
+    fun `compute reuses tables across different frame sizes`() {
+        // Alternate sizes so the cached FFT size has to be rebuilt and reused
+        assertMatchesDirect(generateSineWave(330.0, 0.5f, 4096), 551)
+        assertMatchesDirect(generateSineWave(330.0, 0.5f, 1024), 512)
+        assertMatchesDirect(generateSineWave(110.0, 0.5f, 4096), 551)
+        assertMatchesDirect(generateSineWave(110.0, 0.5f, 4096), 551)
+    }
+
+    @Test
+    fun `compute only reads the first length samples`() {
+        val frame = generateSineWave(220.0, 0.7f, 2048)
+        val padded = frame.copyOf(4096)
+        for (i in 2048 until 4096) padded[i] = 1.0f
+
+        val expected = DoubleArray(551)
+        val actual = DoubleArray(551)
+        differenceFunction.compute(frame, 0, frame.size, 551, expected)
+        differenceFunction.compute(padded, 0, 2048, 551, actual)
+
+        for (t in 0 until 551) {
+            assertEquals("d($t)", expected[t], actual[t], 1e-9)
+        }
+    }
+
+    @Test
+    fun `compute honours offset into a larger buffer`() {
+        val frame = generateSineWave(147.0, 0.6f, 2048)
+        val shifted = FloatArray(3000)
+        System.arraycopy(frame, 0, shifted, 700, frame.size)
+
+        val expected = DoubleArray(551)
+        val actual = DoubleArray(551)
+        differenceFunction.compute(frame, 0, frame.size, 551, expected)
+        differenceFunction.compute(shifted, 700, frame.size, 551, actual)
+
+        for (t in 0 until 551) {
+            assertEquals("d($t)", expected[t], actual[t], 1e-9)
+        }
+    }
+
+    @Test
+    fun `cumulativeSum matches summed direct values`() {
+        val random = Random(7)
+        val buffer = FloatArray(1500) { (random.nextGaussian() * 0.3).toFloat() }
+        val direct = DoubleArray(600)
+        YinDifferenceFunction.computeDirect(buffer, 100, 1400, 600, direct)
+
+        var expected = 0.0
+        for (lag in 1 until 600) {
+            expected += direct[lag]
+            if (lag % 50 == 1) {
+                assertEquals("sum to $lag", expected, YinDifferenceFunction.cumulativeSum(buffer, 100, 1400, lag), 1e-6 * expected)
+            }
+        }
+    }
+
+    @Test
+    fun `cumulativeSum of no lags is zero`() {
+        assertEquals(0.0, YinDifferenceFunction.cumulativeSum(generateSineWave(110.0, 0.5f, 512), 0, 512, 0), 0.0)
+    }
+
+    @Test(expected = IllegalArgumentException::class)
+    fun `cumulativeSum rejects lags beyond the frame`() {
+        YinDifferenceFunction.cumulativeSum(FloatArray(64), 0, 64, 64)
+    }
+
+    @Test
+    fun `lagEnergy matches the energy of both segments`() {
+        val random = Random(11)
+        val buffer = FloatArray(1200) { (random.nextGaussian() * 0.3).toFloat() }
+        val energy = DoubleArray(500)
+        YinDifferenceFunction.lagEnergy(buffer, 100, 1000, 500, energy)
+
+        for (t in listOf(0, 1, 37, 250, 499)) {
+            var expected = 0.0
+            for (j in 100 until 1100 - t) {
+                expected += buffer[j] * buffer[j] + buffer[j + t] * buffer[j + t]
+            }
+            assertEquals("m($t)", expected, energy[t], 1e-9 * expected)
+        }
+    }
+
+    private fun assertMatchesDirect(buffer: FloatArray, tauMax: Int) {
+        val expected = DoubleArray(tauMax)
+        val actual = DoubleArray(tauMax)
+        YinDifferenceFunction.computeDirect(buffer, 0, buffer.size, tauMax, expected)
+        differenceFunction.compute(buffer, 0, buffer.size, tauMax, actual)
+
+        var energy = 0.0
+        for (sample in buffer) energy += sample * sample
+        val tolerance = 1e-6 * Math.max(energy, 1.0)
+
+        for (t in 0 until tauMax) {
+            assertEquals("d($t)", expected[t], actual[t], tolerance)
+        }
+    }
+
+    private fun generateSineWave(frequency: Double, amplitude: Float, samples: Int): FloatArray {
+        val sampleRate = AudioConfig.SAMPLE_RATE.toDouble()
+        val angularFreq = 2.0 * Math.PI * frequency / sampleRate
+        return FloatArray(samples) { i ->
+            (amplitude * Math.sin(angularFreq * i)).toFloat()
+        }
+    }
+}
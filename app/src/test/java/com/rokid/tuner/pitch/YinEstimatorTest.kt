@@ -0,0 +1,109 @@
+package com.rokid.tuner.pitch
+
+import com.rokid.tuner.audio.AudioConfig
+import com.rokid.tuner.constants.AlgorithmConstants
+import org.junit.Assert.*
+import org.junit.Before
+import org.junit.Test
+
+/**
+ * Unit tests for YinEstimator.
+ * Tests the full search, the narrow tracking search and decimation switching.
+ */
+class YinEstimatorTest {
+
+    private lateinit var estimator: YinEstimator
+
+    @Before
+    fun setUp() {
+        estimator = YinEstimator()
+    }
+
+    private fun sine(frequency: Double, samples: Int = 2048) = FloatArray(samples) {
+        (0.8 * Math.sin(2.0 * Math.PI * frequency * it / AudioConfig.SAMPLE_RATE)).toFloat()
+    }
+
+    // ========== Full search tests ==========
+
+    @Test
+    fun `estimate is within a few cents for sine input`() {
+        for (frequency in listOf(82.41, 196.0, 440.0, 1318.5)) {
+            val estimate = estimator.estimate(sine(frequency), 0, 2048, AlgorithmConstants.DEFAULT_CLARITY_THRESHOLD)
+
+            assertEquals("$frequency Hz", 0f, NoteFinder.frequencyToCents(estimate.frequency, frequency), 3f)
+        }
+    }
+
+    @Test
+    fun `estimate gives no pitch for too short frames`() {
+        assertEquals(PitchEstimator.NO_PITCH, estimator.estimate(FloatArray(1), 0, 1, 0.6))
+    }
+
+    // ========== Tracking search tests ==========
+
+    @Test
+    fun `track matches the full search near the given frequency`() {
+        for (frequency in listOf(82.41, 110.0, 329.63)) {
+            val signal = sine(frequency)
+            val full = estimator.estimate(signal, 0, 2048, 0.6)
+            val tracked = estimator.track(signal, 0, 2048, frequency * 1.01, 0.6)
+
+            assertNotNull("$frequency Hz", tracked)
+            assertEquals("$frequency Hz", full.frequency, tracked!!.frequency, 1e-6)
+            assertEquals("$frequency Hz", full.clarity, tracked.clarity, 1e-6)
+        }
+    }
+
+    @Test
+    fun `track gives up when the pitch is outside the window`() {
+        assertNull(estimator.track(sine(110.0), 0, 2048, 150.0, 0.6))
+    }
+
+    @Test
+    fun `track gives up when the window exceeds half the frame`() {
+        assertNull(estimator.track(sine(82.41, 1024), 0, 1024, 82.41, 0.6))
+    }
+
+    // ========== Decimation tests ==========
+
+    @Test
+    fun `setDecimation with factor 1 restores full rate analysis`() {
+        val signal = sine(247.0)
+        val fullRate = estimator.estimate(signal, 0, 2048, 0.6)
+
+        estimator.setDecimation(4)
+        estimator.setDecimation(1)
+
+        assertEquals(fullRate, estimator.estimate(signal, 0, 2048, 0.6))
+    }
+
+    // ========== Range tests ==========
+
+    @Test
+    fun `guitar range does not report notes below 80 Hz`() {
+        val estimate = estimator.estimate(sine(41.2, 4096), 0, 4096, AlgorithmConstants.DEFAULT_CLARITY_THRESHOLD)
+
+        if (estimate.frequency > AlgorithmConstants.INVALID_FREQUENCY) {
+            assertTrue(estimate.frequency >= FrequencyRange.GUITAR.minFrequency)
+        }
+    }
+
+    @Test
+    fun `extended range finds low B at full rate`() {
+        estimator.range = FrequencyRange.EXTENDED
+        val estimate = estimator.estimate(sine(30.87, 4096), 0, 4096, AlgorithmConstants.DEFAULT_CLARITY_THRESHOLD)
+
+        assertEquals(0f, NoteFinder.frequencyToCents(estimate.frequency, 30.87), 1f)
+    }
+
+    @Test
+    fun `extended range with decimation stays accurate across the range`() {
+        estimator.range = FrequencyRange.EXTENDED
+        estimator.setDecimation(FrequencyRange.EXTENDED.decimationFactor)
+        for (frequency in listOf(29.14, 30.87, 41.2, 82.41, 440.0, 1318.5)) {
+            val estimate = estimator.estimate(sine(frequency, 4096), 0, 4096, AlgorithmConstants.DEFAULT_CLARITY_THRESHOLD)
+
+            assertEquals("$frequency Hz", 0f, NoteFinder.frequencyToCents(estimate.frequency, frequency), 1f)
+        }
+    }
+}
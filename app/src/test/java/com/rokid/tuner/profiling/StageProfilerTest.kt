@@ -0,0 +1,97 @@
+package com.rokid.tuner.profiling
+
+import com.rokid.tuner.pitch.PitchDetector
+import org.junit.Assert.*
+import org.junit.Before
+import org.junit.Test
+import org.junit.runner.RunWith
+import org.robolectric.RobolectricTestRunner
+import org.robolectric.annotation.Config
+
+/**
+ * Unit tests for StageProfiler.
+ * Tests histogram bucketing, enable/disable behaviour and detector integration.
+ */
+@RunWith(RobolectricTestRunner::class)
+@Config(manifest = Config.NONE, sdk = [28])
+class StageProfilerTest {
+
+    private lateinit var profiler: StageProfiler
+
+    @Before
+    fun setUp() {
+        profiler = StageProfiler()
+    }
+
+    @Test
+    fun `disabled profiler records nothing`() {
+        val start = profiler.start()
+        profiler.stop(StageProfiler.Stage.YIN, start)
+
+        assertEquals(0L, start)
+        assertEquals(0L, profiler.snapshot()[StageProfiler.Stage.YIN].count)
+    }
+
+    @Test
+    fun `record updates count total max and histogram`() {
+        profiler.record(StageProfiler.Stage.RMS, 1000L)
+        profiler.record(StageProfiler.Stage.RMS, 3000L)
+
+        val stats = profiler.snapshot()[StageProfiler.Stage.RMS]
+        assertEquals(2L, stats.count)
+        assertEquals(4000L, stats.totalNs)
+        assertEquals(3000L, stats.maxNs)
+        assertEquals(2000.0, stats.meanNs, 0.0)
+        assertEquals(2L, stats.histogram.sum())
+    }
+
+    @Test
+    fun `bucketFor uses power-of-two buckets`() {
+        assertEquals(0, StageProfiler.bucketFor(0L))
+        assertEquals(0, StageProfiler.bucketFor(1L))
+        assertEquals(1, StageProfiler.bucketFor(2L))
+        assertEquals(1, StageProfiler.bucketFor(3L))
+        assertEquals(10, StageProfiler.bucketFor(1024L))
+        assertEquals(StageProfiler.HISTOGRAM_BUCKETS - 1, StageProfiler.bucketFor(Long.MAX_VALUE))
+    }
+
+    @Test
+    fun `percentile is within a factor of two`() {
+        repeat(99) { profiler.record(StageProfiler.Stage.YIN, 1_000L) }
+        profiler.record(StageProfiler.Stage.YIN, 1_000_000L)
+
+        val stats = profiler.snapshot()[StageProfiler.Stage.YIN]
+        val p50 = stats.percentileNs(50.0)
+        val p100 = stats.percentileNs(100.0)
+        assertTrue(p50 in 1_000L..2_000L)
+        assertTrue(p100 in 1_000_000L..2_000_000L)
+    }
+
+    @Test
+    fun `reset clears all stages`() {
+        profiler.record(StageProfiler.Stage.NOTE_FIND, 500L)
+        profiler.reset()
+
+        val stats = profiler.snapshot()[StageProfiler.Stage.NOTE_FIND]
+        assertEquals(0L, stats.count)
+        assertEquals(0L, stats.histogram.sum())
+    }
+
+    @Test
+    fun `enabled profiler times detector stages`() {
+        profiler.enabled = true
+        val detector = PitchDetector(profiler)
+        detector.setSensitivity(100)
+        val sampleRate = 44100.0
+        val sine = FloatArray(4096) { i -> (0.8 * Math.sin(2 * Math.PI * 440.0 * i / sampleRate)).toFloat() }
+
+        repeat(3) { detector.detectPitch(sine) }
+
+        val snapshot = profiler.snapshot()
+        assertEquals(3L, snapshot[StageProfiler.Stage.FRAME].count)
+        assertEquals(3L, snapshot[StageProfiler.Stage.RMS].count)
+        assertEquals(3L, snapshot[StageProfiler.Stage.YIN].count)
+        assertTrue(snapshot[StageProfiler.Stage.NOTE_FIND].count >= 3L)
+        assertTrue(snapshot[StageProfiler.Stage.FRAME].totalNs > 0L)
+    }
+}
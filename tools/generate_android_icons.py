@@ -2,11 +2,38 @@
 """
 Generate Android density-specific PNG icons from a source image.
 Creates properly sized icons for all standard Android screen densities.
+
+Designs described in icon_scene.py are rasterised straight to each density from their
+geometry, with supersampling, rather than resized from a 512 px bitmap, and are also
+exported as a VectorDrawable. Other source images are resized as before. PNGs are
+written in the smallest lossless mode their pixels allow (see png_output.py), with the
+saving over a plain RGB PNG reported per file and in total.
+
+Every source x icon kind x density combination is an independent job. Jobs run in
+parallel across a process pool, and each output is written atomically (to a temporary
+file, then renamed). A manifest in each output directory records a content hash of the
+source and the parameters behind every output, so outputs whose inputs have not changed
+are skipped and a rebuild of an unchanged icon set does no image work at all.
+
+Usage (from the project root):
+    python3 tools/generate_android_icons.py            # first available design
+    python3 tools/generate_android_icons.py --all      # every available design
+    python3 tools/generate_android_icons.py --force    # ignore the manifest
 """
 
+import argparse
+import hashlib
+import json
 import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import PIL
 from PIL import Image
 
+from icon_scene import SCENES, SUPERSAMPLE, rasterise, scene_digest, to_vector_drawable
+from png_output import SizeReport, encode_png
+
 # Android density buckets and their scale factors
 # Reference: https://developer.android.com/training/multiscreen/screendensities
 DENSITY_BUCKETS = {
@@ -19,80 +46,168 @@ DENSITY_BUCKETS = {
 
 # Launcher icon sizes (in dp)
 LAUNCHER_ICON_SIZE_DP = 48  # Standard launcher icon size in dp
+NOTIFICATION_ICON_SIZE_DP = 24
+
+# Icon kinds: size in dp and output path pattern within the output directory
+ICON_KINDS = {
+    "launcher": (LAUNCHER_ICON_SIZE_DP, os.path.join("mipmap-{density}", "ic_launcher.png")),
+    "notification": (NOTIFICATION_ICON_SIZE_DP, "notification_{density}.png"),
+}
+
+# VectorDrawable exported for scene designs, and its size (adaptive icon canvas)
+VECTOR_PATH = os.path.join("drawable", "ic_launcher_vector.xml")
+VECTOR_SIZE_DP = 108
+
+MANIFEST_NAME = ".icon_manifest.json"
+
+# Bump when the rendering below changes, so existing outputs are rebuilt
+RENDER_VERSION = 3
+
+# Source image, description and the icon_scene design it was drawn from
+SOURCE_IMAGES = [
+    ("assets/guitar_tuner_simple.png", "Clean headstock design", "simple"),
+    ("assets/guitar_tuner_with_note.png", "Headstock with musical note", "note"),
+    ("assets/tuning_fork_icon.png", "Tuning fork design", "fork"),
+    ("assets/guitar_tuner_icon.png", "Original detailed design", "detailed"),
+]
 
 
-def create_density_icons(source_image_path, output_dir="android_icons"):
+def file_digest(path):
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def current_umask():
+    """Return the process umask, which can only be read by setting it."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+def write_atomically(path, write):
     """
-    Create density-specific icons from a source image.
+    Write a file via a temporary file in the same directory, then rename it into place,
+    so readers never see a partial file and an interrupted run leaves the old one intact.
 
     Args:
-        source_image_path: Path to source PNG (should be high resolution)
-        output_dir: Directory to save generated icons
+        path: Destination path
+        write: Callable taking the open binary temporary file
     """
-
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.basename(path))
     try:
-        # Load source image
-        source_img = Image.open(source_image_path)
-        source_width, source_height = source_img.size
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        # mkstemp creates the file 0600; give it the mode a plain open() would have
+        os.chmod(temp_path, 0o666 & ~current_umask())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def plan_icons(source_image_path, output_dir, source_digest, scene=None):
+    """
+    List the render jobs for one design.
 
-        print(f"Source image: {source_image_path} ({source_width}x{source_height})")
+    Args:
+        source_image_path: Path to source PNG (should be high resolution)
+        output_dir: Directory to save generated icons
+        source_digest: Content hash of the source image, or of the scene if given
+        scene: Name of the icon_scene design to draw from instead of resizing the source
 
-        # Create output directory
-        os.makedirs(output_dir, exist_ok=True)
+    Returns:
+        List of job dicts with source, scene, output path (relative and absolute), kind,
+        density, pixel size and the key recorded in the manifest
+    """
+    method = f"scene x{SUPERSAMPLE}" if scene else "LANCZOS"
+
+    def job(kind, density, size, relative_path):
+        key = hashlib.sha256(
+            json.dumps([source_digest, size, method, PIL.__version__, RENDER_VERSION]).encode()
+        ).hexdigest()
+        return {
+            "source": source_image_path,
+            "scene": scene,
+            "output_dir": output_dir,
+            "relative_path": relative_path,
+            "output_path": os.path.join(output_dir, relative_path),
+            "kind": kind,
+            "density": density,
+            "size": size,
+            "key": key,
+        }
+
+    jobs = []
+    for kind, (size_dp, pattern) in ICON_KINDS.items():
+        for density, scale_factor in DENSITY_BUCKETS.items():
+            jobs.append(job(kind, density, int(size_dp * scale_factor), pattern.format(density=density)))
+    if scene:
+        jobs.append(job("vector", "anydpi", VECTOR_SIZE_DP, VECTOR_PATH))
+    return jobs
 
-        # Calculate pixel sizes for each density
-        base_size_px = LAUNCHER_ICON_SIZE_DP  # mdpi uses dp as px
 
-        print("\nGenerating icons for Android density buckets:")
-        print("=" * 50)
+def render_icon(job):
+    """
+    Draw the job's scene at its size, or resize its source image to it, and save it
+    atomically as a compact PNG. Runs in a worker process.
 
-        for density, scale_factor in DENSITY_BUCKETS.items():
-            # Calculate target size in pixels
-            target_size = int(base_size_px * scale_factor)
+    Returns:
+        (relative path, SHA-256 of the written file, size of a plain RGB PNG and size
+        written in bytes, both None for vectors)
+    """
+    if job["kind"] == "vector":
+        data = to_vector_drawable(SCENES[job["scene"]](), job["size"]).encode("utf-8")
+        write_atomically(job["output_path"], lambda f: f.write(data))
+        return job["relative_path"], file_digest(job["output_path"]), None, None
 
-            # Resize source image to target size
+    if job["scene"]:
+        resized_img = rasterise(SCENES[job["scene"]](), job["size"])
+    else:
+        with Image.open(job["source"]) as source_img:
             # Use high-quality resampling
-            resized_img = source_img.resize(
-                (target_size, target_size), Image.Resampling.LANCZOS
-            )
+            resized_img = source_img.resize((job["size"], job["size"]), Image.Resampling.LANCZOS)
+    data, baseline = encode_png(resized_img)
+    write_atomically(job["output_path"], lambda f: f.write(data))
+    return job["relative_path"], file_digest(job["output_path"]), baseline, len(data)
 
-            # Save to appropriate directory structure
-            density_dir = os.path.join(output_dir, f"mipmap-{density}")
-            os.makedirs(density_dir, exist_ok=True)
 
-            output_path = os.path.join(density_dir, "ic_launcher.png")
-            resized_img.save(output_path, "PNG")
+def load_manifest(output_dir):
+    """Return the manifest of an output directory, or an empty one."""
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
 
-            print(f"{density:6s} | {target_size:3d}x{target_size:<3d} | {output_path}")
 
-        # Also create adaptive icon layers if needed
-        # Adaptive icons need foreground and background layers
-        print("\nAdditional icon assets:")
+def save_manifest(output_dir, manifest):
+    """Write an output directory's manifest atomically."""
+    data = json.dumps(manifest, indent=2, sort_keys=True).encode()
+    write_atomically(os.path.join(output_dir, MANIFEST_NAME), lambda f: f.write(data))
 
-        # Create notification icon (24dp)
-        for density, scale_factor in DENSITY_BUCKETS.items():
-            notif_size = int(24 * scale_factor)
-            resized_img = source_img.resize(
-                (notif_size, notif_size), Image.Resampling.LANCZOS
-            )
 
-            # Save as notification icon
-            output_path = os.path.join(output_dir, f"notification_{density}.png")
-            resized_img.save(output_path, "PNG")
-            print(f"Notification icon ({density}): {notif_size}x{notif_size}")
+def is_up_to_date(job, manifest):
+    """True if the output exists, is what the manifest recorded, and has the same inputs."""
+    entry = manifest.get(job["relative_path"])
+    if entry is None or entry.get("key") != job["key"]:
+        return False
+    try:
+        return file_digest(job["output_path"]) == entry.get("output")
+    except OSError:
+        return False
 
-        # Create a preview of all sizes
-        print("\n" + "=" * 50)
-        print(f"Icons generated in: {output_dir}/")
-        print("\nTo use these icons in your Android app:")
-        print("1. Copy the mipmap-* directories to app/src/main/res/")
-        print("2. Remove or backup the existing ic_launcher.xml vector drawable")
-        print("3. Build and run your app")
 
-        # Create a simple README for the generated icons
-        readme_path = os.path.join(output_dir, "README.txt")
-        with open(readme_path, "w") as f:
-            f.write(f"""Android Launcher Icons
+def write_readme(source_image_path, output_dir):
+    """Create a simple README for the generated icons, rewriting it only if it changed."""
+    readme_path = os.path.join(output_dir, "README.txt")
+    text = f"""Android Launcher Icons
 Generated from: {source_image_path}
 
 Directory Structure:
@@ -112,9 +227,96 @@ To install:
 
 Note: Android Studio may warn about missing density versions.
 These icons cover all standard densities.
-""")
+"""
+    try:
+        with open(readme_path, encoding="utf-8") as f:
+            if f.read() == text:
+                return readme_path
+    except OSError:
+        pass
+    data = text.encode("utf-8")
+    write_atomically(readme_path, lambda f: f.write(data))
+    return readme_path
+
+
+def build_icons(sources, jobs=None, force=False):
+    """
+    Build icons for several source images at once.
+
+    Args:
+        sources: List of (source image path, output directory, scene name or None)
+        jobs: Worker processes (default: one per CPU)
+        force: Rebuild every output, ignoring the manifests
+
+    Returns:
+        (number of outputs written, number skipped as up to date)
+    """
+    planned = []
+    manifests = {}
+    for source_image_path, output_dir, scene in sources:
+        digest = scene_digest(SCENES[scene]()) if scene else file_digest(source_image_path)
+        manifests[output_dir] = {} if force else load_manifest(output_dir)
+        planned.extend(plan_icons(source_image_path, output_dir, digest, scene))
+
+    pending = [job for job in planned if force or not is_up_to_date(job, manifests[job["output_dir"]])]
+    skipped = len(planned) - len(pending)
+
+    report = SizeReport()
+    if pending:
+        workers = min(jobs or os.cpu_count() or 1, len(pending))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for job, result in zip(pending, pool.map(render_icon, pending)):
+                relative_path, output_digest, before, after = result
+                manifests[job["output_dir"]][relative_path] = {
+                    "key": job["key"],
+                    "output": output_digest,
+                }
+                line = f"{job['kind']:12s} {job['density']:7s} | {job['size']:3d}x{job['size']:<3d} | {job['output_path']}"
+                if after is not None:
+                    line += f" | {report.add(job['output_path'], before, after)}"
+                print(line)
+    report.print_total()
+
+    for source_image_path, output_dir, _ in sources:
+        save_manifest(output_dir, manifests[output_dir])
+        write_readme(source_image_path, output_dir)
+
+    return len(pending), skipped
+
+
+def create_density_icons(source_image_path, output_dir="android_icons", jobs=None, force=False, scene=None):
+    """
+    Create density-specific icons from a source image.
 
-        print(f"\nSee {readme_path} for more details.")
+    Args:
+        source_image_path: Path to source PNG (should be high resolution)
+        output_dir: Directory to save generated icons
+        jobs: Worker processes (default: one per CPU)
+        force: Rebuild every output, ignoring the manifest
+        scene: Name of the icon_scene design to draw from instead of the source image
+    """
+
+    try:
+        if scene:
+            print(f"Source design: {scene} (vector scene, supersampled x{SUPERSAMPLE})")
+        else:
+            with Image.open(source_image_path) as source_img:
+                source_width, source_height = source_img.size
+            print(f"Source image: {source_image_path} ({source_width}x{source_height})")
+
+        print("\nGenerating icons for Android density buckets:")
+        print("=" * 50)
+
+        written, skipped = build_icons([(source_image_path, output_dir, scene)], jobs, force)
+        print(f"{written} written, {skipped} up to date")
+
+        print("\n" + "=" * 50)
+        print(f"Icons generated in: {output_dir}/")
+        print("\nTo use these icons in your Android app:")
+        print("1. Copy the mipmap-* directories to app/src/main/res/")
+        print("2. Remove or backup the existing ic_launcher.xml vector drawable")
+        print("3. Build and run your app")
+        print(f"\nSee {os.path.join(output_dir, 'README.txt')} for more details.")
 
     except FileNotFoundError:
         print(f"Error: Source image not found: {source_image_path}")
@@ -126,66 +328,52 @@ These icons cover all standard densities.
         print(f"Error: {e}")
 
 
+def output_dir_for(filename):
+    """Output directory for a source image, e.g. android_icons_guitar_tuner_simple."""
+    return f"android_icons_{os.path.splitext(os.path.basename(filename))[0]}"
+
+
 def main():
     """Generate Android icons from available designs."""
 
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--all", action="store_true", help="build every available design in one batch")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--force", action="store_true", help="rebuild outputs even if up to date")
+    args = parser.parse_args()
+
     print("Android Icon Generator")
     print("=" * 50)
 
-    # List available source images
-    source_images = [
-        ("assets/guitar_tuner_simple.png", "Clean headstock design"),
-        ("assets/guitar_tuner_with_note.png", "Headstock with musical note"),
-        ("assets/tuning_fork_icon.png", "Tuning fork design"),
-        ("assets/guitar_tuner_icon.png", "Original detailed design"),
-    ]
-
+    # Designs with a scene are drawn from it and need no source image on disk
     available_images = []
-    for filename, description in source_images:
-        if os.path.exists(filename):
-            available_images.append((filename, description))
+    for filename, description, scene in SOURCE_IMAGES:
+        if scene in SCENES or os.path.exists(filename):
+            available_images.append((filename, description, scene if scene in SCENES else None))
 
     if not available_images:
         print("No source images found. Please run generate_icon.py first.")
         return
 
     print("\nAvailable source images:")
-    for i, (filename, description) in enumerate(available_images, 1):
-        img = Image.open(filename)
-        print(f"{i}. {filename:30s} ({img.size[0]}x{img.size[1]}) - {description}")
-
-    print("\nSelect source image (1-4) or 'a' for all: ", end="")
-
-    # For automation, use first available
-    selection = "1"  # Default to first
-
-    if selection.lower() == "a":
-        # Generate for all available images
-        for filename, description in available_images:
-            print(f"\n{'=' * 60}")
-            print(f"Generating icons from: {filename} ({description})")
-            print("=" * 60)
-            output_dir = f"android_icons_{os.path.splitext(filename)[0]}"
-            create_density_icons(filename, output_dir)
+    for i, (filename, description, scene) in enumerate(available_images, 1):
+        if scene:
+            print(f"{i}. {filename:30s} (vector)  - {description}")
+        else:
+            with Image.open(filename) as img:
+                print(f"{i}. {filename:30s} ({img.size[0]}x{img.size[1]}) - {description}")
+
+    if args.all:
+        # One batch, so every source x kind x density job shares the pool
+        sources = [(filename, output_dir_for(filename), scene) for filename, _, scene in available_images]
+        print(f"\nGenerating icons from {len(sources)} designs")
+        print("=" * 60)
+        written, skipped = build_icons(sources, args.jobs, args.force)
+        print(f"{written} written, {skipped} up to date")
     else:
-        try:
-            index = int(selection) - 1
-            if 0 <= index < len(available_images):
-                filename, description = available_images[index]
-                output_dir = f"android_icons_{os.path.splitext(filename)[0]}"
-                create_density_icons(filename, output_dir)
-            else:
-                print(
-                    f"Invalid selection. Using first available: {available_images[0][0]}"
-                )
-                filename, description = available_images[0]
-                output_dir = f"android_icons_{os.path.splitext(filename)[0]}"
-                create_density_icons(filename, output_dir)
-        except ValueError:
-            print(f"Invalid input. Using first available: {available_images[0][0]}")
-            filename, description = available_images[0]
-            output_dir = f"android_icons_{os.path.splitext(filename)[0]}"
-            create_density_icons(filename, output_dir)
+        # Default to first available
+        filename, description, scene = available_images[0]
+        create_density_icons(filename, output_dir_for(filename), args.jobs, args.force, scene)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Generate a labelled corpus of synthetic guitar recordings for offline analysis.
+
+Writes 16-bit mono WAV files at 44.1 kHz, each with a JSON sidecar holding its ground
+truth. Three kinds of signal are mixed:
+
+- pluck: Karplus-Strong string, a noise burst circulating in a delay line with a
+  two-point loss filter, tuned with a fractional delay
+- harmonic: additive stack of slightly inharmonic partials with their own decay
+  rates and a short noise transient at the attack
+- noise: white noise alone, for false-detection rates
+
+Each pitched file picks a note, a reference frequency for A4 (430-450 Hz by default),
+a detuning, a slow pitch drift and a signal-to-noise ratio. The SNR is measured
+against the RMS of the tone's first second. Because the reference and detuning move
+the tone off equal temperament at A4 = 440 Hz, files are named after the note nearest
+the starting fundamental at A4 = 440 Hz, e.g. "E2_pluck_000123.wav", which is how
+BatchAnalyzer and pitch_sweep.py read names. The sidecar's "note" is that name;
+"reference_note" is the note played against the file's own reference. Its "pitch_hz"
+is the true fundamental every "pitch_hop_samples" samples.
+
+Files are generated in parallel, one per job, and each is written in chunks of
+--chunk samples with only the chunk (and a pluck's delay line) in memory. A corpus
+can therefore be far larger than RAM. Output is reproducible: each file's parameters
+and noise come from --seed and the file's index alone. A corpus.tsv summary lists
+every file.
+
+Usage (from the project root):
+    python3 tools/generate_corpus.py corpus/ --files 500 --duration 4
+    python3 tools/generate_corpus.py corpus/ --files 20 --kinds pluck --snr 10,20
+    python3 tools/pitch_sweep.py --input corpus/
+"""
+
+import argparse
+import json
+import os
+import wave
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+SAMPLE_RATE = 44100
+PITCH_HOP_SAMPLES = 512
+DEFAULT_CHUNK_SAMPLES = 1 << 16
+
+KINDS = ("pluck", "harmonic", "noise")
+
+# Peak level of a tone before noise, leaving headroom for noise and partials adding up
+TONE_LEVEL = 0.3
+
+# E2 (standard tuning) to E6 (24th fret of the high E string), in semitones from A4
+LOWEST_NOTE = -29
+HIGHEST_NOTE = 19
+
+NOTE_NAMES = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
+
+
+def note_name(semitones_from_a4):
+    """Scientific pitch name, with "#" so file names stay ASCII: -29 -> "E2"."""
+    midi = 69 + semitones_from_a4
+    return f"{NOTE_NAMES[midi % 12]}{midi // 12 - 1}"
+
+
+def nearest_note(frequency_hz):
+    """Semitones from A4 of the equal-tempered note nearest frequency_hz, at A4 = 440 Hz."""
+    return int(round(12.0 * np.log2(frequency_hz / 440.0)))
+
+
+def plan_corpus(files, seed, kinds, snrs, reference_range, detune, drift, duration):
+    """One parameter dict per file, each drawn from its own seeded generator."""
+    specs = []
+    for index in range(files):
+        rng = np.random.default_rng([seed, index])
+        kind = kinds[index % len(kinds)]
+        spec = {
+            "index": index,
+            "kind": kind,
+            "seed": [seed, index],
+            "sample_rate": SAMPLE_RATE,
+            "samples": int(round(duration * SAMPLE_RATE)),
+            "snr_db": float(rng.choice(snrs)),
+        }
+        if kind == "noise":
+            spec.update(note=None, reference_note=None, reference_hz=None, frequency_hz=None, detune_cents=None,
+                        drift_cents_per_s=None)
+            spec["name"] = f"noise_{index:06d}"
+        else:
+            semitones = int(rng.integers(LOWEST_NOTE, HIGHEST_NOTE + 1))
+            reference = float(rng.uniform(*reference_range))
+            detune_cents = float(rng.uniform(-detune, detune))
+            frequency = reference * 2.0 ** ((semitones + detune_cents / 100.0) / 12.0)
+            spec.update(
+                note=note_name(nearest_note(frequency)),
+                reference_note=note_name(semitones),
+                reference_hz=reference,
+                frequency_hz=frequency,
+                detune_cents=detune_cents,
+                drift_cents_per_s=float(rng.uniform(-drift, drift)),
+            )
+            spec["name"] = f"{spec['note']}_{kind}_{index:06d}"
+        specs.append(spec)
+    return specs
+
+
+def instantaneous_frequency(spec, times):
+    """True fundamental at the given times in seconds: exponential drift in cents."""
+    return spec["frequency_hz"] * 2.0 ** (spec["drift_cents_per_s"] * times / 1200.0)
+
+
+def phase_at(spec, times):
+    """Integral of 2 pi f(t), in closed form so chunks need no shared phase state."""
+    frequency = spec["frequency_hz"]
+    rate = spec["drift_cents_per_s"] * np.log(2.0) / 1200.0
+    if rate == 0.0:
+        return 2.0 * np.pi * frequency * times
+    return 2.0 * np.pi * frequency * np.expm1(rate * times) / rate
+
+
+class HarmonicTone:
+    """Additive partials f_n = n f sqrt(1 + B n^2), decaying faster the higher they are."""
+
+    def __init__(self, spec, rng):
+        self.spec = spec
+        self.inharmonicity = rng.uniform(0.0, 1e-4)
+        self.decay_time = rng.uniform(1.5, 4.0)  # seconds for the fundamental to fall by 1/e
+        highest = max(1, int(SAMPLE_RATE / 2 / (spec["frequency_hz"] * 1.2)))
+        count = min(12, highest)
+        self.partials = np.arange(1, count + 1)
+        self.stretch = self.partials * np.sqrt(1.0 + self.inharmonicity * self.partials ** 2)
+        self.amplitudes = rng.uniform(0.3, 1.0, count) / self.partials
+        self.amplitudes *= TONE_LEVEL / self.amplitudes.sum()
+        self.phases = rng.uniform(0.0, 2.0 * np.pi, count)
+        self.transient_seed = rng.integers(2 ** 32)
+
+    def render(self, start, count):
+        times = (start + np.arange(count)) / SAMPLE_RATE
+        phase = phase_at(self.spec, times)
+        tone = np.zeros(count)
+        for partial, stretch, amplitude, offset in zip(self.partials, self.stretch, self.amplitudes, self.phases):
+            decay = np.exp(-times * partial ** 0.7 / self.decay_time)
+            tone += amplitude * decay * np.sin(stretch * phase + offset)
+
+        # Pick noise over the first 10 ms, from its own generator so chunking cannot change it
+        transient_end = int(0.01 * SAMPLE_RATE)
+        if start < transient_end:
+            burst = np.random.default_rng(self.transient_seed).standard_normal(transient_end)
+            burst *= TONE_LEVEL * 0.5 * np.exp(-np.arange(transient_end) / (0.002 * SAMPLE_RATE))
+            overlap = min(count, transient_end - start)
+            tone[:overlap] += burst[start:start + overlap]
+        return tone
+
+
+class KarplusStrong:
+    """
+    Plucked string: y[n] = x[n] + g (h0 y[n-M] + h1 y[n-M-1] + h2 y[n-M-2]), where h is
+    the two-point loss filter convolved with linear interpolation for the fractional
+    part of the period. The loop delay is M + 0.5 + frac samples. Every feedback tap is at
+    least M samples back, so each block of up to M samples is computed at once.
+    """
+
+    def __init__(self, spec, rng):
+        self.spec = spec
+        self.decay_time = rng.uniform(2.0, 5.0)  # T60 in seconds
+        period = SAMPLE_RATE / spec["frequency_hz"]
+        # Longest history the delay line can need: the period at the lowest pitch reached
+        lowest = min(spec["frequency_hz"], instantaneous_frequency(spec, np.array([spec["samples"] / SAMPLE_RATE]))[0])
+        self.history = int(SAMPLE_RATE / lowest) + 3
+        self.output = np.zeros(self.history)
+        self.pending = np.zeros(0)
+        self.generated = 0
+
+        # Excitation: one period of noise, softened by a moving average for a duller pluck
+        length = int(period)
+        burst = rng.uniform(-1.0, 1.0, length)
+        smoothing = int(rng.integers(1, 4))
+        burst = np.convolve(burst, np.ones(smoothing) / smoothing, mode="same")
+        burst -= burst.mean()
+        self.excitation = TONE_LEVEL * burst / np.max(np.abs(burst))
+
+    def render(self, start, count):
+        # Blocks follow the string's period, not the chunks, so carry any surplus over
+        # to the next call and the output is the same whatever the chunk size
+        while len(self.pending) < count:
+            self.pending = np.concatenate([self.pending, self._next_block()])
+        out, self.pending = self.pending[:count], self.pending[count:]
+        return out
+
+    def _next_block(self):
+        n = self.generated
+        frequency = instantaneous_frequency(self.spec, np.array([n / SAMPLE_RATE]))[0]
+        delay = SAMPLE_RATE / frequency - 0.5
+        m = max(1, int(delay))
+        fraction = delay - m
+        gain = 0.001 ** (1.0 / (frequency * self.decay_time))
+        taps = gain * np.array([0.5 * (1.0 - fraction), 0.5, 0.5 * fraction])
+
+        history = self.output
+        h = len(history)
+        value = (
+            taps[0] * history[h - m:h]
+            + taps[1] * history[h - m - 1:h - 1]
+            + taps[2] * history[h - m - 2:h - 2]
+        )
+        if n < len(self.excitation):
+            excitation = self.excitation[n:n + m]
+            value[:len(excitation)] += excitation
+        self.output = np.concatenate([history[m:], value])
+        self.generated += m
+        return value
+
+
+def tone_for(spec, rng):
+    if spec["kind"] == "pluck":
+        return KarplusStrong(spec, rng)
+    if spec["kind"] == "harmonic":
+        return HarmonicTone(spec, rng)
+    return None
+
+
+def generate_file(job):
+    """
+    Write one WAV and its sidecar, chunk by chunk, via temporary names. Runs in a worker
+    process.
+
+    Returns:
+        The sidecar dict, without the pitch track
+    """
+    spec, output_dir, chunk = job
+    rng = np.random.default_rng(spec["seed"])
+    tone = tone_for(spec, rng)
+    noise_rng = np.random.default_rng(spec["seed"] + [1])
+    total = spec["samples"]
+
+    if tone is None:
+        noise_level = TONE_LEVEL * 10.0 ** (-spec["snr_db"] / 20.0)
+    else:
+        # Measure the first second on a copy, so the stream below starts from scratch
+        probe = tone_for(spec, np.random.default_rng(spec["seed"]))
+        reference_rms = np.sqrt(np.mean(probe.render(0, min(total, SAMPLE_RATE)) ** 2))
+        noise_level = reference_rms * 10.0 ** (-spec["snr_db"] / 20.0)
+
+    wav_path = os.path.join(output_dir, spec["name"] + ".wav")
+    temp_path = wav_path + ".tmp"
+    clipped = 0
+    peak = 0.0
+    with wave.open(temp_path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        for start in range(0, total, chunk):
+            count = min(chunk, total - start)
+            signal = noise_level * noise_rng.standard_normal(count)
+            if tone is not None:
+                signal += tone.render(start, count)
+            clipped += int(np.count_nonzero(np.abs(signal) > 1.0))
+            peak = max(peak, float(np.max(np.abs(signal))))
+            f.writeframes(np.round(np.clip(signal, -1.0, 1.0) * 32767).astype("<i2").tobytes())
+    os.replace(temp_path, wav_path)
+
+    sidecar = dict(spec, file=spec["name"] + ".wav", noise_rms=noise_level, peak=peak, clipped_samples=clipped)
+    del sidecar["name"]
+    track = []
+    if tone is not None:
+        times = np.arange(0, total, PITCH_HOP_SAMPLES) / SAMPLE_RATE
+        track = [round(float(value), 4) for value in instantaneous_frequency(spec, times)]
+    sidecar_path = os.path.join(output_dir, spec["name"] + ".json")
+    with open(sidecar_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(dict(sidecar, pitch_hop_samples=PITCH_HOP_SAMPLES, pitch_hz=track), f)
+    os.replace(sidecar_path + ".tmp", sidecar_path)
+    return sidecar
+
+
+def write_summary(output_dir, sidecars):
+    columns = ["file", "kind", "note", "reference_note", "frequency_hz", "reference_hz", "detune_cents",
+               "drift_cents_per_s", "snr_db", "samples", "clipped_samples"]
+    with open(os.path.join(output_dir, "corpus.tsv"), "w", encoding="utf-8") as f:
+        f.write("\t".join(columns) + "\n")
+        for sidecar in sidecars:
+            values = [sidecar[column] for column in columns]
+            f.write("\t".join("" if value is None else f"{value:.6g}" if isinstance(value, float) else str(value)
+                              for value in values) + "\n")
+
+
+def parse_range(text):
+    low, _, high = text.partition(":")
+    return float(low), float(high or low)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("output", help="directory to write the corpus to")
+    parser.add_argument("--files", type=int, default=100, help="number of files (default 100)")
+    parser.add_argument("--duration", type=float, default=3.0, help="seconds per file (default 3)")
+    parser.add_argument("--kinds", default=",".join(KINDS), help=f"comma-separated kinds, cycled (default {','.join(KINDS)})")
+    parser.add_argument("--snr", default="40,20,10", help="SNRs in dB to pick from (default 40,20,10)")
+    parser.add_argument("--reference", default="430:450", help="A4 reference range in Hz (default 430:450)")
+    parser.add_argument("--detune", type=float, default=25.0, help="largest detuning in cents (default 25)")
+    parser.add_argument("--drift", type=float, default=2.0, help="largest pitch drift in cents/s (default 2)")
+    parser.add_argument("--seed", type=int, default=1, help="corpus seed (default 1)")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK_SAMPLES, help="samples generated per write")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    kinds = args.kinds.split(",")
+    unknown = [kind for kind in kinds if kind not in KINDS]
+    if unknown:
+        raise SystemExit(f"Unknown kinds: {', '.join(unknown)} (choose from {', '.join(KINDS)})")
+    if args.files <= 0 or args.duration <= 0 or args.chunk <= 0:
+        raise SystemExit("--files, --duration and --chunk must be positive")
+
+    specs = plan_corpus(
+        args.files, args.seed, kinds, [float(value) for value in args.snr.split(",")],
+        parse_range(args.reference), args.detune, args.drift, args.duration,
+    )
+    os.makedirs(args.output, exist_ok=True)
+    total_bytes = sum(2 * spec["samples"] for spec in specs)
+    print(f"Generating {len(specs)} files, {total_bytes / 1e6:,.1f} MB of audio, in {args.output}/")
+
+    workers = min(args.jobs or os.cpu_count() or 1, len(specs))
+    sidecars = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for sidecar in pool.map(generate_file, [(spec, args.output, args.chunk) for spec in specs]):
+            sidecars.append(sidecar)
+            note = sidecar["note"] or "-"
+            print(f"{sidecar['file']:28s} {note:4s} {sidecar['snr_db']:4.0f} dB"
+                  + (f"  {sidecar['clipped_samples']} samples clipped" if sidecar["clipped_samples"] else ""))
+
+    write_summary(args.output, sidecars)
+    print(f"\n{len(sidecars)} files written; summary in {os.path.join(args.output, 'corpus.tsv')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Resolution-independent description of the guitar tuner icon designs.
+
+Each design is a scene: a black canvas and a list of filled shapes, in drawing order,
+with coordinates given as fractions of the canvas (0.0 to 1.0). The same scene is
+rasterised straight to any pixel size and exported as an Android VectorDrawable, so
+every asset comes from one description instead of drawing at 512 px and resizing.
+
+Rasterising draws the scene at SUPERSAMPLE times the target size in greyscale, then
+averages each SUPERSAMPLE x SUPERSAMPLE block down to one pixel. Edges are anti-aliased
+by coverage, with no resampling filter of its own, so a 48 px icon is as sharp as the
+geometry allows rather than a blurred copy of a larger bitmap.
+
+Usage (from the project root):
+    python3 tools/icon_scene.py simple 192 out.png
+    python3 tools/icon_scene.py simple out.xml
+"""
+
+import hashlib
+import json
+import sys
+from collections import namedtuple
+
+from PIL import Image, ImageDraw
+
+# Pixels per output pixel along each axis when rasterising
+SUPERSAMPLE = 4
+
+# Stroke width of the original 512 px drawings (2 px), as a fraction of the canvas
+STROKE = 2 / 512
+
+WHITE = 255
+BLACK = 0
+
+# kind: "rect" (x0, y0, x1, y1), "rounded_rect" (x0, y0, x1, y1, radius),
+# "ellipse" (x0, y0, x1, y1) or "polygon" ((x, y), ...); fill: WHITE or BLACK
+Shape = namedtuple("Shape", ["kind", "fill", "params"])
+
+
+def _line(x0, x1, y, width, fill):
+    """A horizontal line as the rectangle it covers (butt caps, as PIL draws it)."""
+    return Shape("rect", fill, (min(x0, x1), y - width / 2, max(x0, x1), y + width / 2))
+
+
+def _circle(x, y, radius, fill):
+    return Shape("ellipse", fill, (x - radius, y - radius, x + radius, y + radius))
+
+
+def headstock_scene(include_note=False):
+    """Rounded headstock with six pegs and a tuning indicator (generate_simple_icon.py)."""
+    icon_size = 0.8
+    headstock_width = icon_size * 0.7
+    headstock_height = icon_size * 0.6
+    left = 0.5 - headstock_width / 2
+    right = 0.5 + headstock_width / 2
+    top = 0.5 - headstock_height / 2
+
+    shapes = [
+        Shape(
+            "rounded_rect",
+            WHITE,
+            (left, top, right, 0.5 + headstock_height / 2, headstock_width * 0.1),
+        )
+    ]
+
+    # Tuning pegs, three on each side
+    peg_radius = icon_size * 0.035
+    peg_spacing = headstock_height * 0.25
+    for i in range(3):
+        y = top + (i + 1) * peg_spacing
+        shapes.append(_circle(left + headstock_width * 0.2, y, peg_radius, WHITE))
+        shapes.append(_circle(right - headstock_width * 0.2, y, peg_radius, WHITE))
+
+    # Tuning indicator lines
+    line_length = headstock_width * 0.3
+    line_width = icon_size * 0.03
+    left_start = left + headstock_width * 0.35
+    right_start = right - headstock_width * 0.35
+    shapes.append(_line(left_start, left_start + line_length, 0.5, line_width, BLACK))
+    shapes.append(_line(right_start, right_start - line_length, 0.5, line_width, BLACK))
+
+    if include_note:
+        note_size = icon_size * 0.12
+        shapes.append(
+            Shape(
+                "ellipse",
+                BLACK,
+                (0.5 - note_size * 0.2, 0.5 - note_size * 0.1, 0.5 + note_size * 0.2, 0.5 + note_size * 0.1),
+            )
+        )
+        stem_length = note_size * 0.4
+        shapes.append(
+            Shape(
+                "rect",
+                BLACK,
+                (0.5 + note_size * 0.15, 0.5 - stem_length / 2, 0.5 + note_size * 0.25, 0.5 + stem_length / 2),
+            )
+        )
+
+    return shapes
+
+
+def tuning_fork_scene():
+    """Tuning fork on a base with a note above it (generate_simple_icon.py)."""
+    icon_size = 0.7
+    fork_width = icon_size * 0.3
+    fork_height = icon_size * 0.6
+    fork_thickness = icon_size * 0.08
+    left_prong = 0.5 - fork_width / 2
+    right_prong = 0.5 + fork_width / 2
+    top = 0.5 - fork_height / 2
+    bottom = 0.5 + fork_height / 2
+
+    shapes = []
+    for x in (left_prong, right_prong):
+        shapes.append(Shape("rect", WHITE, (x - fork_thickness / 2, top, x + fork_thickness / 2, bottom)))
+
+    # Bar joining the prongs, and the base
+    shapes.append(Shape("rect", WHITE, (left_prong, top - fork_thickness, right_prong, top)))
+    base_width = fork_width * 1.5
+    shapes.append(
+        Shape("rect", WHITE, (0.5 - base_width / 2, bottom, 0.5 + base_width / 2, bottom + fork_thickness * 1.5))
+    )
+
+    # Note above the fork
+    note_size = icon_size * 0.15
+    note_y = top - fork_thickness - note_size
+    shapes.append(
+        Shape(
+            "ellipse",
+            WHITE,
+            (0.5 - note_size * 0.25, note_y - note_size * 0.15, 0.5 + note_size * 0.25, note_y + note_size * 0.15),
+        )
+    )
+    shapes.append(
+        Shape("rect", WHITE, (0.5 + note_size * 0.2, note_y, 0.5 + note_size * 0.3, note_y + note_size * 0.5))
+    )
+
+    return shapes
+
+
+def detailed_headstock_scene():
+    """Tapered headstock with outlined pegs and a flagged note (generate_icon.py)."""
+    icon_size = 0.8
+    headstock_width = icon_size * 0.7
+    headstock_height = icon_size * 0.6
+    top = 0.5 - headstock_height / 2
+    bottom = 0.5 + headstock_height / 2
+    left = 0.5 - headstock_width / 2
+    right = 0.5 + headstock_width / 2
+    bottom_width = headstock_width * 0.5
+
+    shapes = [
+        Shape(
+            "polygon",
+            WHITE,
+            ((left, top), (right, top), (0.5 + bottom_width / 2, bottom), (0.5 - bottom_width / 2, bottom)),
+        )
+    ]
+
+    # Pegs: black discs with a white outline, each with a short string post
+    peg_radius = icon_size * 0.04
+    peg_spacing = headstock_height * 0.25
+    for i in range(3):
+        y = top + (i + 1) * peg_spacing
+        for x, direction in ((left + headstock_width * 0.15, 1), (right - headstock_width * 0.15, -1)):
+            shapes.append(_circle(x, y, peg_radius, WHITE))
+            shapes.append(_circle(x, y, peg_radius - STROKE, BLACK))
+            shapes.append(_line(x + direction * peg_radius, x + direction * peg_radius * 3, y, STROKE, WHITE))
+
+    # Quarter note in the centre
+    note_size = icon_size * 0.15
+    note_y = 0.5 - note_size * 0.2
+    head_width = note_size * 0.5
+    head_height = note_size * 0.3
+    shapes.append(
+        Shape("ellipse", WHITE, (0.5 - head_width / 2, note_y - head_height / 2, 0.5 + head_width / 2, note_y + head_height / 2))
+    )
+    stem_width = note_size * 0.1
+    stem_x = 0.5 + head_width / 2 - stem_width / 2
+    shapes.append(Shape("rect", WHITE, (stem_x, note_y, stem_x + stem_width, note_y + note_size * 0.6)))
+
+    # Flag, drawn as a short run of overlapping ellipses
+    flag_size = note_size * 0.3
+    for i in range(5):
+        y = note_y + i * flag_size / 10
+        x = stem_x + stem_width + i * flag_size / 15
+        shapes.append(
+            Shape("ellipse", WHITE, (x - flag_size / 10, y - flag_size / 20, x + flag_size / 10, y + flag_size / 20))
+        )
+
+    return shapes
+
+
+SCENES = {
+    "simple": lambda: headstock_scene(include_note=False),
+    "note": lambda: headstock_scene(include_note=True),
+    "fork": tuning_fork_scene,
+    "detailed": detailed_headstock_scene,
+}
+
+
+def scene_digest(shapes, supersample=SUPERSAMPLE):
+    """Content hash of a scene and the rasterising parameters, for build manifests."""
+    return hashlib.sha256(json.dumps([shapes, supersample]).encode()).hexdigest()
+
+
+def rasterise(shapes, size, supersample=SUPERSAMPLE):
+    """
+    Draw a scene at size x size pixels, white on black.
+
+    Args:
+        shapes: Scene shapes, in drawing order
+        size: Output width and height in pixels
+        supersample: Samples per output pixel along each axis
+
+    Returns:
+        RGB image
+    """
+    canvas = size * supersample
+    image = Image.new("L", (canvas, canvas), BLACK)
+    draw = ImageDraw.Draw(image)
+
+    # PIL treats the far corner of a box as inclusive, so end one sample short of it;
+    # features thinner than a sample still cover one
+    def box(x0, y0, x1, y1):
+        x0, y0 = x0 * canvas, y0 * canvas
+        return [x0, y0, max(x0, x1 * canvas - 1), max(y0, y1 * canvas - 1)]
+
+    for kind, fill, params in shapes:
+        if kind == "rect":
+            draw.rectangle(box(*params), fill=fill)
+        elif kind == "rounded_rect":
+            draw.rounded_rectangle(box(*params[:4]), radius=params[4] * canvas, fill=fill)
+        elif kind == "ellipse":
+            draw.ellipse(box(*params), fill=fill)
+        elif kind == "polygon":
+            draw.polygon([(x * canvas, y * canvas) for x, y in params], fill=fill)
+        else:
+            raise ValueError(f"Unknown shape kind: {kind}")
+
+    if supersample > 1:
+        # Box average over each block: the fraction of the pixel each shape covers
+        image = image.reduce(supersample)
+    return image.convert("RGB")
+
+
+def _number(value):
+    text = f"{value:.3f}".rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+
+def _path_data(kind, params, scale):
+    n = lambda value: _number(value * scale)
+    if kind == "rect":
+        x0, y0, x1, y1 = params
+        return f"M{n(x0)},{n(y0)}H{n(x1)}V{n(y1)}H{n(x0)}Z"
+    if kind == "rounded_rect":
+        x0, y0, x1, y1, r = params
+        arc = f"A{n(r)},{n(r)} 0 0,1"
+        return (
+            f"M{n(x0 + r)},{n(y0)}H{n(x1 - r)}{arc} {n(x1)},{n(y0 + r)}"
+            f"V{n(y1 - r)}{arc} {n(x1 - r)},{n(y1)}"
+            f"H{n(x0 + r)}{arc} {n(x0)},{n(y1 - r)}"
+            f"V{n(y0 + r)}{arc} {n(x0 + r)},{n(y0)}Z"
+        )
+    if kind == "ellipse":
+        x0, y0, x1, y1 = params
+        rx, ry, cy = (x1 - x0) / 2, (y1 - y0) / 2, (y0 + y1) / 2
+        arc = f"A{n(rx)},{n(ry)} 0 1,1"
+        return f"M{n(x0)},{n(cy)}{arc} {n(x1)},{n(cy)}{arc} {n(x0)},{n(cy)}Z"
+    if kind == "polygon":
+        return "M" + "L".join(f"{n(x)},{n(y)}" for x, y in params) + "Z"
+    raise ValueError(f"Unknown shape kind: {kind}")
+
+
+def to_vector_drawable(shapes, size_dp=108):
+    """
+    Export a scene as Android VectorDrawable XML, one path per shape over a black square.
+
+    Args:
+        shapes: Scene shapes, in drawing order
+        size_dp: Width, height and viewport size
+
+    Returns:
+        XML text
+    """
+    colours = {WHITE: "#FFFFFFFF", BLACK: "#FF000000"}
+    lines = [
+        '<?xml version="1.0" encoding="utf-8"?>',
+        "<!-- Generated by tools/icon_scene.py; edit the scene there, not this file -->",
+        '<vector xmlns:android="http://schemas.android.com/apk/res/android"',
+        f'    android:width="{size_dp}dp"',
+        f'    android:height="{size_dp}dp"',
+        f'    android:viewportWidth="{size_dp}"',
+        f'    android:viewportHeight="{size_dp}">',
+        "",
+        f'    <path android:fillColor="{colours[BLACK]}" android:pathData="{_path_data("rect", (0, 0, 1, 1), size_dp)}" />',
+    ]
+    for kind, fill, params in shapes:
+        lines.append(f'    <path android:fillColor="{colours[fill]}" android:pathData="{_path_data(kind, params, size_dp)}" />')
+    lines.append("</vector>")
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    """Render one scene to a PNG, or export it as a VectorDrawable."""
+    args = sys.argv[1:]
+    if len(args) not in (2, 3) or args[0] not in SCENES:
+        print(f"Usage: {sys.argv[0]} {{{','.join(SCENES)}}} [SIZE] OUTPUT.(png|xml)")
+        sys.exit(1)
+
+    shapes = SCENES[args[0]]()
+    output_path = args[-1]
+    if output_path.endswith(".xml"):
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(to_vector_drawable(shapes))
+    else:
+        size = int(args[1]) if len(args) == 3 else 512
+        rasterise(shapes, size).save(output_path, "PNG")
+    print(f"Wrote {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,569 @@
+#!/usr/bin/env python3
+"""
+Sweep the pitch detector's sensitivity constants over recorded or synthetic audio.
+
+A NumPy port of the chromatic path of PitchDetector: the RMS gate, YIN (difference
+function, cumulative mean normalisation, threshold search, parabolic interpolation),
+the running-median smoothing and NoteFinder's probability gate and note lock. It
+reproduces the default detector configuration: guitar range at full rate, median
+smoothing, tracking and targeted tuning off. The constants are read from the Kotlin
+sources, so the port follows whatever is committed there.
+
+Work is split so that a sweep does not repeat the expensive part. The YIN difference
+function does not depend on any threshold, so it is computed once for every frame, in
+batches of frames, with one real FFT per frame (the same expansion as
+YinDifferenceFunction). Each setting in the grid then only re-runs the threshold
+search, the smoothing and the note lock, which are a few passes over the normalised
+difference array plus a short loop over the frames that pass the gates. Settings are
+spread over a process pool that shares the precomputed arrays through memory-mapped
+files.
+
+Each setting is scored over all streams:
+
+- detected: share of frames in pitched streams with a result
+- accuracy: share of results within 50 cents of the expected note
+- octave: share of results within 50 cents of another octave of it
+- cents: mean and 95th percentile absolute error of the accurate results
+- false: share of frames in unpitched streams (noise, silence) with a result
+
+These follow PitchTrack.summarize and WavBatchRunner.
+
+Usage (from the project root):
+    python3 tools/pitch_sweep.py                                  # synthetic corpus
+    python3 tools/pitch_sweep.py --input takes/                   # 16-bit WAV files
+    python3 tools/pitch_sweep.py --sensitivity 40,70,100 \\
+        --set YIN_THRESHOLD_OFFSET=0.05,0.08,0.11 --set CLARITY_THRESHOLD_SCALE=0.45,0.55
+
+WAV files named after their note ("E2_take1.wav", "A#2-low.wav") are scored against
+it; any other file is taken to hold no pitch and counts towards the false rate. A JSON
+sidecar next to a file ("E2_take1.json", as written by generate_corpus.py) takes
+precedence: each frame is scored against its "pitch_hz" track at the frame's centre,
+and a null "frequency_hz" marks the file as unpitched.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+KOTLIN_ROOT = os.path.join(PROJECT_ROOT, "app", "src", "main", "java", "com", "rokid", "tuner")
+KOTLIN_CONSTANTS = [
+    os.path.join(KOTLIN_ROOT, "constants", "AlgorithmConstants.kt"),
+    os.path.join(KOTLIN_ROOT, "constants", "MusicalConstants.kt"),
+    os.path.join(KOTLIN_ROOT, "constants", "UiConstants.kt"),
+    os.path.join(KOTLIN_ROOT, "audio", "AudioConfig.kt"),
+]
+
+# Constants the sweep can vary with --set
+SWEEP_PARAMETERS = [
+    "MAX_RMS_THRESHOLD",
+    "RMS_THRESHOLD_SCALE",
+    "MIN_CLARITY_THRESHOLD",
+    "CLARITY_THRESHOLD_SCALE",
+    "MAX_PROBABILITY_THRESHOLD",
+    "PROBABILITY_THRESHOLD_SCALE",
+    "YIN_THRESHOLD_OFFSET",
+    "YIN_THRESHOLD_MULTIPLIER",
+]
+
+# Note lock, private to PitchDetector
+LOCK_THRESHOLD = 3
+FREQUENCY_TOLERANCE_RATIO = 0.08
+
+# Largest chunk of frames transformed at once, to bound memory
+FFT_BATCH_FRAMES = 1024
+
+PCM16_SCALE = np.float32(1.0) / np.float32(32767)
+
+CONSTANT_PATTERN = re.compile(r"const val (\w+)\s*=\s*(-?[\d_]*\.?[\d_]+(?:[eE]-?\d+)?)[fFL]?\s*(?://|$)", re.M)
+NOTE_PREFIX = re.compile(r"^([A-G])([#♯b♭]?)(-?\d)")
+NATURAL_NOTE_INDICES = {"C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9, "B": 11}
+
+
+def load_constants(paths=KOTLIN_CONSTANTS):
+    """Numeric `const val`s from the Kotlin sources, by name."""
+    constants = {}
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for name, value in CONSTANT_PATTERN.findall(f.read()):
+                constants[name] = float(value.replace("_", ""))
+    return constants
+
+
+def thresholds(constants, sensitivity):
+    """
+    PitchDetector's sensitivity mapping: (RMS, clarity, probability) thresholds. The
+    probability threshold is a Float in Kotlin, so it is computed in float32 here.
+    """
+    fraction = sensitivity / constants["MAX_SENSITIVITY"]
+    rms = constants["MAX_RMS_THRESHOLD"] - fraction * constants["RMS_THRESHOLD_SCALE"]
+    clarity = constants["MIN_CLARITY_THRESHOLD"] + fraction * constants["CLARITY_THRESHOLD_SCALE"]
+    probability = np.float32(constants["MAX_PROBABILITY_THRESHOLD"]) - np.float32(
+        sensitivity / np.float32(constants["MAX_SENSITIVITY"])
+    ) * np.float32(constants["PROBABILITY_THRESHOLD_SCALE"])
+    return rms, clarity, probability
+
+
+def lag_bounds(constants, window_size):
+    """YinEstimator's full-rate lag search range [tau_min, tau_max) for the guitar range."""
+    sample_rate = constants["SAMPLE_RATE"]
+    tau_min = int(sample_rate / constants["MAX_GUITAR_FREQUENCY"])
+    tau_max = min(window_size // 2, int(sample_rate / constants["MIN_GUITAR_FREQUENCY"]))
+    return tau_min, tau_max
+
+
+# ---------------------------------------------------------------------------
+# Per-frame stages (vectorised over frames)
+# ---------------------------------------------------------------------------
+
+
+def frame_signal(samples, window_size, hop_size):
+    """Analysis windows as SlidingWindowBuffer emits them: one every hop, once full."""
+    if len(samples) < window_size:
+        return np.empty((0, window_size), dtype=samples.dtype)
+    return sliding_window_view(samples, window_size)[::hop_size]
+
+
+def difference_function(frames, tau_max):
+    """
+    d(t) = sum_j (x[j] - x[j + t])^2 for t < tau_max and every frame, via
+    d(t) = E[0, N - t) + E[t, N) - 2 r(t) with r from one zero-padded real FFT per frame.
+    """
+    frames = np.asarray(frames, dtype=np.float64)
+    n = frames.shape[1]
+    fft_size = 1 << (n + tau_max - 1).bit_length()
+    spectrum = np.fft.rfft(frames, fft_size, axis=1)
+    correlation = np.fft.irfft(spectrum.real ** 2 + spectrum.imag ** 2, fft_size, axis=1)[:, :tau_max]
+
+    prefix = np.zeros((frames.shape[0], n + 1))
+    np.cumsum(frames * frames, axis=1, out=prefix[:, 1:])
+    lags = np.arange(tau_max)
+    total = prefix[:, n:]
+    d = prefix[:, n - lags] + (total - prefix[:, lags]) - 2.0 * correlation
+    return np.maximum(d, 0.0)
+
+
+def normalised_difference(d):
+    """Cumulative mean normalised difference d'(t), with d'(0) = 1 and 1 where sum d = 0."""
+    running = np.cumsum(d[:, 1:], axis=1)
+    lags = np.arange(1, d.shape[1])
+    d_prime = np.ones_like(d)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d_prime[:, 1:] = np.where(running == 0.0, 1.0, d[:, 1:] * lags / running)
+    return d_prime
+
+
+def yin_search(d_prime, tau_min, tau_max, threshold, clarity_threshold, sample_rate, min_denominator):
+    """
+    YinEstimator.searchYIN for every frame: first trough below threshold, walked down to
+    its bottom, else the global minimum; frames whose d' there exceeds clarity_threshold
+    get 0 Hz. Returns (frequency, clarity) arrays.
+    """
+    window = d_prime[:, tau_min:tau_max]
+    frames, span = window.shape
+    rows = np.arange(frames)
+    columns = np.arange(span)
+
+    below = window < threshold
+    has_trough = below.any(axis=1)
+    first = below.argmax(axis=1)
+    # Bottom of the trough: first lag at or after it whose successor is not lower
+    stops = np.ones_like(below)
+    stops[:, :-1] = window[:, 1:] >= window[:, :-1]
+    stops &= columns >= first[:, None]
+    index = np.where(has_trough, stops.argmax(axis=1), window.argmin(axis=1))
+
+    clarity = window[rows, index]
+    tau = index + tau_min
+
+    # Parabolic interpolation inside the searched range (PitchEstimator.parabolicPeak)
+    inner = (index > 0) & (index < span - 1)
+    s0 = window[rows, np.maximum(index - 1, 0)]
+    s2 = window[rows, np.minimum(index + 1, span - 1)]
+    denominator = 2.0 * (2.0 * clarity - s2 - s0)
+    usable = inner & (np.abs(denominator) >= min_denominator)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        adjustment = np.where(usable, (s2 - s0) / denominator, 0.0)
+    best_tau = tau + adjustment
+
+    frequency = sample_rate / best_tau
+    frequency[clarity > clarity_threshold] = 0.0
+    return frequency, clarity
+
+
+def frame_rms(frames):
+    frames = np.asarray(frames, dtype=np.float64)
+    return np.sqrt(np.mean(frames * frames, axis=1))
+
+
+# ---------------------------------------------------------------------------
+# Per-stream stages (sequential in time)
+# ---------------------------------------------------------------------------
+
+
+def running_median(values, window):
+    """RunningMedian.add for each value in turn: median of the last window values."""
+    if len(values) == 0:
+        return values
+    padded = np.concatenate([np.full(window - 1, np.nan), values])
+    return np.nanmedian(sliding_window_view(padded, window), axis=1)
+
+
+def find_notes(frequencies, reference):
+    """NoteFinder.findNote: (semitones from A4, cents as float32, probability as float32)."""
+    semitones = 12.0 * np.log2(frequencies / reference)
+    rounded = np.rint(semitones)
+    cents = ((semitones - rounded) * 100.0).astype(np.float32)
+    probability = np.float32(1.0) - np.clip(np.abs(cents) / np.float32(50.0), 0, 1).astype(np.float32)
+    return rounded.astype(np.int64), cents, probability
+
+
+def detect_stream(rms, raw_frequency, rms_threshold, probability_threshold, constants):
+    """
+    The stateful tail of PitchDetector.analyseFrame over one stream's frames, from a
+    fresh detector. Returns the reported frequency per frame (0 = no result).
+    """
+    valid = (rms >= rms_threshold) & (raw_frequency > 0.0) & (
+        raw_frequency >= constants["MIN_GUITAR_FREQUENCY"]) & (raw_frequency <= constants["MAX_GUITAR_FREQUENCY"])
+    indices = np.flatnonzero(valid)
+    smoothed = running_median(raw_frequency[indices], int(constants["DEFAULT_SMOOTHING_WINDOW"]))
+    notes, _, probability = find_notes(smoothed, constants["DEFAULT_REFERENCE_FREQUENCY"])
+    passed = probability >= probability_threshold
+
+    reported = np.zeros(len(rms))
+    locked_note = None
+    locked_frequency = 0.0
+    confidence = 0
+    for frame, frequency, note in zip(indices[passed].tolist(), smoothed[passed].tolist(), notes[passed].tolist()):
+        if locked_note is None:
+            locked_note, locked_frequency, confidence = note, frequency, LOCK_THRESHOLD
+        elif note == locked_note or abs(frequency - locked_frequency) / locked_frequency < FREQUENCY_TOLERANCE_RATIO:
+            confidence = min(LOCK_THRESHOLD, confidence + 1)
+            locked_frequency = frequency
+        else:
+            confidence -= 1
+            if confidence > 0:
+                continue
+            locked_note, locked_frequency, confidence = note, frequency, LOCK_THRESHOLD
+        reported[frame] = locked_frequency
+    return reported
+
+
+# ---------------------------------------------------------------------------
+# Corpus
+# ---------------------------------------------------------------------------
+
+
+def note_frequency(semitones_from_a4, reference=440.0):
+    return reference * 2.0 ** (semitones_from_a4 / 12.0)
+
+
+def expected_frequency_from_name(file_name, reference=440.0):
+    """BatchAnalyzer.expectedFrequencyFromName: "E2_take1.wav" -> 82.41 Hz, else None."""
+    match = NOTE_PREFIX.match(file_name)
+    if match is None:
+        return None
+    letter, accidental, octave = match.groups()
+    index = NATURAL_NOTE_INDICES[letter] + {"#": 1, "♯": 1, "b": -1, "♭": -1}.get(accidental, 0)
+    return note_frequency((int(octave) + 1) * 12 + index - 69, reference)
+
+
+def read_wav(path, sample_rate):
+    """16-bit PCM as float32 in [-1, 1], channels averaged as WavReader does."""
+    with wave.open(path, "rb") as f:
+        if f.getsampwidth() != 2:
+            raise ValueError(f"{path}: {8 * f.getsampwidth()}-bit samples (expected 16-bit)")
+        if f.getframerate() != sample_rate:
+            raise ValueError(f"{path}: {f.getframerate()} Hz (expected {sample_rate} Hz)")
+        channels = f.getnchannels()
+        pcm = np.frombuffer(f.readframes(f.getnframes()), dtype="<i2").astype(np.int32)
+    if channels > 1:
+        pcm = np.fix(pcm.reshape(-1, channels).sum(axis=1) / channels).astype(np.int32)
+    return pcm.astype(np.float32) * PCM16_SCALE
+
+
+def read_sidecar(path):
+    """
+    Ground truth from a generate_corpus.py sidecar.
+
+    Returns:
+        None for an unpitched file, else (hop in samples, pitch track in Hz)
+    """
+    with open(path, encoding="utf-8") as f:
+        truth = json.load(f)
+    if truth.get("frequency_hz") is None:
+        return None
+    return int(truth["pitch_hop_samples"]), np.asarray(truth["pitch_hz"], dtype=np.float64)
+
+
+def wav_corpus(directory, sample_rate, reference):
+    """
+    (name, samples, expected) for every .wav file in directory, where expected is None,
+    a frequency from the file name or (hop, pitch track) from a sidecar.
+    """
+    streams = []
+    for name in sorted(os.listdir(directory)):
+        if name.lower().endswith(".wav"):
+            samples = read_wav(os.path.join(directory, name), sample_rate)
+            sidecar = os.path.join(directory, os.path.splitext(name)[0] + ".json")
+            if os.path.exists(sidecar):
+                expected = read_sidecar(sidecar)
+            else:
+                expected = expected_frequency_from_name(name, reference)
+            streams.append((name, samples, expected))
+    return streams
+
+
+def expected_per_frame(expected, frame_count, window_size, hop_size):
+    """Expected frequency of each frame, NaN throughout for an unpitched stream."""
+    if expected is None:
+        return np.full(frame_count, np.nan)
+    if isinstance(expected, tuple):
+        track_hop, track = expected
+        centres = np.arange(frame_count) * hop_size + window_size / 2
+        return np.interp(centres, np.arange(len(track)) * track_hop, track)
+    return np.full(frame_count, float(expected))
+
+
+def synthetic_corpus(sample_rate, seed=1):
+    """
+    Plucked-string tones over the guitar range, 2 s each, detuned by up to 20 cents and
+    quantised to 16 bits, clean and with two levels of white noise, plus noise alone.
+    """
+    rng = np.random.default_rng(seed)
+    duration = 2.0
+    t = np.arange(int(duration * sample_rate)) / sample_rate
+    # E2 A2 D3 G3 B3 E4 (open strings), then A4 E5 A5 up the neck
+    notes = {"E2": -29, "A2": -24, "D3": -19, "G3": -14, "B3": -10, "E4": -5, "A4": 0, "E5": 7, "A5": 12}
+    noise_levels = [0.0, 0.003, 0.01]
+
+    def quantise(signal):
+        return np.round(np.clip(signal, -1.0, 1.0) * 32767).astype(np.float32) * PCM16_SCALE
+
+    streams = []
+    for name, semitones in notes.items():
+        for noise in noise_levels:
+            frequency = note_frequency(semitones) * 2.0 ** (rng.uniform(-20, 20) / 1200.0)
+            tone = np.zeros_like(t)
+            for harmonic in range(1, 9):
+                if frequency * harmonic >= sample_rate / 2:
+                    break
+                decay = np.exp(-t * (1.0 + 0.8 * harmonic))
+                tone += decay * np.sin(2 * np.pi * frequency * harmonic * t + rng.uniform(0, 2 * np.pi)) / harmonic
+            signal = 0.3 * tone + noise * rng.standard_normal(len(t))
+            streams.append((f"{name}_noise{noise:g}", quantise(signal), frequency))
+    for noise in noise_levels[1:]:
+        streams.append((f"noise{noise:g}", quantise(noise * rng.standard_normal(len(t))), None))
+    return streams
+
+
+# ---------------------------------------------------------------------------
+# Sweep
+# ---------------------------------------------------------------------------
+
+_shared = {}
+
+
+def _load_shared(directory, constants):
+    """Pool initializer: map the precomputed arrays into this worker."""
+    _shared["constants"] = constants
+    for name in ("d_prime", "rms", "bounds", "expected", "pitched"):
+        _shared[name] = np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+
+
+def evaluate_setting(setting):
+    """Scores one grid point, a dict of constant overrides plus "sensitivity"."""
+    constants = dict(_shared["constants"])
+    constants.update({name: value for name, value in setting.items() if name != "sensitivity"})
+    rms_threshold, clarity_threshold, probability_threshold = thresholds(constants, setting["sensitivity"])
+    yin_threshold = constants["YIN_THRESHOLD_OFFSET"] + clarity_threshold * constants["YIN_THRESHOLD_MULTIPLIER"]
+
+    tau_min, tau_max = lag_bounds(constants, int(constants["ANALYSIS_WINDOW_SIZE"]))
+    raw, _ = yin_search(
+        _shared["d_prime"], tau_min, tau_max, yin_threshold, clarity_threshold,
+        constants["SAMPLE_RATE"], constants["MIN_DENOMINATOR"],
+    )
+
+    rms = _shared["rms"]
+    bounds = _shared["bounds"]
+    expected = _shared["expected"]
+    pitched = _shared["pitched"]
+    pitched_frames = detected = correct = octave_errors = 0
+    unpitched_frames = false_detections = 0
+    errors = []
+    for stream in range(len(pitched)):
+        start, end = int(bounds[stream]), int(bounds[stream + 1])
+        reported = detect_stream(rms[start:end], raw[start:end], rms_threshold, probability_threshold, constants)
+        hit = reported > 0.0
+        hits = reported[hit]
+        if not pitched[stream]:
+            unpitched_frames += end - start
+            false_detections += len(hits)
+            continue
+        pitched_frames += end - start
+        detected += len(hits)
+        error = 1200.0 * np.log2(hits / expected[start:end][hit])
+        octaves = np.round(error / 1200.0)
+        near = np.abs(error - octaves * 1200.0) <= constants["MAX_CENTS_DEVIATION"]
+        correct += int(np.sum(near & (octaves == 0)))
+        octave_errors += int(np.sum(near & (octaves != 0)))
+        errors.append(np.abs(error[near & (octaves == 0)]))
+
+    errors = np.concatenate(errors) if errors else np.empty(0)
+    return {
+        "detected": detected / pitched_frames if pitched_frames else float("nan"),
+        "accuracy": correct / detected if detected else float("nan"),
+        "octave": octave_errors / detected if detected else float("nan"),
+        "mean_cents": float(np.mean(errors)) if len(errors) else float("nan"),
+        "p95_cents": float(np.percentile(errors, 95)) if len(errors) else float("nan"),
+        "false": false_detections / unpitched_frames if unpitched_frames else float("nan"),
+    }
+
+
+def prepare(streams, constants, directory):
+    """Frames every stream, computes RMS and d' for all frames and saves them for the pool."""
+    window_size = int(constants["ANALYSIS_WINDOW_SIZE"])
+    hop_size = int(constants["ANALYSIS_HOP_SIZE"])
+    _, tau_max = lag_bounds(constants, window_size)
+
+    frames_per_stream = [frame_signal(samples, window_size, hop_size) for _, samples, _ in streams]
+    total = sum(len(frames) for frames in frames_per_stream)
+    d_prime = np.lib.format.open_memmap(os.path.join(directory, "d_prime.npy"), "w+", np.float64, (total, tau_max))
+    rms = np.empty(total)
+    bounds = np.zeros(len(streams) + 1, dtype=np.int64)
+
+    position = 0
+    for stream, frames in enumerate(frames_per_stream):
+        for start in range(0, len(frames), FFT_BATCH_FRAMES):
+            batch = frames[start:start + FFT_BATCH_FRAMES]
+            rows = slice(position + start, position + start + len(batch))
+            d_prime[rows] = normalised_difference(difference_function(batch, tau_max))
+            rms[rows] = frame_rms(batch)
+        position += len(frames)
+        bounds[stream + 1] = position
+    d_prime.flush()
+
+    expected = np.concatenate([
+        expected_per_frame(truth, len(frames), window_size, hop_size)
+        for (_, _, truth), frames in zip(streams, frames_per_stream)
+    ])
+    pitched = np.array([truth is not None for _, _, truth in streams])
+    np.save(os.path.join(directory, "rms.npy"), rms)
+    np.save(os.path.join(directory, "bounds.npy"), bounds)
+    np.save(os.path.join(directory, "expected.npy"), expected)
+    np.save(os.path.join(directory, "pitched.npy"), pitched)
+    return total
+
+
+def parse_grid(assignments, sensitivities):
+    """Every combination of the --set values and sensitivities, as override dicts."""
+    axes = []
+    for assignment in assignments:
+        name, _, values = assignment.partition("=")
+        if name not in SWEEP_PARAMETERS or not values:
+            raise SystemExit(f"--set expects NAME=v1,v2,... with NAME one of: {', '.join(SWEEP_PARAMETERS)}")
+        axes.append([(name, float(value)) for value in values.split(",")])
+    axes.append([("sensitivity", int(value)) for value in sensitivities.split(",")])
+    return [dict(combination) for combination in itertools.product(*axes)]
+
+
+def format_table(settings, results):
+    names = list(settings[0])
+    header = names + ["detected", "accuracy", "octave", "mean_cents", "p95_cents", "false"]
+    rows = []
+    for setting, result in zip(settings, results):
+        row = [f"{setting[name]:g}" for name in names]
+        row += [f"{100 * result[key]:.1f}%" for key in ("detected", "accuracy", "octave")]
+        row += [f"{result[key]:.2f}" for key in ("mean_cents", "p95_cents")]
+        row += [f"{100 * result['false']:.1f}%"]
+        rows.append(row)
+    widths = [max(len(header[i]), *(len(row[i]) for row in rows)) for i in range(len(header))]
+    lines = ["  ".join(cell.rjust(width) for cell, width in zip(header, widths))]
+    lines += ["  ".join(cell.rjust(width) for cell, width in zip(row, widths)) for row in rows]
+    return "\n".join(lines)
+
+
+def write_tsv(path, settings, results):
+    names = list(settings[0])
+    keys = list(results[0])
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\t".join(names + keys) + "\n")
+        for setting, result in zip(settings, results):
+            f.write("\t".join([f"{setting[name]:g}" for name in names] + [f"{result[key]:.6g}" for key in keys]) + "\n")
+
+
+def best_setting(settings, results, max_false):
+    """Highest detection rate with no octave errors and at most max_false false detections."""
+    candidates = [
+        (result["detected"], index)
+        for index, result in enumerate(results)
+        if result["octave"] == 0.0 and not (result["false"] > max_false)
+    ]
+    return max(candidates)[1] if candidates else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--input", help="directory of 16-bit PCM WAV files (default: synthetic corpus)")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=V1,V2",
+                        help="values to sweep for an AlgorithmConstants entry (repeatable)")
+    parser.add_argument("--sensitivity", default="0,25,50,75,100", help="comma-separated sensitivities")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--max-false", type=float, default=0.01,
+                        help="largest false-detection rate for the recommended setting (default 0.01)")
+    parser.add_argument("--output", help="also write the results as TSV to this file")
+    args = parser.parse_args()
+
+    constants = load_constants()
+    sample_rate = int(constants["SAMPLE_RATE"])
+    settings = parse_grid(args.set, args.sensitivity)
+
+    if args.input:
+        streams = wav_corpus(args.input, sample_rate, constants["DEFAULT_REFERENCE_FREQUENCY"])
+        if not streams:
+            raise SystemExit(f"No .wav files in {args.input}")
+    else:
+        streams = synthetic_corpus(sample_rate)
+
+    directory = tempfile.mkdtemp(prefix="pitch_sweep-")
+    try:
+        started = time.perf_counter()
+        frames = prepare(streams, constants, directory)
+        prepared = time.perf_counter()
+        print(f"{len(streams)} streams, {frames} frames: difference functions in {prepared - started:.1f} s")
+
+        workers = min(args.jobs or os.cpu_count() or 1, len(settings))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_load_shared, initargs=(directory, constants)) as pool:
+            results = list(pool.map(evaluate_setting, settings))
+        finished = time.perf_counter()
+        print(f"{len(settings)} settings on {workers} workers in {finished - prepared:.1f} s "
+              f"({len(settings) * frames / (finished - prepared):,.0f} frames/s)\n")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    print(format_table(settings, results))
+    if args.output:
+        write_tsv(args.output, settings, results)
+        print(f"\nResults written to {args.output}")
+
+    best = best_setting(settings, results, args.max_false)
+    if best is None:
+        print(f"\nNo setting without octave errors and within {100 * args.max_false:g}% false detections")
+    else:
+        print(f"\nBest without octave errors and within {100 * args.max_false:g}% false detections: "
+              + ", ".join(f"{name}={value:g}" for name, value in settings[best].items()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Compact, lossless PNG output for the icon generators.
+
+Every icon is white on black, so storing it as RGB wastes two channels. encode_png()
+tries each lossless representation that fits the pixels and keeps the smallest at
+maximum compression:
+
+- 1-bit, when the image is pure black and white
+- 8-bit greyscale, when every pixel is grey
+- a palette of the grey levels actually used, which PNG stores at 1, 2 or 4 bits per
+  pixel for up to 16 levels (anti-aliased edges usually need more)
+
+Images with colour or transparency are only recompressed. The byte counts of a plain
+RGB save are kept alongside, so callers can report what the compact stage saved.
+
+Usage (from the project root), to recompress existing PNGs in place:
+    python3 tools/png_output.py app/src/main/res/*/*.png assets/*.png
+"""
+
+import io
+import os
+import sys
+
+from PIL import Image
+
+
+def _encoded(image, **options):
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG", **options)
+    return buffer.getvalue()
+
+
+def _grey_palette(grey):
+    """The image indexed by the grey levels it uses, with a palette of just those."""
+    levels = [level for level, count in enumerate(grey.histogram()) if count]
+    index = {level: i for i, level in enumerate(levels)}
+    indexed = grey.point(lambda level: index.get(level, 0))
+    indexed = Image.frombytes("P", grey.size, indexed.tobytes())
+    indexed.putpalette([channel for level in levels for channel in (level, level, level)])
+    return indexed
+
+
+def encode_png(image):
+    """
+    Encode an image as the smallest lossless PNG among the modes its pixels allow.
+
+    Returns:
+        (PNG bytes, size in bytes of a plain RGB PNG of the same image)
+    """
+    baseline = len(_encoded(image if image.mode in ("RGB", "RGBA") else image.convert("RGB")))
+
+    candidates = [image]
+    if image.mode in ("RGB", "RGBA", "L", "1"):
+        red, green, blue, alpha = image.convert("RGBA").split()
+        opaque = alpha.getextrema() == (255, 255)
+        if opaque and red.tobytes() == green.tobytes() == blue.tobytes():
+            grey = red
+            candidates = [grey, _grey_palette(grey)]
+            if sum(grey.histogram()[1:255]) == 0:
+                candidates.append(grey.convert("1", dither=Image.Dither.NONE))
+
+    data = min((_encoded(candidate, optimize=True) for candidate in candidates), key=len)
+    return data, baseline
+
+
+class SizeReport:
+    """Collects before/after sizes per file for a total at the end."""
+
+    def __init__(self):
+        self.entries = []
+
+    def add(self, path, before, after):
+        """Record one file and return its sizes formatted for printing."""
+        self.entries.append((path, before, after))
+        return format_sizes(before, after)
+
+    def print_total(self):
+        if not self.entries:
+            return
+        before = sum(entry[1] for entry in self.entries)
+        after = sum(entry[2] for entry in self.entries)
+        print(f"PNG total, {len(self.entries)} files: {format_sizes(before, after)}")
+
+
+def format_sizes(before, after):
+    saved = 100.0 * (before - after) / before if before else 0.0
+    return f"{before:,} -> {after:,} bytes ({saved:.0f}% smaller)"
+
+
+def save_png(image, path, report=None):
+    """
+    Save an image as a compact PNG, adding its before/after sizes to report if given.
+
+    Returns:
+        (size of a plain RGB PNG, size written) in bytes
+    """
+    data, baseline = encode_png(image)
+    with open(path, "wb") as f:
+        f.write(data)
+    if report is not None:
+        print(f"  {path}: {report.add(path, baseline, len(data))}")
+    return baseline, len(data)
+
+
+def main():
+    """Recompress PNG files in place, keeping any that are already smaller."""
+    paths = sys.argv[1:]
+    if not paths:
+        print(f"Usage: {sys.argv[0]} FILE.png...")
+        sys.exit(1)
+
+    report = SizeReport()
+    for path in paths:
+        before = os.path.getsize(path)
+        with Image.open(path) as image:
+            image.load()
+            data, _ = encode_png(image)
+        if len(data) < before:
+            with open(path, "wb") as f:
+                f.write(data)
+        print(f"{path}: {report.add(path, before, min(before, len(data)))}")
+    report.print_total()
+
+
+if __name__ == "__main__":
+    main()